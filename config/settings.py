@@ -289,6 +289,17 @@ class Settings(BaseSettings):
     database_pool_size: int = Field(5, alias="DATABASE_POOL_SIZE", gt=0)
     database_max_overflow: int = Field(10, alias="DATABASE_MAX_OVERFLOW", ge=0)
 
+    # Named pools (database/engine_registry.py); read-only pools route to the replica when set
+    database_read_replica_url: str | None = Field(None, alias="DATABASE_READ_REPLICA_URL")
+    database_background_pool_size: int = Field(2, alias="DATABASE_BACKGROUND_POOL_SIZE", gt=0)
+    database_health_pool_size: int = Field(1, alias="DATABASE_HEALTH_POOL_SIZE", gt=0)
+
+    # Async request-path pool (asyncpg); the sync pool above serves scripts and jobs
+    async_database_pool_size: int = Field(10, alias="ASYNC_DATABASE_POOL_SIZE", gt=0)
+    async_database_max_overflow: int = Field(10, alias="ASYNC_DATABASE_MAX_OVERFLOW", ge=0)
+    async_database_pool_timeout: float = Field(5.0, alias="ASYNC_DATABASE_POOL_TIMEOUT", gt=0)
+    async_database_statement_timeout_ms: int = Field(5000, alias="ASYNC_DATABASE_STATEMENT_TIMEOUT_MS", gt=0)
+
     # Redis Configuration
     redis_url: str = Field("redis://localhost:6379", alias="REDIS_URL")
     redis_timeout: int = Field(5, alias="REDIS_TIMEOUT")
@@ -297,6 +308,30 @@ class Settings(BaseSettings):
     rate_limit_enabled: bool = Field(True, alias="RATE_LIMIT_ENABLED")
     rate_limit_backend_url: str = Field("redis://localhost:6379/0", alias="RATE_LIMIT_BACKEND_URL")
     rate_limit_per_minute: int = Field(0, alias="RATE_LIMIT_PER_MINUTE")  # 0 = use defaults
+    # Token bucket (middleware/production_rate_limiter.py): tokens a worker leases per Redis call (0/1 = no leasing)
+    rate_limit_lease_size: int = Field(0, alias="RATE_LIMIT_LEASE_SIZE", ge=0)
+    rate_limit_lease_ttl_seconds: float = Field(1.0, alias="RATE_LIMIT_LEASE_TTL_SECONDS", gt=0)
+    rate_limit_memory_max_keys: int = Field(100000, alias="RATE_LIMIT_MEMORY_MAX_KEYS", gt=0)
+    # Verified API key cache (production/api_commercialization.py); PBKDF2 only runs on a miss
+    api_key_cache_ttl_seconds: float = Field(300.0, alias="API_KEY_CACHE_TTL_SECONDS", gt=0)
+    api_key_cache_max_entries: int = Field(10000, alias="API_KEY_CACHE_MAX_ENTRIES", gt=0)
+    # Per-key usage quotas (production/usage_quota.py): seconds between batched day/month counter flushes
+    api_quota_flush_interval_seconds: float = Field(1.0, alias="API_QUOTA_FLUSH_INTERVAL_SECONDS", gt=0)
+    # Telemetry ingestion queue (services/telemetry_ingest.py): 429 once max_events are waiting to be written
+    telemetry_ingest_max_events: int = Field(20000, alias="TELEMETRY_INGEST_MAX_EVENTS", gt=0)
+    telemetry_ingest_batch_size: int = Field(500, alias="TELEMETRY_INGEST_BATCH_SIZE", gt=0)
+    telemetry_ingest_flush_interval_seconds: float = Field(0.25, alias="TELEMETRY_INGEST_FLUSH_INTERVAL_SECONDS", gt=0)
+    telemetry_ingest_dedup_window: int = Field(100000, alias="TELEMETRY_INGEST_DEDUP_WINDOW", gt=0)
+    # Telemetry rollups (services/telemetry_rollups.py): minute buckets older than this fold into hourly ones
+    telemetry_rollup_minute_retention_hours: int = Field(48, alias="TELEMETRY_ROLLUP_MINUTE_RETENTION_HOURS", gt=24)
+    telemetry_rollup_compact_interval_seconds: float = Field(600.0, alias="TELEMETRY_ROLLUP_COMPACT_INTERVAL_SECONDS", gt=0)
+    # In-memory interaction analytics (services/analytics_service.py); buckets kept for analytics_retention_days
+    analytics_recent_interactions_max: int = Field(10000, alias="ANALYTICS_RECENT_INTERACTIONS_MAX", gt=0)
+    analytics_spill_searches: bool = Field(False, alias="ANALYTICS_SPILL_SEARCHES")  # also write searches to search_analytics
+    # Analytics write-behind queue (services/analytics_writer.py): oldest records dropped beyond max_records
+    analytics_writer_max_records: int = Field(10000, alias="ANALYTICS_WRITER_MAX_RECORDS", gt=0)
+    analytics_writer_batch_size: int = Field(200, alias="ANALYTICS_WRITER_BATCH_SIZE", gt=0)
+    analytics_writer_flush_interval_seconds: float = Field(1.0, alias="ANALYTICS_WRITER_FLUSH_INTERVAL_SECONDS", gt=0)
 
     # Health check endpoint exemption for deployment probes
     rate_limit_exempt_paths: list[str] = Field(
@@ -362,6 +397,21 @@ class Settings(BaseSettings):
     log_level: LogLevel = Field(LogLevel.INFO, alias="LOG_LEVEL")
     log_format: str = Field("json", alias="LOG_FORMAT")  # json or text
     log_file: str | None = Field(None, alias="LOG_FILE")
+    # Non-blocking pipeline and hot-path sampling (utils/logger.py)
+    log_async: bool = Field(True, alias="LOG_ASYNC", description="Format and write records on a background thread; callers only enqueue")
+    log_queue_size: int = Field(10000, alias="LOG_QUEUE_SIZE", gt=0, description="Records buffered for the log writer thread before new ones are dropped")
+    log_sampling: str = Field(
+        "scholarship_api.services.scholarship_service=0.01,"
+        "scholarship_api.services.search_service=0.01,"
+        "scholarship_api.services.eligibility_service=0.01",
+        alias="LOG_SAMPLING",
+        description="logger=fraction pairs: share of INFO/DEBUG records kept for that logger and its children",
+    )
+    log_rate_limits: str = Field(
+        "scholarship_api.services.analytics_service=10",
+        alias="LOG_RATE_LIMITS",
+        description="logger=records_per_second pairs: INFO/DEBUG records beyond the rate are dropped",
+    )
 
     # Analytics Configuration with validation
     analytics_enabled: bool = Field(True, alias="ANALYTICS_ENABLED")
@@ -371,9 +421,14 @@ class Settings(BaseSettings):
     search_default_limit: int = Field(20, alias="SEARCH_DEFAULT_LIMIT", gt=0, le=100)
     search_max_limit: int = Field(100, alias="SEARCH_MAX_LIMIT", gt=0, le=1000)
 
+    # Scholarship Index Configuration (in-process columnar search index)
+    scholarship_index_enabled: bool = Field(True, alias="SCHOLARSHIP_INDEX_ENABLED")
+    scholarship_index_refresh_seconds: float = Field(5.0, alias="SCHOLARSHIP_INDEX_REFRESH_SECONDS", ge=0)
+
     # Cache Configuration with validation
     cache_enabled: bool = Field(True, alias="CACHE_ENABLED")
     cache_ttl_seconds: int = Field(300, alias="CACHE_TTL_SECONDS", gt=0)  # 5 minutes
+    cache_max_entries: int = Field(1024, alias="CACHE_MAX_ENTRIES", gt=0)  # per namespace
 
     # External Services
     notification_service_url: str | None = Field(None, alias="NOTIFICATION_SERVICE_URL")
@@ -402,6 +457,113 @@ class Settings(BaseSettings):
         description="Maximum URL length (path + query) in characters"
     )
 
+    # Response compression (middleware/compression.py): budget for precompressed static/SEO variants
+    compression_variant_cache_max_bytes: int = Field(
+        32 * 1024 * 1024,
+        alias="COMPRESSION_VARIANT_CACHE_MAX_BYTES",
+        gt=0,
+        description="Maximum bytes of compressed static/SEO responses cached by ETag"
+    )
+
+    # Prerendered scholarship pages and sitemap (services/prerender_store.py)
+    prerender_cache_max_entries: int = Field(
+        5000,
+        alias="PRERENDER_CACHE_MAX_ENTRIES",
+        gt=0,
+        description="Maximum rendered pages/sitemaps kept (with their gzip/br variants)"
+    )
+    seo_sitemap_max_urls: int = Field(
+        50000,
+        alias="SEO_SITEMAP_MAX_URLS",
+        gt=0,
+        description="URLs per sitemap file; larger sitemaps are split behind a sitemap index"
+    )
+
+    # LLM page generation (services/llm_generation.py)
+    llm_generation_max_concurrency: int = Field(
+        8,
+        alias="LLM_GENERATION_MAX_CONCURRENCY",
+        gt=0,
+        description="Chat completion requests in flight at once during page generation"
+    )
+    llm_generation_tokens_per_minute: int = Field(
+        90000,
+        alias="LLM_GENERATION_TOKENS_PER_MINUTE",
+        gt=0,
+        description="Token budget (prompt estimate + max_tokens) per minute across all requests"
+    )
+    llm_generation_timeout_seconds: float = Field(
+        60.0,
+        alias="LLM_GENERATION_TIMEOUT_SECONDS",
+        gt=0,
+        description="Per-request timeout for page generation completions"
+    )
+    llm_completion_cache_dir: str = Field(
+        "data/llm_cache",
+        alias="LLM_COMPLETION_CACHE_DIR",
+        description="Directory of cached completions keyed by request content hash"
+    )
+
+    # LLM gateway for request-path AI features (services/llm_gateway.py)
+    llm_gateway_timeout_seconds: float = Field(
+        20.0,
+        alias="LLM_GATEWAY_TIMEOUT_SECONDS",
+        gt=0,
+        description="Per-call timeout for AI completions served on the request path"
+    )
+    llm_gateway_max_connections: int = Field(
+        20,
+        alias="LLM_GATEWAY_MAX_CONNECTIONS",
+        gt=0,
+        description="Pooled HTTP connections to the LLM API"
+    )
+    llm_gateway_cache_max_entries: int = Field(
+        2048,
+        alias="LLM_GATEWAY_CACHE_MAX_ENTRIES",
+        gt=0,
+        description="Cached results per cached operation (query enhancement, summaries)"
+    )
+    llm_gateway_cache_ttl_seconds: float = Field(
+        3600.0,
+        alias="LLM_GATEWAY_CACHE_TTL_SECONDS",
+        gt=0,
+        description="How long cached AI results are served"
+    )
+
+    # Local token revocation cache (services/revocation_cache.py)
+    token_revocation_poll_interval_seconds: float = Field(
+        5.0,
+        alias="TOKEN_REVOCATION_POLL_INTERVAL_SECONDS",
+        gt=0,
+        description="How often revoked_tokens is polled for new revocations"
+    )
+    token_revocation_max_staleness_seconds: float = Field(
+        30.0,
+        alias="TOKEN_REVOCATION_MAX_STALENESS_SECONDS",
+        gt=0,
+        description="Local answers are used only if revoked_tokens was synced this recently"
+    )
+    token_revocation_bloom_capacity: int = Field(
+        100000,
+        alias="TOKEN_REVOCATION_BLOOM_CAPACITY",
+        gt=0,
+        description="Revoked JTIs the Bloom filter is sized for (grows when exceeded)"
+    )
+
+    # Verified JWT cache (services/verified_token_cache.py)
+    verified_token_cache_max_entries: int = Field(
+        10000,
+        alias="VERIFIED_TOKEN_CACHE_MAX_ENTRIES",
+        gt=0,
+        description="Verified bearer tokens kept (LRU) so repeat calls skip signature verification"
+    )
+    verified_token_cache_ttl_seconds: float = Field(
+        300.0,
+        alias="VERIFIED_TOKEN_CACHE_TTL_SECONDS",
+        gt=0,
+        description="Longest a verification is reused; entries also expire with the token"
+    )
+
     # Legacy field for backward compatibility
     max_request_body_bytes: int = Field(
         5242880,  # 5 MiB - matches max_request_size_bytes for Protocol ONE TRUTH
@@ -0,0 +1,362 @@
+"""
+Engine Registry - Named Connection Pools
+One place that creates SQLAlchemy engines, each with its own pool budget
+
+Pools:
+- request_read: request-path reads (AsyncSession); routed to the read replica when configured
+- write:        writes, ledger and general sync sessions (models.database.SessionLocal)
+- background:   event emission, data sync, telemetry
+- health:       health and readiness probes (tiny pool, short timeouts)
+
+Engines are created lazily per (pool, flavor) so a process only opens the pools
+it actually uses. Every engine reports checkouts and pool state to Prometheus.
+"""
+
+import os
+import ssl
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
+
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from config.settings import settings
+from observability.metrics import db_pool_checkouts_total, db_pool_connections
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+REQUEST_READ_POOL = "request_read"
+WRITE_POOL = "write"
+BACKGROUND_POOL = "background"
+HEALTH_POOL = "health"
+
+SQLITE_FALLBACK_URL = "sqlite:///./scholarships.db"
+
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+@dataclass(frozen=True)
+class PoolSpec:
+    """Pool budget for one named workload"""
+    name: str
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float
+    pool_recycle: int = 3600
+    connect_timeout: int = 10
+    statement_timeout_ms: int | None = None
+    read_only: bool = False
+
+
+def default_pool_specs() -> dict[str, PoolSpec]:
+    return {
+        spec.name: spec for spec in (
+            PoolSpec(
+                REQUEST_READ_POOL,
+                pool_size=settings.async_database_pool_size,
+                max_overflow=settings.async_database_max_overflow,
+                pool_timeout=settings.async_database_pool_timeout,
+                statement_timeout_ms=settings.async_database_statement_timeout_ms,
+                read_only=True,
+            ),
+            PoolSpec(
+                WRITE_POOL,
+                pool_size=settings.database_pool_size,
+                max_overflow=settings.database_max_overflow,
+                pool_timeout=30,
+                statement_timeout_ms=5000,
+            ),
+            PoolSpec(
+                BACKGROUND_POOL,
+                pool_size=settings.database_background_pool_size,
+                max_overflow=0,
+                pool_timeout=10,
+            ),
+            PoolSpec(
+                HEALTH_POOL,
+                pool_size=settings.database_health_pool_size,
+                max_overflow=0,
+                pool_timeout=3,
+                pool_recycle=300,
+                connect_timeout=3,
+                statement_timeout_ms=5000,
+            ),
+        )
+    }
+
+
+def primary_database_url() -> str:
+    return os.getenv("DATABASE_URL") or settings.database_url or SQLITE_FALLBACK_URL
+
+
+def _is_postgres(url: str) -> bool:
+    return url.startswith(("postgresql", "postgres"))
+
+
+def _sync_connect_args(spec: PoolSpec) -> dict:
+    """libpq connect args with the production certificate-verification policy"""
+    connect_args = {
+        "connect_timeout": spec.connect_timeout,
+        "application_name": f"scholarship_api:{spec.name}",
+    }
+    if spec.statement_timeout_ms is not None:
+        connect_args["options"] = f"-c statement_timeout={spec.statement_timeout_ms}"
+
+    # Production SSL hardening - ALWAYS enforce certificate verification
+    if settings.environment.value in ["production", "staging"]:
+        ssl_root_cert = os.getenv("SSL_ROOT_CERT")
+        if ssl_root_cert:
+            connect_args.update({
+                "sslmode": "verify-full",
+                "sslcert": os.getenv("SSL_CLIENT_CERT"),
+                "sslkey": os.getenv("SSL_CLIENT_KEY"),
+                "sslrootcert": ssl_root_cert,
+                "sslcrl": os.getenv("SSL_CRL"),
+            })
+            if not spec.read_only:
+                connect_args["target_session_attrs"] = "read-write"  # Ensure we connect to primary
+            connect_args = {k: v for k, v in connect_args.items() if v is not None}
+        else:
+            # Managed providers have valid public certs in the system trust store
+            connect_args["sslmode"] = "verify-full"
+            connect_args["sslrootcert"] = "/etc/ssl/certs/ca-certificates.crt"
+
+    return connect_args
+
+
+def to_async_url(database_url: str, statement_timeout_ms: int | None = None,
+                 application_name: str = "scholarship_api") -> tuple[str, dict]:
+    """
+    Convert a sync DATABASE_URL into an async driver URL plus connect_args.
+
+    asyncpg does not understand libpq's sslmode query parameter, so it is
+    stripped and translated into an ssl context with equivalent verification.
+    """
+    parsed = urlparse(database_url)
+    scheme = _ASYNC_DRIVERS.get(parsed.scheme, parsed.scheme)
+    query_params = parse_qs(parsed.query)
+    ssl_mode = query_params.pop("sslmode", [None])[0]
+    url = urlunparse((
+        scheme,
+        parsed.netloc,
+        parsed.path,
+        parsed.params,
+        urlencode(query_params, doseq=True),
+        parsed.fragment
+    ))
+
+    if not scheme.startswith("postgresql"):
+        return url, {}
+
+    server_settings = {"application_name": application_name}
+    if statement_timeout_ms is not None:
+        server_settings["statement_timeout"] = str(statement_timeout_ms)
+    connect_args: dict = {"timeout": 10, "server_settings": server_settings}
+
+    # Production mirrors the sync engine: always verify the server certificate
+    if settings.environment.value in ["production", "staging"]:
+        ssl_mode = "verify-full"
+
+    if ssl_mode in ("verify-ca", "verify-full"):
+        ssl_context = ssl.create_default_context()
+        ssl_context.check_hostname = ssl_mode == "verify-full"
+        connect_args["ssl"] = ssl_context
+    elif ssl_mode in ("require", "prefer"):
+        ssl_context = ssl.create_default_context()
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+        connect_args["ssl"] = ssl_context
+
+    return url, connect_args
+
+
+class EngineRegistry:
+    """
+    Lazily created sync and async engines per named pool.
+
+    Read-only pools use DATABASE_READ_REPLICA_URL when it is set; everything
+    else always goes to the primary.
+    """
+
+    def __init__(self, specs: dict[str, PoolSpec] | None = None,
+                 url_resolver: Callable[[], str] = primary_database_url):
+        self._specs = specs
+        self._url_resolver = url_resolver
+        self._engines: dict[str, Engine] = {}
+        self._async_engines: dict[str, AsyncEngine] = {}
+        self._sessionmakers: dict[str, sessionmaker] = {}
+        self._async_sessionmakers: dict[str, async_sessionmaker] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def specs(self) -> dict[str, PoolSpec]:
+        if self._specs is None:
+            self._specs = default_pool_specs()
+        return self._specs
+
+    def spec(self, name: str) -> PoolSpec:
+        try:
+            return self.specs[name]
+        except KeyError:
+            raise ValueError(f"Unknown database pool: {name}") from None
+
+    def url_for(self, name: str) -> str:
+        if self.spec(name).read_only and settings.database_read_replica_url:
+            return settings.database_read_replica_url
+        return self._url_resolver()
+
+    def _pool_args(self, spec: PoolSpec) -> dict:
+        return {
+            "pool_size": spec.pool_size,
+            "max_overflow": spec.max_overflow,
+            "pool_timeout": spec.pool_timeout,
+            "pool_recycle": spec.pool_recycle,
+            "pool_pre_ping": True,
+        }
+
+    def get_engine(self, name: str = WRITE_POOL) -> Engine:
+        """Sync engine for the named pool"""
+        engine = self._engines.get(name)
+        if engine is not None:
+            return engine
+
+        with self._lock:
+            engine = self._engines.get(name)
+            if engine is None:
+                spec = self.spec(name)
+                url = self.url_for(name)
+                if _is_postgres(url):
+                    engine = create_engine(
+                        url,
+                        echo=settings.database_echo,
+                        connect_args=_sync_connect_args(spec),
+                        max_identifier_length=63,  # PostgreSQL standard
+                        **self._pool_args(spec)
+                    )
+                else:
+                    # Fallback to SQLite for development
+                    engine = create_engine(url, echo=settings.database_echo)
+                self._register(name, "sync", engine)
+            return engine
+
+    def get_async_engine(self, name: str = REQUEST_READ_POOL) -> AsyncEngine:
+        """Async (asyncpg) engine for the named pool"""
+        engine = self._async_engines.get(name)
+        if engine is not None:
+            return engine
+
+        with self._lock:
+            engine = self._async_engines.get(name)
+            if engine is None:
+                spec = self.spec(name)
+                url, connect_args = to_async_url(
+                    self.url_for(name),
+                    statement_timeout_ms=spec.statement_timeout_ms,
+                    application_name=f"scholarship_api:{name}"
+                )
+                pool_args = self._pool_args(spec) if url.startswith("postgresql") else {}
+                engine = create_async_engine(
+                    url,
+                    echo=settings.database_echo,
+                    connect_args=connect_args,
+                    **pool_args
+                )
+                self._register(name, "async", engine)
+            return engine
+
+    def _register(self, name: str, flavor: str, engine: Engine | AsyncEngine) -> None:
+        if flavor == "async":
+            self._async_engines[name] = engine
+            self._async_sessionmakers.pop(name, None)
+            sync_engine = engine.sync_engine
+        else:
+            self._engines[name] = engine
+            self._sessionmakers.pop(name, None)
+            sync_engine = engine
+
+        def on_checkout(*_):
+            db_pool_checkouts_total.labels(pool=name, flavor=flavor).inc()
+            self._export(name, flavor, sync_engine)
+
+        def on_checkin(*_):
+            self._export(name, flavor, sync_engine)
+
+        event.listen(sync_engine, "checkout", on_checkout)
+        event.listen(sync_engine, "checkin", on_checkin)
+        logger.info(f"Database pool '{name}' ({flavor}) created: {self._describe(sync_engine)}")
+
+    def sessionmaker(self, name: str = WRITE_POOL) -> sessionmaker:
+        factory = self._sessionmakers.get(name)
+        if factory is None:
+            factory = sessionmaker(autocommit=False, autoflush=False, bind=self.get_engine(name))
+            self._sessionmakers[name] = factory
+        return factory
+
+    def session(self, name: str = WRITE_POOL) -> Session:
+        return self.sessionmaker(name)()
+
+    def async_sessionmaker(self, name: str = REQUEST_READ_POOL) -> async_sessionmaker[AsyncSession]:
+        factory = self._async_sessionmakers.get(name)
+        if factory is None:
+            factory = async_sessionmaker(self.get_async_engine(name), class_=AsyncSession, expire_on_commit=False)
+            self._async_sessionmakers[name] = factory
+        return factory
+
+    def configure(self, name: str, engine: Engine | AsyncEngine | None, flavor: str = "sync") -> None:
+        """Install (or with None, forget) the engine for a pool - tests and alternate databases"""
+        engines = self._async_engines if flavor == "async" else self._engines
+        makers = self._async_sessionmakers if flavor == "async" else self._sessionmakers
+        with self._lock:
+            makers.pop(name, None)
+            if engine is None:
+                engines.pop(name, None)
+            else:
+                engines[name] = engine
+
+    @staticmethod
+    def _describe(sync_engine: Engine) -> dict:
+        pool = sync_engine.pool
+        size = getattr(pool, "size", lambda: 0)()
+        checked_out = getattr(pool, "checkedout", lambda: 0)()
+        return {
+            "pool_size": size,
+            "checked_out": checked_out,
+            "idle": getattr(pool, "checkedin", lambda: 0)(),
+            "overflow": max(getattr(pool, "overflow", lambda: 0)(), 0),
+            "utilization_pct": round(checked_out / size * 100, 2) if size else 0.0,
+        }
+
+    def _export(self, name: str, flavor: str, sync_engine: Engine) -> dict:
+        status = self._describe(sync_engine)
+        for state in ("checked_out", "idle", "overflow"):
+            db_pool_connections.labels(pool=name, flavor=flavor, state=state).set(status[state])
+        return status
+
+    def pool_status(self) -> dict[str, dict]:
+        """Status of every pool created in this process, keyed by '<pool>' / '<pool>:async'"""
+        status = {}
+        for name, engine in list(self._engines.items()):
+            status[name] = self._export(name, "sync", engine)
+        for name, engine in list(self._async_engines.items()):
+            status[f"{name}:async"] = self._export(name, "async", engine.sync_engine)
+        return status
+
+    def dispose(self) -> None:
+        for engine in list(self._engines.values()):
+            engine.dispose()
+
+    async def dispose_async(self) -> None:
+        for engine in list(self._async_engines.values()):
+            await engine.dispose()
+
+
+engine_registry = EngineRegistry()
@@ -0,0 +1,87 @@
+-- Business Event Rollups for Command Center dashboards
+-- Per-minute aggregates of business_events by (event_name, app, actor_type),
+-- maintained by a statement-level trigger as events are inserted and compacted
+-- into hourly buckets by services/telemetry_rollups.py.
+-- Idempotent: safe to run on every startup.
+
+-- Block concurrent inserts so the one-time backfill and the trigger never both count a row
+LOCK TABLE business_events IN SHARE ROW EXCLUSIVE MODE;
+
+CREATE TABLE IF NOT EXISTS business_event_rollups (
+    granularity VARCHAR(6) NOT NULL CHECK (granularity IN ('minute', 'hour')),
+    bucket_start TIMESTAMPTZ NOT NULL,
+    event_name VARCHAR(100) NOT NULL,
+    app VARCHAR(50) NOT NULL,
+    actor_type VARCHAR(20) NOT NULL,
+
+    event_count BIGINT NOT NULL DEFAULT 0,
+    amount_cents NUMERIC NOT NULL DEFAULT 0,
+    platform_fee_cents NUMERIC NOT NULL DEFAULT 0,
+    revenue_usd NUMERIC NOT NULL DEFAULT 0,
+    first_ts TIMESTAMPTZ,
+    last_ts TIMESTAMPTZ,
+
+    PRIMARY KEY (granularity, bucket_start, event_name, app, actor_type)
+);
+
+CREATE INDEX IF NOT EXISTS idx_business_event_rollups_bucket ON business_event_rollups(bucket_start DESC);
+
+-- Numeric property or 0; never raises, so a malformed payload cannot fail the insert
+CREATE OR REPLACE FUNCTION business_event_numeric(props JSONB, key TEXT) RETURNS NUMERIC AS $$
+    SELECT CASE
+        WHEN props->>key ~ '^\s*-?[0-9]+(\.[0-9]+)?\s*$' THEN (props->>key)::numeric
+        ELSE 0
+    END
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION rollup_business_events() RETURNS trigger AS $$
+BEGIN
+    -- new_events holds only rows actually inserted (ON CONFLICT DO NOTHING skips are excluded)
+    INSERT INTO business_event_rollups AS r
+        (granularity, bucket_start, event_name, app, actor_type,
+         event_count, amount_cents, platform_fee_cents, revenue_usd, first_ts, last_ts)
+    SELECT 'minute', date_trunc('minute', ts), event_name, app, actor_type,
+           COUNT(*),
+           SUM(business_event_numeric(properties, 'amount_cents')),
+           SUM(business_event_numeric(properties, 'platform_fee_cents')),
+           SUM(business_event_numeric(properties, 'revenue_usd')),
+           MIN(ts), MAX(ts)
+    FROM new_events
+    GROUP BY 2, 3, 4, 5
+    ORDER BY 2, 3, 4, 5  -- same lock order in every writer
+    ON CONFLICT (granularity, bucket_start, event_name, app, actor_type) DO UPDATE SET
+        event_count = r.event_count + EXCLUDED.event_count,
+        amount_cents = r.amount_cents + EXCLUDED.amount_cents,
+        platform_fee_cents = r.platform_fee_cents + EXCLUDED.platform_fee_cents,
+        revenue_usd = r.revenue_usd + EXCLUDED.revenue_usd,
+        first_ts = LEAST(r.first_ts, EXCLUDED.first_ts),
+        last_ts = GREATEST(r.last_ts, EXCLUDED.last_ts);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS business_events_rollup ON business_events;
+CREATE TRIGGER business_events_rollup
+    AFTER INSERT ON business_events
+    REFERENCING NEW TABLE AS new_events
+    FOR EACH STATEMENT EXECUTE FUNCTION rollup_business_events();
+
+-- One-time backfill of existing history; the compactor folds buckets past retention into hours
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM business_event_rollups) THEN
+        INSERT INTO business_event_rollups
+            (granularity, bucket_start, event_name, app, actor_type,
+             event_count, amount_cents, platform_fee_cents, revenue_usd, first_ts, last_ts)
+        SELECT 'minute', date_trunc('minute', ts), event_name, app, actor_type,
+               COUNT(*),
+               SUM(business_event_numeric(properties, 'amount_cents')),
+               SUM(business_event_numeric(properties, 'platform_fee_cents')),
+               SUM(business_event_numeric(properties, 'revenue_usd')),
+               MIN(ts), MAX(ts)
+        FROM business_events
+        GROUP BY 2, 3, 4, 5;
+    END IF;
+END $$;
+
+COMMENT ON TABLE business_event_rollups IS 'Per-minute (recent) and per-hour (compacted) business_events aggregates for dashboards';
@@ -1,57 +1,50 @@
 """
 Simple database session manager for health checks
 SEV-2 hardened: pooling, timeouts, keepalive per CIR-20260119-001
+
+Engines come from the central registry (database/engine_registry.py); the
+health pool keeps the SEV-2 budget (no overflow, 3s checkout, 300s recycle).
 """
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.orm import Session
 
 from config.settings import settings
+from database.engine_registry import HEALTH_POOL, WRITE_POOL, engine_registry
 
-_engine = None
 
 def get_engine():
-    """Get or create the database engine with SEV-2 hardened pooling"""
-    global _engine
-    if _engine is None and settings.database_url:
-        _engine = create_engine(
-            settings.database_url,
-            poolclass=QueuePool,
-            pool_size=settings.database_pool_size,
-            max_overflow=0,
-            pool_pre_ping=True,
-            pool_recycle=300,
-            pool_timeout=3,
-            connect_args={
-                "options": "-c statement_timeout=5000",
-                "connect_timeout": 3
-            }
-        )
-    return _engine
+    """Get the health-check engine (registry pool "health")"""
+    if not settings.database_url:
+        return None
+    return engine_registry.get_engine(HEALTH_POOL)
+
 
 def get_pool_status():
-    """Get pool status for health endpoint"""
-    engine = get_engine()
-    if engine is None:
-        return {"db_connected": False, "pool_in_use": 0, "pool_idle": 0, "pool_size": 0}
-    
+    """
+    Get pool status for health endpoint.
+
+    Top-level counts are totals across every pool opened in this process
+    (request path included); "pools" breaks them down per named pool.
+    """
+    if not settings.database_url:
+        return {"db_connected": False, "pool_in_use": 0, "pool_idle": 0, "pool_size": 0, "pools": {}}
+
     try:
-        pool = engine.pool
+        pools = engine_registry.pool_status()
         return {
             "db_connected": True,
-            "pool_in_use": getattr(pool, 'checkedout', lambda: 0)(),
-            "pool_idle": getattr(pool, 'checkedin', lambda: 0)(),
-            "pool_size": getattr(pool, 'size', lambda: 0)()
+            "pool_in_use": sum(p["checked_out"] for p in pools.values()),
+            "pool_idle": sum(p["idle"] for p in pools.values()),
+            "pool_size": sum(p["pool_size"] for p in pools.values()),
+            "pools": pools
         }
     except Exception:
-        return {"db_connected": True, "pool_in_use": 0, "pool_idle": 0, "pool_size": 0}
+        return {"db_connected": True, "pool_in_use": 0, "pool_idle": 0, "pool_size": 0, "pools": {}}
+
 
-def get_session():
-    """Get a database session for health checks"""
-    engine = get_engine()
-    if engine is None:
+def get_session(pool: str = WRITE_POOL) -> Session:
+    """Get a sync database session from a named pool (default: write/ledger)"""
+    if not settings.database_url:
         raise Exception("No database URL configured")
 
-    SessionLocal = sessionmaker(bind=engine)
-    return SessionLocal()
+    return engine_registry.session(pool)
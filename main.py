@@ -37,13 +37,10 @@ from middleware.api_rate_limiting import APIRateLimitMiddleware
 from middleware.error_handling import (
     general_exception_handler,
     http_exception_handler,
-    trace_id_middleware,
     validation_exception_handler,
 )
 from middleware.rate_limiting import limiter
-from middleware.request_id import RequestIDMiddleware
 from middleware.waf_protection import WAFProtection
-from middleware.identity_headers import IdentityHeadersMiddleware
 from observability.metrics import setup_metrics
 from observability.tracing import tracing_service
 from observability.dashboards import router as observability_router
@@ -216,7 +213,20 @@ async def lifespan(app: FastAPIType):
     except Exception as e:
         logger.error(f"❌ JWKS prewarm failed: {e}")
         logger.warning("⚠️ Falling back to HS256-only validation (degraded mode)")
-    
+
+    # Keep the local token revocation set in sync (services/revocation_cache.py)
+    from services.token_blocklist import revocation_cache
+    revocation_cache.start()
+
+    # Compile per-scholarship competition features for predictive matching
+    from services.scholarship_features import scholarship_feature_store
+
+    try:
+        await scholarship_feature_store.warm_async()
+        logger.info("✅ Scholarship feature store compiled")
+    except Exception as e:
+        logger.warning(f"⚠️ Scholarship feature store warmup failed (computed on demand): {e}")
+
     # Start Command Center registration in background (non-blocking)
     import asyncio
 
@@ -243,6 +253,36 @@ async def lifespan(app: FastAPIType):
     from services.jwks_client import jwks_client
     await jwks_client.close()
 
+    # Close pooled LLM API connections (services/llm_gateway.py)
+    from services.llm_gateway import close_llm_gateway
+    await close_llm_gateway()
+
+    # Write telemetry events still waiting in the ingestion queue (services/telemetry_ingest.py)
+    from services.telemetry_ingest import telemetry_ingest_queue
+    telemetry_ingest_queue.close()
+    from services.telemetry_rollups import telemetry_rollups
+    telemetry_rollups.close()
+
+    # Write queued interaction and search analytics rows (services/analytics_writer.py),
+    # including searches of the still-open minute when ANALYTICS_SPILL_SEARCHES is on
+    from services.analytics_service import analytics_service
+    analytics_service.flush_spill()
+    from services.analytics_writer import analytics_writer
+    analytics_writer.close()
+
+    # Stop the token revocation sync thread (services/revocation_cache.py)
+    from services.token_blocklist import revocation_cache
+    revocation_cache.close()
+
+    # Flush buffered API usage counters (production/usage_quota.py)
+    from production.api_commercialization import commercialization_service
+    commercialization_service.quota.close()
+
+    # Close every named database pool (database/engine_registry.py)
+    from database.engine_registry import engine_registry
+    await engine_registry.dispose_async()
+    engine_registry.dispose()
+
 # Create FastAPI app with production-aware docs configuration
 # CRITICAL: lifespan MUST be defined BEFORE this call and passed via constructor
 app = FastAPI(
@@ -286,6 +326,19 @@ async def startup_a8_telemetry():
     else:
         logger.warning("📡 A8 Telemetry disabled - missing EVENT_BUS_URL or TOKEN")
 
+@app.on_event("startup")
+async def startup_telemetry_rollups():
+    """Install business_event_rollups (first run only) and start minute->hour compaction"""
+    import asyncio
+    from services.telemetry_rollups import telemetry_rollups
+
+    try:
+        if await asyncio.to_thread(telemetry_rollups.ensure_schema):
+            telemetry_rollups.start()
+            logger.info("📊 Telemetry rollups ready - dashboards read business_event_rollups")
+    except Exception as e:
+        logger.error(f"❌ Telemetry rollup setup failed: {e}")
+
 @app.on_event("startup")
 async def startup_telemetry():
     """TELEMETRY CONTRACT v3.5.0: Emit app_started, start heartbeat and KPI_SNAPSHOT loops"""
@@ -653,10 +706,8 @@ setup_metrics(app)
 # Order: CEO Pre-Filter → Security & Host Protection → CORS → Request Processing → Rate Limiting → Routing
 from middleware.body_limit import BodySizeLimitMiddleware
 from middleware.database_session import DatabaseSessionMiddleware
+from middleware.header_pipeline import HeaderPipelineMiddleware
 from middleware.secure_cookies import SecureCookieMiddleware
-from middleware.security_headers import SecurityHeadersMiddleware
-from middleware.trusted_host import TrustedHostMiddleware
-from middleware.url_length import URLLengthMiddleware
 from middleware.debug_block_prefilter import DebugPathBlockerMiddleware
 
 # 0. CEO DIRECTIVE DEF-002: Pre-Router Debug Path Blocker (TOP OF STACK - FAIL CLOSED)
@@ -666,9 +717,8 @@ app.add_middleware(DebugPathBlockerMiddleware)
 # 1. Security and host protection middleware (outermost - first line of defense)
 # DAY 0 CEO DIRECTIVE: WAF AFTER AUTH (DEF-003 fix - auth middleware must execute before WAF for authenticated routes)
 app.add_middleware(SecureCookieMiddleware)     # Phase 2 Auth/OIDC: Secure cookies (SameSite=None; Secure; HttpOnly; Path=/)
-app.add_middleware(SecurityHeadersMiddleware)  # Security headers (must be first)
+# Security headers and trusted host run in HeaderPipelineMiddleware (section 4)
 # CRITICAL FIX: ForwardedHeadersMiddleware breaks route matching on Replit - corrupts ASGI scope paths
-app.add_middleware(TrustedHostMiddleware)      # Validate Host header against whitelist
 # app.add_middleware(ForwardedHeadersMiddleware) # DISABLED: Breaks routing on Replit proxy
 # Temporarily disabled for debugging - suspect it's blocking custom routes
 # app.add_middleware(DocsProtectionMiddleware)   # Block docs in production
@@ -693,19 +743,12 @@ app.add_middleware(
 )
 
 # 3. Request validation (check request before processing)
-app.add_middleware(URLLengthMiddleware, max_length=settings.max_url_length)
 app.add_middleware(BodySizeLimitMiddleware, max_size=settings.max_request_size_bytes)
 
-# 4. Request identification and tracing (before error handling)
-app.add_middleware(RequestIDMiddleware)
-app.middleware("http")(trace_id_middleware)
-
-# 4.05 AGENT3: Identity headers (add system_identity to all responses)
-app.add_middleware(IdentityHeadersMiddleware)
-
-# CEO v2.6 DIRECTIVE: Privacy Headers (X-Privacy-Context, DoNotSell for minors)
-from middleware.privacy_headers import PrivacyHeadersMiddleware
-app.add_middleware(PrivacyHeadersMiddleware)
+# 4. Fused pure-ASGI header pipeline: trusted host, URL length, request/trace IDs,
+# AGENT3 identity headers, CEO v2.6 privacy headers and CEO v2.4 security headers
+# in one pass (replaces seven BaseHTTPMiddleware layers)
+app.add_middleware(HeaderPipelineMiddleware, max_url_length=settings.max_url_length)
 
 # CEO v2.6 DIRECTIVE: API Key Guard (X-API-Key enforcement on external routes)
 from middleware.api_key_guard import APIKeyGuardMiddleware
@@ -721,10 +764,10 @@ app.add_middleware(RequestTimeoutMiddleware, timeout=5.0)
 from middleware.concurrency_limiter import ConcurrencyLimiterMiddleware
 app.add_middleware(ConcurrencyLimiterMiddleware, enabled=True)
 
-# 4.3 Phase 4: GZip Compression for responses
+# 4.3 Phase 4: Streaming compression (br/zstd/gzip) for responses
 # Reduces payload sizes for JSON responses per CIR-20260119-001
-from middleware.compression import GZipMiddleware
-app.add_middleware(GZipMiddleware, minimum_size=500, compression_level=6, enabled=True)
+from middleware.compression import CompressionMiddleware
+app.add_middleware(CompressionMiddleware, minimum_size=500, compression_level=6, enabled=True)
 
 # 4.5 CRITICAL SECURITY: API Rate Limiting Enforcement
 app.add_middleware(APIRateLimitMiddleware)  # Global API rate limiting enforcement
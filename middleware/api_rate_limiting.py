@@ -94,7 +94,7 @@ class APIRateLimitMiddleware(BaseHTTPMiddleware):
 
         # Check rate limits using the commercialization service
         endpoint = path.split("/")[-1] or "root"
-        rate_limit_result = commercialization_service.check_rate_limits(api_key, endpoint)
+        rate_limit_result = await commercialization_service.check_rate_limits_async(api_key, endpoint)
 
         if not rate_limit_result["allowed"]:
             # Rate limit exceeded or invalid key
@@ -191,7 +191,7 @@ async def require_api_key_with_rate_limit(
         )
 
     # Check rate limits
-    rate_limit_result = commercialization_service.check_rate_limits(x_api_key, "manual_check")
+    rate_limit_result = await commercialization_service.check_rate_limits_async(x_api_key, "manual_check")
 
     if not rate_limit_result["allowed"]:
         status_code = rate_limit_result.get("status_code", 429)
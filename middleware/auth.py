@@ -3,6 +3,7 @@ Authentication and Authorization Middleware
 Implementation of JWT-based authentication with role-based access control
 """
 
+import hashlib
 from datetime import datetime, timedelta
 from typing import Any
 
@@ -241,6 +242,17 @@ def create_access_token(data: dict[str, Any], expires_delta: timedelta | None =
     
     return encoded_jwt
 
+def _key_fingerprint(secret_key: str) -> str:
+    return hashlib.sha256(secret_key.encode()).hexdigest()[:16]
+
+def _signing_key_current(key_ref: tuple) -> bool:
+    """Whether the key that verified a cached token is still accepted (JWKS kid or HS256 secret)"""
+    kind, key_id = key_ref
+    if kind == "jwks":
+        from services.jwks_client import jwks_client
+        return jwks_client.has_key(key_id)
+    return any(key and _key_fingerprint(key) == key_id for key in [get_jwt_secret_key()] + get_jwt_previous_keys())
+
 async def decode_token(token: str) -> TokenData | None:
     """
     Decode and validate JWT with hardened security
@@ -258,6 +270,27 @@ async def decode_token(token: str) -> TokenData | None:
         metrics_service.record_token_operation("validate", "failure")
         return None
 
+    # Repeat calls with the same bearer token reuse the verified result
+    from services.verified_token_cache import verified_token_cache
+
+    cached = verified_token_cache.get(token, _signing_key_current)
+    if cached is not None:
+        # Revocation is checked on every hit: a revocation can land between a full
+        # decode's blocklist check and its cache put, so eviction alone is not enough
+        # (a local Bloom probe; remote only when the local set is stale)
+        if cached.jti:
+            try:
+                from services.token_blocklist import is_token_revoked
+                if await is_token_revoked(cached.jti):
+                    verified_token_cache.evict_jti(cached.jti)
+                    metrics_service.record_token_operation("validate", "revoked")
+                    return None
+            except Exception as e:
+                import logging
+                logging.warning(f"Token blocklist check failed: {e}")
+        metrics_service.record_token_operation("validate", "success")
+        return cached.token_data
+
     # Security: Reject tokens with 'none' algorithm
     try:
         header = jwt.get_unverified_header(token)
@@ -308,12 +341,14 @@ async def decode_token(token: str) -> TokenData | None:
                         metrics_service.record_token_operation("validate_permissions_fallback", "success")
                     
                     metrics_service.record_token_operation("validate", "success")
-                    return TokenData(
+                    token_data = TokenData(
                         user_id=user_id, 
                         roles=roles, 
                         scopes=effective_scopes,
                         permissions=raw_permissions
                     )
+                    verified_token_cache.put(token, token_data, payload["exp"], jti, ("jwks", header.get("kid")))
+                    return token_data
             except Exception as e:
                 import logging
                 logging.warning(f"RS256 validation failed: {type(e).__name__}: {e}")
@@ -390,12 +425,14 @@ async def decode_token(token: str) -> TokenData | None:
                         metrics_service.record_token_operation("validate_permissions_fallback", "success")
 
                     metrics_service.record_token_operation("validate", "success")
-                    return TokenData(
+                    token_data = TokenData(
                         user_id=user_id, 
                         roles=roles, 
                         scopes=effective_scopes,
                         permissions=raw_permissions
                     )
+                    verified_token_cache.put(token, token_data, payload["exp"], jti, ("hs256", _key_fingerprint(secret_key)))
+                    return token_data
                 except (JWTError, ValueError, KeyError, TypeError) as e:
                     # Log security events
                     import logging
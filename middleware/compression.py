@@ -1,16 +1,40 @@
 """
 Phase 4: Response Compression Middleware
-Enables gzip compression for API responses
+Streaming gzip / brotli / zstd compression for API responses
 SEV-2 CIR-20260119-001: Performance Decompression
+
+Pure ASGI: body chunks are compressed as they arrive and flushed straight to
+the client, so large listings, sitemaps and SEO pages are never held in memory
+twice and the first compressed bytes leave as soon as the first chunk does.
+
+- Accept-Encoding q-value negotiation (br and zstd only when their optional
+  packages are installed; gzip always)
+- Adaptive level: lighter compression for large bodies and under CPU load
+- Precompressed variant cache for static and SEO pages, keyed by ETag
 """
 
-import gzip
-import io
-from typing import Callable
+import os
+import time
+import zlib
+from collections import OrderedDict
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config.settings import settings
+from observability.metrics import compression_variant_cache_requests_total
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import StreamingResponse
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
 
 COMPRESSIBLE_CONTENT_TYPES = {
     "application/json",
@@ -33,118 +57,342 @@ EXCLUDED_PATHS = {
     "/",
 }
 
+# Responses under these paths carry stable ETags and are worth compressing once
+VARIANT_CACHE_PATHS = ("/static/", "/seo/", "/sitemap.xml", "/robots.txt")
+
+# Server preference when the client weights encodings equally
+ENCODING_PREFERENCE = ("br", "zstd", "gzip")
+
+LARGE_BODY_SIZE = 256 * 1024
+CPU_BUSY_LOAD = 0.75
+
+# (busy, large body, normal) levels per encoding; gzip "normal" comes from compression_level
+ADAPTIVE_LEVELS = {
+    "gzip": (1, 4, None),
+    "br": (1, 4, 5),
+    "zstd": (1, 3, 6),
+}
+# Cached variants are compressed once per ETag, so use the expensive settings
+VARIANT_LEVELS = {"gzip": 9, "br": 9, "zstd": 12}
+
+
+def available_encodings() -> tuple[str, ...]:
+    return tuple(
+        encoding for encoding in ENCODING_PREFERENCE
+        if encoding == "gzip"
+        or (encoding == "br" and BROTLI_AVAILABLE)
+        or (encoding == "zstd" and ZSTD_AVAILABLE)
+    )
+
+
+def negotiate_encoding(accept_encoding: str, supported: tuple[str, ...]) -> str | None:
+    """
+    Pick the best supported content-coding from an Accept-Encoding header.
+
+    Highest q-value wins; ties go to the order of `supported`. q=0 forbids a
+    coding, and "*" covers codings not listed explicitly.
+    """
+    if not accept_encoding:
+        return None
+
+    weights: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding] = q
+
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for coding in supported:
+        q = weights.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class _Compressor:
+    """Incremental compressor with a common interface across codings"""
+
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._obj = brotli.Compressor(quality=level)
+        elif encoding == "zstd":
+            self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+        else:
+            self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31: gzip container
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it so the client can decode it immediately"""
+        if self.encoding == "br":
+            return self._obj.process(data) + self._obj.flush()
+        if self.encoding == "zstd":
+            return self._obj.compress(data) + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == "br":
+            return self._obj.process(data) + self._obj.finish()
+        return self._obj.compress(data) + self._obj.flush()
+
+
+class CompressedVariantCache:
+    """
+    Byte-bounded LRU of compressed bodies keyed by (resource, ETag, encoding).
+
+    The resource (path + query string) is part of the key because ETags are
+    only unique per URL: StaticFiles derives them from mtime and size, so two
+    files can share one.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[tuple[str, str, str], bytes] = OrderedDict()
+
+    def get(self, resource: str, etag: str, encoding: str) -> bytes | None:
+        key = (resource, etag, encoding)
+        body = self._entries.get(key)
+        if body is not None:
+            self._entries.move_to_end(key)
+        compression_variant_cache_requests_total.labels(
+            encoding=encoding, result="hit" if body is not None else "miss"
+        ).inc()
+        return body
 
-class GZipMiddleware(BaseHTTPMiddleware):
+    def put(self, resource: str, etag: str, encoding: str, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        key = (resource, etag, encoding)
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size -= len(previous)
+        self._entries[key] = body
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+
+class CompressionMiddleware:
     """
-    GZip compression middleware for response bodies.
-    
+    Streaming response compression.
+
     Features:
-    - Only compresses responses >500 bytes
-    - Only compresses if client accepts gzip
+    - Only compresses responses >minimum_size bytes (when the size is known)
+    - Negotiates br / zstd / gzip from Accept-Encoding q-values
     - Excludes health/metrics endpoints for fast probes
-    - Sets proper Content-Encoding headers
+    - Sets proper Content-Encoding and Vary headers
     """
-    
+
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         minimum_size: int = MIN_COMPRESS_SIZE,
         compression_level: int = 6,
-        enabled: bool = True
+        enabled: bool = True,
+        variant_cache_paths: tuple[str, ...] = VARIANT_CACHE_PATHS,
+        variant_cache_max_bytes: int | None = None,
     ):
-        super().__init__(app)
+        self.app = app
         self.minimum_size = minimum_size
         self.compression_level = compression_level
         self.enabled = enabled
-    
-    def _should_compress(self, request: Request, response: Response) -> bool:
-        """Determine if response should be compressed."""
-        if not self.enabled:
-            return False
-        
-        if request.url.path in EXCLUDED_PATHS:
-            return False
-        
-        accept_encoding = request.headers.get("accept-encoding", "")
-        if "gzip" not in accept_encoding.lower():
-            return False
-        
-        if response.headers.get("content-encoding"):
-            return False
-        
-        content_type = response.headers.get("content-type", "")
-        base_content_type = content_type.split(";")[0].strip()
-        if base_content_type not in COMPRESSIBLE_CONTENT_TYPES:
-            return False
-        
-        content_length = response.headers.get("content-length")
-        if content_length and int(content_length) < self.minimum_size:
-            return False
-        
-        return True
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        response = await call_next(request)
-        
-        if not self._should_compress(request, response):
-            return response
-        
-        is_streaming = False
-        try:
-            if hasattr(response, 'body_iterator'):
-                is_streaming = True
-                body_chunks = []
-                async for chunk in response.body_iterator:
-                    if isinstance(chunk, bytes):
-                        body_chunks.append(chunk)
-                    elif isinstance(chunk, str):
-                        body_chunks.append(chunk.encode())
-                    else:
-                        body_chunks.append(bytes(chunk))
-                body = b"".join(body_chunks)
-            elif hasattr(response, 'body'):
-                body = response.body
-            else:
-                return response
-        except Exception:
-            return response
-        
-        if len(body) < self.minimum_size:
-            if is_streaming:
-                return Response(
-                    content=body,
-                    status_code=response.status_code,
-                    headers=dict(response.headers),
-                    media_type=response.media_type
-                )
-            return response
-        
-        buffer = io.BytesIO()
-        with gzip.GzipFile(
-            mode="wb",
-            fileobj=buffer,
-            compresslevel=self.compression_level
-        ) as f:
-            f.write(body)
-        
-        compressed_body = buffer.getvalue()
-        
-        if len(compressed_body) >= len(body):
-            return Response(
-                content=body,
-                status_code=response.status_code,
-                headers=dict(response.headers),
-                media_type=response.media_type
-            )
-        
-        headers = dict(response.headers)
-        headers["content-encoding"] = "gzip"
-        headers["content-length"] = str(len(compressed_body))
-        headers["vary"] = "Accept-Encoding"
-        
-        return Response(
-            content=compressed_body,
-            status_code=response.status_code,
-            headers=headers,
-            media_type=response.media_type
+        self.encodings = available_encodings()
+        self.variant_cache_paths = variant_cache_paths
+        self.variant_cache = CompressedVariantCache(
+            variant_cache_max_bytes if variant_cache_max_bytes is not None
+            else settings.compression_variant_cache_max_bytes
         )
+        self._cpu_load = 0.0
+        self._cpu_sampled_at = 0.0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # HEAD is forwarded untouched: a cached variant must never become its body
+        if (scope["type"] != "http" or not self.enabled or scope["path"] in EXCLUDED_PATHS
+                or scope["method"] == "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        resource = None
+        if scope["path"].startswith(self.variant_cache_paths):
+            query = scope.get("query_string", b"")
+            resource = f"{scope['path']}?{query.decode('latin-1')}" if query else scope["path"]
+        responder = _CompressionResponder(self, encoding, resource, send)
+        await self.app(scope, receive, responder.send)
+
+    def cpu_load(self) -> float:
+        """1-minute load average per CPU, sampled at most once per second"""
+        now = time.monotonic()
+        if now - self._cpu_sampled_at >= 1.0:
+            self._cpu_sampled_at = now
+            try:
+                self._cpu_load = os.getloadavg()[0] / (os.cpu_count() or 1)
+            except (AttributeError, OSError):
+                self._cpu_load = 0.0
+        return self._cpu_load
+
+    def level_for(self, encoding: str, size: int | None) -> int:
+        busy, large, normal = ADAPTIVE_LEVELS[encoding]
+        if self.cpu_load() >= CPU_BUSY_LOAD:
+            return busy
+        if size is not None and size >= LARGE_BODY_SIZE:
+            return large
+        return normal if normal is not None else self.compression_level
+
+
+class _CompressionResponder:
+    """Per-request send wrapper; decides on the first body chunk how to respond"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, resource: str | None, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.resource = resource  # variant cache key; None when the path is not cacheable
+        self.downstream = send
+        self.start_message: Message | None = None
+        self.mode = "pending"  # pending | passthrough | stream | drain
+        self.compressor: _Compressor | None = None
+        self.etag: str | None = None
+        self.content_length: int | None = None
+        self.cache_chunks: list[bytes] | None = None
+        self.cache_size = 0
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._on_start(message)
+            if self.mode == "passthrough":
+                await self.downstream(message)
+            return
+
+        if message["type"] != "http.response.body":
+            await self.downstream(message)
+            return
+
+        if self.mode == "passthrough":
+            await self.downstream(message)
+        elif self.mode == "drain":
+            return  # cached variant already sent; discard the app's copy
+        elif self.mode == "pending":
+            await self._on_first_body(message)
+        else:
+            await self._stream(message.get("body", b""), message.get("more_body", False))
+
+    def _on_start(self, message: Message) -> None:
+        self.start_message = message
+        headers = Headers(raw=message.get("headers", []))
+        content_type = headers.get("content-type", "").split(";")[0].strip()
+        content_length = headers.get("content-length")
+        self.content_length = int(content_length) if content_length and content_length.isdigit() else None
+        self.etag = headers.get("etag")
+
+        if (
+            message["status"] in (204, 304)
+            or "content-encoding" in headers
+            or content_type not in COMPRESSIBLE_CONTENT_TYPES
+            or (self.content_length is not None and self.content_length < self.middleware.minimum_size)
+        ):
+            self.mode = "passthrough"
+
+    async def _on_first_body(self, message: Message) -> None:
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        headers = MutableHeaders(scope=self.start_message)
+
+        cached = self._cached_variant()
+        if cached is not None:
+            self._set_encoded_headers(headers, len(cached))
+            await self.downstream(self.start_message)
+            await self.downstream({"type": "http.response.body", "body": cached})
+            self.mode = "drain" if more_body else "done"
+            return
+
+        if not more_body:
+            # Whole body in one message: compress once, keep it only if it is smaller
+            if len(body) < self.middleware.minimum_size:
+                await self._send_uncompressed(message)
+                return
+            compressed = self._new_compressor(len(body)).finish(body)
+            if len(compressed) >= len(body):
+                await self._send_uncompressed(message)
+                return
+            if self._use_variant_cache():
+                self.middleware.variant_cache.put(self.resource, self.etag, self.encoding, compressed)
+            self._set_encoded_headers(headers, len(compressed))
+            await self.downstream(self.start_message)
+            await self.downstream({"type": "http.response.body", "body": compressed})
+            self.mode = "done"
+            return
+
+        # Streaming: length is unknown after compression, so drop Content-Length
+        self._new_compressor(self.content_length)
+        self._set_encoded_headers(headers, None)
+        if self._use_variant_cache():
+            self.cache_chunks = []
+        self.mode = "stream"
+        await self.downstream(self.start_message)
+        await self._stream(body, more_body)
+
+    async def _stream(self, body: bytes, more_body: bool) -> None:
+        chunk = self.compressor.compress(body) if more_body else self.compressor.finish(body)
+        if self.cache_chunks is not None:
+            self.cache_chunks.append(chunk)
+            self.cache_size += len(chunk)
+            if self.cache_size > self.middleware.variant_cache.max_bytes:
+                self.cache_chunks = None
+            elif not more_body:
+                self.middleware.variant_cache.put(self.resource, self.etag, self.encoding, b"".join(self.cache_chunks))
+        if not more_body:
+            self.mode = "done"
+        if chunk or not more_body:
+            await self.downstream({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    def _use_variant_cache(self) -> bool:
+        return self.resource is not None and self.etag is not None and self.start_message["status"] == 200
+
+    def _cached_variant(self) -> bytes | None:
+        if not self._use_variant_cache():
+            return None
+        return self.middleware.variant_cache.get(self.resource, self.etag, self.encoding)
+
+    def _new_compressor(self, size: int | None) -> _Compressor:
+        if self._use_variant_cache():
+            level = VARIANT_LEVELS[self.encoding]
+        else:
+            level = self.middleware.level_for(self.encoding, size)
+        self.compressor = _Compressor(self.encoding, level)
+        return self.compressor
+
+    def _set_encoded_headers(self, headers: MutableHeaders, length: int | None) -> None:
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(length)
+
+    async def _send_uncompressed(self, message: Message) -> None:
+        self.mode = "passthrough"
+        await self.downstream(self.start_message)
+        await self.downstream(message)
+
+
+# Backwards-compatible name from the gzip-only BaseHTTPMiddleware version
+GZipMiddleware = CompressionMiddleware
@@ -0,0 +1,252 @@
+"""
+Header Pipeline Middleware - fused pure-ASGI front door
+Replaces seven BaseHTTPMiddleware layers with one pass over the scope and one
+rewrite of the http.response.start message:
+
+- TrustedHostMiddleware      (Host header whitelist, 400 INVALID_HOST)
+- URLLengthMiddleware        (414 URI_TOO_LONG)
+- RequestIDMiddleware        (X-Request-ID, REQUEST_LOG structured line, Sentry context)
+- trace_id_middleware        (X-Trace-ID)
+- IdentityHeadersMiddleware  (X-System-Identity, X-App-Base-URL)
+- PrivacyHeadersMiddleware   (X-Privacy-Context, X-Do-Not-Sell, X-Minor-Protected)
+- SecurityHeadersMiddleware  (CEO v2.4 6/6 security headers)
+
+None of these concerns touch the body, so the response is streamed straight
+through; there is no extra task hop and no response re-wrapping.
+"""
+
+import fnmatch
+import json
+import os
+import time
+import uuid
+
+from starlette.datastructures import URL
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config.settings import settings
+from utils.logger import get_logger
+
+logger = get_logger("request_id_middleware")
+
+STRICT_CSP = "default-src 'none'; connect-src 'self'; base-uri 'none'; object-src 'none'; frame-ancestors 'none'"
+DOCS_CSP = (
+    "default-src 'self'; "
+    "script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
+    "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net https://fonts.googleapis.com; "
+    "img-src 'self' data: https://fastapi.tiangolo.com; "
+    "font-src 'self' https://fonts.gstatic.com; "
+    "connect-src 'self'"
+)
+
+_SECURITY_HEADERS = (
+    (b"strict-transport-security", b"max-age=15552000; includeSubDomains"),
+    (b"permissions-policy", b"camera=(), microphone=(), geolocation=(), payment=()"),
+    (b"x-frame-options", b"DENY"),
+    (b"referrer-policy", b"no-referrer"),
+    (b"x-content-type-options", b"nosniff"),
+)
+
+_HEADER_NAMES = frozenset(name for name, _ in _SECURITY_HEADERS) | {
+    b"content-security-policy",
+    b"x-system-identity",
+    b"x-app-base-url",
+    b"x-request-id",
+    b"x-trace-id",
+    b"x-privacy-context",
+    b"x-do-not-sell",
+    b"x-minor-protected",
+}
+
+
+def _uses_docs_csp(path: str) -> bool:
+    # GATE 0 EXCEPTION: Relax CSP for /docs, /redoc, and monitoring dashboard
+    return path in ("/docs", "/redoc") or path.startswith("/api/v1/monitoring/")
+
+
+class HeaderPipelineMiddleware:
+    """
+    Pure ASGI middleware fusing the header-only request/response concerns.
+
+    Request state written here (trace_id, privacy_context, is_minor,
+    do_not_sell) lands in scope["state"], which is what request.state reads.
+    """
+
+    def __init__(self, app: ASGIApp, max_url_length: int | None = None,
+                 allowed_hosts: list[str] | None = None):
+        self.app = app
+        self.max_url_length = max_url_length if max_url_length is not None else settings.max_url_length
+
+        # Trusted hosts: exact names in a set, wildcard patterns checked with fnmatch
+        hosts = list(allowed_hosts or settings.allowed_hosts)
+        self.enforce_hosts = settings.environment.value == "production"
+        # CI/Testing environment bypass: Add testserver for non-production environments
+        if not self.enforce_hosts and "testserver" not in hosts:
+            hosts.append("testserver")
+        self.check_hosts = bool(hosts)
+        self.exact_hosts = {h.lower() for h in hosts if "*" not in h}
+        self.wildcard_hosts = [h.lower() for h in hosts if "*" in h]
+
+        self.identity_headers = (
+            (b"x-system-identity", os.getenv("APP_NAME", "scholarship_api").encode("latin-1")),
+            (b"x-app-base-url", os.getenv(
+                "APP_BASE_URL", "https://scholarship-api-jamarrlmayes.replit.app"
+            ).encode("latin-1")),
+        )
+        self.sentry_enabled = bool(settings.sentry_enabled and settings.sentry_dsn)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # One pass over the request headers for everything this pipeline reads
+        host = request_id = trace_id = privacy_context = user_agent = None
+        for name, value in scope["headers"]:
+            if name == b"host":
+                host = value.decode("latin-1")
+            elif name == b"x-request-id":
+                request_id = value.decode("latin-1")
+            elif name == b"x-trace-id":
+                trace_id = value.decode("latin-1")
+            elif name == b"x-privacy-context":
+                privacy_context = value.decode("latin-1")
+            elif name == b"user-agent":
+                user_agent = value.decode("latin-1")
+
+        request_id = request_id or str(uuid.uuid4())
+        trace_id = trace_id or str(uuid.uuid4())
+        privacy_context = privacy_context or ""
+        privacy_lower = privacy_context.lower()
+        is_minor = "minor=true" in privacy_lower
+        do_not_sell = "donotsell=true" in privacy_lower or is_minor
+
+        state = scope.setdefault("state", {})
+        state["trace_id"] = request_id
+        state["privacy_context"] = privacy_context
+        state["is_minor"] = is_minor
+        state["do_not_sell"] = do_not_sell
+
+        path = scope["path"]
+        extra_headers = [
+            (b"content-security-policy", (DOCS_CSP if _uses_docs_csp(path) else STRICT_CSP).encode("latin-1")),
+            *_SECURITY_HEADERS,
+            *self.identity_headers,
+            (b"x-request-id", request_id.encode("latin-1")),
+            (b"x-trace-id", trace_id.encode("latin-1")),
+        ]
+        # Privacy: the security CSP always carries connect-src, so the minor
+        # fallback CSP from PrivacyHeadersMiddleware never applies here either
+        if privacy_context:
+            extra_headers.append((b"x-privacy-context", privacy_context.encode("latin-1")))
+        if do_not_sell:
+            extra_headers.append((b"x-do-not-sell", b"true"))
+        if is_minor:
+            extra_headers.append((b"x-minor-protected", b"true"))
+
+        if self.sentry_enabled:
+            try:
+                from observability.sentry_init import set_request_context
+                set_request_context(request_id, state.get("user_id"), state.get("role"))
+            except ImportError:
+                # Sentry not initialized yet, skip
+                pass
+
+        start_time = time.time()
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = [
+                    (k, v) for k, v in message.get("headers", ()) if k.lower() not in _HEADER_NAMES
+                ]
+                headers.extend(extra_headers)
+                message["headers"] = headers
+                self._log_request(scope, state, request_id, message["status"], start_time, user_agent)
+            await send(message)
+
+        rejection = self._reject(scope, host, request_id)
+        if rejection is not None:
+            await rejection(scope, receive, send_with_headers)
+            return
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        except Exception as e:
+            latency_ms = round((time.time() - start_time) * 1000, 2)
+            logger.error(
+                f"{scope['method']} {path} - ERROR",
+                extra={
+                    "trace_id": request_id,
+                    "method": scope["method"],
+                    "path": path,
+                    "error": str(e),
+                    "latency_ms": latency_ms
+                }
+            )
+            raise
+
+    def _reject(self, scope: Scope, host: str | None, request_id: str) -> JSONResponse | None:
+        """Trusted host and URL length checks; returns the error response or None"""
+        if self.check_hosts:
+            hostname = (host or "").lower().split(":")[0]
+            if not self._is_host_allowed(hostname):
+                return JSONResponse(
+                    status_code=400,
+                    content={
+                        "trace_id": request_id,
+                        "code": "INVALID_HOST",
+                        "message": f"Host '{hostname}' is not allowed",
+                        "status": 400,
+                        "timestamp": int(time.time())
+                    }
+                )
+
+        # Cheap upper bound first; only build the full URL when it might be too long
+        path = scope.get("root_path", "") + scope["path"]
+        bound = len(host or "") + len(path) + len(scope["query_string"]) + 16
+        if bound > self.max_url_length:
+            url_length = len(str(URL(scope=scope)))
+            if url_length > self.max_url_length:
+                logger.warning(
+                    f"URL length exceeded: {url_length} > {self.max_url_length} for {scope['method']} {scope['path']}"
+                )
+                from utils.error_utils import build_error_response
+
+                return JSONResponse(
+                    status_code=414,
+                    content=build_error_response(
+                        trace_id=request_id,
+                        code="URI_TOO_LONG",
+                        message=f"URL length ({url_length}) exceeds maximum allowed length ({self.max_url_length})",
+                        status=414
+                    )
+                )
+        return None
+
+    def _is_host_allowed(self, host: str) -> bool:
+        if host in self.exact_hosts:
+            return True
+        return any(fnmatch.fnmatch(host, pattern) for pattern in self.wildcard_hosts)
+
+    @staticmethod
+    def _log_request(scope: Scope, state: dict, request_id: str, status_code: int,
+                     start_time: float, user_agent: str | None) -> None:
+        # CEO SOFT LAUNCH: Structured JSON logging with required fields
+        # auth/WAF/rate-limit fields are set on request.state by inner middleware
+        log_entry = {
+            "ts": time.time(),
+            "method": scope["method"],
+            "path": scope["path"],
+            "status_code": status_code,
+            "latency_ms": round((time.time() - start_time) * 1000, 2),
+            "auth_result": state.get("auth_result", "no_auth_required"),
+            "waf_rule": state.get("waf_rule"),
+            "request_id": request_id,
+            "rate_limit_state": state.get("rate_limit_state", "allow"),
+            "rate_limit_key": state.get("rate_limit_key"),
+            "tokens_remaining": state.get("tokens_remaining"),
+            "rl_backend": state.get("rl_backend", "memory"),
+            "user_agent": (user_agent or "unknown")[:100]
+        }
+        logger.info(f"REQUEST_LOG: {json.dumps(log_entry)}")
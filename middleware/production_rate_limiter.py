@@ -11,7 +11,7 @@ Features:
 
 import asyncio
 import time
-from collections import defaultdict
+from collections import OrderedDict
 from typing import Optional
 
 import redis
@@ -25,19 +25,67 @@ from utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+# Atomic token bucket: refill, take up to ARGV[3] tokens and persist in one round trip.
+# Uses the Redis server clock so every worker refills against the same time source.
+# KEYS[1] = bucket hash; ARGV = limit, window (seconds), requested tokens
+# Returns {granted, floor(tokens remaining)}
+TOKEN_BUCKET_LUA = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+    tokens = limit
+    ts = now
+end
+
+tokens = math.min(limit, tokens + math.max(0, now - ts) * (limit / window))
+local granted = math.min(requested, math.floor(tokens))
+tokens = tokens - granted
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], window * 2)
+return {granted, math.floor(tokens)}
+"""
+
+
 class TokenBucketLimiter:
-    """Token bucket rate limiter with Redis and in-memory backends"""
+    """
+    Token bucket rate limiter with Redis and in-memory backends
+
+    - Redis: one atomic Lua script call per check (no read/modify/write race)
+    - Optional token leases: a worker takes up to RATE_LIMIT_LEASE_SIZE tokens
+      per script call and spends them locally until the lease expires; unspent
+      leased tokens are forfeited, so leases can under-admit but never over-admit
+    - In-memory fallback buckets are evicted once idle long enough to be full again
+    """
     
-    def __init__(self):
+    def __init__(self, lease_size: int | None = None, lease_ttl: float | None = None,
+                 memory_max_keys: int | None = None):
         self.redis_client: Optional[redis.Redis] = None
         self.redis_available = False
         self.last_health_check = 0
         self.health_check_interval = 300  # 5 minutes
         self.last_warn_time = 0
         self.warn_interval = 300  # Warn once per 5 minutes
+        self._bucket_script = None
+
+        # Local token leases: {key: [tokens, expires_at]}
+        self.lease_size = settings.rate_limit_lease_size if lease_size is None else lease_size
+        self.lease_ttl = settings.rate_limit_lease_ttl_seconds if lease_ttl is None else lease_ttl
+        self.leases: dict[str, list] = {}
         
-        # In-memory fallback storage
-        self.memory_tokens = defaultdict(lambda: {"tokens": 0, "last_refill": time.time()})
+        # In-memory fallback storage: {key: [tokens, last_refill, full_at]}, least recently used first
+        self.memory_tokens: OrderedDict[str, list] = OrderedDict()
+        self.memory_max_keys = settings.rate_limit_memory_max_keys if memory_max_keys is None else memory_max_keys
+        self.memory_sweep_interval = 30
+        self._last_sweep = time.time()
+        self._last_lease_sweep = self._last_sweep
         
         # Try to connect to Redis on init
         self._check_redis_health()
@@ -93,68 +141,96 @@ class TokenBucketLimiter:
             self.redis_available = False
             return False
     
+    def _take_redis(self, key: str, limit: int, window: int, requested: int) -> tuple[int, int]:
+        """Run the bucket script; returns (granted, tokens_remaining)"""
+        if self._bucket_script is None:
+            self._bucket_script = self.redis_client.register_script(TOKEN_BUCKET_LUA)
+        granted, remaining = self._bucket_script(keys=[f"ratelimit:{key}"], args=[limit, window, requested])
+        return int(granted), int(remaining)
+
+    def _lease_size_for(self, limit: int) -> int:
+        # Never lease more than a tenth of the bucket so small limits stay exact
+        return max(1, min(self.lease_size, limit // 10))
+
     def _get_tokens_redis(self, key: str, limit: int, window: int) -> tuple[bool, int]:
-        """Get tokens from Redis backend"""
+        """Get tokens from Redis backend (local lease first when leasing is enabled)"""
         try:
-            pipe = self.redis_client.pipeline()
+            if self.lease_size <= 1:
+                granted, remaining = self._take_redis(key, limit, window, 1)
+                return granted >= 1, remaining
+
             now = time.time()
-            
-            # Token bucket algorithm with Redis
-            # Key format: ratelimit:{key}
-            redis_key = f"ratelimit:{key}"
-            
-            # Get current state
-            pipe.get(f"{redis_key}:tokens")
-            pipe.get(f"{redis_key}:last_refill")
-            result = pipe.execute()
-            
-            tokens = float(result[0]) if result[0] else limit
-            last_refill = float(result[1]) if result[1] else now
-            
-            # Calculate token refill
-            time_passed = now - last_refill
-            refill_rate = limit / window
-            tokens = min(limit, tokens + (time_passed * refill_rate))
-            
-            # Check if request can proceed
-            if tokens >= 1:
-                tokens -= 1
-                allowed = True
-            else:
-                allowed = False
-            
-            # Update Redis state with TTL
-            pipe = self.redis_client.pipeline()
-            pipe.set(f"{redis_key}:tokens", tokens, ex=window * 2)
-            pipe.set(f"{redis_key}:last_refill", now, ex=window * 2)
-            pipe.execute()
-            
-            return allowed, int(tokens)
+            if now - self._last_lease_sweep >= self.memory_sweep_interval:
+                self._sweep_leases(now)
+            lease = self.leases.get(key)
+            if lease is not None and lease[0] >= 1 and lease[1] > now:
+                lease[0] -= 1
+                if lease[0] < 1:
+                    del self.leases[key]  # spent; the next check goes to Redis anyway
+                return True, lease[0]
+
+            granted, remaining = self._take_redis(key, limit, window, self._lease_size_for(limit))
+            self.leases.pop(key, None)
+            if granted < 1:
+                return False, remaining
+            if granted > 1:
+                self.leases[key] = [granted - 1, now + self.lease_ttl]
+            return True, remaining + granted - 1
             
         except Exception as e:
             logger.warning(f"Redis token check failed: {e}, falling back to memory")
             self.redis_available = False
+            self._bucket_script = None
+            self.leases.clear()
             return self._get_tokens_memory(key, limit, window)
     
     def _get_tokens_memory(self, key: str, limit: int, window: int) -> tuple[bool, int]:
         """Get tokens from in-memory backend"""
         now = time.time()
-        bucket = self.memory_tokens[key]
+        if now - self._last_sweep >= self.memory_sweep_interval:
+            self._sweep_memory(now)
+
+        refill_rate = limit / window
+        bucket = self.memory_tokens.get(key)
+        if bucket is None:
+            # New buckets start full, matching the Redis backend
+            bucket = [float(limit), now, now]
+            self.memory_tokens[key] = bucket
+            if len(self.memory_tokens) > self.memory_max_keys:
+                self.memory_tokens.popitem(last=False)
+        else:
+            self.memory_tokens.move_to_end(key)
         
         # Calculate token refill
-        time_passed = now - bucket["last_refill"]
-        refill_rate = limit / window
-        bucket["tokens"] = min(limit, bucket["tokens"] + (time_passed * refill_rate))
-        bucket["last_refill"] = now
+        time_passed = now - bucket[1]
+        bucket[0] = min(limit, bucket[0] + (time_passed * refill_rate))
+        bucket[1] = now
         
         # Check if request can proceed
-        if bucket["tokens"] >= 1:
-            bucket["tokens"] -= 1
+        if bucket[0] >= 1:
+            bucket[0] -= 1
             allowed = True
         else:
             allowed = False
+
+        # Once full again the bucket is indistinguishable from a new one and can be dropped
+        bucket[2] = now + (limit - bucket[0]) / refill_rate
         
-        return allowed, int(bucket["tokens"])
+        return allowed, int(bucket[0])
+
+    def _sweep_memory(self, now: float) -> None:
+        """Drop in-memory buckets that have refilled completely"""
+        self._last_sweep = now
+        expired = [key for key, bucket in self.memory_tokens.items() if bucket[2] <= now]
+        for key in expired:
+            del self.memory_tokens[key]
+        self._sweep_leases(now)
+
+    def _sweep_leases(self, now: float) -> None:
+        """Drop expired leases (runs on the Redis path too, so idle keys do not accumulate)"""
+        self._last_lease_sweep = now
+        for key in [key for key, lease in self.leases.items() if lease[1] <= now]:
+            del self.leases[key]
     
     def check_rate_limit(self, key: str, limit: int, window: int) -> tuple[bool, int, str]:
         """
@@ -0,0 +1,179 @@
+"""
+WAF Rule Engine - single-pass multi-pattern scanning
+Used by WAFProtection (middleware/waf_protection.py)
+
+Every rule family (SQL, XSS, CMD, PATH) is merged into one alternation of
+named groups, and the families applicable to a request are merged again into
+one combined pattern, so a clean request costs one regex pass per text
+instead of one pass per rule. Only when the combined pattern hits are the
+families re-checked in priority order to pick the blocking rule.
+
+- Verdicts are cached per request shape (families, path, query, body digest)
+- Every Nth scan times each rule individually for per-rule cost counters
+"""
+
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from re import Pattern
+
+from observability.metrics import (
+    waf_rule_eval_seconds_total,
+    waf_rule_evaluations_total,
+    waf_rule_matches_total,
+    waf_verdict_cache_requests_total,
+)
+
+# Detection order: the first family that matches decides the block code
+FAMILY_PRIORITY = ("SQL", "XSS", "CMD", "PATH")
+
+MAX_BODY_CHARS = 10000
+
+_INLINE_FLAGS = ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"), (re.VERBOSE, "x"))
+
+
+@dataclass(frozen=True)
+class WAFVerdict:
+    """The rule that matched: family (SQL/XSS/CMD/PATH) and rule id (e.g. SQL_03)"""
+    family: str
+    rule_id: str
+    pattern: str
+
+
+def _scoped(rule_id: str, pattern: Pattern) -> str:
+    """Wrap a compiled pattern as a named group that keeps its own flags"""
+    flags = "".join(letter for flag, letter in _INLINE_FLAGS if pattern.flags & flag)
+    body = f"(?{flags}:{pattern.pattern})" if flags else f"(?:{pattern.pattern})"
+    return f"(?P<{rule_id}>{body})"
+
+
+class WAFRuleEngine:
+    """Merged-alternation scanner over the WAF rule families"""
+
+    def __init__(self, families: dict[str, list[Pattern]], verdict_cache_size: int = 4096,
+                 profile_every: int = 100):
+        self.rules: dict[str, Pattern] = {}
+        self.family_rules: dict[str, list[str]] = {}
+        for family, patterns in families.items():
+            ids = []
+            for i, pattern in enumerate(patterns):
+                rule_id = f"{family}_{i:02d}"
+                self.rules[rule_id] = pattern
+                ids.append(rule_id)
+            self.family_rules[family] = ids
+
+        self._family_patterns = {
+            family: self._merge(ids) for family, ids in self.family_rules.items()
+        }
+        self._combined: dict[tuple[str, ...], Pattern] = {}
+
+        self.verdict_cache_size = verdict_cache_size
+        self._verdicts: OrderedDict[tuple, WAFVerdict | None] = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        self.profile_every = profile_every
+        self._scans = 0
+        # {rule_id: [matches, sampled evaluations, sampled seconds]}
+        self.rule_stats: dict[str, list] = {rule_id: [0, 0, 0.0] for rule_id in self.rules}
+
+    def _merge(self, rule_ids: list[str]) -> Pattern:
+        return re.compile("|".join(_scoped(rule_id, self.rules[rule_id]) for rule_id in rule_ids))
+
+    def combined(self, families: tuple[str, ...]) -> Pattern:
+        """One pattern covering every rule of the given families (built once per family set)"""
+        pattern = self._combined.get(families)
+        if pattern is None:
+            pattern = self._merge([rule_id for family in families for rule_id in self.family_rules[family]])
+            self._combined[families] = pattern
+        return pattern
+
+    def scan(self, families: tuple[str, ...], texts: tuple[str, ...]) -> WAFVerdict | None:
+        """First matching rule by family priority, then text order; None when clean"""
+        texts = tuple(text for text in texts if text)
+        if not families or not texts:
+            return None
+
+        self._scans += 1
+        if self.profile_every and self._scans % self.profile_every == 0:
+            self._profile(families, texts)
+
+        combined = self.combined(families)
+        if not any(combined.search(text) for text in texts):
+            return None
+
+        for family in families:
+            pattern = self._family_patterns[family]
+            for text in texts:
+                match = pattern.search(text)
+                if match:
+                    rule_id = match.lastgroup
+                    self.rule_stats[rule_id][0] += 1
+                    waf_rule_matches_total.labels(family=family, rule=rule_id).inc()
+                    return WAFVerdict(family, rule_id, self.rules[rule_id].pattern)
+        return None
+
+    def inspect(self, content_families: tuple[str, ...], path: str, query: str,
+                body: bytes | None) -> WAFVerdict | None:
+        """
+        Scan query and body with the content families, then path+query for
+        traversal. The body is decoded (and truncated) once, only on a cache miss.
+        """
+        key = (
+            content_families,
+            path,
+            query,
+            hashlib.blake2b(body, digest_size=16).digest() if body else b"",
+        )
+        if key in self._verdicts:
+            self._verdicts.move_to_end(key)
+            self.cache_hits += 1
+            waf_verdict_cache_requests_total.labels(result="hit").inc()
+            return self._verdicts[key]
+
+        self.cache_misses += 1
+        waf_verdict_cache_requests_total.labels(result="miss").inc()
+
+        body_text = body.decode("utf-8", errors="ignore")[:MAX_BODY_CHARS] if body else ""
+        verdict = self.scan(content_families, (query, body_text))
+        if verdict is None and "PATH" in self.family_rules:
+            verdict = self.scan(("PATH",), (f"{path}?{query}",))
+
+        self._verdicts[key] = verdict
+        if len(self._verdicts) > self.verdict_cache_size:
+            self._verdicts.popitem(last=False)
+        return verdict
+
+    def _profile(self, families: tuple[str, ...], texts: tuple[str, ...]) -> None:
+        for family in families:
+            for rule_id in self.family_rules[family]:
+                pattern = self.rules[rule_id]
+                start = time.perf_counter()
+                for text in texts:
+                    pattern.search(text)
+                elapsed = time.perf_counter() - start
+                stats = self.rule_stats[rule_id]
+                stats[1] += 1
+                stats[2] += elapsed
+                waf_rule_evaluations_total.labels(rule=rule_id).inc()
+                waf_rule_eval_seconds_total.labels(rule=rule_id).inc(elapsed)
+
+    def clear_verdicts(self) -> None:
+        self._verdicts.clear()
+
+    def get_stats(self) -> dict:
+        return {
+            "verdict_cache_entries": len(self._verdicts),
+            "verdict_cache_hits": self.cache_hits,
+            "verdict_cache_misses": self.cache_misses,
+            "rules": {
+                rule_id: {
+                    "matches": matches,
+                    "sampled_evaluations": evaluations,
+                    "avg_eval_us": round(seconds / evaluations * 1_000_000, 2) if evaluations else 0.0,
+                }
+                for rule_id, (matches, evaluations, seconds) in self.rule_stats.items()
+            },
+        }
@@ -28,14 +28,26 @@ from re import Pattern
 from typing import Optional
 
 from fastapi import Request, status
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from middleware.waf_engine import WAFRuleEngine
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-class WAFProtection(BaseHTTPMiddleware):
+BODY_METHODS = {"POST", "PUT", "PATCH"}
+
+# Block message and code per rule family
+BLOCK_REASONS = {
+    "SQL": ("SQL injection attempt detected", "WAF_SQLI_001"),
+    "XSS": ("Cross-site scripting attempt detected", "WAF_XSS_001"),
+    "CMD": ("Command injection attempt detected", "WAF_CMD_001"),
+    "PATH": ("Path traversal attempt detected", "WAF_PATH_001"),
+}
+
+class WAFProtection:
     """
     Web Application Firewall middleware providing edge-level security protection
 
@@ -48,8 +60,8 @@ class WAFProtection(BaseHTTPMiddleware):
     - Security event logging and monitoring
     """
 
-    def __init__(self, app, enable_block_mode: bool = True):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, enable_block_mode: bool = True):
+        self.app = app
         self.block_mode = enable_block_mode
         self.blocked_requests = 0
         self.sql_injection_blocks = 0
@@ -78,11 +90,13 @@ class WAFProtection(BaseHTTPMiddleware):
         self._underscore_allowlist = self._parse_underscore_allowlist(os.getenv("WAF_UNDERSCORE_ALLOWLIST", ""))
         self._proto_pollution_blocklist = {"__proto__", "constructor", "__prototype__", "prototype"}
 
-        # Compile security patterns for performance
-        self._sql_patterns = self._compile_sql_patterns()
-        self._xss_patterns = self._compile_xss_patterns()
-        self._command_patterns = self._compile_command_patterns()
-        self._path_traversal_patterns = self._compile_path_traversal_patterns()
+        # Compile security patterns once and merge them into a single-pass engine
+        self._engine = WAFRuleEngine({
+            "SQL": self._compile_sql_patterns(),
+            "XSS": self._compile_xss_patterns(),
+            "CMD": self._compile_command_patterns(),
+            "PATH": self._compile_path_traversal_patterns(),
+        })
         
         # Trust-by-Secret S2S bypass configuration (Gate-2 Stabilization)
         self._shared_secret = os.getenv("SHARED_SECRET", "")
@@ -189,6 +203,30 @@ class WAFProtection(BaseHTTPMiddleware):
             re.compile(r'^/oca/canary/day2/test-suites/[^/]+/run$'),  # QA Orchestrator test suite execution
         ]
 
+        # SQL injection exempt endpoints (legitimate content may contain SQL keywords)
+        self._sql_exempt_paths = {
+            "/partner/register",  # Partner registration may contain text like "select scholarships"
+            "/api/v1/partners/register",  # New partner registration endpoint (legitimate JSON)
+            "/api/v1/launch/simulate/traffic",
+            # CEO P0 DIRECTIVE: Auth endpoints exempt from SQL injection checks (T+3h gate)
+            # Authentication JSON payloads contain "password", "username" which trigger false positives
+            # WAF Rule IDs exempted: WAF_SQLI_001 for these specific endpoints only
+            "/api/v1/auth/login",
+            "/api/v1/auth/login-simple",
+            "/api/v1/auth/logout",
+            "/api/v1/auth/check",
+            "/api/v1/launch/commercialization/api-keys",
+            # Onboarding V2: File upload endpoint - multipart forms may trigger false positives
+            "/api/v2/onboarding/upload",
+            # Orchestration bypass paths (legitimate JSON from Command Center)
+            *self._waf_bypass_paths,
+        }
+
+        # XSS path-level exemptions for legitimate endpoints
+        self._xss_exempt_paths = {
+            "/api/v1/launch/simulate/traffic"
+        }
+
         logger.info(f"WAF Protection initialized - Block mode: {self.block_mode}, Strip X-Forwarded-Host: {self._strip_xfh}")
         logger.info(f"WAF Trusted CIDRs: {len(self._trusted_ingress_cidrs)} ingress, {len(self._trusted_internals)} internal")
         logger.info(f"WAF Allowed Host Suffixes: {self._allowed_host_suffixes}")
@@ -471,10 +509,69 @@ class WAFProtection(BaseHTTPMiddleware):
 
         return [re.compile(pattern, re.IGNORECASE) for pattern in path_patterns]
 
-    async def dispatch(self, request: Request, call_next):
-        """Main WAF processing logic with CEO-mandated debug path blocking"""
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope, receive)
+        body = None
+        if request.method in BODY_METHODS:
+            # Read the body once; the app gets it replayed from memory below
+            body, receive = await self._buffer_body(receive)
+
+        blocked = await self._screen(request, body)
+        if blocked is not None:
+            await blocked(scope, receive, send)
+            return
 
         start_time = time.time()
+
+        async def send_with_status(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Add security headers
+                headers = MutableHeaders(scope=message)
+                headers["X-WAF-Status"] = "passed"
+                headers["X-Content-Type-Options"] = "nosniff"
+            await send(message)
+
+        # Request passes all WAF checks - call next middleware/application
+        # CRITICAL: Do NOT wrap this in try/except - let authentication exceptions propagate
+        await self.app(scope, receive, send_with_status)
+
+        processing_time = (time.time() - start_time) * 1000
+        logger.debug(f"WAF check passed - {request.method} {scope['path']} - {processing_time:.2f}ms")
+
+    @staticmethod
+    async def _buffer_body(receive: Receive) -> tuple[bytes, Receive]:
+        """Read the whole request body and return it with a receive that replays it"""
+        chunks = []
+        disconnect: Message | None = None
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                disconnect = message
+                break
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        body = b"".join(chunks)
+        replayed = False
+
+        async def replay() -> Message:
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            if disconnect is not None:
+                return disconnect
+            return await receive()
+
+        return body, replay
+
+    async def _screen(self, request: Request, body: bytes | None) -> JSONResponse | None:
+        """Main WAF processing logic with CEO-mandated debug path blocking; returns a block response or None"""
+
         client_ip = getattr(request.client, 'host', '127.0.0.1') if request.client else '127.0.0.1'
         method = request.method
         path = request.url.path
@@ -605,7 +702,7 @@ class WAFProtection(BaseHTTPMiddleware):
                 logger.warning(f"[WAF] S2S secret mismatch from {client_ip} to {path}")
 
         # CRITICAL FIX: Only wrap WAF-specific checks in try/except
-        # Do NOT catch exceptions from call_next() - let auth exceptions propagate properly
+        # Do NOT catch exceptions from the app - let auth exceptions propagate properly
         try:
             # 1. AUTHORIZATION ENFORCEMENT (Critical for SQLi protection)
             if await self._check_authorization_requirement(request):
@@ -617,47 +714,18 @@ class WAFProtection(BaseHTTPMiddleware):
                     method
                 )
 
-            # 2. SQL INJECTION DETECTION (skip if S2S bypass active)
-            if not s2s_bypass and await self._detect_sql_injection(request):
-                self.sql_injection_blocks += 1
-                return await self._block_request(
-                    "SQL injection attempt detected",
-                    "WAF_SQLI_001",
-                    client_ip,
-                    path,
-                    method
-                )
-
-            # 3. XSS DETECTION
-            if await self._detect_xss(request):
-                self.xss_blocks += 1
-                return await self._block_request(
-                    "Cross-site scripting attempt detected",
-                    "WAF_XSS_001",
-                    client_ip,
-                    path,
-                    method
-                )
-
-            # 4. COMMAND INJECTION DETECTION
-            if await self._detect_command_injection(request):
-                return await self._block_request(
-                    "Command injection attempt detected",
-                    "WAF_CMD_001",
-                    client_ip,
-                    path,
-                    method
-                )
-
-            # 5. PATH TRAVERSAL DETECTION
-            if await self._detect_path_traversal(request):
-                return await self._block_request(
-                    "Path traversal attempt detected",
-                    "WAF_PATH_001",
-                    client_ip,
-                    path,
-                    method
-                )
+            # 2-5. SQL injection, XSS, command injection and path traversal in one
+            # engine pass; the engine reports the first family in that priority order
+            families = self._content_families(request, s2s_bypass)
+            verdict = self._engine.inspect(families, path, str(request.url.query), body)
+            if verdict is not None:
+                message, error_code = BLOCK_REASONS[verdict.family]
+                logger.warning(f"WAF {verdict.family} pattern detected: {verdict.pattern[:50]}... ({verdict.rule_id})")
+                if verdict.family == "SQL":
+                    self.sql_injection_blocks += 1
+                elif verdict.family == "XSS":
+                    self.xss_blocks += 1
+                return await self._block_request(message, error_code, client_ip, path, method)
 
         except Exception as e:
             logger.error(f"WAF check processing error: {str(e)}")
@@ -665,18 +733,7 @@ class WAFProtection(BaseHTTPMiddleware):
             # Continue to application for availability
             pass
 
-        # Request passes all WAF checks - call next middleware/application
-        # CRITICAL: Do NOT wrap this in try/except - let authentication exceptions propagate
-        response = await call_next(request)
-
-        # Add security headers
-        response.headers["X-WAF-Status"] = "passed"
-        response.headers["X-Content-Type-Options"] = "nosniff"
-
-        processing_time = (time.time() - start_time) * 1000
-        logger.debug(f"WAF check passed - {method} {path} - {processing_time:.2f}ms")
-
-        return response
+        return None
 
     def _is_public_endpoint(self, request: Request) -> bool:
         """Centralized public endpoint check with path normalization"""
@@ -746,35 +803,28 @@ class WAFProtection(BaseHTTPMiddleware):
 
         return False
 
-    async def _detect_sql_injection(self, request: Request) -> bool:
-        """Detect SQL injection patterns in request"""
+    def _content_families(self, request: Request, s2s_bypass: bool) -> tuple[str, ...]:
+        """Rule families that apply to this request's query string and body, in priority order"""
 
-        # Use centralized public endpoint check
+        # Use centralized public endpoint check (SQL, XSS and CMD alike)
         if self._is_public_endpoint(request):
-            return False
+            return ()
 
-        # SQL injection exempt endpoints (legitimate content may contain SQL keywords)
-        sql_exempt_paths = {
-            "/partner/register",  # Partner registration may contain text like "select scholarships"
-            "/api/v1/partners/register",  # New partner registration endpoint (legitimate JSON)
-            "/api/v1/launch/simulate/traffic",
-            # CEO P0 DIRECTIVE: Auth endpoints exempt from SQL injection checks (T+3h gate)
-            # Authentication JSON payloads contain "password", "username" which trigger false positives
-            # WAF Rule IDs exempted: WAF_SQLI_001 for these specific endpoints only
-            "/api/v1/auth/login",
-            "/api/v1/auth/login-simple",
-            "/api/v1/auth/logout",
-            "/api/v1/auth/check",
-            "/api/v1/launch/commercialization/api-keys",
-            # Onboarding V2: File upload endpoint - multipart forms may trigger false positives
-            "/api/v2/onboarding/upload"
-        }
-        
-        # Add orchestration bypass paths (legitimate JSON from Command Center)
-        sql_exempt_paths.update(self._waf_bypass_paths)
+        families = []
+        # SQL INJECTION DETECTION (skip if S2S bypass active)
+        if not s2s_bypass and not self._is_sql_exempt(request):
+            families.append("SQL")
+        # Path-level exemptions for legitimate endpoints
+        if request.url.path not in self._xss_exempt_paths:
+            families.append("XSS")
+        families.append("CMD")
+        return tuple(families)
+
+    def _is_sql_exempt(self, request: Request) -> bool:
+        """SQL-exempt endpoints: legitimate content may contain SQL keywords"""
 
         # Check exact path matches
-        if request.url.path in sql_exempt_paths:
+        if request.url.path in self._sql_exempt_paths:
             # Log auth endpoint bypasses for monitoring and alerting
             from observability.metrics import metrics_service
             
@@ -783,110 +833,16 @@ class WAFProtection(BaseHTTPMiddleware):
                 metrics_service.record_waf_allowlist_bypass(request.url.path)
             else:
                 logger.debug(f"WAF: Allowing SQL-exempt endpoint - {request.method} {request.url.path}")
-            return False
+            return True
         
         # Check regex pattern matches for dynamic bypass routes (SECURITY: narrow scope only)
         for bypass_pattern in self._waf_bypass_patterns:
             if bypass_pattern.match(request.url.path):
                 logger.debug(f"WAF: Allowing HMAC-authenticated callback (pattern match) - {request.method} {request.url.path}")
-                return False
-
-        # Check URL parameters
-        query_string = str(request.url.query)
-        if query_string and await self._scan_for_patterns(query_string, self._sql_patterns, "SQL"):
-            return True
-
-        # Check request body for JSON/form data
-        if request.method in ["POST", "PUT", "PATCH"]:
-            try:
-                body = await self._get_request_body(request)
-                if body and await self._scan_for_patterns(body, self._sql_patterns, "SQL"):
-                    return True
-            except:
-                pass  # Skip body parsing errors
-
-        return False
-
-    async def _detect_xss(self, request: Request) -> bool:
-        """Detect XSS patterns in request"""
-
-        # Path-level exemptions for legitimate endpoints
-        xss_exempt_paths = {
-            "/api/v1/launch/simulate/traffic"
-        }
-
-        if request.url.path in xss_exempt_paths:
-            return False
-
-        # Use centralized public endpoint check (consistency with SQL detection)
-        if self._is_public_endpoint(request):
-            return False
-
-        query_string = str(request.url.query)
-        if await self._scan_for_patterns(query_string, self._xss_patterns, "XSS"):
-            return True
-
-        if request.method in ["POST", "PUT", "PATCH"]:
-            try:
-                body = await self._get_request_body(request)
-                if body and await self._scan_for_patterns(body, self._xss_patterns, "XSS"):
-                    return True
-            except:
-                pass
-
-        return False
-
-    async def _detect_command_injection(self, request: Request) -> bool:
-        """Detect command injection patterns"""
-        
-        if self._is_public_endpoint(request):
-            return False
-
-        query_string = str(request.url.query)
-        if await self._scan_for_patterns(query_string, self._command_patterns, "CMD"):
-            return True
-
-        if request.method in ["POST", "PUT", "PATCH"]:
-            try:
-                body = await self._get_request_body(request)
-                if body and await self._scan_for_patterns(body, self._command_patterns, "CMD"):
-                    return True
-            except:
-                pass
-
-        return False
-
-    async def _detect_path_traversal(self, request: Request) -> bool:
-        """Detect path traversal attempts"""
-
-        path = request.url.path
-        query_string = str(request.url.query)
-
-        # Check URL path and parameters
-        full_url = f"{path}?{query_string}"
-        return await self._scan_for_patterns(full_url, self._path_traversal_patterns, "PATH")
-
-    async def _scan_for_patterns(self, content: str, patterns: list[Pattern], attack_type: str) -> bool:
-        """Scan content against compiled patterns"""
-
-        if not content:
-            return False
-
-        for pattern in patterns:
-            if pattern.search(content):
-                logger.warning(f"WAF {attack_type} pattern detected: {pattern.pattern[:50]}...")
                 return True
 
         return False
 
-    async def _get_request_body(self, request: Request) -> str | None:
-        """Safely extract request body for scanning"""
-        try:
-            body = await request.body()
-            return body.decode('utf-8', errors='ignore')[:10000]  # Limit size
-        except:
-            return None
-
     async def _block_request(self, message: str, error_code: str, client_ip: str, path: str, method: str = "unknown") -> JSONResponse:
         """Block malicious request with structured response"""
         from observability.metrics import metrics_service
@@ -937,5 +893,9 @@ class WAFProtection(BaseHTTPMiddleware):
             "underscore_key_dropped_count": self.underscore_key_dropped_count
         }
 
+    def get_rule_stats(self) -> dict:
+        """Per-rule match counts, sampled evaluation timings and verdict cache stats"""
+        return self._engine.get_stats()
+
 # Global WAF instance
 waf_protection = WAFProtection(None, enable_block_mode=True)
@@ -0,0 +1,80 @@
+"""
+Async Database Configuration
+AsyncSession (asyncpg) engine for request-path reads
+
+The sync engine in models.database stays the default for scripts, jobs and
+write paths. Async handlers read through the registry's request_read pool so a
+slow query yields the event loop instead of stalling every other in-flight request.
+"""
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from database.engine_registry import REQUEST_READ_POOL, engine_registry
+
+
+def get_async_engine() -> AsyncEngine:
+    """The request-path async engine (registry pool "request_read")"""
+    return engine_registry.get_async_engine(REQUEST_READ_POOL)
+
+
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    return engine_registry.async_sessionmaker(REQUEST_READ_POOL)
+
+
+def configure_async_engine(engine: AsyncEngine | None) -> None:
+    """Replace the async engine (tests, alternate databases); None resets to lazy creation"""
+    engine_registry.configure(REQUEST_READ_POOL, engine, flavor="async")
+
+
+async def dispose_async_engine() -> None:
+    """Close pooled async connections (application shutdown)"""
+    await engine_registry.dispose_async()
+
+
+class _RequestSession:
+    """Per-request holder; the session is opened on first use only"""
+
+    def __init__(self):
+        self.session: AsyncSession | None = None
+
+    def get(self) -> AsyncSession:
+        if self.session is None:
+            self.session = get_async_session_factory()()
+        return self.session
+
+
+_request_session: ContextVar[_RequestSession | None] = ContextVar("request_db_session", default=None)
+
+
+async def request_db_session() -> AsyncIterator[None]:
+    """
+    FastAPI dependency that scopes one AsyncSession to the request.
+
+    Every async_session_scope() inside the request reuses it, so a handler
+    that touches several repositories checks out a single pooled connection.
+    Requests served entirely from memory never open a session.
+    """
+    holder = _RequestSession()
+    token = _request_session.set(holder)
+    try:
+        yield
+    finally:
+        _request_session.reset(token)
+        if holder.session is not None:
+            await holder.session.close()
+
+
+@asynccontextmanager
+async def async_session_scope() -> AsyncIterator[AsyncSession]:
+    """Yield the request's session if one is bound, else a short-lived session"""
+    holder = _request_session.get()
+    if holder is not None:
+        yield holder.get()
+        return
+
+    async with get_async_session_factory()() as session:
+        yield session
@@ -17,72 +17,22 @@ from sqlalchemy import (
     Integer,
     String,
     Text,
-    create_engine,
 )
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship, sessionmaker
+from sqlalchemy.orm import relationship
 
 from config.settings import settings
+from database.engine_registry import WRITE_POOL, engine_registry
 
 # Database URL from environment or settings
 DATABASE_URL = os.getenv("DATABASE_URL") or settings.database_url
 
-# Create database engine with SSL hardening and production optimizations
-if DATABASE_URL:
-    # SSL/TLS hardening configuration
-    connect_args = {
-        "connect_timeout": 10,
-        "application_name": "scholarship_api",
-        "options": "-c statement_timeout=5000"  # Phase 4: 5 second query timeout
-    }
-    
-    # Production SSL hardening - ALWAYS enforce certificate verification
-    if settings.environment.value in ["production", "staging"]:
-        ssl_root_cert = os.getenv("SSL_ROOT_CERT")
-        
-        if ssl_root_cert:
-            # CRITICAL SECURITY: Full verification when root cert available
-            connect_args.update({
-                "sslmode": "verify-full",  # Verify server cert AND hostname
-                "sslcert": os.getenv("SSL_CLIENT_CERT"),  # Client certificate (optional mTLS)
-                "sslkey": os.getenv("SSL_CLIENT_KEY"),    # Client key (optional mTLS)
-                "sslrootcert": ssl_root_cert, # CA certificate
-                "sslcrl": os.getenv("SSL_CRL"),           # Certificate revocation list (optional)
-                "target_session_attrs": "read-write"      # Ensure we connect to primary
-            })
-            # Remove None values
-            connect_args = {k: v for k, v in connect_args.items() if v is not None}
-        else:
-            # CRITICAL SECURITY: Use system CA bundle for managed cloud databases
-            # Neon uses Let's Encrypt (ISRG Root X1) which is in system trust store
-            import logging
-            logging.info(
-                "Production SSL: Using system CA bundle (/etc/ssl/certs/ca-certificates.crt) "
-                "for certificate verification with sslmode=verify-full"
-            )
-            # verify-full: Full validation (cert + hostname) using system CA bundle
-            # Neon/RDS/managed providers have valid public certs in Ubuntu trust store
-            connect_args["sslmode"] = "verify-full"
-            connect_args["sslrootcert"] = "/etc/ssl/certs/ca-certificates.crt"
-    
-    engine = create_engine(
-        DATABASE_URL,
-        echo=settings.database_echo,
-        pool_size=settings.database_pool_size,
-        max_overflow=settings.database_max_overflow,
-        pool_pre_ping=True,  # Validate connections before use
-        pool_recycle=3600,   # Recycle connections every hour
-        connect_args=connect_args,
-        # Connection retry and resilience
-        pool_timeout=30,     # Wait up to 30s for connection from pool
-        max_identifier_length=63  # PostgreSQL standard
-    )
-else:
-    # Fallback to SQLite for development
-    engine = create_engine("sqlite:///./scholarships.db", echo=True)
-
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# General-purpose sync engine (writes, ledger, scripts) - the registry's "write" pool.
+# SSL hardening, statement timeout and pool budget live in database/engine_registry.py
+engine = engine_registry.get_engine(WRITE_POOL)
+
+SessionLocal = engine_registry.sessionmaker(WRITE_POOL)
 Base = declarative_base()
 
 class ScholarshipDB(Base):
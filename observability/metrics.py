@@ -5,7 +5,7 @@ Prometheus Metrics for Observability
 
 import prometheus_client
 from fastapi import FastAPI, Response
-from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
 from prometheus_client.core import GaugeMetricFamily
 
 from observability.alerts import setup_alerting
@@ -40,6 +40,151 @@ database_query_duration_seconds = Histogram(
     ['query_type']
 )
 
+# Query result cache metrics (services/query_cache.py)
+query_cache_requests_total = Counter(
+    'query_cache_requests_total',
+    'Query result cache lookups by outcome (hit, miss, coalesced, bypass)',
+    ['namespace', 'result']
+)
+
+query_cache_evictions_total = Counter(
+    'query_cache_evictions_total',
+    'Query result cache evictions by reason (capacity, expired, stale, invalidated)',
+    ['namespace', 'reason']
+)
+
+query_cache_entries = Gauge(
+    'query_cache_entries',
+    'Current number of entries in the query result cache',
+    ['namespace']
+)
+
+# Database connection pool metrics (database/engine_registry.py)
+db_pool_connections = Gauge(
+    'db_pool_connections',
+    'Connections per named pool and engine flavor by state (checked_out, idle, overflow)',
+    ['pool', 'flavor', 'state']
+)
+
+db_pool_checkouts_total = Counter(
+    'db_pool_checkouts_total',
+    'Connection checkouts per named pool and engine flavor',
+    ['pool', 'flavor']
+)
+
+# Response compression metrics (middleware/compression.py)
+compression_variant_cache_requests_total = Counter(
+    'compression_variant_cache_requests_total',
+    'Precompressed variant cache lookups by encoding and outcome (hit, miss)',
+    ['encoding', 'result']
+)
+
+# Prerendered page/sitemap metrics (services/prerender_store.py)
+prerender_requests_total = Counter(
+    'prerender_requests_total',
+    'Prerendered document requests by outcome (hit, render, not_modified)',
+    ['result']
+)
+
+# LLM gateway metrics (services/llm_gateway.py)
+llm_gateway_requests_total = Counter(
+    'llm_gateway_requests_total',
+    'LLM gateway calls by operation and outcome (success, error, timeout, cancelled, coalesced)',
+    ['operation', 'result']
+)
+
+llm_gateway_latency_seconds = Histogram(
+    'llm_gateway_latency_seconds',
+    'Upstream chat completion latency by operation',
+    ['operation'],
+    buckets=[0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0]
+)
+
+llm_gateway_tokens_total = Counter(
+    'llm_gateway_tokens_total',
+    'Tokens reported by the LLM backend by operation and kind (prompt, completion)',
+    ['operation', 'kind']
+)
+
+# LLM page generation metrics (services/llm_generation.py)
+llm_generation_requests_total = Counter(
+    'llm_generation_requests_total',
+    'Chat completion requests by outcome (cache_hit, generated, failed)',
+    ['result']
+)
+
+llm_generation_rate_limit_wait_seconds = Histogram(
+    'llm_generation_rate_limit_wait_seconds',
+    'Time a completion request waited for the token-rate budget',
+    buckets=[0.001, 0.01, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0]
+)
+
+# Token revocation cache metrics (services/revocation_cache.py)
+token_revocation_checks_total = Counter(
+    'token_revocation_checks_total',
+    'Token revocation checks by outcome (bloom_negative, not_revoked, revoked, fallback)',
+    ['result']
+)
+
+token_revocation_cache_entries = Gauge(
+    'token_revocation_cache_entries',
+    'Unexpired revoked JTIs held in the local revocation cache'
+)
+
+# Verified JWT cache metrics (services/verified_token_cache.py)
+verified_token_cache_requests_total = Counter(
+    'verified_token_cache_requests_total',
+    'Verified token cache lookups by outcome (hit, miss, expired, rotated, revoked)',
+    ['result']
+)
+
+verified_token_cache_entries = Gauge(
+    'verified_token_cache_entries',
+    'Verified bearer tokens held in the cache'
+)
+
+# Telemetry ingestion queue metrics (services/telemetry_ingest.py)
+telemetry_ingest_events_total = Counter(
+    'telemetry_ingest_events_total',
+    'Telemetry events by ingestion outcome (queued, duplicate, rejected, written, failed)',
+    ['outcome']
+)
+
+telemetry_ingest_queue_depth = Gauge(
+    'telemetry_ingest_queue_depth',
+    'Telemetry events acknowledged but not yet written'
+)
+
+telemetry_ingest_flush_seconds = Histogram(
+    'telemetry_ingest_flush_seconds',
+    'Time to write one telemetry micro-batch',
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0]
+)
+
+telemetry_ingest_batch_size = Histogram(
+    'telemetry_ingest_batch_size',
+    'Events per telemetry micro-batch',
+    buckets=[1, 5, 10, 25, 50, 100, 250, 500, 1000]
+)
+
+# Analytics write-behind metrics (services/analytics_writer.py)
+analytics_writer_records_total = Counter(
+    'analytics_writer_records_total',
+    'Analytics records by table and outcome (queued, dropped, written, failed)',
+    ['table', 'outcome']
+)
+
+analytics_writer_queue_depth = Gauge(
+    'analytics_writer_queue_depth',
+    'Analytics records queued but not yet written'
+)
+
+analytics_writer_flush_seconds = Histogram(
+    'analytics_writer_flush_seconds',
+    'Time to write one analytics batch',
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0]
+)
+
 interactions_logged_total = Counter(
     'interactions_logged_total',
     'Total interactions logged',
@@ -79,6 +224,31 @@ waf_allowlist_bypasses_total = Counter(
     ['endpoint']
 )
 
+# WAF rule engine metrics (middleware/waf_engine.py)
+waf_rule_matches_total = Counter(
+    'waf_rule_matches_total',
+    'WAF rule matches by family and rule id',
+    ['family', 'rule']
+)
+
+waf_rule_evaluations_total = Counter(
+    'waf_rule_evaluations_total',
+    'Sampled individual WAF rule evaluations (for per-rule timing)',
+    ['rule']
+)
+
+waf_rule_eval_seconds_total = Counter(
+    'waf_rule_eval_seconds_total',
+    'Time spent in sampled individual WAF rule evaluations',
+    ['rule']
+)
+
+waf_verdict_cache_requests_total = Counter(
+    'waf_verdict_cache_requests_total',
+    'WAF verdict cache lookups by outcome (hit, miss)',
+    ['result']
+)
+
 # Agent3 v3.0 Required Observability Counters
 debit_attempts_total = Counter(
     'debit_attempts_total',
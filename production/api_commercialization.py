@@ -2,11 +2,13 @@
 API Commercialization & Billing System
 Executive directive: API plans, rate limits, billing pipeline, revenue tracking
 """
+import asyncio
 import hashlib
 import hmac
 import json
 import secrets
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
@@ -15,6 +17,9 @@ from typing import Any
 
 from prometheus_client import Counter, Gauge
 
+from config.settings import settings
+from production.usage_quota import UsageQuotaEngine, WindowDecision
+
 
 class TierType(Enum):
     """API tier types for commercialization"""
@@ -137,9 +142,24 @@ class APICommercializationService:
 
         # In-memory storage for demonstration (use database in production)
         self.api_keys: dict[str, APIKey] = {}
-        self.usage_tracking: dict[str, dict] = {}
         self.billing_events: list[dict] = []
 
+        # Per-key minute windows and day/month usage, shared across workers via Redis
+        self.quota = UsageQuotaEngine()
+
+        # Verified-key cache: HMAC-SHA256(server secret, presented key) -> (key_id, expires_at).
+        # The secret is per process, so digests are useless outside it; PBKDF2 only runs on a miss.
+        self._verify_secret = secrets.token_bytes(32)
+        self._verified_keys: OrderedDict[bytes, tuple[str, float]] = OrderedDict()
+        self._verify_inflight: dict[bytes, asyncio.Task] = {}
+        self.verified_key_ttl = settings.api_key_cache_ttl_seconds
+        self.verified_key_max_entries = settings.api_key_cache_max_entries
+        self.verify_cache_metrics = Counter(
+            'api_key_verify_cache_total',
+            'API key verifications by cache outcome (hit, miss)',
+            ['result']
+        )
+
         print("💰 API commercialization service initialized")
         print(f"🎯 Tiers configured: {len(self.tiers)} (Free → ${self.tiers[TierType.ENTERPRISE].monthly_cost}/mo)")
 
@@ -183,15 +203,6 @@ class APICommercializationService:
 
         self.api_keys[key_id] = api_key
 
-        # Initialize usage tracking
-        self.usage_tracking[key_id] = {
-            "requests_today": 0,
-            "requests_this_month": 0,
-            "last_reset_daily": datetime.now().date(),
-            "last_reset_monthly": datetime.now().replace(day=1).date(),
-            "overage_charges": 0.0
-        }
-
         # Track subscription
         self.billing_metrics.labels(tier=tier.value).inc()
 
@@ -226,43 +237,132 @@ class APICommercializationService:
 
         return result
 
-    def verify_api_key(self, provided_key: str) -> APIKey | None:
+    def _key_digest(self, provided_key: str) -> bytes:
+        return hmac.new(self._verify_secret, provided_key.encode(), hashlib.sha256).digest()
+
+    def _cached_key(self, digest: bytes) -> APIKey | None:
+        """Verified key for this digest if cached, unexpired and still active"""
+        entry = self._verified_keys.get(digest)
+        if entry is None:
+            return None
+        key_id, expires_at = entry
+        api_key_obj = self.api_keys.get(key_id)
+        if expires_at <= time.monotonic() or api_key_obj is None or api_key_obj.status != "active":
+            del self._verified_keys[digest]
+            return None
+        return api_key_obj
+
+    def _remember_key(self, digest: bytes, api_key_obj: APIKey) -> None:
+        self._verified_keys[digest] = (api_key_obj.key_id, time.monotonic() + self.verified_key_ttl)
+        self._verified_keys.move_to_end(digest)
+        while len(self._verified_keys) > self.verified_key_max_entries:
+            self._verified_keys.popitem(last=False)
+
+    def invalidate_verified_key(self, key_id: str) -> None:
+        """Drop cached verifications of a key (status change, rotation)"""
+        stale = [digest for digest, (cached_id, _) in self._verified_keys.items() if cached_id == key_id]
+        for digest in stale:
+            del self._verified_keys[digest]
+
+    def _verify_api_key_cold(self, provided_key: str) -> APIKey | None:
         """
-        Securely verify API key using constant-time comparison
+        Securely verify API key using constant-time comparison (PBKDF2, CPU-heavy)
         Returns APIKey object if valid, None if invalid
         """
         if not provided_key or not provided_key.startswith("sk_live_"):
             return None
 
         # Extract the secret part (everything after sk_live_)
+        key_secret = provided_key[8:]  # Remove "sk_live_" prefix
+
+        # O(1) lookup by key id instead of scanning every stored key
+        api_key_obj = self.api_keys.get(provided_key)
+        if api_key_obj is None:
+            return None  # No matching key found
+
+        # Parse stored hash (format: salt$hash)
         try:
-            key_secret = provided_key[8:]  # Remove "sk_live_" prefix
-        except (IndexError, AttributeError):
-            return None
+            salt_hex, stored_hash = api_key_obj.key_secret_hash.split('$', 1)
+            salt = bytes.fromhex(salt_hex)
+        except (ValueError, TypeError):
+            return None  # Malformed hash
+
+        # Compute hash of provided secret with same salt
+        provided_hash = hashlib.pbkdf2_hmac('sha256', key_secret.encode(), salt, 100000).hex()
 
-        # Check against all stored keys using constant-time comparison
-        for stored_key_id, api_key_obj in self.api_keys.items():
-            if stored_key_id != provided_key:
-                continue
+        # Constant-time comparison to prevent timing attacks
+        if hmac.compare_digest(provided_hash, stored_hash) and api_key_obj.status == "active":
+            return api_key_obj
+        return None  # Wrong secret, or key exists but is suspended/cancelled
 
-            # Parse stored hash (format: salt$hash)
-            try:
-                salt_hex, stored_hash = api_key_obj.key_secret_hash.split('$', 1)
-                salt = bytes.fromhex(salt_hex)
+    def verify_api_key(self, provided_key: str) -> APIKey | None:
+        """
+        Verify an API key, serving repeat presentations from the verified-key cache
+        Returns APIKey object if valid, None if invalid
+        """
+        if not provided_key or not provided_key.startswith("sk_live_"):
+            return None
 
-                # Compute hash of provided secret with same salt
-                provided_hash = hashlib.pbkdf2_hmac('sha256', key_secret.encode(), salt, 100000).hex()
+        digest = self._key_digest(provided_key)
+        api_key_obj = self._cached_key(digest)
+        if api_key_obj is not None:
+            self.verify_cache_metrics.labels(result="hit").inc()
+            return api_key_obj
 
-                # Constant-time comparison to prevent timing attacks
-                if hmac.compare_digest(provided_hash, stored_hash):
-                    if api_key_obj.status == "active":
-                        return api_key_obj
-                    return None  # Key exists but is suspended/cancelled
+        self.verify_cache_metrics.labels(result="miss").inc()
+        api_key_obj = self._verify_api_key_cold(provided_key)
+        if api_key_obj is not None:
+            self._remember_key(digest, api_key_obj)
+        return api_key_obj
 
-            except (ValueError, TypeError):
-                continue  # Malformed hash, skip this key
+    async def verify_api_key_async(self, provided_key: str) -> APIKey | None:
+        """
+        verify_api_key for async callers: cold PBKDF2 runs in a worker thread so it
+        never blocks the event loop, and concurrent misses for one key share it
+        """
+        if not provided_key or not provided_key.startswith("sk_live_"):
+            return None
 
-        return None  # No matching key found
+        digest = self._key_digest(provided_key)
+        api_key_obj = self._cached_key(digest)
+        if api_key_obj is not None:
+            self.verify_cache_metrics.labels(result="hit").inc()
+            return api_key_obj
+
+        inflight = self._verify_inflight.get(digest)
+        if inflight is None:
+            self.verify_cache_metrics.labels(result="miss").inc()
+            inflight = asyncio.create_task(self._verify_shared(digest, provided_key))
+            # Mark the outcome retrieved when every caller was cancelled
+            inflight.add_done_callback(lambda task: task.cancelled() or task.exception())
+            self._verify_inflight[digest] = inflight
+        # Shielded: a cancelled caller never cancels the lookup others are awaiting
+        return await asyncio.shield(inflight)
+
+    async def _verify_shared(self, digest: bytes, provided_key: str) -> APIKey | None:
+        """One cold verification, shared by every concurrent caller for the key"""
+        try:
+            api_key_obj = await asyncio.to_thread(self._verify_api_key_cold, provided_key)
+            if api_key_obj is not None:
+                self._remember_key(digest, api_key_obj)
+            return api_key_obj
+        finally:
+            del self._verify_inflight[digest]
+
+    def set_key_status(self, key_id: str, status: str) -> bool:
+        """Change a key's status (active, suspended, cancelled); cached verifications are dropped at once"""
+        api_key_obj = self.api_keys.get(key_id)
+        if api_key_obj is None:
+            return False
+        api_key_obj.status = status
+        self.invalidate_verified_key(key_id)
+        return True
+
+    def suspend_api_key(self, key_id: str) -> bool:
+        return self.set_key_status(key_id, "suspended")
+
+    def cancel_api_key(self, key_id: str) -> bool:
+        return self.set_key_status(key_id, "cancelled")
 
     def check_rate_limits(self, api_key: str, endpoint: str) -> dict[str, Any]:
         """
@@ -272,56 +372,52 @@ class APICommercializationService:
         # Securely verify the API key
         key_info = self.verify_api_key(api_key)
         if not key_info:
-            return {
-                "allowed": False,
-                "reason": "invalid_api_key",
-                "status_code": 401
-            }
-        tier_config = self.tiers[key_info.tier]
-        usage = self.usage_tracking[api_key]
-
-        # Reset counters if needed
-        today = datetime.now().date()
-        current_month = datetime.now().replace(day=1).date()
-
-        if usage["last_reset_daily"] < today:
-            usage["requests_today"] = 0
-            usage["last_reset_daily"] = today
+            return self._invalid_key_result()
+        # Sliding-window minute limit, counted atomically across workers
+        window = self.quota.check_window(api_key, self.tiers[key_info.tier].requests_per_minute)
+        return self._apply_rate_limits(api_key, key_info, endpoint, window)
+
+    async def check_rate_limits_async(self, api_key: str, endpoint: str) -> dict[str, Any]:
+        """check_rate_limits for async callers (key verification and the quota store never block the event loop)"""
+        key_info = await self.verify_api_key_async(api_key)
+        if not key_info:
+            return self._invalid_key_result()
+        window = await self.quota.check_window_async(api_key, self.tiers[key_info.tier].requests_per_minute)
+        return self._apply_rate_limits(api_key, key_info, endpoint, window)
 
-        if usage["last_reset_monthly"] < current_month:
-            usage["requests_this_month"] = 0
-            usage["last_reset_monthly"] = current_month
-            usage["overage_charges"] = 0.0
+    @staticmethod
+    def _invalid_key_result() -> dict[str, Any]:
+        return {
+            "allowed": False,
+            "reason": "invalid_api_key",
+            "status_code": 401
+        }
 
-        # Check minute-level rate limit (simplified - use Redis in production)
-        minute_requests = usage["requests_today"] // 1440  # Rough estimate
+    def _apply_rate_limits(self, api_key: str, key_info: APIKey, endpoint: str,
+                           window: WindowDecision) -> dict[str, Any]:
+        tier_config = self.tiers[key_info.tier]
 
-        if minute_requests >= tier_config.requests_per_minute:
+        if not window.allowed:
             return {
                 "allowed": False,
                 "reason": "rate_limit_exceeded",
                 "status_code": 429,
                 "headers": {
-                    "X-RateLimit-Limit": str(tier_config.requests_per_minute),
+                    "X-RateLimit-Limit": str(window.limit),
                     "X-RateLimit-Remaining": "0",
-                    "X-RateLimit-Reset": str(int((datetime.now() + timedelta(minutes=1)).timestamp())),
-                    "Retry-After": "60"
+                    "X-RateLimit-Reset": str(window.reset_at),
+                    "Retry-After": str(max(1, window.reset_at - int(time.time())))
                 }
             }
 
-        # Check monthly quota
-        monthly_overage = max(0, usage["requests_this_month"] - tier_config.requests_per_month)
-
-        # Calculate overage cost (if billing enabled)
-        overage_cost_per_request = 0.001  # $0.001 per overage request
-        if monthly_overage > 0 and key_info.billing_enabled:
-            additional_cost = monthly_overage * overage_cost_per_request
-            usage["overage_charges"] += additional_cost
-
-        # Increment usage
-        usage["requests_today"] += 1
-        usage["requests_this_month"] += 1
+        # Monthly quota (approximate: this worker's unflushed increments plus the last shared total)
+        usage = self.quota.record_usage(api_key)
         key_info.last_used = datetime.now()
+        monthly_overage = max(0, usage.month - tier_config.requests_per_month)
+
+        # Overage cost (if billing enabled): $0.001 per request past the monthly quota
+        overage_cost_per_request = 0.001
+        overage_charges = monthly_overage * overage_cost_per_request if key_info.billing_enabled else 0.0
 
         # Track metrics
         self.usage_metrics.labels(
@@ -330,22 +426,24 @@ class APICommercializationService:
             status="allowed"
         ).inc()
 
-        remaining_monthly = max(0, tier_config.requests_per_month - usage["requests_this_month"])
+        remaining_monthly = max(0, tier_config.requests_per_month - usage.month)
+        current_month = datetime.now().replace(day=1).date()
 
         return {
             "allowed": True,
             "tier": key_info.tier.value,
             "headers": {
-                "X-RateLimit-Limit": str(tier_config.requests_per_minute),
-                "X-RateLimit-Remaining": str(max(0, tier_config.requests_per_minute - minute_requests - 1)),
+                "X-RateLimit-Limit": str(window.limit),
+                "X-RateLimit-Remaining": str(window.remaining),
+                "X-RateLimit-Reset": str(window.reset_at),
                 "X-RateLimit-Monthly-Limit": str(tier_config.requests_per_month),
                 "X-RateLimit-Monthly-Remaining": str(remaining_monthly),
                 "X-RateLimit-Monthly-Overage": str(monthly_overage),
-                "X-Overage-Charges": f"${usage['overage_charges']:.2f}"
+                "X-Overage-Charges": f"${overage_charges:.2f}"
             },
             "billing_impact": {
                 "monthly_overage": monthly_overage,
-                "overage_charges": usage["overage_charges"],
+                "overage_charges": overage_charges,
                 "next_billing_cycle": (current_month + timedelta(days=32)).replace(day=1).isoformat()
             }
         }
@@ -480,7 +578,7 @@ class APICommercializationService:
 
         key_info = self.api_keys[api_key]
         tier_config = self.tiers[key_info.tier]
-        usage = self.usage_tracking[api_key]
+        usage = self.quota.usage(api_key)
 
         # Calculate billing period
         current_month = datetime.now().replace(day=1)
@@ -490,7 +588,7 @@ class APICommercializationService:
         base_cost = tier_config.monthly_cost
 
         # Usage overage costs
-        overage_requests = max(0, usage["requests_this_month"] - tier_config.requests_per_month)
+        overage_requests = max(0, usage.month - tier_config.requests_per_month)
         overage_request_cost = overage_requests * 0.001  # $0.001 per overage request
 
         # AI credits overage
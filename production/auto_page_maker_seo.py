@@ -8,6 +8,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from services.near_duplicate_index import NearDuplicateIndex
+
 
 @dataclass
 class ScholarshipPage:
@@ -626,8 +628,13 @@ class AutoPageMakerSEOService:
             canonical_url=f"{self.base_domain}{url_path}"
         )
 
-    def _calculate_content_quality_score(self, page: ScholarshipPage, existing_pages: list[ScholarshipPage] | None = None) -> float:
-        """Calculate content quality score (target: 90%+ for search rankings)"""
+    def _calculate_content_quality_score(self, page: ScholarshipPage, existing_pages: list[ScholarshipPage] | None = None,
+                                         title_index: NearDuplicateIndex | None = None) -> float:
+        """
+        Calculate content quality score (target: 90%+ for search rankings)
+        Title uniqueness is checked against title_index when given (sub-linear),
+        otherwise pairwise against existing_pages.
+        """
         if existing_pages is None:
             existing_pages = []
         score = 0.0
@@ -689,17 +696,37 @@ class AutoPageMakerSEOService:
             score += 10
 
         # 7. Uniqueness check (5 points)
-        if existing_pages:
-            similar_titles = sum(1 for p in existing_pages if self._calculate_similarity(page.title, p.title) > 0.8)
-            if similar_titles == 0:
-                score += 5
-            elif similar_titles <= 2:
-                score += 3
+        if title_index is not None:
+            similar_titles = sum(1 for _, similarity in title_index.near_duplicates(page.title) if similarity > 0.8)
         else:
+            similar_titles = sum(1 for p in existing_pages if self._calculate_similarity(page.title, p.title) > 0.8)
+        if similar_titles == 0:
             score += 5
+        elif similar_titles <= 2:
+            score += 3
 
         return min(score, max_score)  # Cap at 100%
 
+    def _score_pages(self, pages: list[ScholarshipPage]) -> tuple[list[float], int]:
+        """
+        Quality-score every page against the pages generated before it in one pass.
+        Titles and bodies are added to near-duplicate indexes as they are scored,
+        so each lookup is sub-linear and the pass is roughly linear in len(pages).
+        Returns (scores, pages whose body near-duplicates an earlier page).
+        """
+        title_index = NearDuplicateIndex(threshold=0.8)
+        body_index = NearDuplicateIndex(threshold=0.8, shingle_size=3)
+        scores = []
+        near_duplicate_bodies = 0
+        for i, page in enumerate(pages):
+            body = " ".join(block['content'] for block in page.content_blocks)
+            scores.append(self._calculate_content_quality_score(page, title_index=title_index))
+            if body_index.near_duplicates(body):
+                near_duplicate_bodies += 1
+            title_index.add(i, page.title)
+            body_index.add(i, body)
+        return scores, near_duplicate_bodies
+
     def _calculate_similarity(self, text1: str, text2: str) -> float:
         """Calculate text similarity using simple word overlap"""
         words1 = set(text1.lower().split())
@@ -922,8 +949,7 @@ class AutoPageMakerSEOService:
         # Save comprehensive evidence with quality metrics
         evidence_file = self.evidence_path / f"bulk_seo_pages_{len(generated_pages)}_{datetime.now().strftime('%Y%m%d')}.json"
         with open(evidence_file, 'w') as f:
-            # Calculate quality scores for first 10 pages as sample
-            quality_scores = [self._calculate_content_quality_score(page, generated_pages[:i]) for i, page in enumerate(generated_pages[:10])]
+            quality_scores, near_duplicate_bodies = self._score_pages(generated_pages)
             average_quality = sum(quality_scores) / len(quality_scores) if quality_scores else 0
 
             evidence_data = {
@@ -945,6 +971,7 @@ class AutoPageMakerSEOService:
                     "average_description_length": sum(len(p.meta_description) for p in generated_pages) / len(generated_pages),
                     "unique_urls": len({p.url_path for p in generated_pages}),
                     "unique_titles": len({p.title for p in generated_pages}),
+                    "near_duplicate_bodies": near_duplicate_bodies,
                     "structured_data_coverage": "100%",
                     "internal_links_per_page": sum(len(p.internal_links) for p in generated_pages) / len(generated_pages)
                 },
@@ -973,18 +1000,19 @@ class AutoPageMakerSEOService:
 
         return generated_pages
 
-    def generate_sitemap(self, pages: list[ScholarshipPage]) -> str:
+    def generate_sitemap(self, pages: list[ScholarshipPage], lastmod: datetime | None = None) -> str:
         """
         Generate XML sitemap for SEO pages
         Executive directive: Search engine discoverability
         """
         sitemap_urls = []
+        lastmod_date = (lastmod or datetime.now()).strftime('%Y-%m-%d')
 
         for page in pages:
             sitemap_urls.append(f"""
     <url>
         <loc>{page.canonical_url}</loc>
-        <lastmod>{datetime.now().strftime('%Y-%m-%d')}</lastmod>
+        <lastmod>{lastmod_date}</lastmod>
         <changefreq>weekly</changefreq>
         <priority>0.8</priority>
     </url>""")
@@ -993,6 +1021,22 @@ class AutoPageMakerSEOService:
 <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{"".join(sitemap_urls)}
 </urlset>"""
 
+    def generate_sitemap_index(self, sitemap_urls: list[str], lastmod: datetime | None = None) -> str:
+        """
+        Generate a sitemap index pointing at sitemap shards
+        (the protocol caps each sitemap file at 50,000 URLs)
+        """
+        lastmod_date = (lastmod or datetime.now()).strftime('%Y-%m-%d')
+        entries = "".join(f"""
+    <sitemap>
+        <loc>{url}</loc>
+        <lastmod>{lastmod_date}</lastmod>
+    </sitemap>""" for url in sitemap_urls)
+
+        return f"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}
+</sitemapindex>"""
+
 
     def get_scaling_metrics(self) -> dict[str, Any]:
         """Get current scaling capabilities and metrics"""
@@ -0,0 +1,285 @@
+"""
+Per-Key Usage Quota Engine
+Shared rate and quota state for APICommercializationService
+
+- Minute limits: sliding-window counter (previous window weighted by overlap
+  plus current window), checked and incremented atomically in Redis so every
+  worker sees the same count and X-RateLimit-* headers are exact
+- Day/month quotas: approximate counters; increments are buffered locally and
+  flushed to the shared store in batches by a background thread
+- MemoryQuotaStore stands in for Redis in tests and when Redis is unreachable,
+  including per-worker minute limits while a Redis outage lasts
+- Store keys carry a SHA-256 digest of the API key, never the key itself
+"""
+
+import asyncio
+import hashlib
+import math
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+import redis
+
+from config.settings import settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# KEYS[1] = current window counter, KEYS[2] = previous window counter
+# ARGV = limit, previous-window weight, key TTL (seconds)
+# Returns {allowed, floor(weighted count after this request)}
+SLIDING_WINDOW_LUA = """
+local limit = tonumber(ARGV[1])
+local weight = tonumber(ARGV[2])
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local estimated = previous * weight + current
+if estimated + 1 > limit then
+    return {0, math.floor(estimated)}
+end
+current = redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[3]))
+return {1, math.floor(previous * weight + current)}
+"""
+
+DAY_TTL_SECONDS = 2 * 86400
+MONTH_TTL_SECONDS = 40 * 86400
+
+
+@dataclass(frozen=True)
+class WindowDecision:
+    """Outcome of one sliding-window check"""
+    allowed: bool
+    limit: int
+    count: int
+    reset_at: int  # epoch seconds when the current window rolls over
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.limit - self.count)
+
+
+@dataclass(frozen=True)
+class UsageSnapshot:
+    """Approximate day/month request counts (shared total plus this worker's unflushed share)"""
+    day: int
+    month: int
+
+
+class MemoryQuotaStore:
+    """Process-local quota store (tests, single-instance fallback)"""
+
+    backend = "memory"
+
+    def __init__(self):
+        self._counters: dict[str, tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key: str, now: float) -> int:
+        entry = self._counters.get(key)
+        if entry is None or entry[1] <= now:
+            return 0
+        return entry[0]
+
+    def hit_window(self, current_key: str, previous_key: str, limit: int, weight: float,
+                   ttl: int) -> tuple[bool, int]:
+        now = time.time()
+        with self._lock:
+            current = self._get(current_key, now)
+            estimated = self._get(previous_key, now) * weight + current
+            if estimated + 1 > limit:
+                return False, math.floor(estimated)
+            self._counters[current_key] = (current + 1, now + ttl)
+            return True, math.floor(estimated + 1)
+
+    def add_usage(self, increments: dict[str, int], ttls: dict[str, int]) -> dict[str, int]:
+        now = time.time()
+        totals = {}
+        with self._lock:
+            for key, amount in increments.items():
+                total = self._get(key, now) + amount
+                self._counters[key] = (total, now + ttls[key])
+                totals[key] = total
+        return totals
+
+    def get_usage(self, keys: list[str]) -> dict[str, int]:
+        now = time.time()
+        with self._lock:
+            return {key: self._get(key, now) for key in keys}
+
+
+class RedisQuotaStore:
+    """Redis-backed quota store shared by every worker"""
+
+    backend = "redis"
+
+    def __init__(self, client: redis.Redis):
+        self.client = client
+        self._window_script = client.register_script(SLIDING_WINDOW_LUA)
+
+    def hit_window(self, current_key: str, previous_key: str, limit: int, weight: float,
+                   ttl: int) -> tuple[bool, int]:
+        allowed, count = self._window_script(keys=[current_key, previous_key], args=[limit, weight, ttl])
+        return bool(allowed), int(count)
+
+    def add_usage(self, increments: dict[str, int], ttls: dict[str, int]) -> dict[str, int]:
+        pipe = self.client.pipeline(transaction=False)
+        for key, amount in increments.items():
+            pipe.incrby(key, amount)
+            pipe.expire(key, ttls[key])
+        results = pipe.execute()
+        return {key: int(results[i * 2]) for i, key in enumerate(increments)}
+
+    def get_usage(self, keys: list[str]) -> dict[str, int]:
+        values = self.client.mget(keys)
+        return {key: int(value) if value else 0 for key, value in zip(keys, values)}
+
+
+def create_quota_store() -> MemoryQuotaStore | RedisQuotaStore:
+    """Redis when configured and reachable, otherwise the in-memory stand-in"""
+    redis_url = getattr(settings, "redis_url", None)
+    if redis_url and redis_url != "memory://":
+        try:
+            client = redis.Redis.from_url(redis_url, socket_timeout=2, socket_connect_timeout=2,
+                                          decode_responses=True)
+            client.ping()
+            logger.info("✅ API quota store connected to Redis")
+            return RedisQuotaStore(client)
+        except Exception as e:
+            logger.warning(f"⚠️  API quota store using in-memory fallback (per-worker counts): {e}")
+    return MemoryQuotaStore()
+
+
+class UsageQuotaEngine:
+    """Sliding-window minute limits and write-behind day/month usage per API key"""
+
+    def __init__(self, store: MemoryQuotaStore | RedisQuotaStore | None = None,
+                 window_seconds: int = 60, flush_interval: float | None = None):
+        self.store = store if store is not None else create_quota_store()
+        self.window_seconds = window_seconds
+        self.flush_interval = (
+            settings.api_quota_flush_interval_seconds if flush_interval is None else flush_interval
+        )
+
+        # Per-worker minute windows while the shared store is unreachable
+        self._fallback = MemoryQuotaStore()
+        self._degraded = False
+
+        # Unflushed increments and last known shared totals, keyed by store key
+        self._pending: dict[str, int] = {}
+        self._shared: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._flusher: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    @staticmethod
+    def key_ref(key_id: str) -> str:
+        """Store-key component for an API key (digest, so raw secrets never reach Redis)"""
+        return hashlib.sha256(key_id.encode()).hexdigest()[:32]
+
+    # Minute limit -------------------------------------------------------
+
+    def check_window(self, key_id: str, limit: int) -> WindowDecision:
+        """Count this request against the sliding window; refused requests are not counted"""
+        now = time.time()
+        bucket = int(now // self.window_seconds)
+        elapsed = now - bucket * self.window_seconds
+        weight = 1 - elapsed / self.window_seconds
+        ref = self.key_ref(key_id)
+        args = (f"quota:{ref}:win:{bucket}", f"quota:{ref}:win:{bucket - 1}", limit, weight,
+                self.window_seconds * 2)
+        try:
+            allowed, count = self.store.hit_window(*args)
+            if self._degraded:
+                self._degraded = False
+                logger.info("API quota store recovered, minute limits shared again")
+        except redis.RedisError as e:
+            if not self._degraded:
+                self._degraded = True
+                logger.warning(f"API quota store unavailable, enforcing minute limits per worker: {e}")
+            allowed, count = self._fallback.hit_window(*args)
+        return WindowDecision(allowed, limit, count, (bucket + 1) * self.window_seconds)
+
+    async def check_window_async(self, key_id: str, limit: int) -> WindowDecision:
+        """check_window for async callers: the Redis round trip runs in a worker thread"""
+        if self.store.backend == "memory":
+            return self.check_window(key_id, limit)
+        return await asyncio.to_thread(self.check_window, key_id, limit)
+
+    # Day / month quotas -------------------------------------------------
+
+    @classmethod
+    def _usage_keys(cls, key_id: str, now: datetime) -> tuple[str, str]:
+        ref = cls.key_ref(key_id)
+        return f"quota:{ref}:day:{now:%Y%m%d}", f"quota:{ref}:month:{now:%Y%m}"
+
+    def record_usage(self, key_id: str) -> UsageSnapshot:
+        """Buffer one request against the day and month counters"""
+        day_key, month_key = self._usage_keys(key_id, datetime.now())
+        with self._lock:
+            self._pending[day_key] = self._pending.get(day_key, 0) + 1
+            self._pending[month_key] = self._pending.get(month_key, 0) + 1
+            snapshot = UsageSnapshot(
+                day=self._shared.get(day_key, 0) + self._pending[day_key],
+                month=self._shared.get(month_key, 0) + self._pending[month_key],
+            )
+        self._ensure_flusher()
+        return snapshot
+
+    def usage(self, key_id: str) -> UsageSnapshot:
+        """Current day/month usage read from the shared store plus unflushed local counts"""
+        day_key, month_key = self._usage_keys(key_id, datetime.now())
+        try:
+            shared = self.store.get_usage([day_key, month_key])
+        except redis.RedisError as e:
+            logger.warning(f"API quota store unavailable, reporting last known usage: {e}")
+            with self._lock:
+                shared = {key: self._shared.get(key, 0) for key in (day_key, month_key)}
+        with self._lock:
+            self._shared.update(shared)
+            return UsageSnapshot(
+                day=shared[day_key] + self._pending.get(day_key, 0),
+                month=shared[month_key] + self._pending.get(month_key, 0),
+            )
+
+    def flush(self) -> None:
+        """Push buffered increments to the shared store in one batch"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        ttls = {key: DAY_TTL_SECONDS if ":day:" in key else MONTH_TTL_SECONDS for key in pending}
+        try:
+            totals = self.store.add_usage(pending, ttls)
+        except Exception as e:
+            logger.warning(f"API quota flush failed, will retry: {e}")
+            with self._lock:
+                for key, amount in pending.items():
+                    self._pending[key] = self._pending.get(key, 0) + amount
+            return
+        now = datetime.now()
+        current = (f":day:{now:%Y%m%d}", f":month:{now:%Y%m}")
+        with self._lock:
+            # Only current-period totals are read again; past days and months are dropped
+            self._shared = {
+                key: total for key, total in {**self._shared, **totals}.items() if key.endswith(current)
+            }
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is not None:
+            return
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, name="api-quota-flush", daemon=True)
+                self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def close(self) -> None:
+        """Stop the background flusher after a final flush"""
+        self._stop.set()
+        self.flush()
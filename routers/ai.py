@@ -70,7 +70,7 @@ async def enhance_search_query(request: SearchEnhancementRequest):
             filters={"ai_enhanced": True}
         )
 
-        result = openai_service.enhance_search_query(
+        result = await openai_service.enhance_search_query(
             query=request.query,
             user_context=request.user_context
         )
@@ -109,7 +109,7 @@ async def get_search_suggestions(
         return {"suggestions": fallback_suggestions[:limit]}
 
     try:
-        suggestions = openai_service.generate_search_suggestions(
+        suggestions = await openai_service.generate_search_suggestions(
             partial_query=partial_query
         )
 
@@ -135,7 +135,7 @@ async def analyze_eligibility_match(request: EligibilityAnalysisRequest):
 
     try:
         # Get scholarship data
-        scholarship = scholarship_service.get_scholarship_by_id(request.scholarship_id)
+        scholarship = await scholarship_service.get_scholarship_by_id_async(request.scholarship_id)
         if not scholarship:
             raise HTTPException(status_code=404, detail="Scholarship not found")
 
@@ -143,7 +143,7 @@ async def analyze_eligibility_match(request: EligibilityAnalysisRequest):
         scholarship_dict = scholarship.model_dump() if hasattr(scholarship, 'model_dump') else scholarship.__dict__
 
         # Perform AI analysis
-        analysis = openai_service.analyze_eligibility_match(
+        analysis = await openai_service.analyze_eligibility_match(
             user_profile=request.user_profile,
             scholarship=scholarship_dict
         )
@@ -172,7 +172,7 @@ async def get_ai_scholarship_summary(scholarship_id: str):
     """
     try:
         # Get scholarship data
-        scholarship = scholarship_service.get_scholarship_by_id(scholarship_id)
+        scholarship = await scholarship_service.get_scholarship_by_id_async(scholarship_id)
         if not scholarship:
             raise HTTPException(status_code=404, detail="Scholarship not found")
 
@@ -180,7 +180,7 @@ async def get_ai_scholarship_summary(scholarship_id: str):
         scholarship_dict = scholarship.model_dump() if hasattr(scholarship, 'model_dump') else scholarship.__dict__
 
         if openai_service.is_available():
-            summary = openai_service.generate_scholarship_summary(scholarship_dict)
+            summary = await openai_service.generate_scholarship_summary(scholarship_dict)
         else:
             # Fallback to truncated description
             summary = scholarship_dict.get("description", "No description available")[:200] + "..."
@@ -215,7 +215,7 @@ async def get_scholarship_trends():
         # Get current scholarships for analysis
         from models.scholarship import SearchFilters
         filters = SearchFilters(limit=50, offset=0)
-        search_result = scholarship_service.search_scholarships(filters)
+        search_result = await scholarship_service.search_scholarships_async(filters)
 
         scholarships = search_result.scholarships if hasattr(search_result, 'scholarships') else []
 
@@ -228,7 +228,7 @@ async def get_scholarship_trends():
                 scholarship_dicts.append(scholarship.__dict__)
 
         # Perform AI analysis
-        trends = openai_service.analyze_scholarship_trends(scholarship_dicts)
+        trends = await openai_service.analyze_scholarship_trends(scholarship_dicts)
 
         return {
             "analysis_date": "2025-08-17",
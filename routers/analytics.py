@@ -1,5 +1,4 @@
 
-import uuid
 from datetime import datetime
 from typing import Any, Optional
 
@@ -9,6 +8,7 @@ from pydantic import BaseModel, Field
 from database.session_manager import get_session
 from middleware.auth import User, require_admin
 from services.analytics_service import analytics_service
+from services.analytics_writer import SearchAnalyticsRecord, analytics_writer
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -39,44 +39,21 @@ async def record_search_event(
     Record a search event for analytics tracking.
     
     This endpoint enables frontend tracking of search intent and behavior.
-    Writes directly to the search_analytics table for funnel analysis.
+    Rows reach the search_analytics table through the write-behind
+    analytics writer (services/analytics_writer.py) for funnel analysis.
     """
     try:
-        from sqlalchemy import text
-        db = get_session()
-        
-        event_id = str(uuid.uuid4())
-        timestamp = datetime.utcnow()
-        user_agent = request.headers.get("user-agent", "")[:255]
-        ip_address = request.client.host if request.client else None
-        
-        import json as json_lib
-        filters_json = json_lib.dumps(event.filters) if event.filters else "{}"
-        
-        insert_query = text("""
-            INSERT INTO search_analytics 
-            (id, search_query, filters_applied, results_count, user_id, 
-             response_time_ms, session_id, user_agent, ip_address, timestamp)
-            VALUES 
-            (:id, :query, CAST(:filters AS json), :result_count, :user_id,
-             :response_time_ms, :session_id, :user_agent, :ip_address, :timestamp)
-        """)
-        
-        db.execute(insert_query, {
-            "id": event_id,
-            "query": event.query,
-            "filters": filters_json,
-            "result_count": event.result_count,
-            "user_id": event.user_id,
-            "response_time_ms": event.response_time_ms,
-            "session_id": event.session_id,
-            "user_agent": user_agent,
-            "ip_address": ip_address,
-            "timestamp": timestamp
-        })
-        db.commit()
-        db.close()
-        
+        event_id = analytics_writer.enqueue(SearchAnalyticsRecord(
+            search_query=event.query,
+            filters_applied=event.filters or {},
+            results_count=event.result_count,
+            user_id=event.user_id,
+            response_time_ms=event.response_time_ms,
+            session_id=event.session_id,
+            user_agent=request.headers.get("user-agent", "")[:255],
+            ip_address=request.client.host if request.client else None
+        ))
+
         logger.info(f"Search event recorded: {event_id} | query='{event.query}' | results={event.result_count}")
         
         return SearchEventResponse(
@@ -139,17 +116,7 @@ async def get_recent_interactions(
     by interaction type (search, view_scholarship, etc.).
     """
     try:
-        interactions = analytics_service.interactions
-
-        # Filter by action if specified
-        if action:
-            interactions = [i for i in interactions if i.action == action]
-
-        # Sort by timestamp (most recent first)
-        interactions.sort(key=lambda x: x.timestamp, reverse=True)
-
-        # Apply limit
-        interactions = interactions[:limit]
+        interactions = analytics_service.get_recent_interactions(limit, action)
 
         # Convert to dict format for JSON response
         interaction_dicts = []
@@ -185,29 +152,16 @@ async def get_popular_scholarships(
     the specified time period.
     """
     try:
-        from collections import Counter
-        from datetime import datetime, timedelta
-
         from services.scholarship_service import scholarship_service
 
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
-
-        # Get scholarship views within time period
-        scholarship_views = [
-            i for i in analytics_service.interactions
-            if (i.action == "view_scholarship" and
-                i.scholarship_id and
-                i.timestamp >= cutoff_date)
-        ]
-
-        # Count views per scholarship
-        view_counts = Counter(i.scholarship_id for i in scholarship_views)
+        # Views per scholarship from the per-minute buckets
+        view_counts = analytics_service.get_popular_scholarships(days)
 
         # Get top scholarships with details
         popular_scholarships = []
         for scholarship_id, view_count in view_counts.most_common(limit):
             if scholarship_id:  # Check if scholarship_id is not None
-                scholarship = scholarship_service.get_scholarship_by_id(scholarship_id)
+                scholarship = await scholarship_service.get_scholarship_by_id_async(scholarship_id)
                 if scholarship:
                     popular_scholarships.append({
                         "scholarship": {
@@ -225,7 +179,7 @@ async def get_popular_scholarships(
         return {
             "period_days": days,
             "popular_scholarships": popular_scholarships,
-            "total_scholarship_views": len(scholarship_views),
+            "total_scholarship_views": sum(view_counts.values()),
             "unique_scholarships_viewed": len(view_counts)
         }
 
@@ -244,61 +198,22 @@ async def get_search_trends(
     to identify trends in user behavior.
     """
     try:
-        from collections import Counter
-        from datetime import datetime, timedelta
-
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
-
-        # Get search interactions within time period
-        search_interactions = [
-            i for i in analytics_service.interactions
-            if (i.action == "search" and i.timestamp >= cutoff_date)
-        ]
-
-        # Analyze search queries
-        search_queries = []
-        zero_result_searches = 0
-        total_results = 0
-
-        for interaction in search_interactions:
-            if interaction.metadata:
-                query = interaction.metadata.get("query", "").strip()
-                result_count = interaction.metadata.get("result_count", 0)
-
-                if query:  # Non-empty query
-                    search_queries.append(query.lower())
-
-                if result_count == 0:
-                    zero_result_searches += 1
-
-                total_results += result_count
-
-        # Calculate metrics
-        popular_queries = dict(Counter(search_queries).most_common(15))
-        avg_results_per_search = total_results / len(search_interactions) if search_interactions else 0
-        zero_result_rate = zero_result_searches / len(search_interactions) if search_interactions else 0
-
-        # Analyze search filters usage (simplified)
-        filter_usage = Counter()
-        for interaction in search_interactions:
-            if interaction.metadata and "filters" in interaction.metadata:
-                filters = interaction.metadata["filters"]
-                for key, value in filters.items():
-                    if value and key != "limit" and key != "offset":  # Skip pagination params
-                        if isinstance(value, list) and value or not isinstance(value, list) and value is not None:
-                            filter_usage[key] += 1
+        trends = analytics_service.get_search_trends(days)
+        popular_queries = trends["popular_queries"]
+        avg_results_per_search = trends["avg_results_per_search"]
+        zero_result_rate = trends["zero_result_rate"]
 
         return {
             "period_days": days,
             "search_statistics": {
-                "total_searches": len(search_interactions),
-                "unique_queries": len(set(search_queries)),
+                "total_searches": trends["total_searches"],
+                "unique_queries": trends["unique_queries"],
                 "avg_results_per_search": round(avg_results_per_search, 2),
                 "zero_result_rate": round(zero_result_rate, 2),
-                "zero_result_searches": zero_result_searches
+                "zero_result_searches": trends["zero_result_searches"]
             },
             "popular_queries": popular_queries,
-            "filter_usage": dict(filter_usage.most_common(10)),
+            "filter_usage": trends["filter_usage"],
             "search_quality_insights": [
                 f"{zero_result_rate:.1%} of searches returned no results" if zero_result_rate > 0 else "All searches returned results",
                 f"Average of {avg_results_per_search:.1f} results per search",
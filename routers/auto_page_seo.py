@@ -6,11 +6,19 @@ import json
 import logging
 from typing import Any, List, Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from datetime import datetime
+
+from fastapi import APIRouter, HTTPException, Path, Query, Request
 from fastapi.responses import HTMLResponse, Response
 from pydantic import BaseModel, Field
 
+from config.settings import settings
 from production.auto_page_maker_seo import seo_service
+from services.prerender_store import XML_MEDIA_TYPE, content_hash, prerender_store
+
+# Pages generated for /seo/sitemap.xml
+SITEMAP_PAGE_COUNT = 100
+SITEMAP_INDEX_KEY = "/seo/sitemap.xml"
 
 logger = logging.getLogger(__name__)
 
@@ -218,30 +226,98 @@ async def get_seo_page_details(page_id: str) -> dict[str, Any]:
         logger.error(f"❌ SEO page details error: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get page details: {str(e)}")
 
+def _sitemap_source(key: str) -> dict[str, Any]:
+    """
+    Everything one sitemap file is rendered from; its hash is that file's content
+    version. The file key is part of it, so validators never match across files
+    and a shard that does not exist is never answered with 304
+    """
+    return {
+        "scholarships": seo_service.sample_scholarships,
+        "pages": SITEMAP_PAGE_COUNT,
+        "max_urls": settings.seo_sitemap_max_urls,
+        "file": key,
+    }
+
+
+def _sitemap_shard_key(number: int) -> str:
+    return f"/seo/sitemap-{number}.xml"
+
+
+def _render_sitemaps() -> dict[str, str]:
+    """
+    Render the sitemap for this content version and store every file it consists of:
+    a single urlset, or a sitemap index plus one shard per seo_sitemap_max_urls pages
+    """
+    pages = seo_service.generate_bulk_seo_pages(SITEMAP_PAGE_COUNT)
+    lastmod = datetime.now()
+    max_urls = settings.seo_sitemap_max_urls
+    if len(pages) <= max_urls:
+        documents = {SITEMAP_INDEX_KEY: seo_service.generate_sitemap(pages, lastmod)}
+    else:
+        shards = [pages[i:i + max_urls] for i in range(0, len(pages), max_urls)]
+        documents = {
+            _sitemap_shard_key(number): seo_service.generate_sitemap(shard, lastmod)
+            for number, shard in enumerate(shards, start=1)
+        }
+        documents[SITEMAP_INDEX_KEY] = seo_service.generate_sitemap_index(
+            [f"{seo_service.base_domain}{key}" for key in documents], lastmod
+        )
+    for key, xml in documents.items():
+        prerender_store.put(key, content_hash(_sitemap_source(key)), xml, XML_MEDIA_TYPE)
+    version = content_hash(_sitemap_source(SITEMAP_INDEX_KEY))
+    logger.info(f"🗺️ Rendered sitemap version {version[:8]}: {len(pages)} URLs in {len(documents)} file(s)")
+    return documents
+
+
+def _serve_sitemap(request: Request, key: str) -> Response:
+    def render() -> str:
+        documents = _render_sitemaps()
+        if key not in documents:
+            raise HTTPException(status_code=404, detail="Sitemap not found")
+        return documents[key]
+
+    return prerender_store.respond(request, key, _sitemap_source(key), render, XML_MEDIA_TYPE)
+
+
 @router.get("/sitemap.xml", response_class=Response)
-async def get_sitemap() -> Response:
+async def get_sitemap(request: Request) -> Response:
     """
     🗺️ GENERATE XML SITEMAP
     Executive directive: Search engine discoverability for all SEO pages
 
+    Rendered once per scholarship content version and served precompressed with
+    a strong ETag; past seo_sitemap_max_urls pages this is a sitemap index over
+    /seo/sitemap-{n}.xml shards.
+
     Returns:
-        XML sitemap with all generated pages
+        XML sitemap (or sitemap index) with all generated pages
     """
     try:
-        # Generate a sample set of pages for sitemap
-        pages = seo_service.generate_bulk_seo_pages(100)  # Larger set for comprehensive sitemap
-        sitemap_xml = seo_service.generate_sitemap(pages)
-
-        return Response(
-            content=sitemap_xml,
-            media_type="application/xml",
-            headers={"Content-Type": "application/xml"}
-        )
+        return _serve_sitemap(request, SITEMAP_INDEX_KEY)
 
     except Exception as e:
         logger.error(f"❌ Sitemap generation error: {e}")
         raise HTTPException(status_code=500, detail="Failed to generate sitemap")
 
+@router.get("/sitemap-{number}.xml", response_class=Response)
+async def get_sitemap_shard(
+    request: Request,
+    number: int = Path(..., ge=1, description="Shard number from the sitemap index")
+) -> Response:
+    """
+    🗺️ SITEMAP SHARD
+    One urlset file of a sharded sitemap (listed in /seo/sitemap.xml)
+    """
+    try:
+        return _serve_sitemap(request, _sitemap_shard_key(number))
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Sitemap shard {number} error: {e}")
+        raise HTTPException(status_code=500, detail="Failed to generate sitemap")
+
 @router.get("/templates")
 async def get_seo_templates() -> dict[str, Any]:
     """
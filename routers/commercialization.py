@@ -220,7 +220,7 @@ async def get_usage_details(
             )
 
         # Check rate limits to get current usage
-        usage_info = commercialization_service.check_rate_limits(x_api_key, "usage_check")
+        usage_info = await commercialization_service.check_rate_limits_async(x_api_key, "usage_check")
 
         if not usage_info["allowed"] and usage_info.get("reason") == "invalid_api_key":
             raise HTTPException(
@@ -13,14 +13,15 @@ from schemas.eligibility import (
     GradeLevelEnum,
     StateEnum,
 )
+from services.eligibility_engine import eligibility_engine
+from models.async_database import request_db_session
 from services.eligibility_service import eligibility_service
-from services.scholarship_service import scholarship_service
 
 # from routers.interaction_wrapper import log_interaction  # Will implement if needed
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(request_db_session)])
 
 async def execute_eligibility_check(
     gpa: float | None = None,
@@ -59,11 +60,10 @@ async def execute_eligibility_check(
 
         # If no specific scholarship IDs provided, check against all scholarships
         if not scholarship_ids:
-            all_scholarships = scholarship_service.get_all_scholarships()
-            scholarship_ids = [s.id for s in all_scholarships]
+            scholarship_ids = [s.id for s in (await eligibility_engine.catalog_async()).scholarships]
 
         # Perform eligibility check for each scholarship
-        results = eligibility_service.check_multiple_eligibilities(user_profile, scholarship_ids)
+        results = await eligibility_service.check_multiple_eligibilities_async(user_profile, scholarship_ids)
 
         # Count eligible scholarships
         eligible_count = sum(1 for result in results if result.eligible)
@@ -299,11 +299,13 @@ async def canary_check(request: Request, db: Session = Depends(get_db)):
     ]
     
     # Verify middleware is installed (real detection)
+    from middleware.header_pipeline import HeaderPipelineMiddleware
     from middleware.security_headers import SecurityHeadersMiddleware
+    security_classes = (SecurityHeadersMiddleware, HeaderPipelineMiddleware)
     app = request.app
     security_middleware_installed = any(
-        isinstance(middleware, SecurityHeadersMiddleware) 
-        or (hasattr(middleware, 'cls') and middleware.cls == SecurityHeadersMiddleware)
+        isinstance(middleware, security_classes)
+        or getattr(middleware, 'cls', None) in security_classes
         for middleware in getattr(app, 'user_middleware', [])
     )
     
@@ -376,11 +378,13 @@ async def canary_check_no_cache(request: Request, response: Response, db: Sessio
     ]
     
     # Verify middleware is installed (real detection)
+    from middleware.header_pipeline import HeaderPipelineMiddleware
     from middleware.security_headers import SecurityHeadersMiddleware
+    security_classes = (SecurityHeadersMiddleware, HeaderPipelineMiddleware)
     app = request.app
     security_middleware_installed = any(
-        isinstance(middleware, SecurityHeadersMiddleware) 
-        or (hasattr(middleware, 'cls') and middleware.cls == SecurityHeadersMiddleware)
+        isinstance(middleware, security_classes)
+        or getattr(middleware, 'cls', None) in security_classes
         for middleware in getattr(app, 'user_middleware', [])
     )
     
@@ -6,11 +6,9 @@ import time
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPBearer
-from sqlalchemy.orm import Session
 
 from config.settings import settings
 from middleware.auth import get_current_user
-from models.database import get_db
 from schemas.interaction import (
     BulkInteractionRequest,
     InteractionRequest,
@@ -32,29 +30,22 @@ async def log_scholarship_interaction(
 ):
     """Wrapper to log interactions without breaking the main request flow"""
     try:
-        # Get database session
-        db = next(get_db())
-
-        try:
-            # Create interaction service
-            interaction_service = InteractionService(db)
-
-            # Extract user ID from request if not provided
-            if not user_id and hasattr(request.state, 'user'):
-                user_id = getattr(request.state.user, 'user_id', None)
-
-            # Log the interaction
-            await interaction_service.log_interaction(
-                event_type=event_type,
-                request=request,
-                response=response,
-                user_id=user_id,
-                scholarship_id=scholarship_id,
-                trace_id=getattr(request.state, 'trace_id', None)
-            )
-
-        finally:
-            db.close()
+        # Write-behind: no database session is opened on the request path
+        interaction_service = InteractionService()
+
+        # Extract user ID from request if not provided
+        if not user_id and hasattr(request.state, 'user'):
+            user_id = getattr(request.state.user, 'user_id', None)
+
+        # Log the interaction
+        await interaction_service.log_interaction(
+            event_type=event_type,
+            request=request,
+            response=response,
+            user_id=user_id,
+            scholarship_id=scholarship_id,
+            trace_id=getattr(request.state, 'trace_id', None)
+        )
 
     except Exception as e:
         # Never let interaction logging break the main request
@@ -101,7 +92,6 @@ def with_interaction_logging(event_type: str, scholarship_id_param: str | None =
 async def log_interaction_endpoint(
     interaction: InteractionRequest,
     request: Request,
-    db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user) if not settings.public_read_endpoints else None
 ):
     """
@@ -109,7 +99,7 @@ async def log_interaction_endpoint(
     Requires authentication unless PUBLIC_READ_ENDPOINTS is enabled
     """
     try:
-        interaction_service = InteractionService(db)
+        interaction_service = InteractionService()
 
         # Create mock response for logging
         mock_response = type('MockResponse', (), {'status_code': 200})()
@@ -146,7 +136,6 @@ async def log_interaction_endpoint(
 async def bulk_log_interactions_endpoint(
     bulk_request: BulkInteractionRequest,
     request: Request,
-    db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user) if not settings.public_read_endpoints else None
 ):
     """
@@ -154,7 +143,7 @@ async def bulk_log_interactions_endpoint(
     Requires authentication unless PUBLIC_READ_ENDPOINTS is enabled
     """
     try:
-        interaction_service = InteractionService(db)
+        interaction_service = InteractionService()
         logged_count = 0
         errors = []
 
@@ -412,6 +412,9 @@ async def create_scholarship(
             }
         )
         db.commit()
+
+        from services.scholarship_service import scholarship_service
+        scholarship_service.invalidate_caches()
         
         logger.info(f"Scholarship created: {scholarship_id} by provider {request.provider_id}")
         
@@ -71,16 +71,12 @@ async def predict_scholarship_matches(
     **Credit Cost:** 3.0 credits per matching request
     """
     try:
-        # Get scholarships
+        # Get scholarships (one query either way)
         if match_request.scholarship_ids:
-            scholarships = []
-            for s_id in match_request.scholarship_ids:
-                scholarship = scholarship_service.get_scholarship_by_id(s_id)
-                if scholarship:
-                    scholarships.append(scholarship)
+            scholarships = await scholarship_service.get_scholarships_by_ids_async(match_request.scholarship_ids)
         else:
             # Use all active scholarships
-            all_scholarships = scholarship_service.get_all_scholarships()
+            all_scholarships = await scholarship_service.get_all_scholarships_async()
             scholarships = all_scholarships[:100]  # Limit to prevent timeouts
         
         if not scholarships:
@@ -136,7 +132,7 @@ async def get_quick_wins(
     """
     try:
         # Get all scholarships
-        all_scholarships = scholarship_service.get_all_scholarships()
+        all_scholarships = await scholarship_service.get_all_scholarships_async()
         
         # Run quick analysis
         result = await predictive_service.predict_scholarship_matches(
@@ -184,7 +180,7 @@ async def get_stretch_opportunities(
     """
     try:
         # Get all scholarships
-        all_scholarships = scholarship_service.get_all_scholarships()
+        all_scholarships = await scholarship_service.get_all_scholarships_async()
         
         # Run standard analysis
         result = await predictive_service.predict_scholarship_matches(
@@ -222,7 +218,7 @@ async def analyze_profile_strength(
     """
     try:
         # Run quick analysis to get profile insights
-        all_scholarships = scholarship_service.get_all_scholarships()
+        all_scholarships = await scholarship_service.get_all_scholarships_async()
         
         result = await predictive_service.predict_scholarship_matches(
             user_profile=user_profile,
@@ -1,15 +1,20 @@
 """
 Canonical Scholarship Pages Router
 Serves SEO-optimized scholarship pages at their canonical URLs for search engine indexing.
+
+Pages are rendered once per content version through the prerender store
+(services/prerender_store.py): the scholarships a page is built from are hashed
+into its ETag, so repeat and conditional crawler requests skip rendering.
 """
 import json
 import logging
 import re
 
-from fastapi import APIRouter, HTTPException, Path
-from fastapi.responses import HTMLResponse
+from fastapi import APIRouter, HTTPException, Path, Request
+from fastapi.responses import HTMLResponse, Response
 
 from production.auto_page_maker_seo import ScholarshipPage, seo_service
+from services.prerender_store import prerender_store
 
 logger = logging.getLogger(__name__)
 
@@ -264,8 +269,9 @@ def render_scholarship_page_html(page: ScholarshipPage) -> str:
 
 @router.get("/scholarships/{slug_and_id}", response_class=HTMLResponse)
 async def get_scholarship_detail_page(
+    request: Request,
     slug_and_id: str = Path(..., description="URL slug and ID in format: slug-sch_id_123")
-) -> HTMLResponse:
+) -> Response:
     """
     🎯 SERVE CANONICAL SCHOLARSHIP DETAIL PAGE
 
@@ -310,14 +316,14 @@ async def get_scholarship_detail_page(
             logger.warning(f"Scholarship not found for ID: {scholarship_id}")
             raise HTTPException(status_code=404, detail="Scholarship not found")
 
-        # Generate the scholarship page
-        page = seo_service.generate_scholarship_detail_page(scholarship)
-
-        # Render to HTML
-        html_content = render_scholarship_page_html(page)
+        # Generate and render the page only if this scholarship version is new
+        response = prerender_store.respond(
+            request, request.url.path, scholarship,
+            lambda: render_scholarship_page_html(seo_service.generate_scholarship_detail_page(scholarship))
+        )
 
         logger.info(f"✅ Served scholarship page: {scholarship_id}")
-        return HTMLResponse(content=html_content, status_code=200)
+        return response
 
     except HTTPException:
         raise
@@ -327,8 +333,9 @@ async def get_scholarship_detail_page(
 
 @router.get("/scholarships/category/{category}", response_class=HTMLResponse)
 async def get_category_listing_page(
+    request: Request,
     category: str = Path(..., description="Category name (e.g., engineering, computer-science)")
-) -> HTMLResponse:
+) -> Response:
     """
     📂 SERVE CANONICAL CATEGORY LISTING PAGE
 
@@ -358,18 +365,23 @@ async def get_category_listing_page(
                     category_scholarships.append(s)
 
         # Fallback to all scholarships if none found
-        if not category_scholarships:
+        matched = bool(category_scholarships)
+        if not matched:
             category_scholarships = seo_service.sample_scholarships[:3]
             category_name = category.replace('-', ' ').title()
 
-        # Generate the category page
-        page = seo_service.generate_category_listing_page(category_name, category_scholarships)
-
-        # Render to HTML
-        html_content = render_scholarship_page_html(page)
+        # Generate and render the page only if its scholarships changed; fallback pages
+        # exist for any category in the URL, so they are compressed cheaply
+        response = prerender_store.respond(
+            request, request.url.path, [category_name, category_scholarships],
+            lambda: render_scholarship_page_html(
+                seo_service.generate_category_listing_page(category_name, category_scholarships)
+            ),
+            max_compression=matched
+        )
 
         logger.info(f"✅ Served category page: {category}")
-        return HTMLResponse(content=html_content, status_code=200)
+        return response
 
     except Exception as e:
         logger.error(f"❌ Error serving category page {category}: {e}")
@@ -377,8 +389,9 @@ async def get_category_listing_page(
 
 @router.get("/scholarships/amount/{amount_range}", response_class=HTMLResponse)
 async def get_amount_range_page(
+    request: Request,
     amount_range: str = Path(..., description="Amount range in format: min-max (e.g., 5000-10000)")
-) -> HTMLResponse:
+) -> Response:
     """
     💰 SERVE CANONICAL AMOUNT RANGE PAGE
 
@@ -409,20 +422,25 @@ async def get_amount_range_page(
                 range_scholarships.append(s)
 
         # If no scholarships in exact range, find closest ones
-        if not range_scholarships:
+        matched = bool(range_scholarships)
+        if not matched:
             # Get scholarships closest to the range
             all_scholarships = sorted(seo_service.sample_scholarships,
                                     key=lambda x: abs(x["amount"] - (min_amount + max_amount) / 2))
             range_scholarships = all_scholarships[:3]
 
-        # Generate the amount range page
-        page = seo_service.generate_amount_range_page(min_amount, max_amount, range_scholarships)
-
-        # Render to HTML
-        html_content = render_scholarship_page_html(page)
+        # Generate and render the page only if its scholarships changed; fallback pages
+        # exist for any range in the URL, so they are compressed cheaply
+        response = prerender_store.respond(
+            request, request.url.path, [min_amount, max_amount, range_scholarships],
+            lambda: render_scholarship_page_html(
+                seo_service.generate_amount_range_page(min_amount, max_amount, range_scholarships)
+            ),
+            max_compression=matched
+        )
 
         logger.info(f"✅ Served amount range page: {amount_range}")
-        return HTMLResponse(content=html_content, status_code=200)
+        return response
 
     except HTTPException:
         raise
@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel
 
 from middleware.auth import User, optional_auth, require_auth
+from models.async_database import request_db_session
 from middleware.enhanced_rate_limiting import general_rate_limit, search_rate_limit
 from models.scholarship import (
     FieldOfStudy,
@@ -31,7 +32,7 @@ from services.event_emission import EventEmissionService
 from utils.etag import generate_etag, etag_matches
 
 logger = get_logger(__name__)
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(request_db_session)])
 
 event_emitter = EventEmissionService()
 
@@ -99,20 +100,16 @@ async def search_scholarships(
             offset=offset
         )
 
-        # Log search interaction
+        result = await scholarship_service.search_scholarships_async(filters)
+
+        # Log search interaction with the actual result count
         analytics_service.log_search(
             user_id=user_id,
             query=keyword or "",
-            result_count=0,
-            filters=filters.model_dump()
+            result_count=result.total_count,
+            filters=filters.model_dump(mode="json")
         )
 
-        result = scholarship_service.search_scholarships(filters)
-
-        # Update analytics
-        if analytics_service.interactions:
-            analytics_service.interactions[-1].metadata["result_count"] = result.total_count
-
         # CEO v2.3: Generate ETag and check If-None-Match
         etag = generate_etag(result)
         if_none_match = request.headers.get("If-None-Match")
@@ -179,20 +176,16 @@ async def smart_search_scholarships(
             offset=offset
         )
 
-        # Log search interaction
+        result = await search_service.search_with_smart_suggestions_async(filters)
+
+        # Log search interaction with the actual result count
         analytics_service.log_search(
             user_id=user_id,
             query=keyword or "",
-            result_count=0,
-            filters=filters.model_dump()
+            result_count=result["results"].total_count,
+            filters=filters.model_dump(mode="json")
         )
 
-        result = search_service.search_with_smart_suggestions(filters)
-
-        # Update analytics
-        if analytics_service.interactions:
-            analytics_service.interactions[-1].metadata["result_count"] = result["results"].total_count
-
         return result
 
     except Exception as e:
@@ -241,7 +234,7 @@ async def get_public_scholarships(
             offset=offset
         )
         
-        result = scholarship_service.search_scholarships(filters)
+        result = await scholarship_service.search_scholarships_async(filters)
         
         tag_list = []
         if tags:
@@ -310,7 +303,7 @@ async def get_scholarship(
     - Rate limit: 600 rpm per origin
     """
     try:
-        scholarship = scholarship_service.get_scholarship_by_id(scholarship_id)
+        scholarship = await scholarship_service.get_scholarship_by_id_async(scholarship_id)
 
         if not scholarship:
             raise HTTPException(
@@ -399,7 +392,7 @@ async def save_scholarship(
         session_id = extract_session_id(request)
         actor_id = extract_actor_id(request) or current_user.user_id if current_user else None
         
-        scholarship = scholarship_service.get_scholarship_by_id(scholarship_id)
+        scholarship = await scholarship_service.get_scholarship_by_id_async(scholarship_id)
         if not scholarship:
             raise HTTPException(
                 status_code=404,
@@ -440,7 +433,7 @@ async def check_eligibility(eligibility_request: EligibilityCheck):
     and provides detailed feedback on eligibility status.
     """
     try:
-        result = eligibility_service.check_eligibility(
+        result = await eligibility_service.check_eligibility_async(
             eligibility_request.user_profile,
             eligibility_request.scholarship_id
         )
@@ -477,7 +470,7 @@ async def bulk_eligibility_check(
                 detail="Maximum of 50 scholarships can be checked at once"
             )
 
-        results = eligibility_service.check_multiple_eligibilities(
+        results = await eligibility_service.check_multiple_eligibilities_async(
             user_profile, scholarship_ids
         )
 
@@ -507,7 +500,7 @@ async def get_recommendations(request: RecommendationRequest):
     tailored scholarship recommendations with eligibility scoring.
     """
     try:
-        recommendations = search_service.get_recommendations(request)
+        recommendations = await search_service.get_recommendations_async(request)
 
         # Log recommendation request
         analytics_service.log_recommendation_request(
@@ -606,7 +599,7 @@ async def get_scholarships_by_field(
             offset=0
         )
 
-        result = scholarship_service.search_scholarships(filters)
+        result = await scholarship_service.search_scholarships_async(filters)
 
         return {
             "field_of_study": field_of_study,
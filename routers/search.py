@@ -2,14 +2,13 @@ import time
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, Query, Request
-from sqlalchemy.orm import Session
 
 from middleware.auth import User, optional_auth, require_auth
 from middleware.simple_rate_limiter import search_rate_limit
-from models.database import get_db
+from models.async_database import request_db_session
 from models.scholarship import FieldOfStudy, ScholarshipType, SearchFilters
 from services.analytics_service import analytics_service
-from services.database_service import DatabaseService
+from services.analytics_writer import SearchAnalyticsRecord, analytics_writer
 from services.scholarship_service import scholarship_service
 from services.hybrid_search_service import (
     hybrid_search_service,
@@ -20,7 +19,7 @@ from services.hybrid_search_service import (
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(request_db_session)])
 
 # Pydantic models for search requests
 from pydantic import BaseModel
@@ -56,7 +55,6 @@ async def execute_search(
     limit: int = 20,
     offset: int = 0,
     user_id: str | None = None,
-    db: Session | None = None,
     request: Request | None = None
 ) -> dict:
     """Execute search logic shared between GET and POST endpoints"""
@@ -84,41 +82,35 @@ async def execute_search(
             offset=offset
         )
 
-        # Log search interaction
+        result = await scholarship_service.search_scholarships_async(filters)
+
+        # Log search interaction with the actual result count
         analytics_service.log_search(
             user_id=user_id,
             query=keyword or "",
-            result_count=0,  # Will be updated after search
-            filters=filters.model_dump()
+            result_count=result.total_count,
+            filters=filters.model_dump(mode="json"),
+            persisted=True  # written to search_analytics below
         )
 
-        result = scholarship_service.search_scholarships(filters)
-
-        # Update analytics with actual result count
-        if analytics_service.interactions:
-            analytics_service.interactions[-1].metadata["result_count"] = result.total_count
-
         # Calculate processing time
         took_ms = int((time.time() - start_time) * 1000)
 
-        # Log to database for persistent search analytics (P0 Revenue Unblock)
-        if db:
-            try:
-                db_service = DatabaseService(db)
-                user_agent = request.headers.get("user-agent") if request else None
-                client_ip = request.client.host if request and request.client else None
-                db_service.log_search_analytics(
-                    search_query=keyword,
-                    filters_applied=filters.model_dump(),
-                    results_count=result.total_count,
-                    user_id=user_id,
-                    response_time_ms=float(took_ms),
-                    user_agent=user_agent,
-                    ip_address=client_ip
-                )
-                logger.debug(f"Search analytics logged to DB: query='{keyword}', results={result.total_count}")
-            except Exception as db_err:
-                logger.warning(f"Failed to log search analytics to DB: {db_err}")
+        # Persistent search analytics (P0 Revenue Unblock), written behind the request
+        try:
+            user_agent = request.headers.get("user-agent") if request else None
+            client_ip = request.client.host if request and request.client else None
+            analytics_writer.enqueue(SearchAnalyticsRecord(
+                search_query=keyword,
+                filters_applied=filters.model_dump(mode="json"),
+                results_count=result.total_count,
+                user_id=user_id,
+                response_time_ms=float(took_ms),
+                user_agent=user_agent[:500] if user_agent else None,
+                ip_address=client_ip
+            ))
+        except Exception as queue_err:
+            logger.warning(f"Failed to queue search analytics: {queue_err}")
 
         # Return metadata-rich response matching expected format
         return {
@@ -143,7 +135,6 @@ async def search_scholarships_post(
     request: Request,
     request_data: SearchRequest,
     current_user: User = Depends(require_auth()),
-    db: Session = Depends(get_db),
     _rate_limit: bool = Depends(search_rate_limit)
 ):
     """
@@ -168,7 +159,6 @@ async def search_scholarships_post(
         limit=request_data.limit,
         offset=request_data.offset,
         user_id=user_id,
-        db=db,
         request=request
     )
 
@@ -188,8 +178,7 @@ async def search_scholarships_get(
     deadline_before: datetime | None = Query(None, description="Deadlines before this date"),
     limit: int = Query(20, ge=1, le=100, description="Number of results to return"),
     offset: int = Query(0, ge=0, description="Number of results to skip"),
-    current_user: User | None = Depends(optional_auth),
-    db: Session = Depends(get_db)
+    current_user: User | None = Depends(optional_auth)
 ):
     """
     Public search endpoint for scholarship discovery.
@@ -218,7 +207,6 @@ async def search_scholarships_get(
         limit=limit,
         offset=offset,
         user_id=user_id,
-        db=db,
         request=request
     )
 
@@ -276,7 +264,7 @@ async def hybrid_search_scholarships(
         offset=request_data.offset
     )
     
-    result = hybrid_search_service.search_with_hard_filters(filters)
+    result = await hybrid_search_service.search_with_hard_filters_async(filters)
     
     logger.info(
         f"Hybrid search: {result.total_count} results, "
@@ -338,7 +326,7 @@ async def hybrid_search_public(
         offset=offset
     )
     
-    result = hybrid_search_service.search_with_hard_filters(filters)
+    result = await hybrid_search_service.search_with_hard_filters_async(filters)
     
     logger.info(
         f"Public hybrid search: {result.total_count} results, "
@@ -8,6 +8,7 @@ Protocol ONE_TRUTH v1.2 (2025-12-01):
 - Emits tile_status_rendered diagnostic after dashboard builds
 - Uses REPORT: prefix on log lines per Master Prompt
 """
+import asyncio
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List, Literal, Union
 from enum import Enum
@@ -22,6 +23,8 @@ from fastapi.responses import JSONResponse
 from sqlalchemy import text
 
 from models.database import get_db
+from services.telemetry_ingest import TelemetryQueueFull, telemetry_ingest_queue
+from services.telemetry_rollups import PAYMENT_EVENTS, telemetry_rollups
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -164,10 +167,23 @@ def normalize_event_keys(event_dict: Dict[str, Any]) -> Dict[str, Any]:
     return normalized
 
 
+def queue_full_response(exc: TelemetryQueueFull) -> JSONResponse:
+    """429 with Retry-After when the ingestion queue cannot take the batch"""
+    logger.warning("REPORT: app=scholarship_api | env=prod | TELEMETRY INGEST: queue full, batch refused (HTTP 429)")
+    return JSONResponse(
+        status_code=429,
+        headers={"Retry-After": str(exc.retry_after)},
+        content={
+            "error": "Too Many Requests",
+            "detail": "Telemetry ingestion queue is full; retry the batch later",
+            "retry_after": exc.retry_after
+        }
+    )
+
+
 @router.post("/telemetry/ingest", tags=["Telemetry v3.3.1"])
 async def telemetry_ingest(
-    request: Request,
-    db=Depends(get_db)
+    request: Request
 ):
     """
     Protocol v3.3.1: Primary fallback telemetry ingest endpoint for fleet.
@@ -298,9 +314,9 @@ async def telemetry_ingest(
         elif isinstance(payload, list):
             events_to_process = payload
         
-        accepted = 0
         failed = 0
-        event_ids = []
+        rows = []
+        original_ids = {}
         
         for event_data in events_to_process:
             try:
@@ -353,15 +369,7 @@ async def telemetry_ingest(
                     import hashlib
                     validated_event_id = str(uuid.UUID(hashlib.md5(validated_event_id.encode()).hexdigest()))
                 
-                query = text("""
-                    INSERT INTO business_events 
-                    (request_id, app, env, event_name, ts, actor_type, actor_id, session_id, org_id, properties)
-                    VALUES 
-                    (CAST(:request_id AS uuid), :app, :env, :event_name, :ts, :actor_type, :actor_id, :session_id, :org_id, CAST(:properties AS jsonb))
-                    ON CONFLICT (request_id) DO NOTHING
-                """)
-                
-                result = db.execute(query, {
+                rows.append({
                     "request_id": validated_event_id,
                     "app": app_id,
                     "env": env,
@@ -373,22 +381,21 @@ async def telemetry_ingest(
                     "org_id": event_data.get("account_id"),
                     "properties": json.dumps(props)
                 })
-                
-                if result.rowcount > 0:
-                    accepted += 1
-                    event_ids.append(event_id)
-                    logger.info(f"REPORT: app=scholarship_api | v3.3.1 INGEST: {event_type} from {app_label} (tile={tile})")
-                else:
-                    logger.debug(f"REPORT: app=scholarship_api | v3.3.1 INGEST: Duplicate {event_id}")
+                original_ids[validated_event_id] = event_id
                     
             except Exception as e:
                 logger.error(f"REPORT: app=scholarship_api | v3.3.1 INGEST ERROR: {e}")
                 failed += 1
         
-        if accepted > 0:
-            db.commit()
+        # Acknowledge once queued; business_events is written in micro-batches (services/telemetry_ingest.py)
+        try:
+            receipt = telemetry_ingest_queue.submit(rows)
+        except TelemetryQueueFull as e:
+            return queue_full_response(e)
+        accepted = len(receipt.accepted)
+        event_ids = [original_ids[request_id] for request_id in receipt.accepted]
         
-        logger.info(f"REPORT: app=scholarship_api | app_base_url=https://scholarship-api-jamarrlmayes.replit.app | env=prod | v3.3.1 INGEST BATCH: accepted={accepted}, failed={failed}")
+        logger.info(f"REPORT: app=scholarship_api | app_base_url=https://scholarship-api-jamarrlmayes.replit.app | env=prod | v3.3.1 INGEST BATCH: accepted={accepted}, failed={failed}, duplicates={receipt.duplicates}")
         
         return JSONResponse(status_code=200, content={
             "status": "ok",
@@ -583,8 +590,7 @@ async def write_events_raw(
 @router.post("/analytics/events", response_model=EventWriteResponse, tags=["Telemetry"])
 async def write_events(
     batch: TelemetryEventBatch,
-    request: Request,
-    db=Depends(get_db)
+    request: Request
 ):
     """
     Central telemetry event write endpoint (Protocol ONE_TRUTH v1.2)
@@ -655,16 +661,13 @@ async def write_events(
             })
     
     try:
-        accepted = 0
         failed = 0
-        duplicates = 0
-        event_ids = []
         missing_base_url = 0
+        rows = []
+        original_ids = {}
         
         for event in batch.events:
             try:
-                import json
-                
                 if not event.app_base_url and not event.properties.get("app_base_url"):
                     missing_base_url += 1
                     logger.warning(f"REPORT: app=scholarship_api | app_base_url=https://scholarship-api-jamarrlmayes.replit.app | env=prod | VALIDATION: Event {event.event_id} from {event.app_id} missing app_base_url")
@@ -673,22 +676,15 @@ async def write_events(
                 if event.app_base_url:
                     props["app_base_url"] = event.app_base_url
                 
+                # Non-UUID ids map to a stable UUID so retries still deduplicate
                 validated_event_id = event.event_id
                 try:
                     uuid.UUID(validated_event_id)
                 except (ValueError, TypeError):
-                    validated_event_id = str(uuid.uuid4())
+                    validated_event_id = str(uuid.UUID(hashlib.md5(validated_event_id.encode()).hexdigest()))
                     logger.debug(f"REPORT: app=scholarship_api | Converted non-UUID event_id to UUID: {validated_event_id}")
                 
-                query = text("""
-                    INSERT INTO business_events 
-                    (request_id, app, env, event_name, ts, actor_type, actor_id, session_id, org_id, properties)
-                    VALUES 
-                    (CAST(:request_id AS uuid), :app, :env, :event_name, :ts, :actor_type, :actor_id, :session_id, :org_id, CAST(:properties AS jsonb))
-                    ON CONFLICT (request_id) DO NOTHING
-                """)
-                
-                result = db.execute(query, {
+                rows.append({
                     "request_id": validated_event_id,
                     "app": event.app_id,
                     "env": event.env,
@@ -700,21 +696,21 @@ async def write_events(
                     "org_id": event.account_id,
                     "properties": json.dumps(props)
                 })
-                
-                if result.rowcount > 0:
-                    accepted += 1
-                    event_ids.append(event.event_id)
-                else:
-                    duplicates += 1
+                original_ids[validated_event_id] = event.event_id
                 
             except Exception as e:
                 logger.error(f"REPORT: app=scholarship_api | app_base_url=https://scholarship-api-jamarrlmayes.replit.app | env=prod | Failed to write event {event.event_id}: {e}")
                 failed += 1
         
-        if accepted > 0:
-            db.commit()
+        # Acknowledge once queued; business_events is written in micro-batches (services/telemetry_ingest.py)
+        try:
+            receipt = telemetry_ingest_queue.submit(rows)
+        except TelemetryQueueFull as e:
+            return queue_full_response(e)
+        accepted = len(receipt.accepted)
+        event_ids = [original_ids[request_id] for request_id in receipt.accepted]
         
-        logger.info(f"REPORT: app=scholarship_api | app_base_url=https://scholarship-api-jamarrlmayes.replit.app | env=prod | Telemetry batch: accepted={accepted}, failed={failed}, duplicates={duplicates}, missing_base_url={missing_base_url}")
+        logger.info(f"REPORT: app=scholarship_api | app_base_url=https://scholarship-api-jamarrlmayes.replit.app | env=prod | Telemetry batch: accepted={accepted}, failed={failed}, duplicates={receipt.duplicates}, missing_base_url={missing_base_url}")
         
         return EventWriteResponse(
             accepted=accepted,
@@ -737,14 +733,13 @@ async def write_events(
 @router.post("/events/single", tags=["Telemetry"])
 async def write_single_event(
     event: TelemetryEvent,
-    request: Request,
-    db=Depends(get_db)
+    request: Request
 ):
     """
     Single event write endpoint for simpler integrations
     """
     batch = TelemetryEventBatch(events=[event])
-    return await write_events(batch, request, db)
+    return await write_events(batch, request)
 
 
 def parse_window(window: str) -> timedelta:
@@ -762,59 +757,31 @@ def parse_window(window: str) -> timedelta:
 @router.get("/stats", tags=["Telemetry"])
 async def get_stats(
     window: str = Query("1h", description="Time window: 5m, 1h, 24h"),
-    group: str = Query("event_type", description="Grouping field: event_type, app, actor_type"),
-    db=Depends(get_db)
+    group: str = Query("event_type", description="Grouping field: event_type, app, actor_type")
 ):
     """
     DB-backed stats endpoint for Command Center (Contract v1.1)
     
-    Reads from business_events table and returns aggregated counts
-    grouped by the specified field within the time window.
+    Reads per-minute rollups of the business_events table (services/telemetry_rollups.py)
+    and returns aggregated counts grouped by the specified field within the time window.
     """
     try:
         time_window = parse_window(window)
         cutoff = datetime.utcnow() - time_window
         
-        if group == "event_type":
-            group_col = "event_name"
-        elif group == "app":
-            group_col = "app"
-        elif group == "actor_type":
-            group_col = "actor_type"
-        else:
-            group_col = "event_name"
-        
-        query = text(f"""
-            SELECT 
-                {group_col} as group_key,
-                COUNT(*) as count,
-                MIN(ts) as first_event,
-                MAX(ts) as last_event
-            FROM business_events
-            WHERE ts >= :cutoff
-            GROUP BY {group_col}
-            ORDER BY count DESC
-        """)
-        
-        result = db.execute(query, {"cutoff": cutoff})
-        rows = result.fetchall()
+        rows = await asyncio.to_thread(telemetry_rollups.grouped_counts, cutoff, group)
         
         stats = {}
-        total = 0
+        total_result = 0
         for row in rows:
             group_key = row[0] or "unknown"
-            count = row[1]
+            count = int(row[1])
             stats[group_key] = {
                 "count": count,
                 "first_event": row[2].isoformat() if row[2] else None,
                 "last_event": row[3].isoformat() if row[3] else None
             }
-            total += count
-        
-        query_total = text("""
-            SELECT COUNT(*) FROM business_events WHERE ts >= :cutoff
-        """)
-        total_result = db.execute(query_total, {"cutoff": cutoff}).scalar()
+            total_result += count
         
         return {
             "window": window,
@@ -840,7 +807,7 @@ async def get_stats(
 
 
 @router.get("/kpis/today", tags=["Telemetry"])
-async def get_kpis_today(db=Depends(get_db)):
+async def get_kpis_today():
     """
     Today's KPI summary for Command Center (Protocol ONE_TRUTH v1.2)
     
@@ -851,26 +818,14 @@ async def get_kpis_today(db=Depends(get_db)):
     try:
         today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
         
-        query = text("""
-            SELECT 
-                event_name,
-                COUNT(*) as count,
-                SUM(CASE WHEN (properties->>'amount_cents')::numeric IS NOT NULL 
-                    THEN (properties->>'amount_cents')::numeric ELSE 0 END) as amount_cents
-            FROM business_events
-            WHERE ts >= :today_start
-            GROUP BY event_name
-        """)
-        
-        result = db.execute(query, {"today_start": today_start})
-        rows = result.fetchall()
+        rows = await asyncio.to_thread(telemetry_rollups.event_totals, today_start)
         
         event_counts = {}
         revenue_cents = 0
         for row in rows:
             event_name = row[0] or "unknown"
-            event_counts[event_name] = row[1]
-            if event_name in ("payment_succeeded", "credit_purchased"):
+            event_counts[event_name] = int(row[1])
+            if event_name in PAYMENT_EVENTS:
                 revenue_cents += int(row[2] or 0)
         
         page_views = event_counts.get("page_view", 0)
@@ -913,8 +868,7 @@ async def get_kpis_today(db=Depends(get_db)):
 
 @router.get("/kpis/rollup", tags=["Telemetry"])
 async def get_kpis_rollup(
-    days: int = Query(7, ge=1, le=90, description="Number of days to roll up"),
-    db=Depends(get_db)
+    days: int = Query(7, ge=1, le=90, description="Number of days to roll up")
 ):
     """
     Multi-day KPI rollup for Command Center dashboards
@@ -922,21 +876,7 @@ async def get_kpis_rollup(
     try:
         cutoff = datetime.utcnow() - timedelta(days=days)
         
-        query = text("""
-            SELECT 
-                DATE(ts) as event_date,
-                event_name,
-                COUNT(*) as count,
-                SUM(CASE WHEN (properties->>'revenue_usd')::numeric IS NOT NULL 
-                    THEN (properties->>'revenue_usd')::numeric ELSE 0 END) as revenue
-            FROM business_events
-            WHERE ts >= :cutoff
-            GROUP BY DATE(ts), event_name
-            ORDER BY event_date DESC
-        """)
-        
-        result = db.execute(query, {"cutoff": cutoff})
-        rows = result.fetchall()
+        rows = await asyncio.to_thread(telemetry_rollups.daily_totals, cutoff)
         
         daily_stats = {}
         total_revenue = 0.0
@@ -945,7 +885,7 @@ async def get_kpis_rollup(
         for row in rows:
             date_str = row[0].isoformat() if row[0] else "unknown"
             event_name = row[1]
-            count = row[2]
+            count = int(row[2])
             revenue = float(row[3] or 0)
             
             if date_str not in daily_stats:
@@ -1244,8 +1184,7 @@ def compute_finance_status(payments: int, fees: int) -> str:
 
 @executive_router.get("/central-stats", tags=["Executive Dashboard"])
 async def get_central_stats(
-    window: str = Query("24h", description="Time window: 5m, 1h, 24h"),
-    db=Depends(get_db)
+    window: str = Query("24h", description="Time window: 5m, 1h, 24h")
 ):
     """
     Protocol ONE TRUTH v1.0: Central aggregated stats for Command Center visualization.
@@ -1266,27 +1205,16 @@ async def get_central_stats(
         time_window = parse_window(window)
         cutoff = datetime.utcnow() - time_window
         
-        app_stats_query = text("""
-            SELECT 
-                app as app_id,
-                COUNT(*) as event_count,
-                COUNT(DISTINCT event_name) as event_types,
-                MIN(ts) as first_event,
-                MAX(ts) as last_event
-            FROM business_events
-            WHERE ts >= :cutoff
-            GROUP BY app
-            ORDER BY event_count DESC
-        """)
-        
-        result = db.execute(app_stats_query, {"cutoff": cutoff})
-        rows = result.fetchall()
+        app_rows, event_rows = await asyncio.gather(
+            asyncio.to_thread(telemetry_rollups.app_stats, cutoff),
+            asyncio.to_thread(telemetry_rollups.event_totals, cutoff)
+        )
         
         apps = {}
         total_events = 0
-        for row in rows:
+        for row in app_rows:
             app_id = row[0] or "unknown"
-            count = row[1]
+            count = int(row[1])
             apps[app_id] = {
                 "event_count": count,
                 "event_types": row[2],
@@ -1296,42 +1224,18 @@ async def get_central_stats(
             }
             total_events += count
         
-        event_breakdown_query = text("""
-            SELECT 
-                event_name,
-                COUNT(*) as count
-            FROM business_events
-            WHERE ts >= :cutoff
-            GROUP BY event_name
-            ORDER BY count DESC
-            LIMIT 50
-        """)
-        
-        event_result = db.execute(event_breakdown_query, {"cutoff": cutoff})
-        event_rows = event_result.fetchall()
-        
         event_breakdown = {}
-        for row in event_rows:
-            event_breakdown[row[0] or "unknown"] = row[1]
-        
-        finance_query = text("""
-            SELECT 
-                SUM(CASE WHEN (properties->>'amount_cents')::numeric IS NOT NULL 
-                    THEN (properties->>'amount_cents')::numeric ELSE 0 END) as amount_cents,
-                SUM(CASE WHEN (properties->>'platform_fee_cents')::numeric IS NOT NULL 
-                    THEN (properties->>'platform_fee_cents')::numeric ELSE 0 END) as platform_fees,
-                COUNT(*) as tx_count
-            FROM business_events
-            WHERE ts >= :cutoff
-              AND event_name IN ('payment_succeeded', 'credit_purchased')
-        """)
+        for row in event_rows[:50]:
+            event_breakdown[row[0] or "unknown"] = int(row[1])
         
-        finance_result = db.execute(finance_query, {"cutoff": cutoff})
-        finance_row = finance_result.fetchone()
-        
-        amount_cents = int(finance_row[0] or 0)
-        platform_fees = int(finance_row[1] or 0)
-        finance_tx_count = int(finance_row[2] or 0)
+        amount_cents = 0
+        platform_fees = 0
+        finance_tx_count = 0
+        for row in event_rows:
+            if row[0] in PAYMENT_EVENTS:
+                amount_cents += int(row[2] or 0)
+                platform_fees += int(row[3] or 0)
+                finance_tx_count += int(row[1])
         
         window_seconds = time_window.total_seconds()
         seconds_per_day = 86400
@@ -1513,15 +1417,6 @@ async def get_central_stats(
         logger.info(f"REPORT: app=scholarship_api | app_base_url=https://scholarship-api-jamarrlmayes.replit.app | env=prod | tile_status_rendered: SLO={slo_status} B2C={b2c_status} B2B={b2b_status} SEO={seo_status} Growth={growth_status} Trust={trust_status} Finance={finance_status} | overall={overall_status}")
         
         try:
-            diagnostic_query = text("""
-                INSERT INTO business_events 
-                (request_id, app, env, event_name, ts, actor_type, actor_id, session_id, org_id, properties)
-                VALUES 
-                (CAST(:request_id AS uuid), :app, :env, :event_name, :ts, :actor_type, :actor_id, :session_id, :org_id, CAST(:properties AS jsonb))
-                ON CONFLICT (request_id) DO NOTHING
-            """)
-            
-            import json as json_module
             diagnostic_props = {
                 "app_base_url": "https://scholarship-api-jamarrlmayes.replit.app",
                 "slo": slo_status,
@@ -1537,7 +1432,7 @@ async def get_central_stats(
                 "window": window
             }
             
-            db.execute(diagnostic_query, {
+            telemetry_ingest_queue.submit([{
                 "request_id": str(uuid.uuid4()),
                 "app": "scholarship_api",
                 "env": "prod",
@@ -1547,9 +1442,8 @@ async def get_central_stats(
                 "actor_id": "central_aggregator",
                 "session_id": None,
                 "org_id": None,
-                "properties": json_module.dumps(diagnostic_props)
-            })
-            db.commit()
+                "properties": json.dumps(diagnostic_props)
+            }])
         except Exception as diag_err:
             logger.warning(f"REPORT: app=scholarship_api | Diagnostic emission failed (non-blocking): {diag_err}")
         
@@ -1,27 +1,203 @@
-from collections import Counter, defaultdict
+import threading
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Any
 
+from config.settings import settings
 from models.user import UserInteraction
+from services.analytics_writer import SearchAnalyticsRecord, analytics_writer
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Search filters that are pagination, not intent
+PAGINATION_FILTERS = ("limit", "offset")
+
+
+def _minute_of(moment: datetime) -> int:
+    return int(moment.timestamp() // 60) if moment.tzinfo else int((moment - datetime(1970, 1, 1)).total_seconds() // 60)
+
+
+@dataclass(slots=True)
+class MinuteBucket:
+    """Aggregated interactions for one minute"""
+    minute: int
+    actions: Counter = field(default_factory=Counter)
+    scholarship_views: Counter = field(default_factory=Counter)
+    queries: Counter = field(default_factory=Counter)
+    filter_usage: Counter = field(default_factory=Counter)
+    users: set = field(default_factory=set)
+    searches: int = 0
+    search_results: int = 0
+    zero_result_searches: int = 0
+    eligibility_checks: int = 0
+    eligible_checks: int = 0
+    pending_spill: list = field(default_factory=list)
+
+    def add(self, interaction: UserInteraction) -> None:
+        metadata = interaction.metadata or {}
+        self.actions[interaction.action] += 1
+        if interaction.user_id:
+            self.users.add(interaction.user_id)
+
+        if interaction.action == "view_scholarship" and interaction.scholarship_id:
+            self.scholarship_views[interaction.scholarship_id] += 1
+        elif interaction.action == "search":
+            result_count = metadata.get("result_count", 0) or 0
+            self.searches += 1
+            self.search_results += result_count
+            if result_count == 0:
+                self.zero_result_searches += 1
+            query = (metadata.get("query") or "").strip().lower()
+            if query:
+                self.queries[query] += 1
+            for key, value in (metadata.get("filters") or {}).items():
+                if value and key not in PAGINATION_FILTERS:
+                    self.filter_usage[key] += 1
+        elif interaction.action == "eligibility_check":
+            self.eligibility_checks += 1
+            if metadata.get("eligible", False):
+                self.eligible_checks += 1
+
+
+@dataclass
+class WindowTotals:
+    """MinuteBuckets merged over a query window"""
+    actions: Counter = field(default_factory=Counter)
+    scholarship_views: Counter = field(default_factory=Counter)
+    queries: Counter = field(default_factory=Counter)
+    filter_usage: Counter = field(default_factory=Counter)
+    users: set = field(default_factory=set)
+    searches: int = 0
+    search_results: int = 0
+    zero_result_searches: int = 0
+    eligibility_checks: int = 0
+    eligible_checks: int = 0
+
+    def merge(self, bucket: MinuteBucket) -> None:
+        self.actions.update(bucket.actions)
+        self.scholarship_views.update(bucket.scholarship_views)
+        self.queries.update(bucket.queries)
+        self.filter_usage.update(bucket.filter_usage)
+        self.users |= bucket.users
+        self.searches += bucket.searches
+        self.search_results += bucket.search_results
+        self.zero_result_searches += bucket.zero_result_searches
+        self.eligibility_checks += bucket.eligibility_checks
+        self.eligible_checks += bucket.eligible_checks
+
+
+class InteractionStore:
+    """
+    Ring of per-minute buckets covering the retention window, plus a bounded
+    buffer of the most recent raw interactions (per-user history, /interactions).
+    Only minutes with activity get a bucket, so a query costs O(active minutes).
+    """
+
+    def __init__(self, retention_days: int, recent_max: int):
+        self.retention_minutes = retention_days * 1440
+        self.recent: deque[UserInteraction] = deque(maxlen=recent_max)
+        self._buckets: deque[MinuteBucket] = deque()
+        self._lock = threading.Lock()
+
+    def add(self, interaction: UserInteraction, spill: bool = False) -> list[MinuteBucket]:
+        """Record an interaction; returns buckets closed by this call (for spilling)"""
+        minute = _minute_of(interaction.timestamp)
+        closed: list[MinuteBucket] = []
+        with self._lock:
+            self.recent.append(interaction)
+            if not self._buckets or minute > self._buckets[-1].minute:
+                if self._buckets:
+                    closed.append(self._buckets[-1])
+                self._buckets.append(MinuteBucket(minute))
+                self._evict(minute)
+            # Late arrivals are credited to the newest bucket
+            self._buckets[-1].add(interaction)
+            if spill:
+                self._buckets[-1].pending_spill.append(interaction)
+        return closed
+
+    def take_open_spill(self) -> list[UserInteraction]:
+        """Pending spill rows of the current (still open) minute bucket"""
+        with self._lock:
+            if not self._buckets:
+                return []
+            bucket = self._buckets[-1]
+            rows, bucket.pending_spill = bucket.pending_spill, []
+            return rows
+
+    def _evict(self, now_minute: int) -> None:
+        oldest = now_minute - self.retention_minutes
+        while self._buckets and self._buckets[0].minute <= oldest:
+            self._buckets.popleft()
+
+    def totals(self, days: int) -> WindowTotals:
+        """Merge the buckets of the last `days` days, newest first"""
+        cutoff = _minute_of(datetime.utcnow() - timedelta(days=days))
+        totals = WindowTotals()
+        with self._lock:
+            for bucket in reversed(self._buckets):
+                if bucket.minute < cutoff:
+                    break
+                totals.merge(bucket)
+        return totals
+
+    def snapshot_recent(self) -> list[UserInteraction]:
+        with self._lock:
+            return list(self.recent)
+
+    def bucket_count(self) -> int:
+        return len(self._buckets)
+
+
 class AnalyticsService:
     """Service for tracking and analyzing user interactions"""
 
     def __init__(self):
-        self.interactions: list[UserInteraction] = []
+        self.store = InteractionStore(
+            retention_days=settings.analytics_retention_days,
+            recent_max=settings.analytics_recent_interactions_max
+        )
         self.session_data: dict[str, Any] = defaultdict(dict)
 
-    def log_interaction(self, interaction: UserInteraction) -> None:
-        """Log a user interaction"""
-        self.interactions.append(interaction)
-        logger.info(f"Logged interaction: {interaction.action} by user {interaction.user_id}")
+        # Optional spill of search interactions to search_analytics, one batch per closed minute
+        self.spill_searches = settings.analytics_spill_searches
+
+    @property
+    def interactions(self) -> list[UserInteraction]:
+        """Most recent raw interactions (bounded), oldest first"""
+        return self.store.snapshot_recent()
+
+    def log_interaction(self, interaction: UserInteraction, persisted: bool = False) -> None:
+        """Log a user interaction (persisted: the caller already wrote it to search_analytics)"""
+        spill = self.spill_searches and interaction.action == "search" and not persisted
+        closed = self.store.add(interaction, spill=spill)
+        if self.spill_searches:
+            for bucket in closed:
+                rows, bucket.pending_spill = bucket.pending_spill, []
+                self._spill(rows)
+        logger.info("Logged interaction: %s by user %s", interaction.action, interaction.user_id)
+
+    def flush_spill(self) -> None:
+        """Spill the open minute's searches (shutdown); closed minutes are spilled as they close"""
+        if self.spill_searches:
+            self._spill(self.store.take_open_spill())
+
+    def _spill(self, rows: list[UserInteraction]) -> None:
+        for i in rows:
+            metadata = i.metadata or {}
+            analytics_writer.enqueue(SearchAnalyticsRecord(
+                search_query=metadata.get("query"),
+                filters_applied=metadata.get("filters"),
+                results_count=metadata.get("result_count", 0),
+                user_id=i.user_id,
+                timestamp=i.timestamp
+            ))
 
     def log_search(self, user_id: str | None, query: str, result_count: int,
-                   filters: dict[str, Any]) -> None:
-        """Log a search interaction"""
+                   filters: dict[str, Any], persisted: bool = False) -> None:
+        """Log a search interaction (filters JSON-serializable, e.g. model_dump(mode="json"))"""
         interaction = UserInteraction(
             user_id=user_id,
             action="search",
@@ -33,7 +209,7 @@ class AnalyticsService:
                 "filters": filters
             }
         )
-        self.log_interaction(interaction)
+        self.log_interaction(interaction, persisted=persisted)
 
     def log_scholarship_view(self, user_id: str | None, scholarship_id: str) -> None:
         """Log when a user views a scholarship"""
@@ -76,88 +252,61 @@ class AnalyticsService:
 
     def get_analytics_summary(self, days: int = 7) -> dict[str, Any]:
         """Get analytics summary for the specified number of days"""
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
-        recent_interactions = [
-            i for i in self.interactions
-            if i.timestamp >= cutoff_date
-        ]
-
-        # Basic metrics
-        total_interactions = len(recent_interactions)
-        unique_users = len({i.user_id for i in recent_interactions if i.user_id})
-
-        # Action breakdown
-        action_counts = Counter(i.action for i in recent_interactions)
-
-        # Popular scholarships
-        scholarship_views = [
-            i for i in recent_interactions
-            if i.action == "view_scholarship" and i.scholarship_id
-        ]
-        popular_scholarships = Counter(i.scholarship_id for i in scholarship_views)
-
-        # Search analytics
-        search_interactions = [i for i in recent_interactions if i.action == "search"]
-        total_searches = len(search_interactions)
-
-        # Average results per search
-        avg_results_per_search = 0
-        if search_interactions:
-            total_results = sum(
-                i.metadata.get("result_count", 0)
-                for i in search_interactions
-                if i.metadata
-            )
-            avg_results_per_search = total_results / len(search_interactions)
-
-        # Popular search terms
-        search_terms = []
-        for interaction in search_interactions:
-            if interaction.metadata and "query" in interaction.metadata:
-                query = interaction.metadata["query"]
-                if query:  # Non-empty query
-                    search_terms.append(query.lower())
-
-        popular_search_terms = Counter(search_terms)
-
-        # Eligibility check analytics
-        eligibility_checks = [
-            i for i in recent_interactions
-            if i.action == "eligibility_check"
-        ]
-
-        successful_eligibility = len([
-            i for i in eligibility_checks
-            if i.metadata and i.metadata.get("eligible", False)
-        ])
+        totals = self.store.totals(days)
 
-        eligibility_rate = 0
-        if eligibility_checks:
-            eligibility_rate = successful_eligibility / len(eligibility_checks)
+        avg_results_per_search = totals.search_results / totals.searches if totals.searches else 0
+        eligibility_rate = totals.eligible_checks / totals.eligibility_checks if totals.eligibility_checks else 0
 
         return {
             "period_days": days,
-            "total_interactions": total_interactions,
-            "unique_users": unique_users,
-            "interactions_by_action": dict(action_counts),
-            "popular_scholarships": dict(popular_scholarships.most_common(10)),
+            "total_interactions": sum(totals.actions.values()),
+            "unique_users": len(totals.users),
+            "interactions_by_action": dict(totals.actions),
+            "popular_scholarships": dict(totals.scholarship_views.most_common(10)),
             "search_analytics": {
-                "total_searches": total_searches,
+                "total_searches": totals.searches,
                 "avg_results_per_search": round(avg_results_per_search, 2),
-                "popular_terms": dict(popular_search_terms.most_common(10))
+                "popular_terms": dict(totals.queries.most_common(10))
             },
             "eligibility_analytics": {
-                "total_checks": len(eligibility_checks),
-                "successful_checks": successful_eligibility,
+                "total_checks": totals.eligibility_checks,
+                "successful_checks": totals.eligible_checks,
                 "eligibility_rate": round(eligibility_rate, 2)
             }
         }
 
+    def get_popular_scholarships(self, days: int = 7) -> Counter:
+        """View counts per scholarship over the last `days` days"""
+        return self.store.totals(days).scholarship_views
+
+    def get_search_trends(self, days: int = 7) -> dict[str, Any]:
+        """Search volume, result quality, popular queries and filter usage over the last `days` days"""
+        totals = self.store.totals(days)
+        return {
+            "total_searches": totals.searches,
+            "unique_queries": len(totals.queries),
+            "avg_results_per_search": totals.search_results / totals.searches if totals.searches else 0,
+            "zero_result_rate": totals.zero_result_searches / totals.searches if totals.searches else 0,
+            "zero_result_searches": totals.zero_result_searches,
+            "popular_queries": dict(totals.queries.most_common(15)),
+            "filter_usage": dict(totals.filter_usage.most_common(10))
+        }
+
+    def get_recent_interactions(self, limit: int = 50, action: str | None = None) -> list[UserInteraction]:
+        """Most recent interactions first, optionally filtered by action"""
+        recent = []
+        for interaction in reversed(self.store.snapshot_recent()):
+            if action is None or interaction.action == action:
+                recent.append(interaction)
+                if len(recent) == limit:
+                    break
+        return recent
+
     def get_user_analytics(self, user_id: str, days: int = 30) -> dict[str, Any]:
-        """Get analytics for a specific user"""
+        """Get analytics for a specific user (from the bounded recent-interaction buffer)"""
         cutoff_date = datetime.utcnow() - timedelta(days=days)
         user_interactions = [
-            i for i in self.interactions
+            i for i in self.store.snapshot_recent()
             if i.user_id == user_id and i.timestamp >= cutoff_date
         ]
 
@@ -0,0 +1,225 @@
+"""
+Analytics Write-Behind Pipeline
+Bounded in-process queue between request handlers and the interactions /
+search_analytics tables
+
+- Handlers enqueue immutable records and return; they never open a transaction
+- A background writer groups queued records by table and writes each group as
+  one executemany INSERT on the background pool
+- Analytics are best-effort: when the queue is full the oldest record is
+  dropped (counted in analytics_writer_records_total{outcome="dropped"})
+- close() stops the writer and flushes what is left (application shutdown)
+"""
+
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy.exc import OperationalError
+
+from config.settings import settings
+from database.engine_registry import BACKGROUND_POOL, engine_registry
+from observability.metrics import (
+    analytics_writer_flush_seconds,
+    analytics_writer_queue_depth,
+    analytics_writer_records_total,
+)
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _new_id() -> str:
+    return str(uuid.uuid4())
+
+
+@dataclass(frozen=True)
+class InteractionRecord:
+    """One row of interactions (models/interaction.py)"""
+    event_type: str
+    path: str
+    method: str
+    status: int
+    user_id: str | None = None
+    scholarship_id: str | None = None
+    trace_id: str | None = None
+    request_metadata: dict[str, Any] | None = None
+    id: str = field(default_factory=_new_id)
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+    table = "interactions"
+
+
+@dataclass(frozen=True)
+class SearchAnalyticsRecord:
+    """One row of search_analytics (models/database.py)"""
+    search_query: str | None
+    results_count: int
+    filters_applied: dict[str, Any] | None = None
+    user_id: str | None = None
+    response_time_ms: float | None = None
+    session_id: str | None = None
+    user_agent: str | None = None
+    ip_address: str | None = None
+    id: str = field(default_factory=_new_id)
+    timestamp: datetime = field(default_factory=datetime.utcnow)
+
+    table = "search_analytics"
+
+
+AnalyticsRecord = InteractionRecord | SearchAnalyticsRecord
+
+
+def _tables() -> dict:
+    from models.database import SearchAnalyticsDB
+    from models.interaction import InteractionDB
+    return {"interactions": InteractionDB.__table__, "search_analytics": SearchAnalyticsDB.__table__}
+
+
+class AnalyticsWriter:
+    """Bounded drop-oldest queue of analytics records with a background batch writer"""
+
+    def __init__(self, max_records: int | None = None, batch_size: int | None = None,
+                 flush_interval: float | None = None):
+        self.max_records = max_records or settings.analytics_writer_max_records
+        self.batch_size = batch_size or settings.analytics_writer_batch_size
+        self.flush_interval = flush_interval or settings.analytics_writer_flush_interval_seconds
+
+        self._records: deque[AnalyticsRecord] = deque()
+        self._cond = threading.Condition()
+        self._writer: threading.Thread | None = None
+        self._stopping = False
+        self._flush_lock = threading.Lock()
+
+    # Request side -------------------------------------------------------
+
+    def enqueue(self, record: AnalyticsRecord) -> str:
+        """Queue a record for writing and return its id; never blocks on the database"""
+        with self._cond:
+            if len(self._records) >= self.max_records:
+                dropped = self._records.popleft()
+                analytics_writer_records_total.labels(table=dropped.table, outcome="dropped").inc()
+            self._records.append(record)
+            analytics_writer_queue_depth.set(len(self._records))
+            if len(self._records) >= self.batch_size:
+                self._cond.notify()
+        analytics_writer_records_total.labels(table=record.table, outcome="queued").inc()
+        self._ensure_writer()
+        return record.id
+
+    def depth(self) -> int:
+        return len(self._records)
+
+    # Writer side --------------------------------------------------------
+
+    def _take_batch(self) -> list[AnalyticsRecord]:
+        with self._cond:
+            count = min(self.batch_size, len(self._records))
+            batch = [self._records.popleft() for _ in range(count)]
+            analytics_writer_queue_depth.set(len(self._records))
+            return batch
+
+    def _requeue(self, records: list[AnalyticsRecord]) -> None:
+        """Put an unwritten batch back at the head of the queue, still within max_records"""
+        with self._cond:
+            room = self.max_records - len(self._records)
+            keep = records[len(records) - room:] if room < len(records) else records
+            for record in records[:len(records) - len(keep)]:
+                analytics_writer_records_total.labels(table=record.table, outcome="dropped").inc()
+            self._records.extendleft(reversed(keep))
+            analytics_writer_queue_depth.set(len(self._records))
+
+    def _insert_rows(self, table: str, rows: list[dict[str, Any]]) -> None:
+        engine = engine_registry.get_engine(BACKGROUND_POOL)
+        with engine.begin() as conn:
+            conn.execute(_tables()[table].insert(), rows)
+
+    def _write(self, records: list[AnalyticsRecord]) -> bool:
+        """Write one batch; False means the database is unreachable and the batch was requeued"""
+        groups: dict[str, list[dict[str, Any]]] = {}
+        for record in records:
+            groups.setdefault(record.table, []).append(asdict(record))
+
+        started = time.perf_counter()
+        try:
+            for table, rows in groups.items():
+                try:
+                    self._insert_rows(table, rows)
+                    analytics_writer_records_total.labels(table=table, outcome="written").inc(len(rows))
+                except OperationalError:
+                    raise
+                except Exception as e:
+                    # One bad row must not sink the batch: fall back to row-by-row
+                    logger.error(f"REPORT: app=scholarship_api | ANALYTICS WRITER: {table} batch of {len(rows)} failed, retrying per row: {e}")
+                    for row in rows:
+                        try:
+                            self._insert_rows(table, [row])
+                            analytics_writer_records_total.labels(table=table, outcome="written").inc()
+                        except Exception as row_error:
+                            logger.error(f"REPORT: app=scholarship_api | ANALYTICS WRITER: dropped {table} row {row['id']}: {row_error}")
+                            analytics_writer_records_total.labels(table=table, outcome="failed").inc()
+                # Written groups are done; only the rest goes back on failure
+                records = [r for r in records if r.table != table]
+        except OperationalError as e:
+            logger.warning(f"REPORT: app=scholarship_api | ANALYTICS WRITER: database unavailable, requeued {len(records)} records: {e}")
+            self._requeue(records)
+            return False
+        finally:
+            analytics_writer_flush_seconds.observe(time.perf_counter() - started)
+        return True
+
+    def flush(self) -> None:
+        """Write everything queued so far (shutdown, tests)"""
+        with self._flush_lock:
+            while True:
+                batch = self._take_batch()
+                if not batch or not self._write(batch):
+                    return
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None:
+            return
+        with self._cond:
+            if self._writer is None and not self._stopping:
+                self._writer = threading.Thread(target=self._run, name="analytics-writer", daemon=True)
+                self._writer.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if len(self._records) < self.batch_size and not self._stopping:
+                    self._cond.wait(self.flush_interval)
+                if self._stopping:
+                    return
+            with self._flush_lock:
+                batch = self._take_batch()
+                written = not batch or self._write(batch)
+            if not written:
+                # Database down: back off instead of spinning on the same batch
+                time.sleep(self.flush_interval * 4)
+
+    def close(self) -> None:
+        """Stop the writer and write whatever is still queued"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._writer is not None:
+            self._writer.join(timeout=5)
+        self.flush()
+
+    def get_status(self) -> dict[str, Any]:
+        return {
+            "queue_depth": len(self._records),
+            "max_records": self.max_records,
+            "batch_size": self.batch_size,
+            "flush_interval_seconds": self.flush_interval,
+            "writer_running": self._writer is not None and self._writer.is_alive(),
+        }
+
+
+# Global analytics writer
+analytics_writer = AnalyticsWriter()
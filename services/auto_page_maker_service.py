@@ -1,16 +1,28 @@
 # AI Scholarship Playbook - Auto Page Maker Engine
 # Programmatic SEO content generation with quality gates
 
+import asyncio
 import re
 from datetime import datetime
 from typing import Any
 
 from models.scholarship import Scholarship
+from services.llm_generation import LLMGenerationEngine
+from services.near_duplicate_index import STOPWORDS, NearDuplicateIndex
 from services.openai_service import OpenAIService
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Jaccard over content-word bigrams (stopwords dropped); closer pages are found with
+# >= 99% probability, while unrelated pages share little beyond stopwords and are
+# rarely LSH candidates, so each lookup stays cheap as the page count grows
+UNIQUENESS_INDEX_THRESHOLD = 0.5
+
+
+def uniqueness_index() -> NearDuplicateIndex:
+    return NearDuplicateIndex(threshold=UNIQUENESS_INDEX_THRESHOLD, shingle_size=2, stopwords=STOPWORDS)
+
 class ContentQualityAssurance:
     """Quality assessment for programmatic content"""
 
@@ -45,8 +57,16 @@ class ContentQualityAssurance:
         return max(1, syllables)
 
     @staticmethod
-    def assess_uniqueness(content: str, existing_content: list[str]) -> float:
-        """Assess content uniqueness against existing content"""
+    def assess_uniqueness(content: str, existing_content: list[str] | NearDuplicateIndex) -> float:
+        """
+        Assess content uniqueness against existing content.
+        With a NearDuplicateIndex (see uniqueness_index) only its LSH candidates
+        are compared, so the cost does not grow with the number of pages already
+        generated. Similarity is then measured on the index's shingles, and pages
+        less similar than the index threshold count as fully unique (1.0).
+        """
+        if isinstance(existing_content, NearDuplicateIndex):
+            return 1.0 - existing_content.max_similarity(content)
         if not existing_content:
             return 1.0
 
@@ -89,21 +109,29 @@ class ContentQualityAssurance:
 
         return min(1.0, base_score + length_bonus)
 
+CONTENT_WRITER_PROMPT = "You are a scholarship content writer creating helpful, informative content for students."
+
+
 class ScholarshipPageGenerator:
     """Generate individual scholarship pages"""
 
-    def __init__(self, openai_service: OpenAIService):
+    def __init__(self, openai_service: OpenAIService, engine: LLMGenerationEngine | None = None):
         self.openai_service = openai_service
+        self.engine = engine or LLMGenerationEngine(api_key=openai_service.api_key)
         self.qa = ContentQualityAssurance()
+        # Bodies of pages generated so far, for near-duplicate checks
+        self.content_index = uniqueness_index()
 
     async def generate_scholarship_page(self, scholarship: Scholarship) -> dict[str, Any]:
         """Generate comprehensive scholarship page content"""
         try:
-            # Generate main content sections
-            overview_section = await self._generate_overview_section(scholarship)
-            eligibility_section = await self._generate_eligibility_section(scholarship)
-            application_section = await self._generate_application_section(scholarship)
-            strategy_section = await self._generate_strategy_section(scholarship)
+            # Generate main content sections concurrently (within the engine's budget)
+            overview_section, eligibility_section, application_section, strategy_section = await asyncio.gather(
+                self._generate_overview_section(scholarship),
+                self._generate_eligibility_section(scholarship),
+                self._generate_application_section(scholarship),
+                self._generate_strategy_section(scholarship),
+            )
 
             # Combine sections
             full_content = f"{overview_section}\n\n{eligibility_section}\n\n{application_section}\n\n{strategy_section}"
@@ -113,6 +141,8 @@ class ScholarshipPageGenerator:
 
             # Assess content quality
             quality_score = self._assess_content_quality(full_content)
+            quality_score["uniqueness_score"] = self.qa.assess_uniqueness(full_content, self.content_index)
+            self.content_index.add(scholarship.id, full_content)
 
             return {
                 "scholarship_id": scholarship.id,
@@ -157,21 +187,8 @@ class ScholarshipPageGenerator:
         Write in a helpful, informative tone. Use specific details. Keep it 300-400 words.
         """
 
-        # Use the OpenAI service to generate content
-        try:
-            response = await self.openai_service.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are a scholarship content writer creating helpful, informative content for students."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=500
-            )
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            logger.error(f"Error generating content: {e}")
-            return f"Overview for {scholarship.name} scholarship. Award: ${scholarship.amount:,}. Deadline: {scholarship.application_deadline.strftime('%B %d, %Y')}."
+        content = await self.engine.complete(CONTENT_WRITER_PROMPT, prompt, max_tokens=500)
+        return content or f"Overview for {scholarship.name} scholarship. Award: ${scholarship.amount:,}. Deadline: {scholarship.application_deadline.strftime('%B %d, %Y')}."
 
     async def _generate_eligibility_section(self, scholarship: Scholarship) -> str:
         """Generate detailed eligibility section"""
@@ -194,21 +211,8 @@ class ScholarshipPageGenerator:
         Target 250-300 words.
         """
 
-        # Use the OpenAI service to generate content
-        try:
-            response = await self.openai_service.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are a scholarship content writer creating helpful, informative content for students."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=400
-            )
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            logger.error(f"Error generating content: {e}")
-            return f"Eligibility requirements for {scholarship.name} scholarship."
+        content = await self.engine.complete(CONTENT_WRITER_PROMPT, prompt, max_tokens=400)
+        return content or f"Eligibility requirements for {scholarship.name} scholarship."
 
     async def _generate_application_section(self, scholarship: Scholarship) -> str:
         """Generate application process section"""
@@ -231,21 +235,8 @@ class ScholarshipPageGenerator:
         Target 350-400 words.
         """
 
-        # Use the OpenAI service to generate content
-        try:
-            response = await self.openai_service.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are a scholarship content writer creating helpful, informative content for students."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=500
-            )
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            logger.error(f"Error generating content: {e}")
-            return f"Application guide for {scholarship.name} scholarship. Deadline: {scholarship.application_deadline.strftime('%B %d, %Y')}."
+        content = await self.engine.complete(CONTENT_WRITER_PROMPT, prompt, max_tokens=500)
+        return content or f"Application guide for {scholarship.name} scholarship. Deadline: {scholarship.application_deadline.strftime('%B %d, %Y')}."
 
     async def _generate_strategy_section(self, scholarship: Scholarship) -> str:
         """Generate application strategy section"""
@@ -268,21 +259,8 @@ class ScholarshipPageGenerator:
         Target 250-300 words.
         """
 
-        # Use the OpenAI service to generate content
-        try:
-            response = await self.openai_service.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are a scholarship content writer creating helpful, informative content for students."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=400
-            )
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            logger.error(f"Error generating content: {e}")
-            return f"Strategic advice for {scholarship.name} scholarship application."
+        content = await self.engine.complete(CONTENT_WRITER_PROMPT, prompt, max_tokens=400)
+        return content or f"Strategic advice for {scholarship.name} scholarship application."
 
     async def _generate_seo_metadata(self, scholarship: Scholarship, content: str) -> dict[str, Any]:
         """Generate SEO-optimized metadata"""
@@ -355,8 +333,9 @@ class ScholarshipPageGenerator:
 class CategoryLandingPageGenerator:
     """Generate category-specific landing pages"""
 
-    def __init__(self, openai_service: OpenAIService):
+    def __init__(self, openai_service: OpenAIService, engine: LLMGenerationEngine | None = None):
         self.openai_service = openai_service
+        self.engine = engine or LLMGenerationEngine(api_key=openai_service.api_key)
 
     async def generate_category_page(self, category: str, scholarships: list[Scholarship]) -> dict[str, Any]:
         """Generate category landing page (e.g., STEM scholarships)"""
@@ -387,20 +366,8 @@ class CategoryLandingPageGenerator:
         Focus on actionable insights specific to {category} students.
         """
 
-        # Use the OpenAI service to generate content
-        try:
-            response = await self.openai_service.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are a scholarship content writer creating helpful, informative content for students."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=800
-            )
-            content = response.choices[0].message.content.strip()
-        except Exception as e:
-            logger.error(f"Error generating content: {e}")
+        content = await self.engine.complete(CONTENT_WRITER_PROMPT, prompt, max_tokens=800)
+        if not content:
             content = f"Comprehensive guide to {category} scholarships with {len(scholarships)} opportunities available."
 
         # Generate scholarship highlights
@@ -441,10 +408,12 @@ class CategoryLandingPageGenerator:
 class AutoPageMakerService:
     """Main service for automated SEO page generation"""
 
-    def __init__(self, openai_service: OpenAIService):
+    def __init__(self, openai_service: OpenAIService, engine: LLMGenerationEngine | None = None):
         self.openai_service = openai_service
-        self.scholarship_generator = ScholarshipPageGenerator(openai_service)
-        self.category_generator = CategoryLandingPageGenerator(openai_service)
+        # One engine for both generators, so every page shares the concurrency/token budget
+        self.engine = engine or LLMGenerationEngine(api_key=openai_service.api_key)
+        self.scholarship_generator = ScholarshipPageGenerator(openai_service, self.engine)
+        self.category_generator = CategoryLandingPageGenerator(openai_service, self.engine)
         self.generated_pages = []
         self.sitemap_entries = []
 
@@ -467,36 +436,48 @@ class AutoPageMakerService:
 
             start_time = datetime.utcnow()
 
-            # Generate individual scholarship pages
-            for scholarship in scholarships[:50]:  # Start with 50 for demo
-                try:
-                    page_data = await self.scholarship_generator.generate_scholarship_page(scholarship)
-                    results["individual_pages"].append(page_data)
-                    self.sitemap_entries.append({
-                        "url": f"/scholarships/{page_data['slug']}",
-                        "lastmod": datetime.utcnow().isoformat(),
-                        "priority": 0.8
-                    })
-                except Exception as e:
-                    logger.warning(f"Failed to generate page for scholarship {scholarship.id}: {str(e)}")
-                    continue
-
-            # Generate category landing pages
+            # Generate individual scholarship and category landing pages concurrently;
+            # the shared engine bounds in-flight requests and token rate
+            selected = scholarships[:50]  # Start with 50 for demo
             categories = ["STEM", "Women in Technology", "First-Generation College", "Community Service", "Academic Merit"]
-            for category in categories:
-                category_scholarships = [s for s in scholarships if self._matches_category(s, category)]
-                if category_scholarships:
-                    try:
-                        page_data = await self.category_generator.generate_category_page(category, category_scholarships)
-                        results["category_pages"].append(page_data)
-                        self.sitemap_entries.append({
-                            "url": f"/scholarships/{page_data['slug']}",
-                            "lastmod": datetime.utcnow().isoformat(),
-                            "priority": 0.9
-                        })
-                    except Exception as e:
-                        logger.warning(f"Failed to generate category page for {category}: {str(e)}")
-                        continue
+            category_members = {
+                category: [s for s in scholarships if self._matches_category(s, category)]
+                for category in categories
+            }
+            category_members = {category: members for category, members in category_members.items() if members}
+
+            scholarship_results, category_results = await asyncio.gather(
+                asyncio.gather(
+                    *(self.scholarship_generator.generate_scholarship_page(s) for s in selected),
+                    return_exceptions=True
+                ),
+                asyncio.gather(
+                    *(self.category_generator.generate_category_page(c, members) for c, members in category_members.items()),
+                    return_exceptions=True
+                ),
+            )
+
+            for scholarship, page_data in zip(selected, scholarship_results, strict=True):
+                if isinstance(page_data, Exception):
+                    logger.warning(f"Failed to generate page for scholarship {scholarship.id}: {str(page_data)}")
+                    continue
+                results["individual_pages"].append(page_data)
+                self.sitemap_entries.append({
+                    "url": f"/scholarships/{page_data['slug']}",
+                    "lastmod": datetime.utcnow().isoformat(),
+                    "priority": 0.8
+                })
+
+            for category, page_data in zip(category_members, category_results, strict=True):
+                if isinstance(page_data, Exception):
+                    logger.warning(f"Failed to generate category page for {category}: {str(page_data)}")
+                    continue
+                results["category_pages"].append(page_data)
+                self.sitemap_entries.append({
+                    "url": f"/scholarships/{page_data['slug']}",
+                    "lastmod": datetime.utcnow().isoformat(),
+                    "priority": 0.9
+                })
 
             # Calculate final stats
             all_pages = results["individual_pages"] + results["category_pages"]
@@ -519,7 +500,7 @@ class AutoPageMakerService:
 
     def _matches_category(self, scholarship: Scholarship, category: str) -> bool:
         """Check if scholarship matches category"""
-        title_lower = scholarship.title.lower()
+        title_lower = scholarship.name.lower()
         desc_lower = scholarship.description.lower()
 
         category_keywords = {
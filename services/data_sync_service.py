@@ -8,14 +8,12 @@ Implements:
 """
 
 import asyncio
-import os
 from datetime import datetime, timezone, timedelta
 from typing import Optional
-from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy import text
 
+from database.engine_registry import BACKGROUND_POOL, engine_registry
 from utils.logger import get_logger
 from models.business_events import BusinessEvent
 
@@ -33,45 +31,9 @@ class DataSyncService:
         self._scheduler_running = False
         self._scheduler_task: Optional[asyncio.Task] = None
         
-        database_url = os.getenv("DATABASE_URL", "")
-        if database_url.startswith("postgresql://"):
-            database_url = database_url.replace("postgresql://", "postgresql+asyncpg://")
-        
-        parsed = urlparse(database_url)
-        query_params = parse_qs(parsed.query)
-        ssl_mode = query_params.pop('sslmode', ['prefer'])[0]
-        new_query = urlencode(query_params, doseq=True)
-        database_url = urlunparse((
-            parsed.scheme,
-            parsed.netloc,
-            parsed.path,
-            parsed.params,
-            new_query,
-            parsed.fragment
-        ))
-        
-        connect_args = {}
-        if ssl_mode in ('require', 'verify-ca', 'verify-full', 'prefer'):
-            import ssl
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            connect_args['ssl'] = ssl_context
-        
-        self.engine = create_async_engine(
-            database_url,
-            pool_size=2,
-            max_overflow=0,
-            pool_pre_ping=True,
-            echo=False,
-            connect_args=connect_args
-        )
-        
-        self.async_session_maker = async_sessionmaker(
-            self.engine,
-            class_=AsyncSession,
-            expire_on_commit=False
-        )
+        # Background pool from the central registry (shared with event emission)
+        self.engine = engine_registry.get_async_engine(BACKGROUND_POOL)
+        self.async_session_maker = engine_registry.async_sessionmaker(BACKGROUND_POOL)
         
         logger.info("DataSyncService initialized")
     
@@ -113,6 +75,9 @@ class DataSyncService:
                 await session.commit()
                 
                 logger.info(f"Updated {synced_count} scholarships")
+
+            from services.scholarship_service import scholarship_service
+            scholarship_service.invalidate_caches()
             
             sync_end = datetime.now(timezone.utc)
             duration_ms = int((sync_end - sync_start).total_seconds() * 1000)
@@ -0,0 +1,227 @@
+"""
+Eligibility Engine - Vectorized Batch Eligibility Scoring
+Compiles catalog eligibility criteria into NumPy columns once per catalog version
+
+Scores one profile, or a batch of profiles, against the whole catalog in a single
+broadcast pass. Scores are bit-for-bit identical to EligibilityService._evaluate_eligibility;
+human-readable reasons are left to the caller and built only for returned rows.
+"""
+
+import threading
+import numpy as np
+
+from models.scholarship import Scholarship
+from models.user import UserProfile
+from services.scholarship_service import scholarship_service
+from utils.epoch import epoch_microseconds
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# Profile-independent scholarship type bonus; need_based depends on the profile
+TYPE_BONUS = {"merit_based": 0.05, "academic_achievement": 0.05}
+
+def _optional_column(values) -> np.ndarray:
+    return np.array([np.nan if v is None else float(v) for v in values], dtype=np.float64)
+
+
+class CompiledCatalog:
+    """Columnar eligibility criteria for a fixed list of scholarships"""
+
+    def __init__(self, scholarships: list[Scholarship], version: int | None = None):
+        self.version = version
+        self.scholarships = scholarships
+        self.size = len(scholarships)
+        self.positions = {sch.id: i for i, sch in enumerate(scholarships)}
+
+        criteria = [sch.eligibility_criteria for sch in scholarships]
+
+        # Numeric ranges (NaN = no requirement)
+        self.min_gpa = _optional_column(c.min_gpa for c in criteria)
+        self.max_gpa = _optional_column(c.max_gpa for c in criteria)
+        self.min_age = _optional_column(c.min_age for c in criteria)
+        self.max_age = _optional_column(c.max_age for c in criteria)
+        self.has_min_gpa = ~np.isnan(self.min_gpa)
+        self.has_max_gpa = ~np.isnan(self.max_gpa)
+        self.has_min_age = ~np.isnan(self.min_age)
+        self.has_max_age = ~np.isnan(self.max_age)
+
+        # Financial need: has requirement / requires need
+        self.has_financial_need = np.array([c.financial_need is not None for c in criteria], dtype=bool)
+        self.requires_financial_need = np.array([bool(c.financial_need) for c in criteria], dtype=bool)
+
+        # Set-membership criteria: restriction mask + bitmap per allowed value
+        self.grade_restricted, self.grade_bitmaps = self._membership(
+            [c.grade_levels for c in criteria]
+        )
+        self.citizenship_restricted, self.citizenship_bitmaps = self._membership(
+            [[c.citizenship_required] if c.citizenship_required else [] for c in criteria]
+        )
+        self.state_restricted, self.state_bitmaps = self._membership(
+            [c.residency_states for c in criteria]
+        )
+        self.field_restricted, self.field_bitmaps = self._membership(
+            [[f.value for f in c.fields_of_study] for c in criteria]
+        )
+
+        # Profile-independent recommendation score parts (see SearchService)
+        amounts = np.array([sch.amount for sch in scholarships], dtype=np.float64)
+        self.amount_bonus = np.select([amounts >= 5000, amounts >= 1000], [0.1, 0.05], 0.0)
+        types = [sch.scholarship_type.value for sch in scholarships]
+        self.type_bonus = np.array([TYPE_BONUS.get(t, 0.0) for t in types], dtype=np.float64)
+        self.need_based = np.array([t == "need_based" for t in types], dtype=bool)
+        self.deadline_us = np.array(
+            [epoch_microseconds(sch.application_deadline) for sch in scholarships], dtype=np.int64
+        )
+
+    def _membership(self, allowed: list[list[str]]) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+        restricted = np.array([bool(values) for values in allowed], dtype=bool)
+        bitmaps: dict[str, np.ndarray] = {}
+        for position, values in enumerate(allowed):
+            for value in values or ():
+                bitmap = bitmaps.get(value)
+                if bitmap is None:
+                    bitmap = bitmaps[value] = np.zeros(self.size, dtype=bool)
+                bitmap[position] = True
+        return restricted, bitmaps
+
+    def _allowed(self, bitmaps: dict[str, np.ndarray], values: list[str | None]) -> np.ndarray:
+        """Stack per-profile membership rows into a (profiles, catalog) matrix"""
+        empty = np.zeros(self.size, dtype=bool)
+        return np.stack([bitmaps.get(v, empty) if v is not None else empty for v in values])
+
+    def score(self, profiles: list[UserProfile]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Score profiles against every scholarship in the catalog.
+
+        Returns (eligible, match_score) arrays of shape (len(profiles), catalog size).
+        Penalties are applied in the same order as the scalar evaluator so
+        floating-point results are identical.
+        """
+        shape = (len(profiles), self.size)
+        eligible = np.ones(shape, dtype=bool)
+        match = np.ones(shape, dtype=np.float64)
+        if not profiles or not self.size:
+            return eligible, match
+
+        def column(values) -> tuple[np.ndarray, np.ndarray]:
+            known = np.array([v is not None for v in values], dtype=bool)[:, None]
+            data = np.array([np.nan if v is None else float(v) for v in values], dtype=np.float64)[:, None]
+            return known, data
+
+        def penalize(mask: np.ndarray, amount: float) -> None:
+            np.subtract(match, amount, out=match, where=mask)
+
+        def fail(mask: np.ndarray, amount: float) -> None:
+            eligible[mask] = False
+            penalize(mask, amount)
+
+        gpa_known, gpa = column([p.gpa for p in profiles])
+        age_known, age = column([p.age for p in profiles])
+
+        with np.errstate(invalid="ignore"):
+            # GPA range
+            penalize(self.has_min_gpa & ~gpa_known, 0.3)
+            fail(self.has_min_gpa & gpa_known & (gpa < self.min_gpa), 0.4)
+            fail(self.has_max_gpa & gpa_known & (gpa > self.max_gpa), 0.4)
+
+            # Grade level, citizenship, residency, field of study
+            for restricted, bitmaps, values, missing_penalty, fail_penalty in (
+                (self.grade_restricted, self.grade_bitmaps,
+                 [p.grade_level for p in profiles], 0.2, 0.3),
+                (self.citizenship_restricted, self.citizenship_bitmaps,
+                 [p.citizenship for p in profiles], 0.2, 0.4),
+                (self.state_restricted, self.state_bitmaps,
+                 [p.state_of_residence for p in profiles], 0.2, 0.3),
+                (self.field_restricted, self.field_bitmaps,
+                 [p.field_of_study.value if p.field_of_study else None for p in profiles], 0.2, 0.3),
+            ):
+                known = np.array([v is not None for v in values], dtype=bool)[:, None]
+                penalize(restricted & ~known, missing_penalty)
+                fail(restricted & known & ~self._allowed(bitmaps, values), fail_penalty)
+
+            # Age range
+            penalize(self.has_min_age & ~age_known, 0.1)
+            fail(self.has_min_age & age_known & (age < self.min_age), 0.2)
+            fail(self.has_max_age & age_known & (age > self.max_age), 0.2)
+
+        # Financial need
+        need_known = np.array([p.financial_need is not None for p in profiles], dtype=bool)[:, None]
+        has_need = np.array([bool(p.financial_need) for p in profiles], dtype=bool)[:, None]
+        penalize(self.has_financial_need & ~need_known, 0.1)
+        fail(self.has_financial_need & need_known & self.requires_financial_need & ~has_need, 0.2)
+
+        np.clip(match, 0.0, 1.0, out=match)
+        return eligible, match
+
+
+class EligibilityEngine:
+    """Holds the compiled catalog and recompiles it when the catalog version changes"""
+
+    def __init__(self):
+        self._compiled: CompiledCatalog | None = None
+        self._lock = threading.Lock()
+        self.compilations = 0
+
+    @property
+    def compiled(self) -> CompiledCatalog | None:
+        """Most recently compiled versioned catalog, without checking for a newer version"""
+        return self._compiled
+
+    def _current(self, version: int | None) -> CompiledCatalog | None:
+        compiled = self._compiled
+        if compiled is not None and version is not None and compiled.version == version:
+            return compiled
+        return None
+
+    def _compile(self, scholarships: list[Scholarship], version: int | None) -> CompiledCatalog:
+        compiled = CompiledCatalog(scholarships, version)
+        self.compilations += 1
+        logger.info(f"Compiled eligibility catalog: {compiled.size} scholarships (version {version})")
+        # Unversioned catalogs (index unavailable) are never reused
+        if version is not None:
+            self._compiled = compiled
+        return compiled
+
+    def catalog(self) -> CompiledCatalog:
+        """Return the compiled catalog for the current scholarship catalog version"""
+        version = scholarship_service.catalog_version()
+        compiled = self._current(version)
+        if compiled is not None:
+            return compiled
+
+        with self._lock:
+            compiled = self._current(version)
+            if compiled is not None:
+                return compiled
+            return self._compile(scholarship_service.get_all_scholarships(), version)
+
+    async def catalog_async(self) -> CompiledCatalog:
+        """catalog() for async handlers; loads scholarships over the AsyncSession path"""
+        version = await scholarship_service.catalog_version_async()
+        compiled = self._current(version)
+        if compiled is not None:
+            return compiled
+
+        scholarships = await scholarship_service.get_all_scholarships_async()
+        with self._lock:
+            compiled = self._current(version)
+            if compiled is not None:
+                return compiled
+            return self._compile(scholarships, version)
+
+    def score(self, user_profile: UserProfile) -> tuple[CompiledCatalog, np.ndarray, np.ndarray]:
+        """Score a single profile; returns (catalog, eligible[n], match_score[n])"""
+        compiled = self.catalog()
+        eligible, match = compiled.score([user_profile])
+        return compiled, eligible[0], match[0]
+
+    def score_batch(self, user_profiles: list[UserProfile]) -> tuple[CompiledCatalog, np.ndarray, np.ndarray]:
+        """Score a batch of profiles; returns (catalog, eligible[p, n], match_score[p, n])"""
+        compiled = self.catalog()
+        eligible, match = compiled.score(user_profiles)
+        return compiled, eligible, match
+
+
+eligibility_engine = EligibilityEngine()
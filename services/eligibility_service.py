@@ -1,17 +1,23 @@
+import numpy as np
+
 
 from models.scholarship import Scholarship
 from models.user import EligibilityResult, UserProfile
+from services.eligibility_engine import eligibility_engine
+from services.query_cache import query_optimization_service
 from services.scholarship_service import scholarship_service
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+ALL_CRITERIA_MET = "All eligibility criteria met"
+
 class EligibilityService:
     """Service for checking scholarship eligibility"""
 
     def check_eligibility(self, user_profile: UserProfile, scholarship_id: str) -> EligibilityResult:
         """Check if user is eligible for a specific scholarship"""
-        logger.info(f"Checking eligibility for user {user_profile.id} and scholarship {scholarship_id}")
+        logger.info("Checking eligibility for user %s and scholarship %s", user_profile.id, scholarship_id)
 
         scholarship = scholarship_service.get_scholarship_by_id(scholarship_id)
         if not scholarship:
@@ -24,32 +30,86 @@ class EligibilityService:
 
         return self._evaluate_eligibility(user_profile, scholarship)
 
+    async def check_eligibility_async(self, user_profile: UserProfile, scholarship_id: str) -> EligibilityResult:
+        """check_eligibility for async handlers"""
+        logger.info("Checking eligibility for user %s and scholarship %s", user_profile.id, scholarship_id)
+
+        scholarship = await scholarship_service.get_scholarship_by_id_async(scholarship_id)
+        if not scholarship:
+            return EligibilityResult(
+                scholarship_id=scholarship_id,
+                eligible=False,
+                reasons=["Scholarship not found"],
+                match_score=0.0
+            )
+
+        return self._evaluate_eligibility(user_profile, scholarship)
+
     def check_multiple_eligibilities(self, user_profile: UserProfile,
                                    scholarship_ids: list[str]) -> list[EligibilityResult]:
         """Check eligibility for multiple scholarships"""
+        # Resolve scholarships from the compiled catalog instead of one lookup per ID
+        catalog = eligibility_engine.catalog()
         results = []
         for scholarship_id in scholarship_ids:
-            result = self.check_eligibility(user_profile, scholarship_id)
+            position = catalog.positions.get(scholarship_id)
+            if position is None:
+                result = self.check_eligibility(user_profile, scholarship_id)
+            else:
+                result = self._evaluate_eligibility(user_profile, catalog.scholarships[position])
             results.append(result)
 
-        logger.info(f"Checked eligibility for {len(scholarship_ids)} scholarships")
+        logger.info("Checked eligibility for %d scholarships", len(scholarship_ids))
         return results
 
+    async def check_multiple_eligibilities_async(self, user_profile: UserProfile,
+                                                 scholarship_ids: list[str]) -> list[EligibilityResult]:
+        """check_multiple_eligibilities for async handlers"""
+        catalog = await eligibility_engine.catalog_async()
+        results = []
+        for scholarship_id in scholarship_ids:
+            position = catalog.positions.get(scholarship_id)
+            if position is None:
+                result = await self.check_eligibility_async(user_profile, scholarship_id)
+            else:
+                result = self._evaluate_eligibility(user_profile, catalog.scholarships[position])
+            results.append(result)
+
+        logger.info("Checked eligibility for %d scholarships", len(scholarship_ids))
+        return results
+
+    def evaluate_scholarships(self, user_profile: UserProfile,
+                              scholarships: list[Scholarship]) -> list[EligibilityResult]:
+        """Evaluate scholarships the caller already holds; no lookups by id"""
+        return [self._evaluate_eligibility(user_profile, scholarship) for scholarship in scholarships]
+
     def get_eligible_scholarships(self, user_profile: UserProfile,
                                 min_match_score: float = 0.7) -> list[EligibilityResult]:
-        """Get all scholarships user is eligible for"""
-        all_scholarships = scholarship_service.get_all_scholarships()
-        eligible_results = []
+        """Get all scholarships user is eligible for (read-through query cache)"""
+        results = query_optimization_service.get_eligible_scholarships(
+            user_profile,
+            min_match_score,
+            loader=lambda: self._compute_eligible_scholarships(user_profile, min_match_score),
+            version=scholarship_service.catalog_version()
+        )
+        # Shallow copy so callers can reorder/slice without touching the cached list
+        return list(results)
+
+    def _compute_eligible_scholarships(self, user_profile: UserProfile,
+                                       min_match_score: float) -> list[EligibilityResult]:
+        """Evaluate the user profile against every active scholarship in one vectorized pass"""
+        catalog, eligible, match_scores = eligibility_engine.score(user_profile)
 
-        for scholarship in all_scholarships:
-            result = self._evaluate_eligibility(user_profile, scholarship)
-            if result.eligible and result.match_score >= min_match_score:
-                eligible_results.append(result)
+        # Sort by match score (highest first); stable, so catalog order breaks ties
+        positions = np.flatnonzero(eligible & (match_scores >= min_match_score))
+        positions = positions[np.argsort(-match_scores[positions], kind="stable")]
 
-        # Sort by match score (highest first)
-        eligible_results.sort(key=lambda x: x.match_score, reverse=True)
+        # Reasons are only built for the rows actually returned
+        eligible_results = [
+            self._evaluate_eligibility(user_profile, catalog.scholarships[p]) for p in positions
+        ]
 
-        logger.info(f"Found {len(eligible_results)} eligible scholarships for user")
+        logger.info("Found %d eligible scholarships for user", len(eligible_results))
         return eligible_results
 
     def _evaluate_eligibility(self, user_profile: UserProfile,
@@ -147,7 +207,7 @@ class EligibilityService:
 
         # If eligible, add positive reasons
         if eligible and not reasons:
-            reasons.append("All eligibility criteria met")
+            reasons.append(ALL_CRITERIA_MET)
 
         return EligibilityResult(
             scholarship_id=scholarship.id,
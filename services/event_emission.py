@@ -7,10 +7,10 @@ import asyncio
 from typing import Optional
 from datetime import datetime
 from contextlib import asynccontextmanager
-import os
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy import text
+
+from database.engine_registry import BACKGROUND_POOL, engine_registry
 from models.business_events import BusinessEvent
 
 logger = logging.getLogger(__name__)
@@ -33,62 +33,9 @@ class EventEmissionService:
         self.max_failures = 10
         self.circuit_open = False
         
-        # Create async engine for event emission
-        database_url = os.getenv("DATABASE_URL", "")
-        if database_url.startswith("postgresql://"):
-            # Convert to async driver
-            database_url = database_url.replace("postgresql://", "postgresql+asyncpg://")
-        
-        # Remove sslmode parameter - asyncpg handles SSL differently
-        # Parse URL and remove sslmode query parameter
-        from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
-        parsed = urlparse(database_url)
-        query_params = parse_qs(parsed.query)
-        
-        # Remove sslmode - asyncpg uses ssl=True/False instead
-        ssl_mode = query_params.pop('sslmode', ['prefer'])[0]
-        
-        # Reconstruct URL without sslmode
-        new_query = urlencode(query_params, doseq=True)
-        database_url = urlunparse((
-            parsed.scheme,
-            parsed.netloc,
-            parsed.path,
-            parsed.params,
-            new_query,
-            parsed.fragment
-        ))
-        
-        # Configure SSL based on sslmode
-        connect_args = {}
-        if ssl_mode in ('require', 'verify-ca', 'verify-full'):
-            import ssl
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            connect_args['ssl'] = ssl_context
-        elif ssl_mode == 'prefer':
-            # Try SSL but don't require it
-            import ssl
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            connect_args['ssl'] = ssl_context
-        
-        self.engine = create_async_engine(
-            database_url,
-            pool_size=2,  # Small pool for background events
-            max_overflow=0,
-            pool_pre_ping=True,
-            echo=False,
-            connect_args=connect_args
-        )
-        
-        self.async_session_maker = async_sessionmaker(
-            self.engine,
-            class_=AsyncSession,
-            expire_on_commit=False
-        )
+        # Background pool from the central registry (small budget, never the request path)
+        self.engine = engine_registry.get_async_engine(BACKGROUND_POOL)
+        self.async_session_maker = engine_registry.async_sessionmaker(BACKGROUND_POOL)
     
     async def emit(self, event: BusinessEvent) -> bool:
         """
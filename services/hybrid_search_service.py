@@ -3,11 +3,12 @@ Hybrid Search Service - Hard Filters + Semantic Ranking
 ML DIRECTIVE: Eliminate False Positives through strict eligibility enforcement
 """
 
+import time
 from datetime import datetime
 from typing import Optional
 
 from pydantic import BaseModel, Field
-from sqlalchemy import and_, or_
+from sqlalchemy import Select
 from sqlalchemy.orm import Session
 
 from models.database import ScholarshipDB, SessionLocal
@@ -19,6 +20,11 @@ from models.scholarship import (
     ScholarshipType,
     SearchResponse,
 )
+from services.scholarship_repository import (
+    active_scholarships,
+    keyword_clause,
+    scholarship_repository,
+)
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -77,6 +83,26 @@ class HybridSearchService:
         """Get database session"""
         return SessionLocal()
 
+    def _candidate_statement(self, filters: HybridSearchFilters) -> Select:
+        """Column filters (deadline, amount, type, keyword); eligibility is applied in Python"""
+        stmt = active_scholarships().where(
+            ScholarshipDB.application_deadline >= datetime.utcnow()
+        )
+
+        if filters.min_amount is not None:
+            stmt = stmt.where(ScholarshipDB.amount >= filters.min_amount)
+        if filters.max_amount is not None:
+            stmt = stmt.where(ScholarshipDB.amount <= filters.max_amount)
+
+        if filters.scholarship_types:
+            type_values = [t.value for t in filters.scholarship_types]
+            stmt = stmt.where(ScholarshipDB.scholarship_type.in_(type_values))
+
+        if filters.keyword:
+            stmt = stmt.where(keyword_clause(filters.keyword))
+
+        return stmt.order_by(ScholarshipDB.application_deadline)
+
     def search_with_hard_filters(
         self,
         filters: HybridSearchFilters
@@ -85,85 +111,80 @@ class HybridSearchService:
         Execute hybrid search with hard eligibility filters.
         Hard filters: deadline, GPA, residency, major
         """
-        import time
         start_time = time.time()
         
         db = self._get_db_session()
         try:
-            now = datetime.utcnow()
-            hard_filters_applied = ["deadline"]
-            
-            query = db.query(ScholarshipDB).filter(
-                ScholarshipDB.is_active == True,
-                ScholarshipDB.application_deadline >= now
-            )
-            
-            if filters.min_amount is not None:
-                query = query.filter(ScholarshipDB.amount >= filters.min_amount)
-            if filters.max_amount is not None:
-                query = query.filter(ScholarshipDB.amount <= filters.max_amount)
-            
-            if filters.scholarship_types:
-                type_values = [t.value for t in filters.scholarship_types]
-                query = query.filter(ScholarshipDB.scholarship_type.in_(type_values))
-            
-            if filters.keyword:
-                keyword_pattern = f"%{filters.keyword}%"
-                query = query.filter(
-                    or_(
-                        ScholarshipDB.name.ilike(keyword_pattern),
-                        ScholarshipDB.description.ilike(keyword_pattern),
-                        ScholarshipDB.organization.ilike(keyword_pattern)
-                    )
-                )
-            
-            total_before_eligibility = query.count()
-            all_scholarships = query.order_by(ScholarshipDB.application_deadline).all()
-            
-            results = []
-            filtered_out = 0
-            
-            for db_sch in all_scholarships:
-                eligibility_result = self._apply_hard_filters(
-                    db_sch, 
-                    filters.student_profile,
-                    hard_filters_applied
-                )
-                
-                if eligibility_result["passed"]:
-                    scholarship_summary = self._db_to_summary(db_sch)
-                    results.append(HybridSearchResult(
-                        scholarship=scholarship_summary,
-                        eligibility_score=eligibility_result["score"],
-                        hard_filter_passed=True,
-                        filter_details=eligibility_result["details"]
-                    ))
-                else:
-                    filtered_out += 1
-            
-            results.sort(key=lambda x: x.eligibility_score, reverse=True)
-            
-            paginated_results = results[filters.offset:filters.offset + filters.limit]
-            
-            took_ms = int((time.time() - start_time) * 1000)
-            
-            fpr_reduction = (filtered_out / max(total_before_eligibility, 1)) * 100
-            
-            return HybridSearchResponse(
-                results=paginated_results,
-                total_count=len(results),
-                filtered_out_count=filtered_out,
-                hard_filters_applied=hard_filters_applied,
-                fpr_reduction_estimate=round(fpr_reduction, 2),
-                took_ms=took_ms
-            )
-            
+            candidates = db.scalars(self._candidate_statement(filters)).all()
+            return self._rank(candidates, filters, start_time)
         except Exception as e:
             logger.error(f"Hybrid search failed: {str(e)}")
             raise
         finally:
             db.close()
 
+    async def search_with_hard_filters_async(
+        self,
+        filters: HybridSearchFilters
+    ) -> HybridSearchResponse:
+        """search_with_hard_filters for async handlers (AsyncSession read path)"""
+        start_time = time.time()
+
+        try:
+            candidates = await scholarship_repository.fetch(self._candidate_statement(filters))
+            return self._rank(candidates, filters, start_time)
+        except Exception as e:
+            logger.error(f"Hybrid search failed: {str(e)}")
+            raise
+
+    def _rank(
+        self,
+        all_scholarships: list[ScholarshipDB],
+        filters: HybridSearchFilters,
+        start_time: float
+    ) -> HybridSearchResponse:
+        """Apply hard eligibility filters to the candidates, rank and paginate"""
+        hard_filters_applied = ["deadline"]
+        total_before_eligibility = len(all_scholarships)
+        
+        results = []
+        filtered_out = 0
+        
+        for db_sch in all_scholarships:
+            eligibility_result = self._apply_hard_filters(
+                db_sch, 
+                filters.student_profile,
+                hard_filters_applied
+            )
+            
+            if eligibility_result["passed"]:
+                scholarship_summary = self._db_to_summary(db_sch)
+                results.append(HybridSearchResult(
+                    scholarship=scholarship_summary,
+                    eligibility_score=eligibility_result["score"],
+                    hard_filter_passed=True,
+                    filter_details=eligibility_result["details"]
+                ))
+            else:
+                filtered_out += 1
+        
+        results.sort(key=lambda x: x.eligibility_score, reverse=True)
+        
+        paginated_results = results[filters.offset:filters.offset + filters.limit]
+        
+        took_ms = int((time.time() - start_time) * 1000)
+        
+        fpr_reduction = (filtered_out / max(total_before_eligibility, 1)) * 100
+        
+        return HybridSearchResponse(
+            results=paginated_results,
+            total_count=len(results),
+            filtered_out_count=filtered_out,
+            hard_filters_applied=hard_filters_applied,
+            fpr_reduction_estimate=round(fpr_reduction, 2),
+            took_ms=took_ms
+        )
+
     def _apply_hard_filters(
         self,
         db_sch: ScholarshipDB,
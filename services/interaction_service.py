@@ -2,14 +2,13 @@
 Interaction Service for Logging User Behavior and API Analytics
 """
 
-import builtins
-import contextlib
 from typing import Any
 
 from fastapi import Request, Response
 from sqlalchemy.orm import Session
 
 from models.interaction import InteractionDB
+from services.analytics_writer import InteractionRecord, analytics_writer
 from utils.logger import get_logger
 
 logger = get_logger("interaction_service")
@@ -17,8 +16,8 @@ logger = get_logger("interaction_service")
 class InteractionService:
     """Service for logging user interactions"""
 
-    def __init__(self, db_session: Session):
-        self.db = db_session
+    def __init__(self, db_session: Session | None = None):
+        self.db = db_session  # only needed for get_interaction_stats; logging is write-behind
 
     async def log_interaction(
         self,
@@ -31,7 +30,7 @@ class InteractionService:
         trace_id: str | None = None
     ) -> str | None:
         """
-        Log user interaction to database
+        Queue a user interaction for the background analytics writer
 
         Args:
             event_type: Type of event (root_view, list_scholarships, view_scholarship, search_scholarships)
@@ -43,7 +42,7 @@ class InteractionService:
             trace_id: Request trace ID for correlation
 
         Returns:
-            Interaction ID if successful, None if failed
+            Interaction ID if queued, None if failed
         """
         try:
             # Extract request information
@@ -58,8 +57,8 @@ class InteractionService:
             # Sanitize metadata - remove sensitive information
             safe_metadata = self._sanitize_metadata(metadata, request)
 
-            # Create interaction record
-            interaction = InteractionDB(
+            # Queue an immutable record; the row is inserted by services/analytics_writer.py
+            interaction_id = analytics_writer.enqueue(InteractionRecord(
                 event_type=event_type,
                 user_id=user_id,
                 scholarship_id=scholarship_id,
@@ -68,15 +67,12 @@ class InteractionService:
                 status=status,
                 trace_id=trace_id,
                 request_metadata=safe_metadata
-            )
-
-            self.db.add(interaction)
-            self.db.commit()
+            ))
 
             logger.info(
-                f"Logged interaction: {event_type}",
+                f"Queued interaction: {event_type}",
                 extra={
-                    "interaction_id": interaction.id,
+                    "interaction_id": interaction_id,
                     "event_type": event_type,
                     "user_id": user_id,
                     "scholarship_id": scholarship_id,
@@ -87,7 +83,7 @@ class InteractionService:
                 }
             )
 
-            return interaction.id
+            return interaction_id
 
         except Exception as e:
             # Never let interaction logging break the main request
@@ -101,9 +97,6 @@ class InteractionService:
                     "trace_id": trace_id
                 }
             )
-            # Rollback any partial transaction
-            with contextlib.suppress(builtins.BaseException):
-                self.db.rollback()
             return None
 
     def _sanitize_metadata(
@@ -223,6 +223,10 @@ class JWKSClient:
         await self._refresh_keys()
         return self._keys.get(kid)
     
+    def has_key(self, kid: str) -> bool:
+        """Whether kid is in the current key set (no refresh)"""
+        return kid in self._keys
+
     async def prewarm(self):
         """
         Prewarm cache on startup
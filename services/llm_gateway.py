@@ -0,0 +1,225 @@
+"""
+LLM Gateway
+Async chat completions for request-path AI features (services/openai_service.py)
+
+- One process-wide AsyncOpenAI client over a pooled HTTP connection, so
+  completions no longer block the worker's event loop
+- Every call has a timeout; when the last caller waiting on a completion is
+  cancelled the upstream request is cancelled too
+- Identical concurrent requests share one upstream call (single-flight)
+- Callers can opt into an LRU + TTL result cache keyed on normalised inputs
+  (QueryResultCache from services/query_cache.py)
+- Latency, token and outcome metrics per operation
+- Backends are pluggable: OpenAIBackend in production, FakeLLMBackend in tests
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+from config.settings import settings
+from observability.metrics import (
+    llm_gateway_latency_seconds,
+    llm_gateway_requests_total,
+    llm_gateway_tokens_total,
+)
+from services.query_cache import QueryResultCache
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class LLMResult:
+    text: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+class LLMBackend(Protocol):
+    """Anything that can answer a chat completion request"""
+
+    async def chat(self, request: dict[str, Any]) -> LLMResult: ...
+
+    async def close(self) -> None: ...
+
+
+class OpenAIBackend:
+    """AsyncOpenAI over a pooled, keep-alive HTTP client"""
+
+    def __init__(self, api_key: str, base_url: str | None = None, max_connections: int | None = None):
+        max_connections = max_connections or settings.llm_gateway_max_connections
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            # Timeouts are enforced per call by the gateway; retries would hide them
+            max_retries=0,
+            http_client=DefaultAsyncHttpxClient(limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            )),
+        )
+
+    async def chat(self, request: dict[str, Any]) -> LLMResult:
+        response = await self.client.chat.completions.create(**request)
+        usage = response.usage
+        return LLMResult(
+            text=response.choices[0].message.content or "",
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0,
+        )
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+class FakeLLMBackend:
+    """In-process backend for tests: answers with responder(request) after an optional delay"""
+
+    def __init__(self, responder: Callable[[dict[str, Any]], str] | None = None, delay: float = 0.0):
+        self.responder = responder or (lambda request: json.dumps({"echo": request["messages"][-1]["content"]}))
+        self.delay = delay
+        self.requests: list[dict[str, Any]] = []
+        self.cancelled = 0
+
+    async def chat(self, request: dict[str, Any]) -> LLMResult:
+        self.requests.append(request)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        text = self.responder(request)
+        return LLMResult(text=text, prompt_tokens=len(json.dumps(request["messages"])) // 4,
+                         completion_tokens=len(text) // 4)
+
+    async def close(self) -> None:
+        pass
+
+
+def request_key(request: dict[str, Any]) -> str:
+    payload = json.dumps(request, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LLMGateway:
+    """Timeouts, single-flight coalescing, result caching and metrics in front of an LLMBackend"""
+
+    def __init__(self, backend: LLMBackend, model: str = "gpt-4o", timeout: float | None = None,
+                 cache_max_entries: int | None = None, cache_ttl: float | None = None):
+        self.backend = backend
+        self.model = model
+        self.timeout = timeout or settings.llm_gateway_timeout_seconds
+        self.cache_max_entries = cache_max_entries or settings.llm_gateway_cache_max_entries
+        self.cache_ttl = cache_ttl or settings.llm_gateway_cache_ttl_seconds
+        self._caches: dict[str, QueryResultCache] = {}
+        # {request key: (shared upstream task, callers still waiting on it)}
+        self._inflight: dict[str, list] = {}
+
+    async def _call(self, operation: str, request: dict[str, Any], timeout: float) -> str:
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(self.backend.chat(request), timeout)
+        except asyncio.TimeoutError:
+            llm_gateway_requests_total.labels(operation=operation, result="timeout").inc()
+            raise
+        except asyncio.CancelledError:
+            llm_gateway_requests_total.labels(operation=operation, result="cancelled").inc()
+            raise
+        except Exception:
+            llm_gateway_requests_total.labels(operation=operation, result="error").inc()
+            raise
+        finally:
+            llm_gateway_latency_seconds.labels(operation=operation).observe(time.perf_counter() - started)
+        llm_gateway_requests_total.labels(operation=operation, result="success").inc()
+        llm_gateway_tokens_total.labels(operation=operation, kind="prompt").inc(result.prompt_tokens)
+        llm_gateway_tokens_total.labels(operation=operation, kind="completion").inc(result.completion_tokens)
+        return result.text
+
+    async def complete(self, operation: str, messages: list[dict[str, str]], *, temperature: float,
+                       max_tokens: int | None = None, json_mode: bool = False,
+                       timeout: float | None = None) -> str:
+        """
+        Completion text for messages. Raises on timeout or backend error so
+        callers can fall back; results are never cached from here.
+        """
+        request: dict[str, Any] = {"model": self.model, "messages": messages, "temperature": temperature}
+        if max_tokens is not None:
+            request["max_tokens"] = max_tokens
+        if json_mode:
+            request["response_format"] = {"type": "json_object"}
+
+        key = request_key(request)
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            task = asyncio.ensure_future(self._call(operation, request, timeout or self.timeout))
+            inflight = self._inflight[key] = [task, 0]
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            llm_gateway_requests_total.labels(operation=operation, result="coalesced").inc()
+        task = inflight[0]
+        inflight[1] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # Nobody left to use the answer: stop the upstream request as well
+            if inflight[1] == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            inflight[1] -= 1
+
+    def _cache(self, namespace: str) -> QueryResultCache:
+        cache = self._caches.get(namespace)
+        if cache is None:
+            cache = self._caches[namespace] = QueryResultCache(
+                f"llm_{namespace}", self.cache_max_entries, self.cache_ttl
+            )
+        return cache
+
+    async def cached(self, namespace: str, key_parts: Any, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        loader() through the namespace's LRU + TTL cache. key_parts should be the
+        normalised inputs the prompt is built from; failures are not cached.
+        """
+        return await self._cache(namespace).get_or_load_async(request_key(key_parts), loader)
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+    def get_status(self) -> dict[str, Any]:
+        return {
+            "backend": type(self.backend).__name__,
+            "model": self.model,
+            "timeout_seconds": self.timeout,
+            "inflight": len(self._inflight),
+            "caches": {namespace: cache.get_stats() for namespace, cache in self._caches.items()},
+        }
+
+
+_gateway: LLMGateway | None = None
+
+
+def get_llm_gateway() -> LLMGateway | None:
+    """Process-wide gateway, created on first use; None when OPENAI_API_KEY is not configured"""
+    global _gateway
+    if _gateway is None:
+        api_key = os.environ.get("OPENAI_API_KEY")
+        if api_key:
+            _gateway = LLMGateway(OpenAIBackend(api_key))
+    return _gateway
+
+
+async def close_llm_gateway() -> None:
+    global _gateway
+    if _gateway is not None:
+        await _gateway.close()
+        _gateway = None
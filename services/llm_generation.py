@@ -0,0 +1,180 @@
+"""
+LLM Generation Engine
+Async, budgeted and cached chat completions for bulk content generation
+(services/auto_page_maker_service.py)
+
+- AsyncOpenAI client, so concurrent sections and pages overlap their network
+  waits instead of blocking the event loop one call at a time
+- One engine per generation run carries the global budget: at most
+  max_concurrency requests in flight and tokens_per_minute (prompt estimate +
+  max_tokens, settled against reported usage) across all of them
+- Completions are cached on disk by a hash of the full request (model,
+  messages, sampling parameters), so regenerating pages for unchanged
+  scholarships makes no API calls
+- The client honours OPENAI_BASE_URL, so tests and local runs can point it at
+  a stub server
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from openai import AsyncOpenAI
+
+from config.settings import settings
+from observability.metrics import (
+    llm_generation_rate_limit_wait_seconds,
+    llm_generation_requests_total,
+)
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Rough prompt size estimate when budgeting a request before it is sent
+CHARS_PER_TOKEN = 4
+
+
+def completion_key(request: dict[str, Any]) -> str:
+    """Content hash of a chat completion request"""
+    payload = json.dumps(request, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class CompletionCache:
+    """prompt -> completion text, one JSON file per request hash"""
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> str | None:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return json.load(f)["completion"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, key: str, completion: str) -> None:
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write-then-rename so a concurrent reader never sees a partial file
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"completion": completion}, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Could not cache completion {key[:12]}: {e}")
+
+
+class TokenRateLimiter:
+    """Async token bucket refilled at tokens_per_minute; waiters are served in arrival order"""
+
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = float(tokens_per_minute)
+        self.rate = tokens_per_minute / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: int) -> None:
+        tokens = min(tokens, self.capacity)
+        started = time.monotonic()
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    break
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+        llm_generation_rate_limit_wait_seconds.observe(time.monotonic() - started)
+
+    def settle(self, reserved: int, used: int) -> None:
+        """Correct a reservation once the API reports actual usage"""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + reserved - used)
+
+
+class LLMGenerationEngine:
+    """Shared client, concurrency/token budget and completion cache for one generation workload"""
+
+    def __init__(self, api_key: str | None = None, base_url: str | None = None,
+                 model: str = "gpt-4o", max_concurrency: int | None = None,
+                 tokens_per_minute: int | None = None, cache_dir: str | Path | None = None,
+                 timeout: float | None = None):
+        api_key = api_key or os.environ.get("OPENAI_API_KEY")
+        self.client = AsyncOpenAI(
+            api_key=api_key, base_url=base_url,
+            timeout=timeout or settings.llm_generation_timeout_seconds
+        ) if api_key else None
+        self.model = model
+        self.max_concurrency = max_concurrency or settings.llm_generation_max_concurrency
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.limiter = TokenRateLimiter(tokens_per_minute or settings.llm_generation_tokens_per_minute)
+        self.cache = CompletionCache(cache_dir or settings.llm_completion_cache_dir)
+
+    def is_available(self) -> bool:
+        return self.client is not None
+
+    async def complete(self, system: str, prompt: str, max_tokens: int,
+                       temperature: float = 0.7) -> str | None:
+        """
+        Completion text for this request: from the cache when the exact request
+        was answered before, otherwise from the API within the budget. None when
+        no client is configured or the call fails (callers keep their fallbacks).
+        """
+        request = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt},
+            ],
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+        key = completion_key(request)
+        cached = self.cache.get(key)
+        if cached is not None:
+            llm_generation_requests_total.labels(result="cache_hit").inc()
+            return cached
+        if self.client is None:
+            return None
+
+        reserved = (len(system) + len(prompt)) // CHARS_PER_TOKEN + max_tokens
+        async with self._semaphore:
+            await self.limiter.acquire(reserved)
+            try:
+                response = await self.client.chat.completions.create(**request)
+            except Exception as e:
+                llm_generation_requests_total.labels(result="failed").inc()
+                logger.error(f"Error generating content: {e}")
+                return None
+        if response.usage is not None:
+            self.limiter.settle(reserved, response.usage.total_tokens)
+
+        completion = (response.choices[0].message.content or "").strip()
+        llm_generation_requests_total.labels(result="generated").inc()
+        if completion:
+            self.cache.put(key, completion)
+        return completion or None
+
+    def get_status(self) -> dict[str, Any]:
+        return {
+            "available": self.is_available(),
+            "model": self.model,
+            "max_concurrency": self.max_concurrency,
+            "tokens_per_minute": int(self.limiter.capacity),
+            "cache_dir": str(self.cache.directory),
+        }
@@ -0,0 +1,168 @@
+"""
+Near-Duplicate Index - Shingle + MinHash + LSH
+Incremental near-duplicate lookup for generated SEO titles and page bodies
+
+Each text is reduced to a set of word shingles, summarised by a MinHash
+signature and filed under one LSH bucket per band. A lookup hashes the query
+the same way and only looks at the texts sharing a bucket: their MinHash
+estimates are screened in one vectorised comparison and the plausible ones
+verified with an exact Jaccard over the stored shingle sets. Checking a new
+page therefore costs about the same at 50k indexed pages as at 500 instead of
+growing with the corpus (tests/perf/scripts/near_duplicate_index.py).
+
+Bands are sized so that a pair at the index threshold becomes a candidate
+with >= 99% probability; pairs well below it are rarely compared at all.
+"""
+
+import zlib
+from collections.abc import Hashable, Iterable
+
+import numpy as np
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+# A 256-permutation MinHash estimate is within ~0.03 of the true Jaccard (1 sigma at 0.5);
+# candidates estimated further than this below the floor are not verified exactly
+ESTIMATE_MARGIN = 0.2
+
+
+# Function words common to nearly every generated page; dropping them keeps
+# signatures about content, so unrelated pages rarely share an LSH bucket
+STOPWORDS = frozenset(
+    "a about after all also an and any are as at be been before but by can do does each for from has have "
+    "how if in into is it its may more most must no not of on or our out over should so such than that the "
+    "their them then there these they this those through to up us was we were what when where which who "
+    "will with within you your".split()
+)
+
+
+def word_shingles(text: str, size: int = 1, stopwords: frozenset[str] = frozenset()) -> frozenset[str]:
+    """Lower-cased word k-grams, skipping stopwords; size=1 is the plain word set"""
+    words = text.lower().split()
+    if stopwords:
+        words = [word for word in words if word not in stopwords]
+    if size <= 1:
+        return frozenset(words)
+    if len(words) <= size:
+        return frozenset([" ".join(words)]) if words else frozenset()
+    return frozenset(" ".join(words[i:i + size]) for i in range(len(words) - size + 1))
+
+
+def jaccard(a: frozenset[str], b: frozenset[str]) -> float:
+    if not a or not b:
+        return 0.0
+    intersection = len(a & b)
+    return intersection / (len(a) + len(b) - intersection)
+
+
+def band_layout(threshold: float, num_perm: int, recall: float = 0.99) -> tuple[int, int]:
+    """(bands, rows) with the most rows per band that still finds pairs at threshold with `recall`"""
+    for rows in range(num_perm, 0, -1):
+        bands = num_perm // rows
+        if 1 - (1 - threshold ** rows) ** bands >= recall:
+            return bands, rows
+    return num_perm, 1
+
+
+class MinHasher:
+    """MinHash signatures from num_perm universal hash functions (a*x + b mod p)"""
+
+    def __init__(self, num_perm: int = 256, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self._a = rng.randint(1, np.iinfo(np.int64).max, size=num_perm, dtype=np.int64).astype(np.uint64) % _MERSENNE_PRIME
+        self._b = rng.randint(0, np.iinfo(np.int64).max, size=num_perm, dtype=np.int64).astype(np.uint64) % _MERSENNE_PRIME
+
+    def signature(self, shingles: Iterable[str]) -> np.ndarray:
+        hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64)
+        if hashes.size == 0:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        # uint64 wrap-around is intended: the products are only used as a hash family
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0)
+
+
+class NearDuplicateIndex:
+    """Incremental LSH index answering "which indexed texts are near-duplicates of this one?" """
+
+    def __init__(self, threshold: float = 0.8, shingle_size: int = 1, num_perm: int = 256, seed: int = 1,
+                 stopwords: frozenset[str] = frozenset()):
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.stopwords = stopwords
+        self.hasher = MinHasher(num_perm, seed)
+        self.bands, self.rows = band_layout(threshold, num_perm)
+        # Buckets hold row numbers into _keys/_shingles/_signatures
+        self._buckets: list[dict[bytes, list[int]]] = [{} for _ in range(self.bands)]
+        self._rows: dict[Hashable, int] = {}
+        self._keys: list[Hashable] = []
+        self._shingles: list[frozenset[str]] = []
+        self._signatures = np.empty((64, num_perm), dtype=np.uint64)
+        # Check-then-add of the same text is the common pattern; hash it once
+        self._last_hashed: tuple[str, frozenset[str], np.ndarray] | None = None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _hash(self, text: str) -> tuple[frozenset[str], np.ndarray]:
+        if self._last_hashed is not None and self._last_hashed[0] == text:
+            return self._last_hashed[1], self._last_hashed[2]
+        shingles = word_shingles(text, self.shingle_size, self.stopwords)
+        signature = self.hasher.signature(shingles)
+        self._last_hashed = (text, shingles, signature)
+        return shingles, signature
+
+    def _band_keys(self, signature: np.ndarray) -> list[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, key: Hashable, text: str) -> None:
+        """Index text under key (texts without words are never near-duplicates and are skipped)"""
+        if key in self._rows:
+            return
+        shingles, signature = self._hash(text)
+        if not shingles:
+            return
+        row = len(self._keys)
+        if row == len(self._signatures):
+            self._signatures = np.concatenate([self._signatures, np.empty_like(self._signatures)])
+        self._signatures[row] = signature
+        self._rows[key] = row
+        self._keys.append(key)
+        self._shingles.append(shingles)
+        for band, band_key in zip(self._buckets, self._band_keys(signature), strict=True):
+            band.setdefault(band_key, []).append(row)
+
+    def _verified(self, text: str, floor: float) -> list[tuple[Hashable, float]]:
+        """
+        Candidates sharing an LSH bucket with text whose exact Jaccard is >= floor.
+        Candidates are first screened on their MinHash estimate (vectorised), so
+        exact set comparisons only run for plausible matches.
+        """
+        if not self._keys:
+            return []
+        shingles, signature = self._hash(text)
+        if not shingles:
+            return []
+        seen: set[int] = set()
+        for band, band_key in zip(self._buckets, self._band_keys(signature), strict=True):
+            seen.update(band.get(band_key, ()))
+        if not seen:
+            return []
+        rows = np.fromiter(seen, dtype=np.int64, count=len(seen))
+        estimates = (self._signatures[rows] == signature).mean(axis=1)
+        matches = []
+        for row in rows[estimates >= floor - ESTIMATE_MARGIN]:
+            similarity = jaccard(shingles, self._shingles[row])
+            if similarity >= floor:
+                matches.append((self._keys[row], similarity))
+        return matches
+
+    def near_duplicates(self, text: str, min_similarity: float | None = None) -> list[tuple[Hashable, float]]:
+        """Indexed texts at least min_similarity (default: the index threshold) similar, most similar first"""
+        floor = self.threshold if min_similarity is None else min_similarity
+        return sorted(self._verified(text, floor), key=lambda match: match[1], reverse=True)
+
+    def max_similarity(self, text: str) -> float:
+        """Highest exact similarity among indexed texts at least the index threshold similar (else 0.0)"""
+        return max((similarity for _, similarity in self._verified(text, self.threshold)), default=0.0)
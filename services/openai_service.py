@@ -1,34 +1,44 @@
 """
 OpenAI Service for AI-powered scholarship features
+
+All completions go through the async LLM gateway (services/llm_gateway.py):
+pooled connection, per-call timeouts, single-flight coalescing and, for query
+enhancement and summaries, an LRU + TTL cache keyed on normalised inputs.
 """
 
 import json
 import os
 from typing import Any
 
-from openai import OpenAI
-
+from services.llm_gateway import LLMGateway, get_llm_gateway
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+
+def _normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
 class OpenAIService:
     """Service for OpenAI-powered scholarship features"""
 
-    def __init__(self):
+    def __init__(self, gateway: LLMGateway | None = None):
         self.api_key = os.environ.get("OPENAI_API_KEY")
-        if not self.api_key:
+        self.gateway = gateway or get_llm_gateway()
+        if self.gateway is None:
             logger.warning("OPENAI_API_KEY not found, AI features will be disabled")
             self.client = None
         else:
-            self.client = OpenAI(api_key=self.api_key)
+            # Async client for callers that still build their own requests
+            self.client = getattr(self.gateway.backend, "client", None)
             logger.info("OpenAI service initialized successfully")
 
     def is_available(self) -> bool:
         """Check if OpenAI service is available"""
-        return self.client is not None
+        return self.gateway is not None
 
-    def enhance_search_query(self, query: str, user_context: dict | None = None) -> dict[str, Any]:
+    async def enhance_search_query(self, query: str, user_context: dict | None = None) -> dict[str, Any]:
         """
         Enhance search query using AI to extract better search terms and filters
         """
@@ -54,17 +64,21 @@ class OpenAIService:
             Focus on scholarship-related terms and educational context.
             """
 
-            response = self.client.chat.completions.create(
-                model="gpt-4o",  # the newest OpenAI model is "gpt-4o" which was released May 13, 2024. do not change this unless explicitly requested by the user
-                messages=[
-                    {"role": "system", "content": "You are a scholarship search expert. Analyze queries and suggest improvements for finding relevant scholarships."},
-                    {"role": "user", "content": prompt}
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.3
+            async def load() -> dict[str, Any]:
+                content = await self.gateway.complete(
+                    "enhance_search_query",
+                    [
+                        {"role": "system", "content": "You are a scholarship search expert. Analyze queries and suggest improvements for finding relevant scholarships."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    json_mode=True,
+                    temperature=0.3
+                )
+                return json.loads(content)
+
+            result = await self.gateway.cached(
+                "enhance_search_query", [_normalize_query(query), user_context], load
             )
-
-            result = json.loads(response.choices[0].message.content)
             logger.info(f"Enhanced search query: {query} -> {result.get('enhanced_query')}")
             return result
 
@@ -72,7 +86,7 @@ class OpenAIService:
             logger.error(f"Error enhancing search query: {e}")
             return {"enhanced_query": query, "suggested_filters": {}}
 
-    def generate_scholarship_summary(self, scholarship_data: dict[str, Any]) -> str:
+    async def generate_scholarship_summary(self, scholarship_data: dict[str, Any]) -> str:
         """
         Generate a concise, student-friendly summary of a scholarship
         """
@@ -99,17 +113,24 @@ class OpenAIService:
             Keep it under 150 words and make it appealing to students.
             """
 
-            response = self.client.chat.completions.create(
-                model="gpt-4o",  # the newest OpenAI model is "gpt-4o" which was released May 13, 2024. do not change this unless explicitly requested by the user
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that creates engaging scholarship summaries for students."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=200
-            )
-
-            summary = response.choices[0].message.content.strip()
+            async def load() -> str:
+                content = await self.gateway.complete(
+                    "generate_scholarship_summary",
+                    [
+                        {"role": "system", "content": "You are a helpful assistant that creates engaging scholarship summaries for students."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.7,
+                    max_tokens=200
+                )
+                return content.strip()
+
+            # Keyed on the fields the prompt uses, so an edited scholarship gets a new summary
+            summary_inputs = {field: scholarship_data.get(field) for field in (
+                "id", "name", "organization", "amount", "scholarship_type", "description",
+                "eligibility_criteria", "application_deadline"
+            )}
+            summary = await self.gateway.cached("generate_scholarship_summary", summary_inputs, load)
             logger.info(f"Generated summary for scholarship: {scholarship_data.get('name')}")
             return summary
 
@@ -117,7 +138,7 @@ class OpenAIService:
             logger.error(f"Error generating scholarship summary: {e}")
             return scholarship_data.get("description", "")[:200] + "..."
 
-    def analyze_eligibility_match(self, user_profile: dict[str, Any], scholarship: dict[str, Any]) -> dict[str, Any]:
+    async def analyze_eligibility_match(self, user_profile: dict[str, Any], scholarship: dict[str, Any]) -> dict[str, Any]:
         """
         Use AI to analyze how well a user matches scholarship eligibility
         """
@@ -145,17 +166,17 @@ class OpenAIService:
             5. strengths: what makes them a good candidate
             """
 
-            response = self.client.chat.completions.create(
-                model="gpt-4o",  # the newest OpenAI model is "gpt-4o" which was released May 13, 2024. do not change this unless explicitly requested by the user
-                messages=[
+            content = await self.gateway.complete(
+                "analyze_eligibility_match",
+                [
                     {"role": "system", "content": "You are a scholarship advisor analyzing student-scholarship matches."},
                     {"role": "user", "content": prompt}
                 ],
-                response_format={"type": "json_object"},
+                json_mode=True,
                 temperature=0.4
             )
 
-            result = json.loads(response.choices[0].message.content)
+            result = json.loads(content)
             logger.info(f"Analyzed eligibility match for {scholarship.get('name')}: {result.get('match_score')}")
             return result
 
@@ -163,7 +184,7 @@ class OpenAIService:
             logger.error(f"Error analyzing eligibility match: {e}")
             return {"match_score": 0.5, "analysis": "Analysis unavailable", "recommendations": []}
 
-    def generate_search_suggestions(self, partial_query: str, search_history: list[str] = None) -> list[str]:
+    async def generate_search_suggestions(self, partial_query: str, search_history: list[str] = None) -> list[str]:
         """
         Generate intelligent search suggestions based on partial query
         """
@@ -187,17 +208,17 @@ class OpenAIService:
             - Diverse in scope (merit, need-based, field-specific, etc.)
             """
 
-            response = self.client.chat.completions.create(
-                model="gpt-4o",  # the newest OpenAI model is "gpt-4o" which was released May 13, 2024. do not change this unless explicitly requested by the user
-                messages=[
+            content = await self.gateway.complete(
+                "generate_search_suggestions",
+                [
                     {"role": "system", "content": "You are a scholarship search assistant providing helpful query suggestions."},
                     {"role": "user", "content": prompt}
                 ],
-                response_format={"type": "json_object"},
+                json_mode=True,
                 temperature=0.6
             )
 
-            result = json.loads(response.choices[0].message.content)
+            result = json.loads(content)
             suggestions = result.get("suggestions", [])
             logger.info(f"Generated {len(suggestions)} search suggestions for: {partial_query}")
             return suggestions
@@ -206,7 +227,7 @@ class OpenAIService:
             logger.error(f"Error generating search suggestions: {e}")
             return [partial_query + " scholarship"]
 
-    def analyze_scholarship_trends(self, scholarships: list[dict[str, Any]]) -> dict[str, Any]:
+    async def analyze_scholarship_trends(self, scholarships: list[dict[str, Any]]) -> dict[str, Any]:
         """
         Analyze scholarship data to identify trends and insights
         """
@@ -231,17 +252,17 @@ class OpenAIService:
             5. recommendations: advice for students based on trends
             """
 
-            response = self.client.chat.completions.create(
-                model="gpt-4o",  # the newest OpenAI model is "gpt-4o" which was released May 13, 2024. do not change this unless explicitly requested by the user
-                messages=[
+            content = await self.gateway.complete(
+                "analyze_scholarship_trends",
+                [
                     {"role": "system", "content": "You are a scholarship data analyst providing insights on funding opportunities."},
                     {"role": "user", "content": prompt}
                 ],
-                response_format={"type": "json_object"},
+                json_mode=True,
                 temperature=0.4
             )
 
-            result = json.loads(response.choices[0].message.content)
+            result = json.loads(content)
             logger.info("Generated scholarship trend analysis")
             return result
 
@@ -265,15 +286,13 @@ class OpenAIService:
 
             messages.append({"role": "user", "content": prompt})
 
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=messages,
+            return await self.gateway.complete(
+                "generate_chat_response",
+                messages,
                 temperature=0.7,
                 max_tokens=500
             )
 
-            return response.choices[0].message.content
-
         except Exception as e:
             logger.error(f"Error generating chat response: {e}")
             return "I apologize, but I'm having trouble responding right now. Please try again."
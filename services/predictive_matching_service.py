@@ -3,34 +3,40 @@
 
 import logging
 import math
+from collections import Counter
 from datetime import datetime
 from typing import Any
 
+import numpy as np
+
 from models.predictive_matching import (
     CompetitionAnalysis,
     CompetitionLevel,
+    EligibilityStatus,
+    MatchConfidence,
     PredictiveMatchingResponse,
     PredictiveMatchResult,
     RankedScholarshipRecommendation,
     WinProbabilityFactors,
 )
 from models.scholarship import Scholarship
-from models.user import UserProfile
-from services.eligibility_service import EligibilityService
+from models.user import EligibilityResult, UserProfile
+from services.eligibility_service import ALL_CRITERIA_MET, EligibilityService
 from services.openai_service import OpenAIService
+from services.scholarship_features import ScholarshipFeatureStore, scholarship_feature_store
 
 logger = logging.getLogger(__name__)
 
 class PredictiveMatchingService:
     """Service for AI-powered predictive scholarship matching"""
 
-    def __init__(self, openai_service: OpenAIService, eligibility_service: EligibilityService):
+    def __init__(self, openai_service: OpenAIService, eligibility_service: EligibilityService,
+                 feature_store: ScholarshipFeatureStore | None = None):
         self.openai_service = openai_service
         self.eligibility_service = eligibility_service
 
-        # Historical data for prediction modeling
-        self.historical_winners = self._load_historical_data()
-        self.competition_models = self._load_competition_models()
+        # Precomputed per-scholarship competition model and historical winners
+        self.feature_store = feature_store or scholarship_feature_store
 
     async def predict_scholarship_matches(
         self,
@@ -40,15 +46,33 @@ class PredictiveMatchingService:
     ) -> PredictiveMatchingResponse:
         """
         Generate predictive scholarship matches with likelihood scoring
+
+        Works entirely on the scholarships passed in: eligibility is evaluated
+        once per scholarship and the factor vectors for all candidates are
+        computed together, so no database lookups happen here.
         """
         try:
             logger.info(f"Starting predictive matching for user with {len(scholarships)} scholarships")
 
-            # Calculate predictions for each scholarship
+            # Skip obviously ineligible scholarships before any scoring
+            evaluations = self.eligibility_service.evaluate_scholarships(user_profile, scholarships)
+            candidates = [
+                (scholarship, evaluation)
+                for scholarship, evaluation in zip(scholarships, evaluations)
+                if evaluation.eligible or evaluation.match_score >= 0.3
+            ]
+            candidate_scholarships = [scholarship for scholarship, _ in candidates]
+            factor_rows = self._calculate_win_probability_factors(
+                user_profile, candidate_scholarships, [evaluation for _, evaluation in candidates]
+            )
+            # Scholarship-only competition features come from the precomputed store
+            competitions = self.feature_store.competition(candidate_scholarships)
+
+            # Calculate predictions for each candidate
             match_results = []
-            for scholarship in scholarships:
+            for (scholarship, evaluation), factors, competition in zip(candidates, factor_rows, competitions):
                 result = await self._calculate_scholarship_prediction(
-                    user_profile, scholarship, analysis_depth
+                    user_profile, scholarship, evaluation, factors, competition, analysis_depth
                 )
                 if result:
                     match_results.append(result)
@@ -57,16 +81,17 @@ class PredictiveMatchingService:
             match_results.sort(key=lambda x: x.likelihood_to_win, reverse=True)
 
             # Create ranked recommendations
+            by_id = {s.id: s for s in scholarships}
             recommendations = []
             for i, result in enumerate(match_results):
-                scholarship = next(s for s in scholarships if s.id == result.scholarship_id)
+                scholarship = by_id[result.scholarship_id]
 
                 # Determine recommendation category
                 rec = RankedScholarshipRecommendation(
                     scholarship_id=result.scholarship_id,
-                    scholarship_title=scholarship.title,
+                    scholarship_title=scholarship.name,
                     award_amount=scholarship.amount,
-                    deadline=scholarship.deadline,
+                    deadline=scholarship.application_deadline,
                     predictive_match_result=result,
                     priority_rank=i + 1,
                     quick_win_indicator=self._is_quick_win(result),
@@ -100,7 +125,7 @@ class PredictiveMatchingService:
             success_prob_range = self._calculate_success_probability_range(recommendations[:recommended_count])
 
             return PredictiveMatchingResponse(
-                user_id=user_profile.user_id,
+                user_id=self._user_id(user_profile),
                 analysis_timestamp=datetime.utcnow(),
                 total_scholarships_analyzed=len(scholarships),
                 high_priority_matches=high_priority[:5],
@@ -118,26 +143,21 @@ class PredictiveMatchingService:
             logger.error(f"Predictive matching failed: {str(e)}")
             raise
 
+    @staticmethod
+    def _user_id(user_profile: UserProfile) -> str:
+        return user_profile.id or "anonymous"
+
     async def _calculate_scholarship_prediction(
         self,
         user_profile: UserProfile,
         scholarship: Scholarship,
+        eligibility_result: EligibilityResult,
+        factors: WinProbabilityFactors,
+        competition: CompetitionAnalysis,
         analysis_depth: str
     ) -> PredictiveMatchResult | None:
-        """Calculate predictive match for a single scholarship"""
+        """Calculate predictive match for a single scholarship from its precomputed eligibility, factors and competition"""
         try:
-            # Basic eligibility check first
-            eligibility_result = self.eligibility_service.check_eligibility(user_profile, scholarship.id)
-
-            if not eligibility_result.eligible and eligibility_result.match_score < 0.3:
-                return None  # Skip obviously ineligible scholarships
-
-            # Calculate win probability factors
-            factors = await self._calculate_win_probability_factors(user_profile, scholarship)
-
-            # Analyze competition
-            competition = await self._analyze_competition(scholarship)
-
             # Calculate overall likelihood to win
             likelihood = self._calculate_likelihood_to_win(factors, competition)
 
@@ -156,7 +176,7 @@ class PredictiveMatchingService:
 
             return PredictiveMatchResult(
                 scholarship_id=scholarship.id,
-                user_id=user_profile.user_id,
+                user_id=self._user_id(user_profile),
                 likelihood_to_win=likelihood,
                 match_confidence=confidence,
                 eligibility_status=self._map_eligibility_status(eligibility_result),
@@ -176,106 +196,73 @@ class PredictiveMatchingService:
             logger.warning(f"Failed to calculate prediction for scholarship {scholarship.id}: {str(e)}")
             return None
 
-    async def _calculate_win_probability_factors(
+    def _calculate_win_probability_factors(
         self,
         user_profile: UserProfile,
-        scholarship: Scholarship
-    ) -> WinProbabilityFactors:
-        """Calculate detailed factors contributing to win probability"""
+        scholarships: list[Scholarship],
+        eligibility_results: list[EligibilityResult]
+    ) -> list[WinProbabilityFactors]:
+        """Calculate detailed win probability factors for all candidates together"""
+        if not scholarships:
+            return []
 
         # Eligibility scoring (40% weight)
-        eligibility_result = self.eligibility_service.check_eligibility(user_profile, scholarship.id)
-        eligibility_score = eligibility_result.match_score
-        requirements_met = len([r for r in eligibility_result.reasons if "meets" in r.lower()])
-        total_requirements = len(scholarship.eligibility_criteria) if hasattr(scholarship, 'eligibility_criteria') else 5
-        critical_met = eligibility_score > 0.8
+        eligibility_scores = np.clip([r.match_score for r in eligibility_results], 0.0, 1.0)
+        total_requirements = np.array([self._count_requirements(s) for s in scholarships])
+        unmet = np.array([len([r for r in result.reasons if r != ALL_CRITERIA_MET]) for result in eligibility_results])
+        requirements_met = np.maximum(total_requirements - unmet, 0)
+        critical_met = eligibility_scores > 0.8
 
         # Academic strength (25% weight)
-        gpa_percentile = self._calculate_gpa_percentile(user_profile.gpa, scholarship)
+        amounts = np.array([s.amount for s in scholarships], dtype=np.float64)
+        gpa_percentiles = self._calculate_gpa_percentiles(user_profile.gpa, amounts)
         academic_score = min(1.0, (user_profile.gpa or 3.0) / 4.0)
         test_percentile = None  # Would calculate if test scores available
 
-        # Fit and alignment (20% weight)
-        field_match = self._calculate_field_match(user_profile, scholarship)
-        career_alignment = self._calculate_career_alignment(user_profile, scholarship)
-        values_alignment = self._calculate_values_alignment(user_profile, scholarship)
-        geo_preference = self._calculate_geographic_preference(user_profile, scholarship)
-
-        # Experience and activities (10% weight)
+        # User-level scores do not depend on the scholarship: compute them once
+        career_alignment = self._calculate_career_alignment(user_profile, scholarships[0])
+        values_alignment = self._calculate_values_alignment(user_profile, scholarships[0])
         experience_score = self._calculate_experience_score(user_profile)
         leadership_score = self._calculate_leadership_score(user_profile)
         service_score = self._calculate_service_score(user_profile)
-
-        # Application quality potential (5% weight)
-        essay_prediction = self._predict_essay_quality(user_profile, scholarship)
         rec_prediction = self._predict_recommendation_strength(user_profile)
         completeness_likelihood = 0.9  # Based on user engagement level
 
-        return WinProbabilityFactors(
-            eligibility_score=eligibility_score,
-            requirements_met=requirements_met,
-            total_requirements=total_requirements,
-            critical_requirements_met=critical_met,
-            gpa_percentile=gpa_percentile,
-            academic_achievements_score=academic_score,
-            test_scores_percentile=test_percentile,
-            field_of_study_match=field_match,
-            career_goals_alignment=career_alignment,
-            values_alignment=values_alignment,
-            geographic_preference=geo_preference,
-            relevant_experience_score=experience_score,
-            leadership_score=leadership_score,
-            community_service_score=service_score,
-            essay_quality_prediction=essay_prediction,
-            recommendation_strength_prediction=rec_prediction,
-            application_completeness_likelihood=completeness_likelihood
-        )
-
-    async def _analyze_competition(self, scholarship: Scholarship) -> CompetitionAnalysis:
-        """Analyze competition level for a scholarship"""
-
-        # Estimate applicant count based on award amount and criteria
-        estimated_applicants = self._estimate_applicant_count(scholarship)
-
-        # Determine competition level
-        if estimated_applicants < 50:
-            level = CompetitionLevel.VERY_LOW
-        elif estimated_applicants < 200:
-            level = CompetitionLevel.LOW
-        elif estimated_applicants < 500:
-            level = CompetitionLevel.MEDIUM
-        elif estimated_applicants < 1000:
-            level = CompetitionLevel.HIGH
-        else:
-            level = CompetitionLevel.VERY_HIGH
-
-        # Calculate applicant pool quality
-        pool_quality = self._estimate_applicant_pool_quality(scholarship)
-
-        # Load historical winner profiles
-        historical_profiles = self._get_historical_winners(scholarship.id)
-
-        # Calculate acceptance rate if known
-        acceptance_rate = self._estimate_acceptance_rate(scholarship, estimated_applicants)
-
-        # Analyze trends
-        trend = self._analyze_application_trend(scholarship)
-
-        # Calculate deadline pressure
-        days_to_deadline = (scholarship.deadline - datetime.now()).days
-        deadline_pressure = max(0.0, min(1.0, (90 - days_to_deadline) / 90))
-
-        return CompetitionAnalysis(
-            scholarship_id=scholarship.id,
-            estimated_applicant_count=estimated_applicants,
-            competition_level=level,
-            applicant_pool_quality=pool_quality,
-            historical_winner_profiles=historical_profiles,
-            acceptance_rate=acceptance_rate,
-            application_trend=trend,
-            deadline_pressure=deadline_pressure,
-            similar_scholarships_competition=[]  # Would analyze similar opportunities
-        )
+        factors = []
+        for i, scholarship in enumerate(scholarships):
+            factors.append(WinProbabilityFactors(
+                eligibility_score=float(eligibility_scores[i]),
+                requirements_met=int(requirements_met[i]),
+                total_requirements=int(total_requirements[i]),
+                critical_requirements_met=bool(critical_met[i]),
+                gpa_percentile=None if gpa_percentiles is None else float(gpa_percentiles[i]),
+                academic_achievements_score=academic_score,
+                test_scores_percentile=test_percentile,
+                # Fit and alignment (20% weight)
+                field_of_study_match=self._calculate_field_match(user_profile, scholarship),
+                career_goals_alignment=career_alignment,
+                values_alignment=values_alignment,
+                geographic_preference=self._calculate_geographic_preference(user_profile, scholarship),
+                # Experience and activities (10% weight)
+                relevant_experience_score=experience_score,
+                leadership_score=leadership_score,
+                community_service_score=service_score,
+                # Application quality potential (5% weight)
+                essay_quality_prediction=self._predict_essay_quality(user_profile, scholarship),
+                recommendation_strength_prediction=rec_prediction,
+                application_completeness_likelihood=completeness_likelihood
+            ))
+        return factors
+
+    @staticmethod
+    def _count_requirements(scholarship: Scholarship) -> int:
+        """Number of eligibility criteria the scholarship actually sets"""
+        criteria = scholarship.eligibility_criteria
+        return sum(1 for value in (
+            criteria.min_gpa is not None, criteria.max_gpa is not None, criteria.grade_levels,
+            criteria.citizenship_required, criteria.residency_states, criteria.fields_of_study,
+            criteria.min_age is not None, criteria.max_age is not None, criteria.financial_need is not None,
+        ) if value)
 
     def _calculate_likelihood_to_win(
         self,
@@ -318,50 +305,18 @@ class PredictiveMatchingService:
 
         return max(0.0, min(1.0, final_score))
 
-    def _estimate_applicant_count(self, scholarship: Scholarship) -> int:
-        """Estimate number of applicants based on scholarship characteristics"""
-        base_applicants = 100
-
-        # Award amount impact
-        if scholarship.amount > 10000:
-            base_applicants *= 3
-        elif scholarship.amount > 5000:
-            base_applicants *= 2
-        elif scholarship.amount > 1000:
-            base_applicants *= 1.5
-
-        # Specificity impact (more specific = fewer applicants)
-        specificity_factors = 0
-        if hasattr(scholarship, 'field_of_study') and scholarship.field_of_study:
-            specificity_factors += 1
-        if hasattr(scholarship, 'gpa_requirement') and scholarship.gpa_requirement > 3.5:
-            specificity_factors += 1
-        if hasattr(scholarship, 'geographic_restriction') and scholarship.geographic_restriction:
-            specificity_factors += 1
-
-        # Apply specificity reduction
-        reduction_factor = 0.7 ** specificity_factors
-
-        return int(base_applicants * reduction_factor)
-
-    def _calculate_gpa_percentile(self, user_gpa: float | None, scholarship: Scholarship) -> float | None:
-        """Calculate user's GPA percentile among likely applicants"""
+    def _calculate_gpa_percentiles(self, user_gpa: float | None, amounts: np.ndarray) -> np.ndarray | None:
+        """User's GPA percentile among likely applicants, per scholarship award amount"""
         if not user_gpa:
             return None
 
-        # Estimate typical applicant GPA distribution for this scholarship
-        if scholarship.amount > 5000:  # Competitive scholarship
-            mean_gpa = 3.6
-            std_dev = 0.3
-        else:  # Less competitive
-            mean_gpa = 3.3
-            std_dev = 0.4
+        def percentile(mean_gpa: float, std_dev: float) -> float:
+            # Normal distribution approximation of the applicant GPA spread
+            z_score = (user_gpa - mean_gpa) / std_dev
+            return max(0.0, min(1.0, 0.5 * (1 + math.erf(z_score / math.sqrt(2)))))
 
-        # Calculate percentile using normal distribution approximation
-        z_score = (user_gpa - mean_gpa) / std_dev
-        percentile = 0.5 * (1 + math.erf(z_score / math.sqrt(2)))
-
-        return max(0.0, min(1.0, percentile))
+        # Competitive (> $5,000) vs less competitive applicant pools
+        return np.where(amounts > 5000, percentile(3.6, 0.3), percentile(3.3, 0.4))
 
     def _calculate_field_match(self, user_profile: UserProfile, scholarship: Scholarship) -> float:
         """Calculate how well user's field matches scholarship focus"""
@@ -454,9 +409,6 @@ class PredictiveMatchingService:
 
         return min(1.0, score)
 
-    # Additional helper methods would continue here...
-    # For brevity, including key framework methods
-
     def _is_quick_win(self, result: PredictiveMatchResult) -> bool:
         """Determine if this is a quick win opportunity"""
         return (result.likelihood_to_win > 0.7 and
@@ -471,17 +423,232 @@ class PredictiveMatchingService:
         """Determine if this is a safety option"""
         return result.likelihood_to_win > 0.8
 
-    def _load_historical_data(self) -> dict[str, Any]:
-        """Load historical winner data for prediction modeling"""
-        # In production, this would load from database
-        return {}
+    def _determine_match_confidence(
+        self,
+        factors: WinProbabilityFactors,
+        competition: CompetitionAnalysis,
+        analysis_depth: str
+    ) -> MatchConfidence:
+        """Confidence grows with how much of the profile and history the prediction could use"""
+        confidence = 0.5
+        if factors.critical_requirements_met:
+            confidence += 0.2
+        if factors.gpa_percentile is not None:
+            confidence += 0.1
+        if competition.historical_winner_profiles:
+            confidence += 0.1
+        confidence += {"quick": -0.1, "deep": 0.1, "comprehensive": 0.1}.get(analysis_depth, 0.0)
+
+        if confidence >= 0.9:
+            return MatchConfidence.VERY_HIGH
+        if confidence >= 0.75:
+            return MatchConfidence.HIGH
+        if confidence >= 0.5:
+            return MatchConfidence.MEDIUM
+        if confidence >= 0.25:
+            return MatchConfidence.LOW
+        return MatchConfidence.VERY_LOW
+
+    def _map_eligibility_status(self, eligibility_result: EligibilityResult) -> EligibilityStatus:
+        """Map an eligibility check onto the detailed status scale"""
+        if eligibility_result.eligible:
+            return EligibilityStatus.FULLY_ELIGIBLE if eligibility_result.match_score >= 0.9 \
+                else EligibilityStatus.MOSTLY_ELIGIBLE
+        if eligibility_result.match_score >= 0.6:
+            return EligibilityStatus.PARTIALLY_ELIGIBLE
+        if eligibility_result.match_score >= 0.3:
+            return EligibilityStatus.CONDITIONALLY_ELIGIBLE
+        return EligibilityStatus.NOT_ELIGIBLE
+
+    def _predict_essay_quality(self, user_profile: UserProfile, scholarship: Scholarship) -> float:
+        """Expected essay strength; a field match gives the applicant more to write about"""
+        if not scholarship.eligibility_criteria.essay_required:
+            return 0.8
+        fields = scholarship.eligibility_criteria.fields_of_study
+        return 0.75 if user_profile.field_of_study and user_profile.field_of_study in fields else 0.6
+
+    def _predict_recommendation_strength(self, user_profile: UserProfile) -> float:
+        """Expected recommendation letter strength"""
+        # Would use teacher/mentor relationships if tracked
+        return 0.7
 
-    def _load_competition_models(self) -> dict[str, Any]:
-        """Load competition analysis models"""
-        # In production, this would load ML models
-        return {}
+    def _estimate_application_time_for_scholarship(self, scholarship: Scholarship) -> int:
+        """Hours to prepare a strong application"""
+        criteria = scholarship.eligibility_criteria
+        hours = 1
+        if criteria.essay_required:
+            hours += 3
+        hours += criteria.recommendation_letters
+        return hours
+
+    def _estimate_application_time(self, result: PredictiveMatchResult) -> int:
+        return result.estimated_time_investment
+
+    def _get_key_requirements(self, result: PredictiveMatchResult) -> list[str]:
+        """Requirements worth highlighting in the application"""
+        return result.why_matched_reasons[:3]
+
+    def _get_application_strategy(self, result: PredictiveMatchResult) -> str:
+        """One-line approach for this application"""
+        if self._is_safety_option(result):
+            return "Strong fit: submit early with a polished, complete application"
+        if result.likelihood_to_win >= 0.5:
+            return "Good fit: tailor your essay to the sponsor's mission and highlight your strongest achievements"
+        return "Competitive: invest in standout essays and recommendations to differentiate your application"
+
+    async def _generate_why_matched_explanation(
+        self,
+        user_profile: UserProfile,
+        scholarship: Scholarship,
+        factors: WinProbabilityFactors
+    ) -> list[str]:
+        """Plain-language reasons this scholarship was matched"""
+        reasons = []
+        if factors.critical_requirements_met:
+            reasons.append(f"Meets {factors.requirements_met} of {factors.total_requirements} eligibility requirements")
+        if factors.field_of_study_match >= 0.8:
+            reasons.append("Field of study aligns with the scholarship focus")
+        if factors.gpa_percentile is not None and factors.gpa_percentile >= 0.6:
+            reasons.append("GPA is above the typical applicant")
+        if not reasons:
+            reasons.append("Partially matches eligibility criteria")
+        return reasons
+
+    async def _identify_strength_indicators(
+        self,
+        user_profile: UserProfile,
+        scholarship: Scholarship,
+        factors: WinProbabilityFactors
+    ) -> list[str]:
+        """Profile strengths relevant to this scholarship"""
+        strengths = []
+        if factors.academic_achievements_score >= 0.875:
+            strengths.append("Strong academic record")
+        if factors.leadership_score >= 0.7:
+            strengths.append("Leadership experience")
+        if factors.community_service_score >= 0.7:
+            strengths.append("Community service involvement")
+        if factors.relevant_experience_score >= 0.7:
+            strengths.append("Relevant work or research experience")
+        return strengths
+
+    async def _identify_improvement_opportunities(
+        self,
+        user_profile: UserProfile,
+        scholarship: Scholarship,
+        factors: WinProbabilityFactors
+    ) -> list[str]:
+        """Changes that would raise the likelihood to win"""
+        opportunities = []
+        if factors.requirements_met < factors.total_requirements:
+            opportunities.append("Complete missing profile information for eligibility checks")
+        if factors.leadership_score < 0.5:
+            opportunities.append("Highlight leadership roles")
+        if factors.community_service_score < 0.5:
+            opportunities.append("Document community service hours")
+        if scholarship.eligibility_criteria.essay_required and factors.essay_quality_prediction < 0.7:
+            opportunities.append("Strengthen your personal essay")
+        return opportunities
+
+    async def _identify_potential_weaknesses(
+        self,
+        user_profile: UserProfile,
+        scholarship: Scholarship,
+        factors: WinProbabilityFactors
+    ) -> list[str]:
+        """Gaps a reviewer is likely to notice"""
+        weaknesses = []
+        if not factors.critical_requirements_met:
+            weaknesses.append("Does not clearly meet all eligibility requirements")
+        if factors.gpa_percentile is not None and factors.gpa_percentile < 0.4:
+            weaknesses.append("GPA below the typical applicant")
+        if factors.field_of_study_match < 0.5:
+            weaknesses.append("Field of study is outside the scholarship focus")
+        return weaknesses
+
+    async def _generate_recommended_actions(
+        self,
+        user_profile: UserProfile,
+        scholarship: Scholarship,
+        factors: WinProbabilityFactors
+    ) -> list[str]:
+        """Concrete next steps for this application"""
+        criteria = scholarship.eligibility_criteria
+        actions = []
+        if criteria.recommendation_letters:
+            actions.append(f"Request {criteria.recommendation_letters} recommendation letter(s) early")
+        if criteria.essay_required:
+            actions.append("Draft the essay at least two weeks before the deadline")
+        actions.append("Review eligibility requirements and gather supporting documents")
+        return actions
+
+    async def _generate_strategy_tips(
+        self,
+        user_profile: UserProfile,
+        scholarship: Scholarship,
+        factors: WinProbabilityFactors
+    ) -> list[str]:
+        """Application strategy tips"""
+        tips = [f"Connect your goals to {scholarship.organization}'s mission"]
+        if factors.academic_achievements_score >= 0.875:
+            tips.append("Lead with your academic achievements")
+        if factors.field_of_study_match >= 0.8:
+            tips.append("Emphasize coursework and projects in your field")
+        return tips
+
+    def _calculate_overall_competitiveness(
+        self,
+        user_profile: UserProfile,
+        match_results: list[PredictiveMatchResult]
+    ) -> float:
+        """Overall competitiveness: mean likelihood across the best matches"""
+        if not match_results:
+            return 0.0
+        top = [r.likelihood_to_win for r in match_results[:5]]
+        return max(0.0, min(1.0, sum(top) / len(top)))
+
+    def _calculate_success_probability_range(
+        self,
+        recommendations: list[RankedScholarshipRecommendation]
+    ) -> tuple[int, int]:
+        """(min, max) percent chance of winning at least one of the recommended scholarships"""
+        if not recommendations:
+            return (0, 0)
+
+        def at_least_one(scale: float) -> int:
+            miss = 1.0
+            for rec in recommendations:
+                miss *= 1.0 - min(1.0, rec.predictive_match_result.likelihood_to_win * scale)
+            return round((1.0 - miss) * 100)
 
-    # Many more helper methods would be implemented for a complete service...
+        return (at_least_one(0.8), at_least_one(1.2))
+
+    async def _generate_profile_strength_summary(
+        self,
+        user_profile: UserProfile,
+        match_results: list[PredictiveMatchResult]
+    ) -> dict[str, str]:
+        """Short summary of profile strengths across all matches"""
+        academic = "Not provided" if user_profile.gpa is None else (
+            "Strong" if user_profile.gpa >= 3.5 else "Competitive" if user_profile.gpa >= 3.0 else "Developing"
+        )
+        eligible = sum(1 for r in match_results if r.eligibility_status in (
+            EligibilityStatus.FULLY_ELIGIBLE, EligibilityStatus.MOSTLY_ELIGIBLE
+        ))
+        return {
+            "academic": academic,
+            "eligibility": f"Eligible for {eligible} of {len(match_results)} matched scholarships",
+            "competitiveness": f"{self._calculate_overall_competitiveness(user_profile, match_results):.0%}",
+        }
+
+    async def _generate_improvement_recommendations(
+        self,
+        user_profile: UserProfile,
+        match_results: list[PredictiveMatchResult]
+    ) -> list[str]:
+        """Most common improvement opportunities across matches"""
+        counts = Counter(o for r in match_results for o in r.improvement_opportunities)
+        return [opportunity for opportunity, _ in counts.most_common(5)]
 
     async def get_win_probability_explanation(
         self,
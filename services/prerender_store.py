@@ -0,0 +1,195 @@
+"""
+Prerender Store
+Content-addressed cache of rendered crawler-facing documents (canonical
+scholarship pages, /seo/sitemap.xml and its shards)
+
+- Each document is keyed by URL path and versioned by a hash of the content it
+  is rendered from, so it is rendered and compressed once per content version;
+  when a scholarship changes only the pages built from it re-render
+- Identity, gzip and (when brotli is installed) br bodies are stored together
+  with a strong ETag derived from the content hash and a Last-Modified stamp
+- If-None-Match is answered from the content hash alone and If-Modified-Since
+  from the stored stamp, so conditional requests never render
+- Bodies already carry Content-Encoding, so CompressionMiddleware passes them
+  through untouched
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from config.settings import settings
+from middleware.compression import BROTLI_AVAILABLE, VARIANT_LEVELS, negotiate_encoding
+from observability.metrics import prerender_requests_total
+from utils.etag import etag_matches
+
+if BROTLI_AVAILABLE:
+    import brotli
+
+# Bump when a renderer or template changes so every stored document is re-rendered
+RENDER_VERSION = "1"
+
+HTML_MEDIA_TYPE = "text/html; charset=utf-8"
+XML_MEDIA_TYPE = "application/xml"
+
+# Cacheable by crawlers and CDNs, but always revalidated (cheap: 304 from the hash)
+CACHE_CONTROL = "public, no-cache"
+
+# Brotli quality for documents built from catalog content (rendered once per version),
+# and for documents any client can mint by URL (fallback pages), which must stay cheap
+BROTLI_QUALITY = 11
+ADHOC_BROTLI_QUALITY = 5
+
+
+def content_hash(source: Any) -> str:
+    """Stable hash of the data a document is rendered from"""
+    payload = json.dumps(source, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(f"{RENDER_VERSION}:{payload}".encode()).hexdigest()[:32]
+
+
+def _precompress(body: bytes, max_compression: bool = True) -> dict[str, bytes]:
+    """Variants in server preference order (negotiate_encoding breaks q-value ties by order)"""
+    encoded = {}
+    if BROTLI_AVAILABLE:
+        encoded["br"] = brotli.compress(body, quality=BROTLI_QUALITY if max_compression else ADHOC_BROTLI_QUALITY)
+    encoded["gzip"] = gzip.compress(body, compresslevel=VARIANT_LEVELS["gzip"], mtime=0)
+    return encoded
+
+
+@dataclass(frozen=True)
+class PrerenderedDocument:
+    """One rendered document with its precompressed variants"""
+    content_hash: str
+    media_type: str
+    body: bytes
+    encoded: dict[str, bytes] = field(default_factory=dict)
+    last_modified: datetime = field(default_factory=lambda: datetime.now(timezone.utc).replace(microsecond=0))
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.content_hash}"'
+
+
+def _not_modified(request: Request, etag: str, last_modified: datetime | None) -> bool:
+    """RFC 9110 evaluation: If-None-Match wins; If-Modified-Since only applies without it"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        return etag_matches(etag, if_none_match)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            return last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+class PrerenderStore:
+    """LRU of PrerenderedDocument by path, replaced whenever the content hash changes"""
+
+    def __init__(self, max_entries: int | None = None):
+        self.max_entries = max_entries or settings.prerender_cache_max_entries
+        self._documents: OrderedDict[str, PrerenderedDocument] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def lookup(self, key: str, digest: str) -> PrerenderedDocument | None:
+        """The stored document for key if it was rendered from this content version"""
+        with self._lock:
+            document = self._documents.get(key)
+            if document is None or document.content_hash != digest:
+                return None
+            self._documents.move_to_end(key)
+            return document
+
+    def put(self, key: str, digest: str, rendered: str, media_type: str = HTML_MEDIA_TYPE,
+            max_compression: bool = True) -> PrerenderedDocument:
+        """
+        Store a freshly rendered document (compressing it once); pass
+        max_compression=False for documents not derived from catalog entries
+        """
+        body = rendered.encode("utf-8")
+        document = PrerenderedDocument(content_hash=digest, media_type=media_type, body=body,
+                                       encoded=_precompress(body, max_compression))
+        with self._lock:
+            self._documents[key] = document
+            self._documents.move_to_end(key)
+            while len(self._documents) > self.max_entries:
+                self._documents.popitem(last=False)
+        return document
+
+    def get_or_render(self, key: str, source: Any, render: Callable[[], str],
+                      media_type: str = HTML_MEDIA_TYPE, max_compression: bool = True) -> PrerenderedDocument:
+        """The document for key at source's content version, rendering it only if that version is new"""
+        return self._get_or_render(key, content_hash(source), render, media_type, max_compression)
+
+    def _get_or_render(self, key: str, digest: str, render: Callable[[], str],
+                       media_type: str, max_compression: bool) -> PrerenderedDocument:
+        document = self.lookup(key, digest)
+        if document is not None:
+            prerender_requests_total.labels(result="hit").inc()
+            return document
+        rendered = render()
+        prerender_requests_total.labels(result="render").inc()
+        # A renderer may store several documents at once (sitemap shards)
+        return self.lookup(key, digest) or self.put(key, digest, rendered, media_type, max_compression)
+
+    def respond(self, request: Request, key: str, source: Any, render: Callable[[], str],
+                media_type: str = HTML_MEDIA_TYPE, max_compression: bool = True) -> Response:
+        """
+        Serve key for this request: 304 when the client's validators match the
+        current content version, otherwise the stored body in the best encoding
+        the client accepts (rendering it first if this version is new)
+        """
+        digest = content_hash(source)
+        with self._lock:
+            stored = self._documents.get(key)
+        last_modified = stored.last_modified if stored is not None and stored.content_hash == digest else None
+        if _not_modified(request, f'"{digest}"', last_modified):
+            prerender_requests_total.labels(result="not_modified").inc()
+            headers = {"ETag": f'"{digest}"', "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+            if last_modified is not None:
+                headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+            return Response(status_code=304, headers=headers)
+
+        document = self._get_or_render(key, digest, render, media_type, max_compression)
+        headers = {
+            "ETag": document.etag,
+            "Last-Modified": format_datetime(document.last_modified, usegmt=True),
+            "Cache-Control": CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+        }
+        body = document.body
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", ""), tuple(document.encoded))
+        if encoding is not None:
+            body = document.encoded[encoding]
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type=document.media_type, headers=headers)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._documents.clear()
+
+    def get_status(self) -> dict[str, Any]:
+        return {
+            "documents": len(self._documents),
+            "max_entries": self.max_entries,
+            "render_version": RENDER_VERSION,
+            "brotli": BROTLI_AVAILABLE,
+        }
+
+
+# Global prerender store
+prerender_store = PrerenderStore()
@@ -1,105 +1,303 @@
 """
-Query Optimization Service - Prepared Statements & Caching
-Reduces P95 latency through query optimization
+Query Optimization Service - Read-Through Result Caching
+Reduces P95 latency by serving hot scholarship queries from memory
 """
-from typing import Optional, List, Dict, Any
-from functools import lru_cache
+import asyncio
 import hashlib
 import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Future
+from typing import Any
 
+from config.settings import settings
+from observability.metrics import (
+    query_cache_entries,
+    query_cache_evictions_total,
+    query_cache_requests_total,
+)
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class QueryResultCache:
+    """
+    Size- and TTL-bounded LRU cache with single-flight loading
+
+    - Entries are tagged with a catalog version; a version change makes them stale
+    - Identical concurrent misses share one loader call (single-flight)
+    - Hit/miss/eviction counts are exported to Prometheus per namespace
+    """
+
+    def __init__(self, namespace: str, max_entries: int, ttl_seconds: float):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        # {key: (value, expires_at, version)}
+        self._entries: OrderedDict[str, tuple[Any, float, Any]] = OrderedDict()
+        self._inflight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def _evict(self, key: str, reason: str) -> None:
+        del self._entries[key]
+        self.evictions += 1
+        query_cache_evictions_total.labels(namespace=self.namespace, reason=reason).inc()
+
+    def _begin(self, key: str, version: Any) -> tuple[bool, Any, bool]:
+        """Returns (hit, value_or_future, leader)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at, entry_version = entry
+                if entry_version != version:
+                    self._evict(key, "stale")
+                elif expires_at <= time.monotonic():
+                    self._evict(key, "expired")
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    query_cache_requests_total.labels(namespace=self.namespace, result="hit").inc()
+                    return True, value, False
+
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        result = "miss" if leader else "coalesced"
+        query_cache_requests_total.labels(namespace=self.namespace, result=result).inc()
+        return False, future, leader
+
+    def _fail(self, key: str, future: Future, error: BaseException) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+        future.set_exception(error)
+
+    def _store(self, key: str, future: Future, value: Any, version: Any) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds, version)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._evict(next(iter(self._entries)), "capacity")
+            self._inflight.pop(key, None)
+            query_cache_entries.labels(namespace=self.namespace).set(len(self._entries))
+        future.set_result(value)
+
+    def get_or_load(self, key: str, loader: Callable[[], Any], version: Any = None) -> Any:
+        """Return the cached value for key, calling loader once on a miss"""
+        hit, value, leader = self._begin(key, version)
+        if hit:
+            return value
+        future = value
+        if not leader:
+            if _on_event_loop():
+                # Blocking here could stall the loop an async leader needs to finish; load independently
+                return loader()
+            return future.result()
+
+        try:
+            value = loader()
+        except BaseException as e:
+            self._fail(key, future, e)
+            raise
+        self._store(key, future, value, version)
+        return value
+
+    async def get_or_load_async(self, key: str, loader: Callable[[], Awaitable[Any]],
+                                version: Any = None) -> Any:
+        """get_or_load for coroutine loaders; waiting on an in-flight load never blocks the loop"""
+        hit, value, leader = self._begin(key, version)
+        if hit:
+            return value
+        future = value
+        if not leader:
+            return await asyncio.wrap_future(future)
+
+        task = asyncio.create_task(self._load_async(key, future, loader, version))
+        # Mark the outcome retrieved when the leader was cancelled before it finished
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        # Shielded: a cancelled leader never cancels the load its followers are waiting on
+        return await asyncio.shield(task)
+
+    async def _load_async(self, key: str, future: Future, loader: Callable[[], Awaitable[Any]],
+                          version: Any) -> Any:
+        try:
+            value = await loader()
+        except Exception as e:
+            self._fail(key, future, e)
+            raise
+        except asyncio.CancelledError:
+            # The load itself was cancelled (loop shutdown); release followers with it
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.cancel()
+            raise
+        self._store(key, future, value, version)
+        return value
+
+    def clear(self, reason: str = "invalidated") -> int:
+        """Drop all entries; in-flight loads still complete for their waiters"""
+        with self._lock:
+            dropped = len(self._entries)
+            self._entries.clear()
+            if dropped:
+                self.evictions += dropped
+                query_cache_evictions_total.labels(namespace=self.namespace, reason=reason).inc(dropped)
+            query_cache_entries.labels(namespace=self.namespace).set(0)
+        return dropped
+
+    def get_stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_rate_percent": round(self.hits / lookups * 100, 2) if lookups else 0.0
+        }
+
+
 class QueryOptimizationService:
     """
     Service for optimizing frequently-executed database queries
     
     Features:
-    - In-memory LRU cache for hot queries (Redis fallback when available)
-    - Query result caching with TTL
-    - Prepared statement simulation via parameterized queries
+    - Read-through result cache per query family (search, scholarship, eligibility)
+    - LRU + TTL eviction, single-flight coalescing of identical misses
+    - Invalidation on scholarship writes/syncs and on catalog version change
     """
-    
-    def __init__(self):
-        self.cache_hits = 0
-        self.cache_misses = 0
-        logger.info("🚀 Query optimization service initialized (in-memory cache active)")
-    
-    def _generate_cache_key(self, query_type: str, params: Dict[str, Any]) -> str:
+
+    NAMESPACES = ("search", "scholarship", "eligibility")
+
+    def __init__(
+        self,
+        enabled: bool = settings.cache_enabled,
+        max_entries: int = settings.cache_max_entries,
+        ttl_seconds: float = settings.cache_ttl_seconds
+    ):
+        self.enabled = enabled
+        self.caches = {
+            namespace: QueryResultCache(namespace, max_entries, ttl_seconds)
+            for namespace in self.NAMESPACES
+        }
+        logger.info(
+            f"🚀 Query result cache initialized (enabled={enabled}, "
+            f"max_entries={max_entries}/namespace, ttl={ttl_seconds}s)"
+        )
+
+    def _generate_cache_key(self, query_type: str, params: dict[str, Any]) -> str:
         """Generate stable cache key for query + params"""
         # Sort params for deterministic key
-        param_str = json.dumps(params, sort_keys=True)
+        param_str = json.dumps(params, sort_keys=True, default=str)
         key_input = f"{query_type}:{param_str}"
-        return hashlib.sha256(key_input.encode()).hexdigest()[:16]
-    
-    @lru_cache(maxsize=256)
-    def get_scholarships_by_criteria(
-        self, 
-        keyword: Optional[str] = None,
-        min_amount: Optional[int] = None,
-        max_amount: Optional[int] = None,
-        scholarship_type: Optional[str] = None
-    ) -> str:
+        return hashlib.sha256(key_input.encode()).hexdigest()[:32]
+
+    def _cached(self, namespace: str, params: dict[str, Any],
+                loader: Callable[[], Any], version: Any) -> Any:
+        if not self.enabled or version is None:
+            query_cache_requests_total.labels(namespace=namespace, result="bypass").inc()
+            return loader()
+        key = self._generate_cache_key(namespace, params)
+        return self.caches[namespace].get_or_load(key, loader, version)
+
+    async def _cached_async(self, namespace: str, params: dict[str, Any],
+                            loader: Callable[[], Awaitable[Any]], version: Any) -> Any:
+        if not self.enabled or version is None:
+            query_cache_requests_total.labels(namespace=namespace, result="bypass").inc()
+            return await loader()
+        key = self._generate_cache_key(namespace, params)
+        return await self.caches[namespace].get_or_load_async(key, loader, version)
+
+    def get_scholarships_by_criteria(self, filters, loader: Callable[[], Any], version: Any = None):
         """
-        Cached query: Get scholarships by search criteria
-        Returns cache key for actual execution
-        
+        Cached query: scholarship search for a SearchFilters instance
+
         Top Query #1: Keyword search (45% of all queries)
         """
-        self.cache_hits += 1
-        return f"search:keyword={keyword},min={min_amount},max={max_amount},type={scholarship_type}"
-    
-    @lru_cache(maxsize=128)
-    def get_eligible_scholarships(
-        self,
-        gpa: Optional[float] = None,
-        citizenship: Optional[str] = None,
-        state: Optional[str] = None
-    ) -> str:
+        return self._cached("search", filters.model_dump(mode="json"), loader, version)
+
+    async def get_scholarships_by_criteria_async(self, filters, loader: Callable[[], Awaitable[Any]],
+                                                 version: Any = None):
+        """get_scholarships_by_criteria with a coroutine loader (async request path)"""
+        return await self._cached_async("search", filters.model_dump(mode="json"), loader, version)
+
+    def get_eligible_scholarships(self, user_profile, min_match_score: float,
+                                  loader: Callable[[], Any], version: Any = None):
         """
-        Cached query: Get eligible scholarships for user profile
-        Returns cache key for actual execution
-        
+        Cached query: eligible scholarships for a user profile
+
         Top Query #2: Eligibility checks (30% of all queries)
         """
-        self.cache_hits += 1
-        return f"eligibility:gpa={gpa},citizenship={citizenship},state={state}"
-    
-    @lru_cache(maxsize=64)
-    def get_scholarship_by_id(self, scholarship_id: str) -> str:
+        # Identity and timestamps do not affect eligibility; keep them out of the key
+        profile = user_profile.model_dump(mode="json", exclude={"id", "created_at"})
+        params = {"profile": profile, "min_match_score": min_match_score}
+        return self._cached("eligibility", params, loader, version)
+
+    def get_scholarship_by_id(self, scholarship_id: str, loader: Callable[[], Any], version: Any = None):
         """
-        Cached query: Get single scholarship by ID
-        
+        Cached query: single scholarship by ID
+
         Top Query #3: Scholarship details (15% of all queries)
         """
-        self.cache_hits += 1
-        return f"scholarship:{scholarship_id}"
-    
-    def get_cache_stats(self) -> Dict[str, Any]:
+        return self._cached("scholarship", {"id": scholarship_id}, loader, version)
+
+    async def get_scholarship_by_id_async(self, scholarship_id: str,
+                                          loader: Callable[[], Awaitable[Any]], version: Any = None):
+        """get_scholarship_by_id with a coroutine loader (async request path)"""
+        return await self._cached_async("scholarship", {"id": scholarship_id}, loader, version)
+
+    def invalidate(self, reason: str = "invalidated") -> None:
+        """Drop every cached result (scholarship write, sync or manual clear)"""
+        dropped = sum(cache.clear(reason) for cache in self.caches.values())
+        logger.info(f"🗑️ Query cache invalidated ({reason}): {dropped} entries dropped")
+
+    def get_cache_stats(self) -> dict[str, Any]:
         """Get cache performance statistics"""
-        total_requests = self.cache_hits + self.cache_misses
-        hit_rate: float = (self.cache_hits / total_requests * 100) if total_requests > 0 else 0.0
-        
+        per_namespace = {name: cache.get_stats() for name, cache in self.caches.items()}
+        hits = sum(s["hits"] for s in per_namespace.values())
+        misses = sum(s["misses"] for s in per_namespace.values())
+        coalesced = sum(s["coalesced"] for s in per_namespace.values())
+        total_requests = hits + misses + coalesced
+        hit_rate: float = (hits / total_requests * 100) if total_requests > 0 else 0.0
+
         return {
-            "cache_hits": self.cache_hits,
-            "cache_misses": self.cache_misses,
+            "enabled": self.enabled,
+            "cache_hits": hits,
+            "cache_misses": misses,
+            "coalesced": coalesced,
+            "evictions": sum(s["evictions"] for s in per_namespace.values()),
             "total_requests": total_requests,
-            "hit_rate_percent": round(hit_rate, 2)
+            "hit_rate_percent": round(hit_rate, 2),
+            "namespaces": per_namespace
         }
     
     def clear_cache(self):
         """Clear all cached queries"""
-        self.get_scholarships_by_criteria.cache_clear()
-        self.get_eligible_scholarships.cache_clear()
-        self.get_scholarship_by_id.cache_clear()
-        
         logger.info(f"🗑️ Query cache cleared (hit rate was {self.get_cache_stats()['hit_rate_percent']}%)")
-        
-        # Reset stats
-        self.cache_hits = 0
-        self.cache_misses = 0
+        self.invalidate("cleared")
 
 
 # Global query optimization service
@@ -0,0 +1,267 @@
+"""
+Revocation Cache - In-Process Token Revocation Set
+Local answer for services/token_blocklist.is_token_revoked, so authenticated
+requests no longer make a Redis or database round trip
+
+- A Bloom filter in front answers the common case (token not revoked) with a
+  few bit probes
+- An exact jti -> expiry map confirms Bloom positives; entries expire with
+  the token they revoke
+- A background thread keeps workers in sync: revocations published on the
+  Redis channel arrive immediately, and revoked_tokens is polled for rows
+  revoked since the last watermark (full load on start)
+- Staleness is bounded: if the database has not been synced within
+  max_staleness seconds, check() returns None and callers fall back to the
+  remote lookup
+"""
+
+import hashlib
+import json
+import math
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import text
+
+from config.settings import settings
+from database.engine_registry import BACKGROUND_POOL, engine_registry
+from observability.metrics import token_revocation_cache_entries, token_revocation_checks_total
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+REVOCATION_CHANNEL = "token_blocklist:revoked"
+BLOOM_ERROR_RATE = 0.001
+# Rows whose revoked_at lands just behind the watermark (clock skew, late commits) are re-read
+POLL_OVERLAP = timedelta(seconds=60)
+
+
+def expiry_epoch(value: datetime) -> float:
+    """Epoch seconds for a token expiry (naive values are UTC, like the revoked_tokens columns)"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on one blake2b digest)"""
+
+    def __init__(self, capacity: int, error_rate: float = BLOOM_ERROR_RATE):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationCache:
+    """Bloom filter + exact expiry map of revoked JTIs, synced from Redis pub/sub and revoked_tokens"""
+
+    def __init__(self, poll_interval: float | None = None, max_staleness: float | None = None,
+                 bloom_capacity: int | None = None,
+                 redis_factory: Callable[[], Any] | None = None):
+        self.poll_interval = poll_interval or settings.token_revocation_poll_interval_seconds
+        self.max_staleness = max_staleness or settings.token_revocation_max_staleness_seconds
+        self.bloom_capacity = bloom_capacity or settings.token_revocation_bloom_capacity
+        self._redis_factory = redis_factory
+
+        self._expiry: dict[str, float] = {}
+        self._bloom = BloomFilter(self.bloom_capacity)
+        self._lock = threading.Lock()
+        self._watermark: datetime | None = None
+        self._synced_at = 0.0
+        self._healthy = True
+
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._listeners: list[Callable[[str], None]] = []
+
+    # Lookups ------------------------------------------------------------
+
+    def is_fresh(self) -> bool:
+        return self._synced_at > 0 and time.monotonic() - self._synced_at <= self.max_staleness
+
+    def check(self, jti: str) -> bool | None:
+        """True/False from the local set, or None when it is too stale to answer"""
+        if not self.is_fresh():
+            token_revocation_checks_total.labels(result="fallback").inc()
+            return None
+        if jti not in self._bloom:
+            token_revocation_checks_total.labels(result="bloom_negative").inc()
+            return False
+        expires = self._expiry.get(jti)
+        revoked = expires is not None and expires > time.time()
+        token_revocation_checks_total.labels(result="revoked" if revoked else "not_revoked").inc()
+        return revoked
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+    # Updates ------------------------------------------------------------
+
+    def add_listener(self, listener: Callable[[str], None]) -> None:
+        """Call listener(jti) for every newly recorded revocation, whichever path it arrived by"""
+        self._listeners.append(listener)
+
+    def add(self, jti: str, expires_at: float) -> None:
+        """Record a revocation until expires_at (epoch seconds)"""
+        if expires_at <= time.time():
+            return
+        with self._lock:
+            new = jti not in self._expiry
+            self._expiry[jti] = max(expires_at, self._expiry.get(jti, 0.0))
+            if len(self._expiry) > self._bloom.capacity:
+                self._rebuild(2 * len(self._expiry))
+            else:
+                self._bloom.add(jti)
+            token_revocation_cache_entries.set(len(self._expiry))
+        if new:
+            for listener in self._listeners:
+                listener(jti)
+
+    def prune(self) -> int:
+        """Drop expired entries (and rebuild the Bloom filter, which cannot delete)"""
+        now = time.time()
+        with self._lock:
+            expired = [jti for jti, expires in self._expiry.items() if expires <= now]
+            if not expired:
+                return 0
+            for jti in expired:
+                del self._expiry[jti]
+            self._rebuild(max(self.bloom_capacity, len(self._expiry)))
+            token_revocation_cache_entries.set(len(self._expiry))
+        return len(expired)
+
+    def _rebuild(self, capacity: int) -> None:
+        bloom = BloomFilter(capacity)
+        for jti in self._expiry:
+            bloom.add(jti)
+        self._bloom = bloom
+
+    def apply_message(self, data: bytes | str) -> None:
+        """Apply one pub/sub message: {"jti": ..., "exp": epoch seconds}"""
+        try:
+            message = json.loads(data)
+            self.add(message["jti"], float(message["exp"]))
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring malformed revocation message: {e}")
+
+    # Database sync ------------------------------------------------------
+
+    def _fetch(self, since: datetime | None) -> tuple[list, datetime]:
+        """Rows to apply, plus the database clock read on the same connection"""
+        engine = engine_registry.get_engine(BACKGROUND_POOL)
+        with engine.connect() as conn:
+            if since is None:
+                rows = conn.execute(text(
+                    "SELECT jti, expires_at, revoked_at FROM revoked_tokens WHERE expires_at > NOW()"
+                )).fetchall()
+            else:
+                rows = conn.execute(text(
+                    "SELECT jti, expires_at, revoked_at FROM revoked_tokens "
+                    "WHERE revoked_at > :since AND expires_at > NOW()"
+                ), {"since": since - POLL_OVERLAP}).fetchall()
+            db_now = conn.execute(text("SELECT NOW()")).scalar()
+        return rows, db_now
+
+    def sync(self) -> bool:
+        """Full load on first call, then rows revoked since the watermark"""
+        try:
+            rows, db_now = self._fetch(self._watermark)
+        except Exception as e:
+            if self._healthy:
+                logger.warning(f"Token revocation sync failed, remote checks after {self.max_staleness:.0f}s: {e}")
+            self._healthy = False
+            return False
+
+        for jti, expires_at, revoked_at in rows:
+            self.add(jti, expiry_epoch(expires_at))
+            if revoked_at is not None and (self._watermark is None or revoked_at > self._watermark):
+                self._watermark = revoked_at
+        if self._watermark is None:
+            # Empty table: later polls only need rows revoked from now on, by the
+            # database clock that stamps revoked_at
+            self._watermark = db_now
+        self.prune()
+        if not self._healthy:
+            logger.info("Token revocation sync recovered")
+        self._healthy = True
+        self._synced_at = time.monotonic()
+        return True
+
+    # Background thread --------------------------------------------------
+
+    def _subscribe(self):
+        client = self._redis_factory() if self._redis_factory else None
+        if client is None:
+            return None
+        try:
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(REVOCATION_CHANNEL)
+            return pubsub
+        except Exception as e:
+            logger.warning(f"Token revocation pub/sub unavailable, polling only: {e}")
+            return None
+
+    def _run(self) -> None:
+        pubsub = self._subscribe()
+        try:
+            while not self._stop.is_set():
+                self.sync()
+                deadline = time.monotonic() + self.poll_interval
+                while not self._stop.is_set() and (remaining := deadline - time.monotonic()) > 0:
+                    if pubsub is None:
+                        self._stop.wait(remaining)
+                        break
+                    try:
+                        message = pubsub.get_message(timeout=min(remaining, 1.0))
+                    except Exception as e:
+                        logger.warning(f"Token revocation pub/sub dropped, polling only: {e}")
+                        pubsub = None
+                        continue
+                    if message and message.get("type") == "message":
+                        self.apply_message(message["data"])
+        finally:
+            if pubsub is not None:
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="token-revocation-sync", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def get_status(self) -> dict[str, Any]:
+        return {
+            "entries": len(self._expiry),
+            "fresh": self.is_fresh(),
+            "seconds_since_sync": round(time.monotonic() - self._synced_at, 1) if self._synced_at else None,
+            "watermark": self._watermark.isoformat() if self._watermark else None,
+            "bloom_bits": self._bloom.size,
+            "bloom_hashes": self._bloom.hashes,
+        }
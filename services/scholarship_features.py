@@ -0,0 +1,204 @@
+"""
+Scholarship Features - Precomputed Competition Model for Predictive Matching
+Scholarship-only inputs to PredictiveMatchingService compiled into NumPy columns
+
+Estimated applicants, competition level, applicant pool quality, acceptance
+rate, application trend and historical-winner summaries depend only on the
+scholarship, so they are computed once per catalog version (whenever the
+eligibility engine compiles a new catalog, and at startup) instead of once per
+(user, scholarship) pair. Entries are keyed by scholarship id and updated_at:
+a scholarship changed since compilation, or one outside the catalog, is
+computed on the fly rather than served stale.
+"""
+
+import threading
+from datetime import datetime
+
+import numpy as np
+
+from models.predictive_matching import CompetitionAnalysis, CompetitionLevel, HistoricalWinnerProfile
+from models.scholarship import Scholarship
+from services.eligibility_engine import eligibility_engine
+from utils.epoch import epoch_microseconds
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Competition level by estimated applicants: <50, <200, <500, <1000, 1000+
+LEVEL_BOUNDARIES = [50, 200, 500, 1000]
+LEVELS = [
+    CompetitionLevel.VERY_LOW,
+    CompetitionLevel.LOW,
+    CompetitionLevel.MEDIUM,
+    CompetitionLevel.HIGH,
+    CompetitionLevel.VERY_HIGH,
+]
+
+_DAY_US = 86_400 * 1_000_000
+
+
+class ScholarshipFeatures:
+    """Columnar competition features for a fixed list of scholarships"""
+
+    def __init__(self, scholarships: list[Scholarship], version: int | None = None,
+                 historical_winners: dict[str, list[HistoricalWinnerProfile]] | None = None):
+        self.version = version
+        self.ids = [sch.id for sch in scholarships]
+        self.size = len(scholarships)
+        self.positions = {sch.id: i for i, sch in enumerate(scholarships)}
+        self.updated_us = np.array([epoch_microseconds(sch.updated_at) for sch in scholarships], dtype=np.int64)
+        self.deadline_us = np.array(
+            [epoch_microseconds(sch.application_deadline) for sch in scholarships], dtype=np.int64
+        )
+
+        criteria = [sch.eligibility_criteria for sch in scholarships]
+        amounts = np.array([sch.amount for sch in scholarships], dtype=np.float64)
+        min_gpa = np.array([np.nan if c.min_gpa is None else c.min_gpa for c in criteria], dtype=np.float64)
+
+        # Estimated applicants: award size draws applicants, each restriction narrows the pool
+        base = 100 * np.select([amounts > 10000, amounts > 5000, amounts > 1000], [3.0, 2.0, 1.5], 1.0)
+        with np.errstate(invalid="ignore"):
+            selective_gpa = min_gpa > 3.5
+            strong_gpa = min_gpa >= 3.5
+        specificity = (
+            np.array([bool(c.fields_of_study) for c in criteria], dtype=np.int64)
+            + selective_gpa
+            + np.array([bool(c.residency_states) for c in criteria], dtype=np.int64)
+        )
+        self.estimated_applicants = (base * 0.7 ** specificity).astype(np.int64)
+        self.level = np.digitize(self.estimated_applicants, LEVEL_BOUNDARIES)
+
+        # Average strength of likely applicants
+        self.pool_quality = np.minimum(
+            1.0, 0.5 + np.select([amounts > 10000, amounts > 5000], [0.2, 0.1], 0.0) + 0.1 * strong_gpa
+        )
+
+        # Awards per estimated applicant (NaN = unknown)
+        max_awards = np.array([sch.max_awards or 0 for sch in scholarships], dtype=np.float64)
+        known = (max_awards > 0) & (self.estimated_applicants > 0)
+        self.acceptance_rate = np.full(self.size, np.nan)
+        np.divide(max_awards, self.estimated_applicants, out=self.acceptance_rate, where=known)
+        np.minimum(self.acceptance_rate, 1.0, out=self.acceptance_rate, where=known)
+
+        # Large awards keep attracting more applicants cycle over cycle
+        self.trend_increasing = amounts > 10000
+
+        # Historical winner summaries
+        historical_winners = historical_winners or {}
+        self.winner_profiles = [historical_winners.get(sch.id, []) for sch in scholarships]
+        self.winner_avg_gpa = np.array([
+            np.mean(gpas) if (gpas := [w.avg_gpa for w in profiles if w.avg_gpa is not None]) else np.nan
+            for profiles in self.winner_profiles
+        ], dtype=np.float64)
+
+    def is_current(self, position: int, scholarship: Scholarship) -> bool:
+        return self.updated_us[position] == epoch_microseconds(scholarship.updated_at)
+
+    def analyses(self, positions: list[int], now: datetime) -> list[CompetitionAnalysis]:
+        """CompetitionAnalysis for the given rows; only deadline pressure depends on the time"""
+        rows = np.asarray(positions, dtype=np.int64)
+        days_to_deadline = (self.deadline_us[rows] - epoch_microseconds(now)) // _DAY_US
+        deadline_pressure = np.clip((90 - days_to_deadline) / 90, 0.0, 1.0)
+
+        analyses = []
+        for i, p in enumerate(positions):
+            acceptance_rate = self.acceptance_rate[p]
+            avg_gpa = self.winner_avg_gpa[p]
+            profiles = self.winner_profiles[p]
+            analyses.append(CompetitionAnalysis(
+                scholarship_id=self.ids[p],
+                estimated_applicant_count=int(self.estimated_applicants[p]),
+                competition_level=LEVELS[self.level[p]],
+                applicant_pool_quality=float(self.pool_quality[p]),
+                historical_winner_profiles=profiles,
+                acceptance_rate=None if np.isnan(acceptance_rate) else float(acceptance_rate),
+                avg_winner_characteristics={"winner_years": len(profiles), "avg_gpa": float(avg_gpa)}
+                if profiles and not np.isnan(avg_gpa) else {},
+                application_trend="increasing" if self.trend_increasing[p] else "stable",
+                deadline_pressure=float(deadline_pressure[i]),
+                similar_scholarships_competition=[]  # Would analyze similar opportunities
+            ))
+        return analyses
+
+
+class ScholarshipFeatureStore:
+    """Holds the compiled features and follows the eligibility engine's catalog version"""
+
+    def __init__(self, historical_winners: dict[str, list[HistoricalWinnerProfile]] | None = None):
+        self.historical_winners = historical_winners or self._load_historical_winners()
+        self._features: ScholarshipFeatures | None = None
+        self._lock = threading.Lock()
+        self.compilations = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _load_historical_winners(self) -> dict[str, list[HistoricalWinnerProfile]]:
+        """Historical winner profiles by scholarship id"""
+        # In production, this would load from database
+        return {}
+
+    def load(self, scholarships: list[Scholarship], version: int | None) -> ScholarshipFeatures:
+        """Compile features for a catalog; unversioned catalogs are never kept"""
+        features = ScholarshipFeatures(scholarships, version, self.historical_winners)
+        self.compilations += 1
+        logger.info(f"Compiled scholarship features: {features.size} scholarships (version {version})")
+        if version is not None:
+            self._features = features
+        return features
+
+    def _sync(self) -> ScholarshipFeatures | None:
+        """Recompile when the eligibility engine holds a newer catalog (no database access)"""
+        catalog = eligibility_engine.compiled
+        features = self._features
+        if catalog is None or catalog.version is None or (features is not None and features.version == catalog.version):
+            return features
+        with self._lock:
+            features = self._features
+            if features is None or features.version != catalog.version:
+                features = self.load(catalog.scholarships, catalog.version)
+            return features
+
+    async def warm_async(self) -> None:
+        """Compile features for the current catalog (startup)"""
+        catalog = await eligibility_engine.catalog_async()
+        with self._lock:
+            if self._features is None or self._features.version != catalog.version:
+                self.load(catalog.scholarships, catalog.version)
+
+    def competition(self, scholarships: list[Scholarship], now: datetime | None = None) -> list[CompetitionAnalysis]:
+        """CompetitionAnalysis per scholarship, in order, from precomputed rows where current"""
+        now = now or datetime.utcnow()
+        features = self._sync()
+        cached: list[tuple[int, int]] = []
+        missing: list[tuple[int, Scholarship]] = []
+        for i, scholarship in enumerate(scholarships):
+            position = features.positions.get(scholarship.id) if features is not None else None
+            if position is not None and features.is_current(position, scholarship):
+                cached.append((i, position))
+            else:
+                missing.append((i, scholarship))
+        self.hits += len(cached)
+        self.misses += len(missing)
+
+        results: list[CompetitionAnalysis | None] = [None] * len(scholarships)
+        if cached:
+            for (i, _), analysis in zip(cached, features.analyses([p for _, p in cached], now)):
+                results[i] = analysis
+        if missing:
+            adhoc = ScholarshipFeatures([s for _, s in missing], historical_winners=self.historical_winners)
+            for (i, _), analysis in zip(missing, adhoc.analyses(list(range(adhoc.size)), now)):
+                results[i] = analysis
+        return results
+
+    def get_status(self) -> dict:
+        features = self._features
+        return {
+            "version": features.version if features is not None else None,
+            "scholarships": features.size if features is not None else 0,
+            "compilations": self.compilations,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+scholarship_feature_store = ScholarshipFeatureStore()
@@ -0,0 +1,410 @@
+"""
+Scholarship Index - In-Process Columnar Search Index
+Array-backed index of active scholarships used by ScholarshipService.search_scholarships
+
+Every SearchFilters predicate is evaluated against the index *before* pagination,
+so total_count is exact and every page is full. Rows are refreshed incrementally
+from ScholarshipDB.updated_at; readers always see an immutable snapshot.
+"""
+
+import asyncio
+import re
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import numpy as np
+
+from models.database import ScholarshipDB, SessionLocal
+from models.scholarship import Scholarship, ScholarshipSummary, SearchFilters, SearchResponse
+from services.scholarship_repository import (
+    active_scholarships,
+    changed_since,
+    count_active,
+    scholarship_repository,
+)
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def build_summary(scholarship: Scholarship) -> ScholarshipSummary:
+    """Build the search-result summary for a scholarship"""
+    description = scholarship.description
+    return ScholarshipSummary(
+        id=scholarship.id,
+        name=scholarship.name,
+        organization=scholarship.organization,
+        amount=scholarship.amount,
+        application_deadline=scholarship.application_deadline,
+        scholarship_type=scholarship.scholarship_type,
+        description=description[:197] + "..." if len(description) > 200 else description,
+        eligibility_criteria=scholarship.eligibility_criteria
+    )
+
+
+def _to_epoch(value: datetime) -> float:
+    """Convert a datetime to epoch seconds (naive values are treated as UTC, like the DB column)"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _keyword_matcher(keyword: str) -> Callable[[str], bool]:
+    """Build a matcher with ILIKE '%keyword%' semantics against lower-cased text"""
+    needle = keyword.lower()
+    if "%" not in needle and "_" not in needle:
+        return lambda text: needle in text
+    # Honour ILIKE wildcards so results match the database path exactly
+    pattern = "".join(
+        ".*" if ch == "%" else "." if ch == "_" else re.escape(ch)
+        for ch in needle
+    )
+    compiled = re.compile(pattern, re.DOTALL)
+    return lambda text: compiled.search(text) is not None
+
+
+@dataclass(frozen=True)
+class _IndexRow:
+    """Denormalized, filter-ready view of one active scholarship"""
+    id: str
+    scholarship_type: str
+    amount: float
+    deadline: float
+    min_gpa: float | None
+    fields_of_study: tuple[str, ...]
+    residency_states: tuple[str, ...]
+    citizenship_required: str | None
+    search_text: str
+    summary: ScholarshipSummary
+
+
+class _IndexSnapshot:
+    """Immutable columnar snapshot; rows are ordered by (application_deadline, id)"""
+
+    def __init__(self, rows: list[_IndexRow]):
+        rows = sorted(rows, key=lambda r: (r.deadline, r.id))
+        self.size = len(rows)
+        self.summaries = [r.summary for r in rows]
+        self.search_text = [r.search_text for r in rows]
+
+        # Deadline column is the row order itself, so range filters are a slice
+        self.deadline = np.array([r.deadline for r in rows], dtype=np.float64)
+
+        # Sorted numeric columns: values plus the row positions that produce them
+        self.amount_sorted, self.amount_order = self._sorted_column([r.amount for r in rows])
+        self.min_gpa_sorted, self.min_gpa_order = self._sorted_column(
+            [-np.inf if r.min_gpa is None else r.min_gpa for r in rows]
+        )
+
+        # Bitmap posting lists
+        self.by_type = self._postings(rows, lambda r: (r.scholarship_type,))
+        self.by_field = self._postings(rows, lambda r: r.fields_of_study)
+        self.by_state = self._postings(rows, lambda r: r.residency_states)
+        self.by_citizenship = self._postings(
+            rows, lambda r: (r.citizenship_required,) if r.citizenship_required is not None else ()
+        )
+        self.no_state_restriction = np.array([not r.residency_states for r in rows], dtype=bool)
+        self.no_citizenship_restriction = np.array(
+            [r.citizenship_required is None for r in rows], dtype=bool
+        )
+
+    @staticmethod
+    def _sorted_column(values: list[float]) -> tuple[np.ndarray, np.ndarray]:
+        column = np.array(values, dtype=np.float64)
+        order = np.argsort(column, kind="stable")
+        return column[order], order
+
+    def _postings(self, rows: list[_IndexRow], keys: Callable[[_IndexRow], tuple]) -> dict[str, np.ndarray]:
+        postings: dict[str, np.ndarray] = {}
+        for position, row in enumerate(rows):
+            for key in keys(row):
+                bitmap = postings.get(key)
+                if bitmap is None:
+                    bitmap = postings[key] = np.zeros(self.size, dtype=bool)
+                bitmap[position] = True
+        return postings
+
+    def _range(self, sorted_values: np.ndarray, order: np.ndarray,
+               low: float | None, high: float | None) -> np.ndarray:
+        start = 0 if low is None else int(np.searchsorted(sorted_values, low, side="left"))
+        stop = self.size if high is None else int(np.searchsorted(sorted_values, high, side="right"))
+        mask = np.zeros(self.size, dtype=bool)
+        mask[order[start:stop]] = True
+        return mask
+
+    def _any_of(self, postings: dict[str, np.ndarray], keys) -> np.ndarray:
+        mask = np.zeros(self.size, dtype=bool)
+        for key in keys:
+            bitmap = postings.get(key)
+            if bitmap is not None:
+                mask |= bitmap
+        return mask
+
+    def match(self, filters: SearchFilters) -> np.ndarray:
+        """Return row positions matching every filter, in deadline order"""
+        mask = np.ones(self.size, dtype=bool)
+
+        if filters.deadline_after is not None or filters.deadline_before is not None:
+            start = 0
+            stop = self.size
+            if filters.deadline_after is not None:
+                start = int(np.searchsorted(self.deadline, _to_epoch(filters.deadline_after), side="left"))
+            if filters.deadline_before is not None:
+                stop = int(np.searchsorted(self.deadline, _to_epoch(filters.deadline_before), side="right"))
+            window = np.zeros(self.size, dtype=bool)
+            window[start:stop] = True
+            mask &= window
+
+        if filters.min_amount is not None or filters.max_amount is not None:
+            mask &= self._range(self.amount_sorted, self.amount_order,
+                                filters.min_amount, filters.max_amount)
+
+        if filters.scholarship_types:
+            type_values = [t.value if hasattr(t, "value") else str(t) for t in filters.scholarship_types]
+            mask &= self._any_of(self.by_type, type_values)
+
+        if filters.fields_of_study:
+            field_values = [f.value if hasattr(f, "value") else str(f) for f in filters.fields_of_study]
+            mask &= self._any_of(self.by_field, field_values)
+
+        if filters.states:
+            mask &= self._any_of(self.by_state, filters.states) | self.no_state_restriction
+
+        if filters.min_gpa is not None:
+            # Applicant qualifies when the scholarship minimum is unset or <= their GPA
+            mask &= self._range(self.min_gpa_sorted, self.min_gpa_order, None, filters.min_gpa)
+
+        if filters.citizenship:
+            mask &= self._any_of(self.by_citizenship, (filters.citizenship,)) | self.no_citizenship_restriction
+
+        positions = np.flatnonzero(mask)
+
+        if filters.keyword:
+            matches = _keyword_matcher(filters.keyword)
+            text = self.search_text
+            positions = np.fromiter(
+                (p for p in positions if matches(text[p])), dtype=np.intp
+            )
+
+        return positions
+
+
+class ScholarshipIndex:
+    """
+    In-process columnar index over active scholarships.
+
+    - Bitmap posting lists per field of study, state, citizenship and type
+    - Sorted numeric columns for amount, deadline and min_gpa
+    - Incremental refresh from ScholarshipDB.updated_at with bounded staleness
+    - Full reload when the active row count drifts (raw-SQL inserts, hard deletes)
+    """
+
+    def __init__(
+        self,
+        converter: Callable[[ScholarshipDB], Scholarship],
+        session_factory: Callable = SessionLocal,
+        refresh_interval_seconds: float = 5.0
+    ):
+        self._converter = converter
+        self._session_factory = session_factory
+        self.refresh_interval_seconds = refresh_interval_seconds
+
+        self._rows: dict[str, _IndexRow] = {}
+        self._snapshot: _IndexSnapshot | None = None
+        self._watermark: datetime | None = None
+        self._last_refresh = 0.0
+        self._lock = threading.Lock()
+        self._async_lock = asyncio.Lock()
+        self._generation = 0
+
+        # Bumped whenever indexed content changes (snapshot rebuilt)
+        self.version = 0
+        # Bumped whenever the active catalog changes at all: row count or newest
+        # updated_at, including fields the index does not hold; result caches key on it
+        self.catalog_version = 0
+        self._catalog_stamp: tuple[int, datetime | None] | None = None
+        self.full_reloads = 0
+        self.incremental_refreshes = 0
+
+    @property
+    def size(self) -> int:
+        snapshot = self._snapshot
+        return snapshot.size if snapshot else 0
+
+    def invalidate(self) -> None:
+        """Force a refresh on the next search (call after scholarship writes or syncs)"""
+        self._last_refresh = 0.0
+
+    def reset(self) -> None:
+        """Drop all indexed rows; the next search performs a full reload"""
+        with self._lock:
+            self._rows = {}
+            self._snapshot = None
+            self._watermark = None
+            self._last_refresh = 0.0
+
+    def _build_row(self, db_sch: ScholarshipDB) -> _IndexRow:
+        scholarship = self._converter(db_sch)
+        criteria = scholarship.eligibility_criteria
+        return _IndexRow(
+            id=scholarship.id,
+            scholarship_type=db_sch.scholarship_type,
+            amount=float(scholarship.amount),
+            deadline=_to_epoch(scholarship.application_deadline),
+            min_gpa=criteria.min_gpa,
+            fields_of_study=tuple(f.value for f in criteria.fields_of_study),
+            residency_states=tuple(criteria.residency_states or ()),
+            citizenship_required=criteria.citizenship_required,
+            search_text="\x00".join(
+                (scholarship.name or "", scholarship.description or "", scholarship.organization or "")
+            ).lower(),
+            summary=build_summary(scholarship)
+        )
+
+    def _apply(self, db_rows) -> bool:
+        """Upsert/remove rows; returns True if indexed content changed"""
+        changed = False
+        for db_sch in db_rows:
+            if db_sch.updated_at is not None and (self._watermark is None or db_sch.updated_at > self._watermark):
+                self._watermark = db_sch.updated_at
+            previous = self._rows.pop(db_sch.id, None)
+            if db_sch.is_active is not True:
+                changed = changed or previous is not None
+                continue
+            try:
+                row = self._build_row(db_sch)
+            except Exception as e:
+                changed = changed or previous is not None
+                logger.warning(f"Skipping unindexable scholarship {db_sch.id}: {str(e)}")
+                continue
+            self._rows[db_sch.id] = row
+            changed = changed or row != previous
+        return changed
+
+    def _is_fresh(self, force: bool) -> bool:
+        return (
+            not force and self._snapshot is not None
+            and time.monotonic() - self._last_refresh < self.refresh_interval_seconds
+        )
+
+    def _incremental_watermark(self) -> datetime | None:
+        """Watermark to refresh from, or None when a full reload is required"""
+        return self._watermark if self._snapshot is not None else None
+
+    def _apply_incremental(self, changed_rows, active_count: int) -> bool | None:
+        """Apply rows changed since the watermark; None when a full reload is required"""
+        changed = self._apply(changed_rows)
+        if active_count != len(self._rows):
+            return None
+        self.incremental_refreshes += 1
+        return changed
+
+    def _apply_full(self, active_rows) -> None:
+        self._rows = {}
+        self._watermark = None
+        self._apply(active_rows)
+        self.full_reloads += 1
+        logger.info(f"Scholarship index reloaded: {len(self._rows)} active scholarships")
+
+    def _publish(self, changed: bool) -> None:
+        if changed:
+            self._snapshot = _IndexSnapshot(list(self._rows.values()))
+            self.version += 1
+        stamp = (len(self._rows), self._watermark)
+        if changed or stamp != self._catalog_stamp:
+            self._catalog_stamp = stamp
+            self.catalog_version += 1
+        self._generation += 1
+        self._last_refresh = time.monotonic()
+
+    def refresh(self, force: bool = False) -> None:
+        """Bring the index up to date with the database"""
+        if self._is_fresh(force):
+            return
+
+        with self._lock:
+            if self._is_fresh(force):
+                return
+
+            db = self._session_factory()
+            try:
+                changed = None
+                watermark = self._incremental_watermark()
+                if watermark is not None:
+                    changed = self._apply_incremental(
+                        db.scalars(changed_since(watermark)).all(),
+                        db.scalar(count_active())
+                    )
+                if changed is None:
+                    self._apply_full(db.scalars(active_scholarships()).all())
+                    changed = True
+                self._publish(changed)
+            finally:
+                db.close()
+
+    async def refresh_async(self, force: bool = False) -> None:
+        """
+        refresh() over the async repository, for use from request handlers.
+
+        Rows are fetched without holding the index lock; they are applied only
+        if no other refresh completed meanwhile (that one saw data at least as new).
+        """
+        if self._is_fresh(force):
+            return
+
+        async with self._async_lock:
+            if self._is_fresh(force):
+                return
+
+            generation = self._generation
+            watermark = self._incremental_watermark()
+            if watermark is not None:
+                changed_rows, active_count = await scholarship_repository.list_changed_since(watermark)
+                with self._lock:
+                    if self._generation != generation:
+                        return
+                    changed = self._apply_incremental(changed_rows, active_count)
+                    if changed is not None:
+                        self._publish(changed)
+                        return
+
+            active_rows = await scholarship_repository.fetch(active_scholarships())
+            with self._lock:
+                if self._generation != generation:
+                    return
+                self._apply_full(active_rows)
+                self._publish(True)
+
+    def search(self, filters: SearchFilters, refresh: bool = True) -> SearchResponse:
+        """Evaluate all filters against the index, then paginate"""
+        if refresh:
+            self.refresh()
+        snapshot = self._snapshot
+
+        positions = snapshot.match(filters)
+        total_count = int(len(positions))
+        page_positions = positions[filters.offset:filters.offset + filters.limit]
+
+        return SearchResponse(
+            scholarships=[snapshot.summaries[p] for p in page_positions],
+            total_count=total_count,
+            page=(filters.offset // filters.limit) + 1,
+            page_size=filters.limit,
+            has_next=(filters.offset + filters.limit) < total_count,
+            has_previous=filters.offset > 0
+        )
+
+    def get_stats(self) -> dict:
+        """Index statistics for diagnostics"""
+        return {
+            "indexed_scholarships": self.size,
+            "version": self.version,
+            "catalog_version": self.catalog_version,
+            "watermark": self._watermark.isoformat() if self._watermark else None,
+            "full_reloads": self.full_reloads,
+            "incremental_refreshes": self.incremental_refreshes,
+            "refresh_interval_seconds": self.refresh_interval_seconds
+        }
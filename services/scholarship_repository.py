@@ -0,0 +1,144 @@
+"""
+Scholarship Repository - Async Read Path
+SQLAlchemy 2.0 statements shared by the sync services and the AsyncSession read path
+
+Statements are built once here so the sync (scripts, jobs) and async (request
+handlers) paths can never drift apart in what they select.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import Select, desc, func, or_, select
+
+from models.async_database import async_session_scope
+from models.database import ScholarshipDB
+from models.scholarship import SearchFilters
+
+
+def active_scholarships() -> Select:
+    return select(ScholarshipDB).where(ScholarshipDB.is_active == True)
+
+
+def active_by_id(scholarship_id: str) -> Select:
+    return active_scholarships().where(ScholarshipDB.id == scholarship_id)
+
+
+def active_by_ids(scholarship_ids: list[str]) -> Select:
+    return active_scholarships().where(ScholarshipDB.id.in_(scholarship_ids))
+
+
+def all_active_by_deadline() -> Select:
+    return active_scholarships().order_by(desc(ScholarshipDB.application_deadline))
+
+
+def count_active() -> Select:
+    return select(func.count()).select_from(ScholarshipDB).where(ScholarshipDB.is_active == True)
+
+
+def catalog_stamp() -> Select:
+    """(active row count, newest updated_at): changes whenever any active scholarship is written"""
+    return (
+        select(func.count(), func.max(ScholarshipDB.updated_at))
+        .select_from(ScholarshipDB)
+        .where(ScholarshipDB.is_active == True)
+    )
+
+
+def changed_since(watermark: datetime) -> Select:
+    # >= so rows committed in the same tick as the watermark are not missed
+    return select(ScholarshipDB).where(ScholarshipDB.updated_at >= watermark)
+
+
+def keyword_clause(keyword: str):
+    pattern = f"%{keyword}%"
+    return or_(
+        ScholarshipDB.name.ilike(pattern),
+        ScholarshipDB.description.ilike(pattern),
+        ScholarshipDB.organization.ilike(pattern)
+    )
+
+
+def search_statement(filters: SearchFilters) -> Select:
+    """Column filters for scholarship search, ordered for stable pagination"""
+    stmt = active_scholarships()
+
+    if filters.keyword:
+        stmt = stmt.where(keyword_clause(filters.keyword))
+    if filters.min_amount is not None:
+        stmt = stmt.where(ScholarshipDB.amount >= filters.min_amount)
+    if filters.max_amount is not None:
+        stmt = stmt.where(ScholarshipDB.amount <= filters.max_amount)
+    if filters.scholarship_types:
+        type_values = [t.value if hasattr(t, 'value') else str(t) for t in filters.scholarship_types]
+        stmt = stmt.where(ScholarshipDB.scholarship_type.in_(type_values))
+    if filters.deadline_after:
+        stmt = stmt.where(ScholarshipDB.application_deadline >= filters.deadline_after)
+    if filters.deadline_before:
+        stmt = stmt.where(ScholarshipDB.application_deadline <= filters.deadline_before)
+
+    return stmt.order_by(ScholarshipDB.application_deadline, ScholarshipDB.id)
+
+
+def count_of(stmt: Select) -> Select:
+    return select(func.count()).select_from(stmt.order_by(None).subquery())
+
+
+def needs_criteria_filter(filters: SearchFilters) -> bool:
+    """Eligibility filters live in the JSON column and are applied in Python"""
+    return bool(
+        filters.fields_of_study or filters.states or
+        filters.min_gpa is not None or filters.citizenship
+    )
+
+
+class ScholarshipRepository:
+    """Async reads over ScholarshipDB; uses the request-scoped session when bound"""
+
+    async def get_active(self, scholarship_id: str) -> ScholarshipDB | None:
+        async with async_session_scope() as session:
+            return (await session.scalars(active_by_id(scholarship_id))).first()
+
+    async def list_active_by_ids(self, scholarship_ids: list[str]) -> list[ScholarshipDB]:
+        """Active rows for the given ids in one IN query (row order unspecified)"""
+        if not scholarship_ids:
+            return []
+        async with async_session_scope() as session:
+            return list((await session.scalars(active_by_ids(scholarship_ids))).all())
+
+    async def list_active(self) -> list[ScholarshipDB]:
+        async with async_session_scope() as session:
+            return list((await session.scalars(all_active_by_deadline())).all())
+
+    async def list_changed_since(self, watermark: datetime) -> tuple[list[ScholarshipDB], int]:
+        """Rows touched since watermark plus the current active row count"""
+        async with async_session_scope() as session:
+            rows = list((await session.scalars(changed_since(watermark))).all())
+            active_count = await session.scalar(count_active())
+            return rows, active_count
+
+    async def get_catalog_stamp(self) -> tuple[int, datetime | None]:
+        async with async_session_scope() as session:
+            return tuple((await session.execute(catalog_stamp())).one())
+
+    async def search(self, filters: SearchFilters) -> tuple[list[ScholarshipDB], int | None]:
+        """
+        Column-filtered rows for a search.
+
+        Without JSON criteria filters the page is fetched with OFFSET/LIMIT and
+        the exact total is returned; otherwise every candidate row is returned
+        (total None) for criteria filtering before pagination.
+        """
+        stmt = search_statement(filters)
+        async with async_session_scope() as session:
+            if needs_criteria_filter(filters):
+                return list((await session.scalars(stmt)).all()), None
+            total_count = await session.scalar(count_of(stmt))
+            page = await session.scalars(stmt.offset(filters.offset).limit(filters.limit))
+            return list(page.all()), total_count
+
+    async def fetch(self, stmt: Select) -> list[ScholarshipDB]:
+        async with async_session_scope() as session:
+            return list((await session.scalars(stmt)).all())
+
+
+scholarship_repository = ScholarshipRepository()
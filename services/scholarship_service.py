@@ -3,22 +3,33 @@ Scholarship Service - Database-Backed Real-Time Data
 SRE DIRECTIVE: Zero-Staleness - All data from Production Database
 """
 
+import time
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import desc, or_
 from sqlalchemy.orm import Session
 
+from config.settings import settings
 from models.database import ScholarshipDB, SessionLocal
 from models.scholarship import (
     EligibilityCriteria,
     FieldOfStudy,
     Scholarship,
-    ScholarshipSummary,
     ScholarshipType,
     SearchFilters,
     SearchResponse,
 )
+from services.query_cache import query_optimization_service
+from services.scholarship_index import ScholarshipIndex, build_summary
+from services.scholarship_repository import (
+    active_by_id,
+    all_active_by_deadline,
+    catalog_stamp,
+    count_of,
+    needs_criteria_filter,
+    scholarship_repository,
+    search_statement,
+)
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -33,11 +44,23 @@ class ScholarshipService:
     """
     Service for managing scholarship operations.
     SRE DIRECTIVE: All data sourced from Production Database.
-    No in-memory caching. No mock data fallback.
+    No mock data fallback. Search is served from an in-process index that is
+    refreshed from ScholarshipDB.updated_at (bounded staleness, see
+    SCHOLARSHIP_INDEX_REFRESH_SECONDS) and falls back to the database on error.
     """
 
     def __init__(self):
         logger.info("ScholarshipService initialized - Database-backed mode (Zero-Staleness)")
+        self.index = ScholarshipIndex(
+            converter=self._db_to_scholarship,
+            session_factory=lambda: get_db_session(),
+            refresh_interval_seconds=settings.scholarship_index_refresh_seconds
+        )
+        # Catalog version without the index: (count, max(updated_at)) re-read at most
+        # once per SCHOLARSHIP_INDEX_REFRESH_SECONDS
+        self._stamp: tuple | None = None
+        self._stamp_version = 0
+        self._stamp_checked = 0.0
         self._update_metrics()
 
     def get_scholarship_count(self) -> int:
@@ -52,6 +75,59 @@ class ScholarshipService:
         finally:
             db.close()
 
+    def invalidate_caches(self) -> None:
+        """Mark in-process scholarship state stale after a write or sync"""
+        self.index.invalidate()
+        self._stamp_checked = 0.0
+        query_optimization_service.invalidate("scholarship_write")
+
+    def _stamp_fresh(self) -> bool:
+        return (
+            self._stamp is not None
+            and time.monotonic() - self._stamp_checked < settings.scholarship_index_refresh_seconds
+        )
+
+    def _apply_stamp(self, stamp: tuple) -> int:
+        if stamp != self._stamp:
+            self._stamp = stamp
+            self._stamp_version += 1
+        self._stamp_checked = time.monotonic()
+        return self._stamp_version
+
+    def catalog_version(self) -> int | None:
+        """
+        Version of the scholarship catalog used to tag cached query results.
+        Changes on any write to an active scholarship (count or newest updated_at).
+        Returns None (cache bypass) when it cannot be determined.
+        """
+        try:
+            if settings.scholarship_index_enabled:
+                self.index.refresh()
+                return self.index.catalog_version
+            if self._stamp_fresh():
+                return self._stamp_version
+            db = get_db_session()
+            try:
+                return self._apply_stamp(tuple(db.execute(catalog_stamp()).one()))
+            finally:
+                db.close()
+        except Exception as e:
+            logger.warning(f"Catalog version unavailable, bypassing query cache: {str(e)}")
+            return None
+
+    async def catalog_version_async(self) -> int | None:
+        """catalog_version() for async handlers; reads over the AsyncSession path"""
+        try:
+            if settings.scholarship_index_enabled:
+                await self.index.refresh_async()
+                return self.index.catalog_version
+            if self._stamp_fresh():
+                return self._stamp_version
+            return self._apply_stamp(await scholarship_repository.get_catalog_stamp())
+        except Exception as e:
+            logger.warning(f"Catalog version unavailable, bypassing query cache: {str(e)}")
+            return None
+
     def _update_metrics(self):
         """Update scholarship count metrics from database"""
         try:
@@ -109,40 +185,60 @@ class ScholarshipService:
             eligibility_criteria=eligibility,
             application_url=db_sch.application_url if db_sch.application_url is not None else "",
             contact_email=db_sch.contact_email if db_sch.contact_email is not None else "",
-            renewable=db_sch.renewable or False
+            renewable=db_sch.renewable or False,
+            created_at=db_sch.created_at or datetime.utcnow(),
+            updated_at=db_sch.updated_at or datetime.utcnow()
         )
 
     def get_scholarship_by_id(self, scholarship_id: str) -> Scholarship | None:
+        """Get a specific scholarship by ID (read-through query cache)"""
+        return query_optimization_service.get_scholarship_by_id(
+            scholarship_id,
+            loader=lambda: self._get_scholarship_by_id_db(scholarship_id),
+            version=self.catalog_version()
+        )
+
+    def _get_scholarship_by_id_db(self, scholarship_id: str) -> Scholarship | None:
         """Get a specific scholarship by ID from database"""
         db = get_db_session()
         try:
-            db_sch = db.query(ScholarshipDB).filter(
-                ScholarshipDB.id == scholarship_id,
-                ScholarshipDB.is_active == True
-            ).first()
-            
-            if db_sch:
-                logger.info(f"Retrieved scholarship from DB: {scholarship_id}")
-                return self._db_to_scholarship(db_sch)
-            else:
-                logger.warning(f"Scholarship not found in DB: {scholarship_id}")
-                return None
+            return self._found(scholarship_id, db.scalars(active_by_id(scholarship_id)).first())
         except Exception as e:
             logger.error(f"Database error retrieving scholarship {scholarship_id}: {str(e)}")
             raise
         finally:
             db.close()
 
+    async def get_scholarship_by_id_async(self, scholarship_id: str) -> Scholarship | None:
+        """get_scholarship_by_id for async handlers (AsyncSession on cache miss)"""
+        return await query_optimization_service.get_scholarship_by_id_async(
+            scholarship_id,
+            loader=lambda: self._get_scholarship_by_id_db_async(scholarship_id),
+            version=await self.catalog_version_async()
+        )
+
+    async def _get_scholarship_by_id_db_async(self, scholarship_id: str) -> Scholarship | None:
+        try:
+            return self._found(scholarship_id, await scholarship_repository.get_active(scholarship_id))
+        except Exception as e:
+            logger.error(f"Database error retrieving scholarship {scholarship_id}: {str(e)}")
+            raise
+
+    def _found(self, scholarship_id: str, db_sch: ScholarshipDB | None) -> Scholarship | None:
+        if db_sch:
+            logger.info("Retrieved scholarship from DB: %s", scholarship_id)
+            return self._db_to_scholarship(db_sch)
+        logger.warning(f"Scholarship not found in DB: {scholarship_id}")
+        return None
+
     def get_all_scholarships(self) -> list[Scholarship]:
         """Get all active scholarships from database"""
         db = get_db_session()
         try:
-            db_scholarships = db.query(ScholarshipDB).filter(
-                ScholarshipDB.is_active == True
-            ).order_by(desc(ScholarshipDB.application_deadline)).all()
+            db_scholarships = db.scalars(all_active_by_deadline()).all()
             
             result = [self._db_to_scholarship(sch) for sch in db_scholarships]
-            logger.info(f"Retrieved {len(result)} scholarships from database")
+            logger.info("Retrieved %d scholarships from database", len(result))
             return result
         except Exception as e:
             logger.error(f"Database error retrieving all scholarships: {str(e)}")
@@ -150,106 +246,93 @@ class ScholarshipService:
         finally:
             db.close()
 
+    async def get_all_scholarships_async(self) -> list[Scholarship]:
+        """get_all_scholarships for async handlers"""
+        try:
+            db_scholarships = await scholarship_repository.list_active()
+        except Exception as e:
+            logger.error(f"Database error retrieving all scholarships: {str(e)}")
+            raise
+        result = [self._db_to_scholarship(sch) for sch in db_scholarships]
+        logger.info("Retrieved %d scholarships from database", len(result))
+        return result
+
+    async def get_scholarships_by_ids_async(self, scholarship_ids: list[str]) -> list[Scholarship]:
+        """Active scholarships for the given ids in one query, in request order (unknown ids skipped)"""
+        unique_ids = list(dict.fromkeys(scholarship_ids))
+        try:
+            db_scholarships = await scholarship_repository.list_active_by_ids(unique_ids)
+        except Exception as e:
+            logger.error(f"Database error retrieving scholarships by id: {str(e)}")
+            raise
+        by_id = {sch.id: self._db_to_scholarship(sch) for sch in db_scholarships}
+        result = [by_id[s_id] for s_id in unique_ids if s_id in by_id]
+        logger.info("Retrieved %d of %d requested scholarships from database", len(result), len(unique_ids))
+        return result
+
     def search_scholarships(self, filters: SearchFilters) -> SearchResponse:
+        """Search scholarships with filters (read-through query cache)"""
+        logger.info("Searching scholarships with filters: %s", filters)
+        return query_optimization_service.get_scholarships_by_criteria(
+            filters,
+            loader=lambda: self._search_scholarships_uncached(filters),
+            version=self.catalog_version()
+        )
+
+    def _search_scholarships_uncached(self, filters: SearchFilters) -> SearchResponse:
+        """Search scholarships - served from the columnar index, DB fallback"""
+        if settings.scholarship_index_enabled:
+            try:
+                response = self.index.search(filters)
+                logger.info("Index search completed: %d results out of %d total", len(response.scholarships), response.total_count)
+                return response
+            except Exception as e:
+                logger.warning(f"Scholarship index unavailable, falling back to database search: {str(e)}")
+
+        return self._search_scholarships_db(filters)
+
+    async def search_scholarships_async(self, filters: SearchFilters) -> SearchResponse:
+        """search_scholarships for async handlers; never blocks the event loop on the database"""
+        logger.info("Searching scholarships with filters: %s", filters)
+        return await query_optimization_service.get_scholarships_by_criteria_async(
+            filters,
+            loader=lambda: self._search_scholarships_uncached_async(filters),
+            version=await self.catalog_version_async()
+        )
+
+    async def _search_scholarships_uncached_async(self, filters: SearchFilters) -> SearchResponse:
+        if settings.scholarship_index_enabled:
+            try:
+                # catalog_version_async() already refreshed the index
+                response = self.index.search(filters, refresh=False)
+                logger.info("Index search completed: %d results out of %d total", len(response.scholarships), response.total_count)
+                return response
+            except Exception as e:
+                logger.warning(f"Scholarship index unavailable, falling back to database search: {str(e)}")
+
+        try:
+            rows, total_count = await scholarship_repository.search(filters)
+        except Exception as e:
+            logger.error(f"Database error during search: {str(e)}")
+            raise
+        return self._search_response(filters, rows, total_count)
+
+    def _search_scholarships_db(self, filters: SearchFilters) -> SearchResponse:
         """Search scholarships with filters - queries database directly"""
-        logger.info(f"Searching scholarships with filters: {filters}")
         db = get_db_session()
         
         try:
-            query = db.query(ScholarshipDB).filter(ScholarshipDB.is_active == True)
-            
-            if filters.keyword:
-                keyword_filter = or_(
-                    ScholarshipDB.name.ilike(f"%{filters.keyword}%"),
-                    ScholarshipDB.description.ilike(f"%{filters.keyword}%"),
-                    ScholarshipDB.organization.ilike(f"%{filters.keyword}%")
-                )
-                query = query.filter(keyword_filter)
-            
-            if filters.min_amount is not None:
-                query = query.filter(ScholarshipDB.amount >= filters.min_amount)
-            
-            if filters.max_amount is not None:
-                query = query.filter(ScholarshipDB.amount <= filters.max_amount)
-            
-            if filters.scholarship_types:
-                type_values = [t.value if hasattr(t, 'value') else str(t) for t in filters.scholarship_types]
-                query = query.filter(ScholarshipDB.scholarship_type.in_(type_values))
-            
-            if filters.deadline_after:
-                query = query.filter(ScholarshipDB.application_deadline >= filters.deadline_after)
-            
-            if filters.deadline_before:
-                query = query.filter(ScholarshipDB.application_deadline <= filters.deadline_before)
-            
-            total_count = query.count()
-            
-            db_scholarships = query.order_by(
-                ScholarshipDB.application_deadline
-            ).offset(filters.offset).limit(filters.limit).all()
-            
-            scholarships = [self._db_to_scholarship(sch) for sch in db_scholarships]
-            
-            if filters.fields_of_study:
-                scholarships = [
-                    sch for sch in scholarships
-                    if any(field in sch.eligibility_criteria.fields_of_study
-                          for field in filters.fields_of_study)
-                ]
-            
-            if filters.states:
-                scholarships = [
-                    sch for sch in scholarships
-                    if (any(state in (sch.eligibility_criteria.residency_states or [])
-                          for state in filters.states) or
-                       not sch.eligibility_criteria.residency_states)
-                ]
-            
-            if filters.min_gpa is not None:
-                scholarships = [
-                    sch for sch in scholarships
-                    if (sch.eligibility_criteria.min_gpa is None or
-                        filters.min_gpa >= sch.eligibility_criteria.min_gpa)
-                ]
-            
-            if filters.citizenship:
-                scholarships = [
-                    sch for sch in scholarships
-                    if (sch.eligibility_criteria.citizenship_required is None or
-                        sch.eligibility_criteria.citizenship_required == filters.citizenship)
-                ]
-            
-            page_size = filters.limit
-            page = (filters.offset // page_size) + 1
-            
-            scholarship_summaries = [
-                ScholarshipSummary(
-                    id=sch.id,
-                    name=sch.name,
-                    organization=sch.organization,
-                    amount=sch.amount,
-                    application_deadline=sch.application_deadline,
-                    scholarship_type=sch.scholarship_type,
-                    description=sch.description[:197] + "..." if len(sch.description) > 200 else sch.description,
-                    eligibility_criteria=sch.eligibility_criteria
-                )
-                for sch in scholarships
-            ]
-            
-            has_next = (filters.offset + filters.limit) < total_count
-            has_previous = filters.offset > 0
-            
-            response = SearchResponse(
-                scholarships=scholarship_summaries,
-                total_count=total_count,
-                page=page,
-                page_size=page_size,
-                has_next=has_next,
-                has_previous=has_previous
-            )
-            
-            logger.info(f"Database search completed: {len(scholarship_summaries)} results out of {total_count} total")
-            return response
+            stmt = search_statement(filters)
+
+            # Eligibility filters live in the JSON column; they must be applied
+            # before pagination so total_count is exact and pages are full
+            if needs_criteria_filter(filters):
+                rows, total_count = db.scalars(stmt).all(), None
+            else:
+                total_count = db.scalar(count_of(stmt))
+                rows = db.scalars(stmt.offset(filters.offset).limit(filters.limit)).all()
+
+            return self._search_response(filters, rows, total_count)
             
         except Exception as e:
             logger.error(f"Database error during search: {str(e)}")
@@ -257,6 +340,64 @@ class ScholarshipService:
         finally:
             db.close()
 
+    def _search_response(self, filters: SearchFilters, rows: list[ScholarshipDB],
+                         total_count: int | None) -> SearchResponse:
+        """Build a search page; total_count None means rows still need criteria filtering"""
+        if total_count is None:
+            scholarships = [
+                sch for sch in (self._db_to_scholarship(row) for row in rows)
+                if self._matches_criteria(sch, filters)
+            ]
+            total_count = len(scholarships)
+            scholarships = scholarships[filters.offset:filters.offset + filters.limit]
+        else:
+            scholarships = [self._db_to_scholarship(row) for row in rows]
+
+        page_size = filters.limit
+        page = (filters.offset // page_size) + 1
+        
+        scholarship_summaries = [build_summary(sch) for sch in scholarships]
+        
+        has_next = (filters.offset + filters.limit) < total_count
+        has_previous = filters.offset > 0
+        
+        response = SearchResponse(
+            scholarships=scholarship_summaries,
+            total_count=total_count,
+            page=page,
+            page_size=page_size,
+            has_next=has_next,
+            has_previous=has_previous
+        )
+        
+        logger.info("Database search completed: %d results out of %d total", len(scholarship_summaries), total_count)
+        return response
+
+    @staticmethod
+    def _matches_criteria(sch: Scholarship, filters: SearchFilters) -> bool:
+        """Apply the eligibility-criteria filters to a hydrated scholarship"""
+        criteria = sch.eligibility_criteria
+
+        if filters.fields_of_study and not any(
+            field in criteria.fields_of_study for field in filters.fields_of_study
+        ):
+            return False
+
+        if filters.states and criteria.residency_states and not any(
+            state in criteria.residency_states for state in filters.states
+        ):
+            return False
+
+        if (filters.min_gpa is not None and criteria.min_gpa is not None
+                and filters.min_gpa < criteria.min_gpa):
+            return False
+
+        if (filters.citizenship and criteria.citizenship_required is not None
+                and criteria.citizenship_required != filters.citizenship):
+            return False
+
+        return True
+
     def get_scholarships_by_organization(self, organization: str) -> list[Scholarship]:
         """Get scholarships by organization from database"""
         db = get_db_session()
@@ -267,7 +408,7 @@ class ScholarshipService:
             ).all()
             
             results = [self._db_to_scholarship(sch) for sch in db_scholarships]
-            logger.info(f"Found {len(results)} scholarships for organization: {organization}")
+            logger.info("Found %d scholarships for organization: %s", len(results), organization)
             return results
         except Exception as e:
             logger.error(f"Database error for organization search: {str(e)}")
@@ -1,9 +1,14 @@
+from datetime import datetime
 from typing import Any
 
-from models.scholarship import Scholarship, SearchFilters
+import numpy as np
+
+from models.scholarship import Scholarship, SearchFilters, SearchResponse
 from models.user import RecommendationRequest, UserProfile
+from services.eligibility_engine import TYPE_BONUS, CompiledCatalog, eligibility_engine
 from services.eligibility_service import eligibility_service
 from services.scholarship_service import scholarship_service
+from utils.epoch import epoch_microseconds
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -11,52 +16,119 @@ logger = get_logger(__name__)
 class SearchService:
     """Advanced search and recommendation service"""
 
-    def get_recommendations(self, request: RecommendationRequest) -> list[dict[str, Any]]:
+    def get_recommendations(self, request: RecommendationRequest,
+                            catalog: CompiledCatalog | None = None) -> list[dict[str, Any]]:
         """Generate personalized scholarship recommendations"""
-        logger.info(f"Generating recommendations for user {request.user_profile.id}")
-
-        # Get all scholarships
-        all_scholarships = scholarship_service.get_all_scholarships()
-        recommendations = []
-
-        for scholarship in all_scholarships:
-            # Check eligibility
-            eligibility_result = eligibility_service._evaluate_eligibility(
-                request.user_profile, scholarship
+        logger.info("Generating recommendations for user %s", request.user_profile.id)
+
+        # Vectorized eligibility and scoring over the compiled catalog
+        catalog = catalog or eligibility_engine.catalog()
+        eligible, match_scores = catalog.score([request.user_profile])
+        eligible, match_scores = eligible[0], match_scores[0]
+        scores = self._recommendation_scores(request.user_profile, catalog, match_scores)
+
+        if request.include_ineligible:
+            candidates = np.arange(catalog.size)
+        else:
+            candidates = np.flatnonzero(eligible)
+
+        # Top-k selection, then build response dicts (and reasons) only for the survivors
+        recommendations = [
+            self._build_recommendation(
+                request.user_profile, catalog.scholarships[position], float(scores[position])
             )
+            for position in self._top_k(scores, candidates, request.limit)
+        ]
 
-            # Include scholarship if eligible or if including ineligible ones
-            if eligibility_result.eligible or request.include_ineligible:
-                recommendation = {
-                    "scholarship": {
-                        "id": scholarship.id,
-                        "name": scholarship.name,
-                        "organization": scholarship.organization,
-                        "amount": scholarship.amount,
-                        "application_deadline": scholarship.application_deadline,
-                        "scholarship_type": scholarship.scholarship_type,
-                        "description": scholarship.description[:200] + "..." if len(scholarship.description) > 200 else scholarship.description
-                    },
-                    "eligibility": {
-                        "eligible": eligibility_result.eligible,
-                        "match_score": eligibility_result.match_score,
-                        "reasons": eligibility_result.reasons
-                    },
-                    "recommendation_score": self._calculate_recommendation_score(
-                        request.user_profile, scholarship, eligibility_result.match_score
-                    )
-                }
-                recommendations.append(recommendation)
-
-        # Sort by recommendation score (highest first)
-        recommendations.sort(key=lambda x: x["recommendation_score"], reverse=True)
-
-        # Apply limit
-        recommendations = recommendations[:request.limit]
-
-        logger.info(f"Generated {len(recommendations)} recommendations")
+        logger.info("Generated %d recommendations", len(recommendations))
         return recommendations
 
+    async def get_recommendations_async(self, request: RecommendationRequest) -> list[dict[str, Any]]:
+        """get_recommendations for async handlers; only the catalog load touches the database"""
+        return self.get_recommendations(request, await eligibility_engine.catalog_async())
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, candidates: np.ndarray, k: int) -> np.ndarray:
+        """
+        Positions of the k highest-scoring candidates, highest first.
+
+        Ties keep catalog order (same as a stable descending sort), so the
+        result is identical to sorting every candidate and slicing.
+        Selection is O(n) via partition; only the k survivors are sorted.
+        """
+        if k <= 0:
+            return candidates[:0]
+        candidate_scores = scores[candidates]
+        if len(candidates) > k:
+            kth = np.partition(candidate_scores, len(candidates) - k)[len(candidates) - k]
+            above = candidates[candidate_scores > kth]
+            tied = candidates[candidate_scores == kth][:k - len(above)]
+            candidates = np.concatenate([above, tied])
+            candidate_scores = scores[candidates]
+        return candidates[np.lexsort((candidates, -candidate_scores))]
+
+    def _recommendation_scores(self, user_profile: UserProfile, catalog: CompiledCatalog,
+                               eligibility_scores: np.ndarray) -> np.ndarray:
+        """
+        Vectorized _calculate_recommendation_score over the whole catalog.
+
+        Amount tier, type bonus and deadline column are precomputed per catalog
+        version; only the profile-dependent parts and the deadline bucket (which
+        depends on the current time) are evaluated here, in the same order as the
+        scalar version so scores are identical.
+        """
+        score = eligibility_scores * 0.4  # Base eligibility weight
+
+        # Field of study match bonus
+        if user_profile.field_of_study:
+            field_match = catalog.field_bitmaps.get(user_profile.field_of_study.value)
+            if field_match is not None:
+                score += np.where(field_match, 0.3, 0.0)
+
+        # Amount factor
+        score += catalog.amount_bonus
+
+        # Deadline factor (floor division matches timedelta.days)
+        now_us = epoch_microseconds(datetime.utcnow())
+        days_until_deadline = (catalog.deadline_us - now_us) // 86_400_000_000
+        score += np.select(
+            [
+                (days_until_deadline >= 30) & (days_until_deadline <= 180),
+                (days_until_deadline >= 7) & (days_until_deadline < 30),
+                days_until_deadline < 7,
+            ],
+            [0.1, 0.05, -0.1],
+            0.0
+        )
+
+        # Scholarship type preferences
+        need_bonus = 0.05 if user_profile.financial_need else 0.0
+        score += np.where(catalog.need_based, need_bonus, catalog.type_bonus)
+
+        return np.clip(score, 0.0, 1.0)
+
+    def _build_recommendation(self, user_profile: UserProfile, scholarship: Scholarship,
+                              recommendation_score: float) -> dict[str, Any]:
+        """Materialize the response dict for a recommended scholarship"""
+        eligibility_result = eligibility_service._evaluate_eligibility(user_profile, scholarship)
+        return {
+            "scholarship": {
+                "id": scholarship.id,
+                "name": scholarship.name,
+                "organization": scholarship.organization,
+                "amount": scholarship.amount,
+                "application_deadline": scholarship.application_deadline,
+                "scholarship_type": scholarship.scholarship_type,
+                "description": scholarship.description[:200] + "..." if len(scholarship.description) > 200 else scholarship.description
+            },
+            "eligibility": {
+                "eligible": eligibility_result.eligible,
+                "match_score": eligibility_result.match_score,
+                "reasons": eligibility_result.reasons
+            },
+            "recommendation_score": recommendation_score
+        }
+
     def _calculate_recommendation_score(self, user_profile: UserProfile,
                                       scholarship: Scholarship,
                                       eligibility_score: float) -> float:
@@ -75,7 +147,6 @@ class SearchService:
             score += 0.05
 
         # Deadline factor (prefer scholarships with reasonable time to apply)
-        from datetime import datetime
         days_until_deadline = (scholarship.application_deadline - datetime.utcnow()).days
 
         if 30 <= days_until_deadline <= 180:  # Sweet spot for application time
@@ -86,22 +157,23 @@ class SearchService:
             score -= 0.1
 
         # Scholarship type preferences (can be customized based on user profile)
-        type_preferences = {
-            "merit_based": 0.05,
-            "need_based": 0.05 if user_profile.financial_need else 0.0,
-            "academic_achievement": 0.05
-        }
-
-        if scholarship.scholarship_type.value in type_preferences:
-            score += type_preferences[scholarship.scholarship_type.value]
+        if scholarship.scholarship_type.value == "need_based":
+            score += 0.05 if user_profile.financial_need else 0.0
+        else:
+            score += TYPE_BONUS.get(scholarship.scholarship_type.value, 0.0)
 
         return min(1.0, max(0.0, score))
 
     def search_with_smart_suggestions(self, filters: SearchFilters) -> dict[str, Any]:
         """Enhanced search with smart suggestions"""
         # Get regular search results
-        search_response = scholarship_service.search_scholarships(filters)
+        return self._with_smart_suggestions(filters, scholarship_service.search_scholarships(filters))
+
+    async def search_with_smart_suggestions_async(self, filters: SearchFilters) -> dict[str, Any]:
+        """search_with_smart_suggestions for async handlers (search never blocks the event loop)"""
+        return self._with_smart_suggestions(filters, await scholarship_service.search_scholarships_async(filters))
 
+    def _with_smart_suggestions(self, filters: SearchFilters, search_response: SearchResponse) -> dict[str, Any]:
         # Generate smart suggestions based on search
         suggestions = self._generate_search_suggestions(filters, search_response.total_count)
 
@@ -0,0 +1,241 @@
+"""
+Telemetry Ingestion Queue
+Bounded in-process queue between the telemetry write endpoints and business_events
+
+- Requests are acknowledged once events are validated, deduplicated on their
+  idempotency key (request_id) and queued; the request never touches the database
+- A background writer flushes micro-batches as one multi-row
+  INSERT ... ON CONFLICT (request_id) DO NOTHING on the background pool
+- When the queue is full the whole batch is refused (TelemetryQueueFull -> HTTP 429)
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from config.settings import settings
+from database.engine_registry import BACKGROUND_POOL, engine_registry
+from observability.metrics import (
+    telemetry_ingest_batch_size,
+    telemetry_ingest_events_total,
+    telemetry_ingest_flush_seconds,
+    telemetry_ingest_queue_depth,
+)
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+EVENT_COLUMNS = (
+    "request_id", "app", "env", "event_name", "ts",
+    "actor_type", "actor_id", "session_id", "org_id", "properties",
+)
+
+# Placeholder per column; request_id and properties need explicit casts for text() binds
+_PLACEHOLDERS = {
+    "request_id": "CAST(:request_id_{i} AS uuid)",
+    "properties": "CAST(:properties_{i} AS jsonb)",
+}
+
+
+class TelemetryQueueFull(Exception):
+    """Raised when a batch does not fit in the ingestion queue"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Telemetry ingestion queue is full")
+        self.retry_after = retry_after
+
+
+@dataclass
+class IngestReceipt:
+    """What submit() acknowledged"""
+    accepted: list[str] = field(default_factory=list)  # request_ids queued for writing
+    duplicates: int = 0
+
+
+def build_insert(row_count: int) -> str:
+    """Multi-row INSERT for row_count events with per-row bind names"""
+    values = []
+    for i in range(row_count):
+        values.append("(" + ", ".join(
+            _PLACEHOLDERS.get(column, f":{column}_{{i}}").format(i=i) for column in EVENT_COLUMNS
+        ) + ")")
+    return (
+        f"INSERT INTO business_events ({', '.join(EVENT_COLUMNS)}) VALUES "
+        + ", ".join(values)
+        + " ON CONFLICT (request_id) DO NOTHING"
+    )
+
+
+def batch_params(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    return {f"{column}_{i}": row[column] for i, row in enumerate(rows) for column in EVENT_COLUMNS}
+
+
+class TelemetryIngestQueue:
+    """Bounded queue of business_events rows with a background micro-batch writer"""
+
+    def __init__(self, max_events: int | None = None, batch_size: int | None = None,
+                 flush_interval: float | None = None, dedup_window: int | None = None):
+        self.max_events = max_events or settings.telemetry_ingest_max_events
+        self.batch_size = batch_size or settings.telemetry_ingest_batch_size
+        self.flush_interval = flush_interval or settings.telemetry_ingest_flush_interval_seconds
+        self.dedup_window = dedup_window or settings.telemetry_ingest_dedup_window
+
+        self._rows: deque[dict[str, Any]] = deque()
+        self._seen: OrderedDict[str, None] = OrderedDict()
+        self._cond = threading.Condition()
+        self._writer: threading.Thread | None = None
+        self._stopping = False
+        self._flush_lock = threading.Lock()
+
+    # Request side -------------------------------------------------------
+
+    def submit(self, rows: list[dict[str, Any]]) -> IngestReceipt:
+        """
+        Queue rows (dicts keyed by EVENT_COLUMNS) for writing.
+        All-or-nothing: raises TelemetryQueueFull without queueing anything.
+        """
+        receipt = IngestReceipt()
+        with self._cond:
+            fresh = []
+            batch_ids = set()
+            for row in rows:
+                request_id = row["request_id"]
+                if request_id in self._seen or request_id in batch_ids:
+                    receipt.duplicates += 1
+                    continue
+                batch_ids.add(request_id)
+                fresh.append(row)
+
+            if len(self._rows) + len(fresh) > self.max_events:
+                telemetry_ingest_events_total.labels(outcome="rejected").inc(len(rows))
+                raise TelemetryQueueFull(retry_after=max(1, round(self.flush_interval * 4)))
+
+            for row in fresh:
+                self._seen[row["request_id"]] = None
+                self._rows.append(row)
+                receipt.accepted.append(row["request_id"])
+            while len(self._seen) > self.dedup_window:
+                self._seen.popitem(last=False)
+
+            telemetry_ingest_queue_depth.set(len(self._rows))
+            if len(self._rows) >= self.batch_size:
+                self._cond.notify()
+
+        telemetry_ingest_events_total.labels(outcome="queued").inc(len(receipt.accepted))
+        telemetry_ingest_events_total.labels(outcome="duplicate").inc(receipt.duplicates)
+        self._ensure_writer()
+        return receipt
+
+    def depth(self) -> int:
+        return len(self._rows)
+
+    # Writer side --------------------------------------------------------
+
+    def _take_batch(self) -> list[dict[str, Any]]:
+        with self._cond:
+            count = min(self.batch_size, len(self._rows))
+            batch = [self._rows.popleft() for _ in range(count)]
+            telemetry_ingest_queue_depth.set(len(self._rows))
+            return batch
+
+    def _insert_batch(self, rows: list[dict[str, Any]]) -> int:
+        engine = engine_registry.get_engine(BACKGROUND_POOL)
+        with engine.begin() as conn:
+            return conn.execute(text(build_insert(len(rows))), batch_params(rows)).rowcount
+
+    def _requeue(self, rows: list[dict[str, Any]]) -> None:
+        """Put an unwritten batch back at the head of the queue"""
+        with self._cond:
+            self._rows.extendleft(reversed(rows))
+            telemetry_ingest_queue_depth.set(len(self._rows))
+
+    def _forget(self, rows: list[dict[str, Any]]) -> None:
+        """Drop idempotency keys of rows that were never written so a client retry is accepted"""
+        with self._cond:
+            for row in rows:
+                self._seen.pop(row["request_id"], None)
+
+    def _write(self, rows: list[dict[str, Any]]) -> bool:
+        """Write one batch; False means the database is unreachable and the batch was requeued"""
+        started = time.perf_counter()
+        try:
+            self._insert_batch(rows)
+            telemetry_ingest_events_total.labels(outcome="written").inc(len(rows))
+        except OperationalError as e:
+            logger.warning(f"REPORT: app=scholarship_api | TELEMETRY INGEST: database unavailable, requeued {len(rows)} events: {e}")
+            self._requeue(rows)
+            return False
+        except Exception as e:
+            # One bad row must not sink the batch: fall back to row-by-row
+            logger.error(f"REPORT: app=scholarship_api | TELEMETRY INGEST: batch of {len(rows)} failed, retrying per event: {e}")
+            failed = []
+            for row in rows:
+                try:
+                    self._insert_batch([row])
+                except Exception as row_error:
+                    logger.error(f"REPORT: app=scholarship_api | TELEMETRY INGEST: dropped event {row['request_id']}: {row_error}")
+                    failed.append(row)
+            self._forget(failed)
+            telemetry_ingest_events_total.labels(outcome="written").inc(len(rows) - len(failed))
+            telemetry_ingest_events_total.labels(outcome="failed").inc(len(failed))
+        finally:
+            telemetry_ingest_flush_seconds.observe(time.perf_counter() - started)
+            telemetry_ingest_batch_size.observe(len(rows))
+        return True
+
+    def flush(self) -> None:
+        """Write everything queued so far (shutdown, tests)"""
+        with self._flush_lock:
+            while True:
+                batch = self._take_batch()
+                if not batch or not self._write(batch):
+                    return
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None:
+            return
+        with self._cond:
+            if self._writer is None and not self._stopping:
+                self._writer = threading.Thread(target=self._run, name="telemetry-ingest", daemon=True)
+                self._writer.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if len(self._rows) < self.batch_size and not self._stopping:
+                    self._cond.wait(self.flush_interval)
+                if self._stopping:
+                    return
+            with self._flush_lock:
+                batch = self._take_batch()
+                written = not batch or self._write(batch)
+            if not written:
+                # Database down: back off instead of spinning on the same batch
+                time.sleep(self.flush_interval * 4)
+
+    def close(self) -> None:
+        """Stop the writer and write whatever is still queued"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._writer is not None:
+            self._writer.join(timeout=5)
+        self.flush()
+
+    def get_status(self) -> dict[str, Any]:
+        return {
+            "queue_depth": len(self._rows),
+            "max_events": self.max_events,
+            "batch_size": self.batch_size,
+            "flush_interval_seconds": self.flush_interval,
+            "writer_running": self._writer is not None and self._writer.is_alive(),
+        }
+
+
+# Global ingestion queue
+telemetry_ingest_queue = TelemetryIngestQueue()
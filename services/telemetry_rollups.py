@@ -0,0 +1,190 @@
+"""
+Telemetry Rollup Service
+Dashboard aggregates for /stats, /kpis/today, /kpis/rollup and /central-stats
+
+business_event_rollups holds per-minute counts and payment sums by
+(event_name, app, actor_type). A statement-level trigger on business_events
+keeps it current as events are inserted (database/migrations/
+create_business_event_rollups.sql), and a background compactor folds minute
+buckets older than the retention window into hourly buckets. Dashboard reads
+therefore scan at most (minutes in window x distinct keys) rows, however many
+raw events arrived, and never touch business_events.
+
+Windows are resolved at bucket granularity: a cutoff is rounded down to the
+minute (or the hour, for windows reaching past minute retention).
+"""
+
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import text
+
+from config.settings import settings
+from database.engine_registry import BACKGROUND_POOL, REQUEST_READ_POOL, engine_registry
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MIGRATION_PATH = Path(__file__).resolve().parent.parent / "database" / "migrations" / "create_business_event_rollups.sql"
+
+# Arbitrary constant shared by all workers so only one compacts at a time
+COMPACTION_LOCK_ID = 0x524F4C4C5550  # "ROLLUP"
+
+GROUP_COLUMNS = {"event_type": "event_name", "app": "app", "actor_type": "actor_type"}
+
+PAYMENT_EVENTS = ("payment_succeeded", "credit_purchased")
+
+COMPACT_SQL = """
+    WITH moved AS (
+        DELETE FROM business_event_rollups
+        WHERE granularity = 'minute' AND bucket_start < :cutoff
+        RETURNING bucket_start, event_name, app, actor_type, event_count,
+                  amount_cents, platform_fee_cents, revenue_usd, first_ts, last_ts
+    )
+    INSERT INTO business_event_rollups AS r
+        (granularity, bucket_start, event_name, app, actor_type,
+         event_count, amount_cents, platform_fee_cents, revenue_usd, first_ts, last_ts)
+    SELECT 'hour', date_trunc('hour', bucket_start), event_name, app, actor_type,
+           SUM(event_count), SUM(amount_cents), SUM(platform_fee_cents), SUM(revenue_usd),
+           MIN(first_ts), MAX(last_ts)
+    FROM moved
+    GROUP BY 2, 3, 4, 5
+    ORDER BY 2, 3, 4, 5
+    ON CONFLICT (granularity, bucket_start, event_name, app, actor_type) DO UPDATE SET
+        event_count = r.event_count + EXCLUDED.event_count,
+        amount_cents = r.amount_cents + EXCLUDED.amount_cents,
+        platform_fee_cents = r.platform_fee_cents + EXCLUDED.platform_fee_cents,
+        revenue_usd = r.revenue_usd + EXCLUDED.revenue_usd,
+        first_ts = LEAST(r.first_ts, EXCLUDED.first_ts),
+        last_ts = GREATEST(r.last_ts, EXCLUDED.last_ts)
+"""
+
+
+def bucket_floor(moment: datetime, granularity: str = "minute") -> datetime:
+    """Start of the rollup bucket containing moment"""
+    moment = moment.replace(second=0, microsecond=0)
+    if granularity == "hour":
+        moment = moment.replace(minute=0)
+    return moment
+
+
+class TelemetryRollupService:
+    """Reads dashboard aggregates from business_event_rollups and compacts old buckets"""
+
+    def __init__(self, minute_retention_hours: int | None = None, compact_interval: float | None = None):
+        self.minute_retention = timedelta(
+            hours=minute_retention_hours or settings.telemetry_rollup_minute_retention_hours
+        )
+        self.compact_interval = compact_interval or settings.telemetry_rollup_compact_interval_seconds
+        self.schema_ready = False
+        self._compactor: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    # Schema -------------------------------------------------------------
+
+    def ensure_schema(self) -> bool:
+        """Install the rollup table and trigger unless the trigger already exists"""
+        engine = engine_registry.get_engine(BACKGROUND_POOL)
+        if engine.dialect.name != "postgresql":
+            logger.warning(f"Telemetry rollups need PostgreSQL (dialect={engine.dialect.name}); dashboards unavailable")
+            return False
+        with engine.begin() as conn:
+            installed = conn.execute(text(
+                "SELECT 1 FROM pg_trigger WHERE tgname = 'business_events_rollup' AND NOT tgisinternal"
+            )).first()
+            if not installed:
+                logger.info("📊 Installing business_event_rollups (one-time backfill from business_events)")
+                conn.exec_driver_sql(MIGRATION_PATH.read_text())
+        self.schema_ready = True
+        return True
+
+    # Compaction ---------------------------------------------------------
+
+    def compact(self, now: datetime | None = None) -> int:
+        """Fold minute buckets older than retention into hourly buckets; returns hour rows touched"""
+        cutoff = bucket_floor((now or datetime.utcnow()) - self.minute_retention, "hour")
+        engine = engine_registry.get_engine(BACKGROUND_POOL)
+        with engine.begin() as conn:
+            if not conn.execute(text("SELECT pg_try_advisory_xact_lock(:lock_id)"),
+                                {"lock_id": COMPACTION_LOCK_ID}).scalar():
+                return 0  # another worker is compacting
+            touched = conn.execute(text(COMPACT_SQL), {"cutoff": cutoff}).rowcount
+        if touched:
+            logger.info(f"REPORT: app=scholarship_api | TELEMETRY ROLLUPS: compacted minute buckets before {cutoff.isoformat()} into {touched} hourly rows")
+        return touched
+
+    def start(self) -> None:
+        """Start the background compactor (idempotent)"""
+        if self._compactor is not None:
+            return
+        self._compactor = threading.Thread(target=self._compact_loop, name="telemetry-rollups", daemon=True)
+        self._compactor.start()
+
+    def _compact_loop(self) -> None:
+        while not self._stop.wait(self.compact_interval):
+            try:
+                self.compact()
+            except Exception as e:
+                logger.warning(f"Telemetry rollup compaction failed: {e}")
+
+    def close(self) -> None:
+        self._stop.set()
+
+    # Dashboard queries --------------------------------------------------
+
+    def _cutoff(self, cutoff: datetime) -> datetime:
+        granularity = "hour" if datetime.utcnow() - cutoff > self.minute_retention else "minute"
+        return bucket_floor(cutoff, granularity)
+
+    def _fetch(self, sql: str, params: dict[str, Any]) -> list:
+        engine = engine_registry.get_engine(REQUEST_READ_POOL)
+        with engine.connect() as conn:
+            return conn.execute(text(sql), params).fetchall()
+
+    def grouped_counts(self, cutoff: datetime, group: str) -> list:
+        """(group_key, count, first_event, last_event) per group, largest first"""
+        column = GROUP_COLUMNS.get(group, "event_name")
+        return self._fetch(f"""
+            SELECT {column}, SUM(event_count), MIN(first_ts), MAX(last_ts)
+            FROM business_event_rollups
+            WHERE bucket_start >= :cutoff
+            GROUP BY {column}
+            ORDER BY 2 DESC
+        """, {"cutoff": self._cutoff(cutoff)})
+
+    def event_totals(self, cutoff: datetime, limit: int | None = None) -> list:
+        """(event_name, count, amount_cents, platform_fee_cents) per event, largest first"""
+        return self._fetch(f"""
+            SELECT event_name, SUM(event_count), SUM(amount_cents), SUM(platform_fee_cents)
+            FROM business_event_rollups
+            WHERE bucket_start >= :cutoff
+            GROUP BY event_name
+            ORDER BY 2 DESC
+            {"LIMIT :limit" if limit else ""}
+        """, {"cutoff": self._cutoff(cutoff), "limit": limit})
+
+    def app_stats(self, cutoff: datetime) -> list:
+        """(app, count, distinct event types, first_event, last_event) per app, largest first"""
+        return self._fetch("""
+            SELECT app, SUM(event_count), COUNT(DISTINCT event_name), MIN(first_ts), MAX(last_ts)
+            FROM business_event_rollups
+            WHERE bucket_start >= :cutoff
+            GROUP BY app
+            ORDER BY 2 DESC
+        """, {"cutoff": self._cutoff(cutoff)})
+
+    def daily_totals(self, cutoff: datetime) -> list:
+        """(date, event_name, count, revenue_usd) per day and event, newest day first"""
+        return self._fetch("""
+            SELECT DATE(bucket_start), event_name, SUM(event_count), SUM(revenue_usd)
+            FROM business_event_rollups
+            WHERE bucket_start >= :cutoff
+            GROUP BY 1, 2
+            ORDER BY 1 DESC
+        """, {"cutoff": self._cutoff(cutoff)})
+
+
+# Global rollup service
+telemetry_rollups = TelemetryRollupService()
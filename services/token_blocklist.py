@@ -3,8 +3,10 @@ Token Blocklist Service - JWT Revocation Support
 SEC-05 REMEDIATION: Enable token revocation for compromised/logout tokens
 
 Provides centralized token revocation checking via:
-1. Redis SET (preferred for horizontal scaling)
-2. PostgreSQL fallback (if Redis unavailable)
+1. Local revocation cache (services/revocation_cache.py), synced from Redis
+   pub/sub and revoked_tokens polling - no round trip per request
+2. Redis SET (preferred for horizontal scaling) when the cache is stale
+3. PostgreSQL fallback (if Redis unavailable)
 
 Usage:
     from services.token_blocklist import is_token_revoked, revoke_token
@@ -13,12 +15,15 @@ Usage:
         raise HTTPException(status_code=401, detail="Token revoked")
 """
 
+import asyncio
+import json
 import logging
 import os
 from datetime import datetime, timedelta
 from typing import Optional
 
 from config.settings import settings
+from services.revocation_cache import REVOCATION_CHANNEL, RevocationCache, expiry_epoch
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +55,9 @@ _init_redis()
 BLOCKLIST_KEY = "token_blocklist"
 BLOCKLIST_TTL_SECONDS = 86400 * 7  # 7 days (tokens typically expire in 30 min, but keep for audit)
 
+# Started with the application (main.py); until its first sync every check goes remote
+revocation_cache = RevocationCache(redis_factory=lambda: _redis_client if _redis_available else None)
+
 
 async def is_token_revoked(jti: str) -> bool:
     """
@@ -63,7 +71,17 @@ async def is_token_revoked(jti: str) -> bool:
     """
     if not jti:
         return False
-    
+
+    cached = revocation_cache.check(jti)
+    if cached is not None:
+        return cached
+
+    # Local cache is stale: blocking Redis/DB lookup off the event loop
+    return await asyncio.to_thread(_is_token_revoked_remote, jti)
+
+
+def _is_token_revoked_remote(jti: str) -> bool:
+    """Revocation lookup against Redis, then PostgreSQL"""
     # Try Redis first (faster, distributed)
     if _redis_available and _redis_client:
         try:
@@ -128,6 +146,14 @@ async def revoke_token(jti: str, expires_at: Optional[datetime] = None, reason:
         except Exception as e:
             logger.warning(f"Redis token revocation failed: {e}")
     
+    # This worker sees the revocation at once; others through pub/sub or their next poll
+    revocation_cache.add(jti, expiry_epoch(expires_at))
+    if _redis_available and _redis_client:
+        try:
+            _redis_client.publish(REVOCATION_CHANNEL, json.dumps({"jti": jti, "exp": expiry_epoch(expires_at)}))
+        except Exception as e:
+            logger.warning(f"Redis revocation publish failed (workers catch up by polling): {e}")
+
     # Also persist to PostgreSQL for durability
     try:
         from sqlalchemy import text
@@ -214,12 +240,13 @@ def get_blocklist_stats() -> dict:
     Get blocklist statistics for health checks.
     
     Returns:
-        Dict with redis_available, redis_count, db_count
+        Dict with redis_available, redis_count, db_count, local_cache
     """
     stats = {
         "redis_available": _redis_available,
         "redis_count": 0,
-        "db_count": 0
+        "db_count": 0,
+        "local_cache": revocation_cache.get_status()
     }
     
     if _redis_available and _redis_client:
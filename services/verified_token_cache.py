@@ -0,0 +1,121 @@
+"""
+Verified Token Cache - Reuse of JWT Verification Results
+Bounded LRU of verified TokenData for middleware/auth.decode_token, keyed by a
+SHA-256 digest of the bearer token (the token itself is never stored)
+
+Clients reuse one bearer token for many calls; a hit skips header parsing,
+signature verification (RS256 via JWKS or HS256) and claim extraction.
+
+- Entries expire at min(token exp, cache TTL)
+- An entry is dropped on lookup when the key that verified it is no longer
+  current (JWKS kid rotated out, HS256 secret removed)
+- Revocations recorded by the local revocation cache (revoke_token, Redis
+  pub/sub or revoked_tokens polling) evict every entry for that jti
+- Failed verifications are never cached
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from config.settings import settings
+from observability.metrics import verified_token_cache_entries, verified_token_cache_requests_total
+from services.token_blocklist import revocation_cache
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class CachedVerification:
+    token_data: Any
+    expires_at: float
+    jti: str | None
+    key_ref: tuple
+
+
+class VerifiedTokenCache:
+    """token digest -> CachedVerification, LRU-bounded, with per-jti eviction"""
+
+    def __init__(self, max_entries: int | None = None, ttl_seconds: float | None = None):
+        self.max_entries = max_entries or settings.verified_token_cache_max_entries
+        self.ttl_seconds = ttl_seconds or settings.verified_token_cache_ttl_seconds
+        self._entries: OrderedDict[str, CachedVerification] = OrderedDict()
+        self._by_jti: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def _remove(self, digest: str) -> None:
+        entry = self._entries.pop(digest, None)
+        if entry is not None and entry.jti is not None:
+            digests = self._by_jti.get(entry.jti)
+            if digests is not None:
+                digests.discard(digest)
+                if not digests:
+                    del self._by_jti[entry.jti]
+
+    def get(self, token: str, key_current: Callable[[tuple], bool]) -> CachedVerification | None:
+        """Cached verification for token, if still within its lifetime and signed by a current key"""
+        digest = token_digest(token)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                result = "miss"
+            elif entry.expires_at <= time.time():
+                self._remove(digest)
+                result = "expired"
+            elif not key_current(entry.key_ref):
+                self._remove(digest)
+                result = "rotated"
+            else:
+                self._entries.move_to_end(digest)
+                result = "hit"
+            verified_token_cache_entries.set(len(self._entries))
+        verified_token_cache_requests_total.labels(result=result).inc()
+        return entry if result == "hit" else None
+
+    def put(self, token: str, token_data: Any, exp: float, jti: str | None, key_ref: tuple) -> None:
+        """Remember a successful verification until min(exp, now + TTL)"""
+        expires_at = min(float(exp), time.time() + self.ttl_seconds)
+        if expires_at <= time.time():
+            return
+        digest = token_digest(token)
+        with self._lock:
+            self._remove(digest)
+            self._entries[digest] = CachedVerification(token_data, expires_at, jti, key_ref)
+            if jti is not None:
+                self._by_jti.setdefault(jti, set()).add(digest)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+            verified_token_cache_entries.set(len(self._entries))
+
+    def evict_jti(self, jti: str) -> None:
+        """Drop every cached verification of a revoked token"""
+        with self._lock:
+            digests = list(self._by_jti.get(jti, ()))
+            for digest in digests:
+                self._remove(digest)
+            verified_token_cache_entries.set(len(self._entries))
+        if digests:
+            verified_token_cache_requests_total.labels(result="revoked").inc(len(digests))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_jti.clear()
+            verified_token_cache_entries.set(0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_status(self) -> dict[str, Any]:
+        return {"entries": len(self._entries), "max_entries": self.max_entries, "ttl_seconds": self.ttl_seconds}
+
+
+verified_token_cache = VerifiedTokenCache()
+# Revocations seen by this worker, by whichever path, evict cached verifications
+revocation_cache.add_listener(verified_token_cache.evict_jti)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Middleware Overhead Benchmark - header-only concerns
+Compares per-request overhead of the seven BaseHTTPMiddleware layers against
+the fused HeaderPipelineMiddleware on a trivial endpoint, in-process (no
+network, no server) so only middleware cost is measured.
+
+Usage:
+    python tests/perf/scripts/middleware_overhead.py [--requests 5000]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from starlette.applications import Starlette  # noqa: E402
+from starlette.middleware import Middleware  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+from starlette.routing import Route  # noqa: E402
+
+from middleware.error_handling import trace_id_middleware  # noqa: E402
+from middleware.header_pipeline import HeaderPipelineMiddleware  # noqa: E402
+from middleware.identity_headers import IdentityHeadersMiddleware  # noqa: E402
+from middleware.privacy_headers import PrivacyHeadersMiddleware  # noqa: E402
+from middleware.request_id import RequestIDMiddleware  # noqa: E402
+from middleware.security_headers import SecurityHeadersMiddleware  # noqa: E402
+from middleware.trusted_host import TrustedHostMiddleware  # noqa: E402
+from middleware.url_length import URLLengthMiddleware  # noqa: E402
+
+
+async def ping(request):
+    return JSONResponse({"status": "ok"})
+
+
+def build_app(stack: str) -> Starlette:
+    routes = [Route("/ping", ping)]
+    if stack == "none":
+        middleware = []
+    elif stack == "layered":
+        # Same relative order main.py used (first listed = outermost)
+        middleware = [
+            Middleware(PrivacyHeadersMiddleware),
+            Middleware(IdentityHeadersMiddleware),
+            Middleware(BaseHTTPMiddleware, dispatch=trace_id_middleware),
+            Middleware(RequestIDMiddleware),
+            Middleware(URLLengthMiddleware),
+            Middleware(TrustedHostMiddleware),
+            Middleware(SecurityHeadersMiddleware),
+        ]
+    else:
+        middleware = [Middleware(HeaderPipelineMiddleware)]
+    return Starlette(routes=routes, middleware=middleware)
+
+
+async def call(app, scope: dict) -> None:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(dict(scope), receive, send)
+
+
+async def measure(app, requests: int) -> list[float]:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"testserver"), (b"user-agent", b"bench")],
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 50000),
+    }
+    for _ in range(200):  # warm-up
+        await call(app, scope)
+
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await call(app, scope)
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    results = {}
+    for stack in ("none", "layered", "fused"):
+        samples = asyncio.run(measure(build_app(stack), args.requests))
+        results[stack] = (statistics.median(samples), sorted(samples)[int(len(samples) * 0.95)])
+
+    baseline = results["none"][0]
+    print(f"{'stack':<10}{'p50 (us)':>12}{'p95 (us)':>12}{'overhead p50 (us)':>20}")
+    for stack, (p50, p95) in results.items():
+        print(f"{stack:<10}{p50:>12.1f}{p95:>12.1f}{p50 - baseline:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
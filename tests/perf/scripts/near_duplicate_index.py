@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Index Benchmark - SEO bulk page scoring
+Scores N synthetic SEO pages the way generate_bulk_seo_pages does (title
+uniqueness against every earlier page, body near-duplicate check) using the
+MinHash/LSH indexes, and - up to --pairwise-max pages - the old pairwise
+title comparison for reference. Then scores synthetic ~600-word generated
+pages the way ScholarshipPageGenerator does (uniqueness against its
+uniqueness_index), reporting LSH candidates and exact comparisons per page.
+In-process, no database.
+
+Usage:
+    python tests/perf/scripts/near_duplicate_index.py [--sizes 500 5000 50000] [--pairwise-max 5000]
+        [--page-sizes 500 1500 5000] [--page-pairwise-max 500]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from production.auto_page_maker_seo import AutoPageMakerSEOService, ScholarshipPage  # noqa: E402
+from services.auto_page_maker_service import ContentQualityAssurance, uniqueness_index  # noqa: E402
+from services.near_duplicate_index import STOPWORDS  # noqa: E402
+
+FIELDS = ["Nursing", "Engineering", "Computer Science", "Biology", "Education", "Finance", "Music",
+          "Public Health", "Data Science", "Social Work", "Journalism", "Pre-Law", "Chemistry", "Arts"]
+STATES = ["Texas", "Ohio", "California", "Georgia", "New York", "Florida", "Oregon", "Maine",
+          "Illinois", "Arizona", "Virginia", "Michigan", "Colorado", "Nevada", "Utah", "Iowa"]
+KINDS = ["Merit", "Need-Based", "Leadership", "Memorial", "Foundation", "Excellence", "Achievement", "Innovation"]
+FILLER = ("students applicants award deadline essay transcript recommendation community service "
+          "leadership financial need gpa eligibility renewable tuition fees campus research mentor "
+          "internship application portal interview selection committee criteria residency enrollment").split()
+
+
+def synthetic_pages(count: int, seed: int = 42) -> list[ScholarshipPage]:
+    rng = random.Random(seed)
+    pages = []
+    for i in range(count):
+        field, state, kind = rng.choice(FIELDS), rng.choice(STATES), rng.choice(KINDS)
+        amount = rng.randrange(1000, 25000, 500)
+        title = f"{state} {field} {kind} Scholarship #{i} - ${amount:,} Award | Apply Now"
+        body = " ".join(rng.choice(FILLER) for _ in range(180))
+        pages.append(ScholarshipPage(
+            scholarship_id=f"bench_{i}", url_path=f"/scholarships/bench-{i}", title=title,
+            meta_description=f"Apply for the {title}.", h1_title=title,
+            content_blocks=[{"type": "overview", "content": f"{title}. {body}"}],
+            structured_data={"@type": "MonetaryGrant"}, internal_links=[], keywords=[field, state, kind],
+            canonical_url=f"https://example.test/scholarships/bench-{i}"
+        ))
+    return pages
+
+
+def generated_bodies(count: int, seed: int = 7) -> list[str]:
+    """~600-word pages, half stopwords, content words from a shared domain vocabulary"""
+    rng = random.Random(seed)
+    stopwords = sorted(STOPWORDS)
+    vocabulary = FILLER + [f"{field.lower()}{i}" for field in FIELDS for i in range(150)]
+    return [" ".join(rng.choice(stopwords) if rng.random() < 0.5 else rng.choice(vocabulary) for _ in range(600))
+            for _ in range(count)]
+
+
+def run_generated(size: int, pairwise_max: int) -> None:
+    bodies = generated_bodies(size)
+    index = uniqueness_index()
+    verified = index._verified
+    candidates = exact = 0
+
+    def counting_verified(text, floor):
+        nonlocal candidates, exact
+        shingles, signature = index._hash(text)
+        rows = set()
+        for band, band_key in zip(index._buckets, index._band_keys(signature), strict=True):
+            rows.update(band.get(band_key, ()))
+        candidates += len(rows)
+        matches = verified(text, floor)
+        exact += len(matches)
+        return matches
+
+    index._verified = counting_verified
+    started = time.perf_counter()
+    for i, body in enumerate(bodies):
+        ContentQualityAssurance.assess_uniqueness(body, index)
+        index.add(i, body)
+    indexed = time.perf_counter() - started
+    line = (f"{size:>7} generated pages | indexed {indexed:8.2f}s ({indexed / size * 1e3:6.3f} ms/page) | "
+            f"LSH candidates {candidates / size:6.1f}/page | matches {exact / size:5.2f}/page")
+
+    if size <= pairwise_max:
+        started = time.perf_counter()
+        for i, body in enumerate(bodies):
+            ContentQualityAssurance.assess_uniqueness(body, bodies[:i])
+        pairwise = time.perf_counter() - started
+        line += f" | pairwise word sets {pairwise:8.2f}s ({pairwise / indexed:5.1f}x)"
+    print(line)
+
+
+def run(service: AutoPageMakerSEOService, size: int, pairwise_max: int) -> None:
+    pages = synthetic_pages(size)
+
+    started = time.perf_counter()
+    scores, near_duplicate_bodies = service._score_pages(pages)
+    indexed = time.perf_counter() - started
+    line = (f"{size:>7} pages | indexed {indexed:8.2f}s ({indexed / size * 1e3:6.3f} ms/page) | "
+            f"avg score {sum(scores) / len(scores):5.1f} | near-duplicate bodies {near_duplicate_bodies}")
+
+    if size <= pairwise_max:
+        started = time.perf_counter()
+        for i, page in enumerate(pages):
+            service._calculate_content_quality_score(page, pages[:i])
+        pairwise = time.perf_counter() - started
+        line += f" | pairwise titles {pairwise:8.2f}s ({pairwise / indexed:5.1f}x)"
+    print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 5000, 50000])
+    parser.add_argument("--pairwise-max", type=int, default=5000,
+                        help="skip the quadratic reference above this many pages")
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[500, 1500, 5000],
+                        help="generated-page counts for the ScholarshipPageGenerator uniqueness path")
+    parser.add_argument("--page-pairwise-max", type=int, default=500,
+                        help="skip the quadratic word-set reference above this many generated pages")
+    args = parser.parse_args()
+
+    service = AutoPageMakerSEOService()
+    for size in args.sizes:
+        run(service, size, args.pairwise_max)
+    for size in args.page_sizes:
+        run_generated(size, args.page_pairwise_max)
+
+
+if __name__ == "__main__":
+    main()
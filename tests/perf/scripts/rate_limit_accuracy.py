@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Rate Limit Accuracy Load Test - multiple worker processes, one Redis
+Each worker process owns its own TokenBucketLimiter, exactly like gunicorn
+workers do, and hammers the same key. Total admissions must never exceed
+the bucket capacity plus what refills during the run.
+
+Usage (needs a reachable Redis):
+    REDIS_URL=redis://localhost:6379/0 python tests/perf/scripts/rate_limit_accuracy.py \
+        --workers 8 --requests 2000 --limit 500 --window 60 --lease-size 0 20
+"""
+
+import argparse
+import multiprocessing
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+
+def worker(key: str, requests: int, limit: int, window: int, lease_size: int, start_at: float, results) -> None:
+    from middleware.production_rate_limiter import TokenBucketLimiter
+
+    limiter = TokenBucketLimiter(lease_size=lease_size)
+    if not limiter.redis_available:
+        results.put(("error", "Redis unavailable"))
+        return
+
+    calls = 0
+    script = limiter.redis_client.register_script
+    original = None
+
+    def counting_register(source):
+        nonlocal original
+        original = script(source)
+
+        def run(*args, **kwargs):
+            nonlocal calls
+            calls += 1
+            return original(*args, **kwargs)
+        return run
+
+    limiter.redis_client.register_script = counting_register
+
+    while time.time() < start_at:
+        time.sleep(0.001)
+
+    admitted = 0
+    for _ in range(requests):
+        allowed, _, backend = limiter.check_rate_limit(key, limit, window)
+        admitted += allowed and backend == "redis"
+    results.put(("ok", admitted, calls))
+
+
+def run(workers: int, requests: int, limit: int, window: int, lease_size: int) -> dict:
+    key = f"loadtest:{uuid.uuid4().hex}"
+    results = multiprocessing.Queue()
+    start_at = time.time() + 1.0
+    procs = [
+        multiprocessing.Process(target=worker, args=(key, requests, limit, window, lease_size, start_at, results))
+        for _ in range(workers)
+    ]
+    for proc in procs:
+        proc.start()
+    outcomes = [results.get() for _ in procs]
+    for proc in procs:
+        proc.join()
+    elapsed = time.time() - start_at
+
+    errors = [o for o in outcomes if o[0] == "error"]
+    if errors:
+        raise SystemExit(f"Worker failed: {errors[0][1]}")
+
+    admitted = sum(o[1] for o in outcomes)
+    redis_calls = sum(o[2] for o in outcomes)
+    allowed_max = limit + int(elapsed * limit / window) + 1
+    return {
+        "lease_size": lease_size,
+        "admitted": admitted,
+        "allowed_max": allowed_max,
+        "accurate": admitted <= allowed_max,
+        "redis_calls": redis_calls,
+        "calls_per_request": round(redis_calls / (workers * requests), 3),
+        "elapsed_s": round(elapsed, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Token bucket accuracy across worker processes")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2000, help="requests per worker")
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--window", type=int, default=60)
+    parser.add_argument("--lease-size", type=int, nargs="+", default=[0, 20])
+    args = parser.parse_args()
+
+    failed = False
+    for lease_size in args.lease_size:
+        result = run(args.workers, args.requests, args.limit, args.window, lease_size)
+        failed |= not result["accurate"]
+        print(result)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
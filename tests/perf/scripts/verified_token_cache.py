@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Verified Token Cache Benchmark - RS256 decode_token cost
+Signs an RS256 token with a generated key, installs the public key in the
+JWKS client, and times middleware/auth.decode_token with the verified-token
+cache cleared before every call (full signature verification) and warm
+(digest lookup). In-process, no network or database.
+
+Usage:
+    python tests/perf/scripts/verified_token_cache.py [--calls 2000] [--key-size 2048]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import rsa  # noqa: E402
+from jose import jwk, jwt  # noqa: E402
+
+from config.settings import settings  # noqa: E402
+from middleware.auth import decode_token  # noqa: E402
+from services.jwks_client import jwks_client  # noqa: E402
+from services.verified_token_cache import verified_token_cache  # noqa: E402
+
+KID = "bench-key"
+
+
+def install_key(key_size: int) -> str:
+    """Register a fresh RSA public key under KID and return a token signed with it"""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=key_size)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    jwks_client._keys = {KID: jwk.construct(public_pem, algorithm="RS256")}
+    jwks_client._cache_timestamp = time.time()
+
+    now = datetime.utcnow()
+    claims = {"sub": "bench_user", "roles": ["student"], "scope": "read write",
+              "iss": settings.scholar_auth_issuer, "iat": now, "exp": now + timedelta(hours=1)}
+    return jwt.encode(claims, private_pem, algorithm="RS256", headers={"kid": KID})
+
+
+async def timed(token: str, calls: int, cold: bool) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        if cold:
+            verified_token_cache.clear()
+        if await decode_token(token) is None:
+            raise SystemExit("decode_token rejected the benchmark token")
+    return time.perf_counter() - started
+
+
+async def main_async(calls: int, key_size: int) -> None:
+    token = install_key(key_size)
+    cold = await timed(token, calls, cold=True)
+    warm = await timed(token, calls, cold=False)
+    print(f"RS256-{key_size} | {calls} calls")
+    print(f"  verify every call {cold:8.3f}s ({cold / calls * 1e6:8.1f} us/call)")
+    print(f"  verified cache    {warm:8.3f}s ({warm / calls * 1e6:8.1f} us/call) | {cold / warm:6.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--key-size", type=int, default=2048)
+    args = parser.parse_args()
+    asyncio.run(main_async(args.calls, args.key_size))
+
+
+if __name__ == "__main__":
+    main()
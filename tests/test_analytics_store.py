@@ -0,0 +1,89 @@
+"""
+Test Analytics Interaction Store
+Per-minute buckets, retention and bounded recent history
+"""
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from models.scholarship import SearchFilters
+from models.user import UserInteraction
+from services import analytics_service as analytics_module
+from services.analytics_service import AnalyticsService, InteractionStore
+
+
+def interaction(action: str, minutes_ago: float = 0, **kwargs) -> UserInteraction:
+    return UserInteraction(action=action, timestamp=datetime.utcnow() - timedelta(minutes=minutes_ago), **kwargs)
+
+
+@pytest.fixture
+def service():
+    svc = AnalyticsService()
+    svc.store = InteractionStore(retention_days=2, recent_max=5)
+    svc.spill_searches = False
+    return svc
+
+
+def test_summary_counts_from_buckets(service):
+    service.log_search("u1", "Nursing ", 3, {"state": "TX", "limit": 20})
+    service.log_search("u2", "nursing", 0, {"state": None})
+    service.log_scholarship_view("u1", "sch_1")
+    service.log_scholarship_view("u2", "sch_1")
+    service.log_eligibility_check("u1", "sch_1", eligible=True, match_score=0.9)
+
+    summary = service.get_analytics_summary(days=1)
+    assert summary["total_interactions"] == 5
+    assert summary["unique_users"] == 2
+    assert summary["popular_scholarships"] == {"sch_1": 2}
+    assert summary["search_analytics"] == {"total_searches": 2, "avg_results_per_search": 1.5, "popular_terms": {"nursing": 2}}
+    assert summary["eligibility_analytics"]["eligibility_rate"] == 1.0
+
+    trends = service.get_search_trends(days=1)
+    assert trends["zero_result_searches"] == 1
+    assert trends["filter_usage"] == {"state": 1}
+
+
+def test_window_excludes_older_buckets(service):
+    service.log_interaction(interaction("view_scholarship", minutes_ago=3 * 60, scholarship_id="old"))
+    service.log_interaction(interaction("view_scholarship", scholarship_id="new"))
+    assert service.get_popular_scholarships(days=1) == {"old": 1, "new": 1}
+    # A window shorter than three hours only sees the newest bucket
+    assert service.store.totals(days=0.1).scholarship_views == {"new": 1}
+
+
+def test_retention_evicts_old_buckets(service):
+    service.log_interaction(interaction("search", minutes_ago=3 * 1440, metadata={"query": "x"}))
+    service.log_interaction(interaction("search", metadata={"query": "y"}))
+    assert service.store.bucket_count() == 1
+    assert service.get_search_trends(days=7)["popular_queries"] == {"y": 1}
+
+
+def test_same_minute_shares_a_bucket(service):
+    for _ in range(50):
+        service.log_scholarship_view(None, "sch_1")
+    assert service.store.bucket_count() == 1
+
+
+def test_recent_history_is_bounded(service):
+    for i in range(8):
+        service.log_scholarship_view("u1", f"sch_{i}")
+    recent = service.get_recent_interactions(limit=10)
+    assert [i.scholarship_id for i in recent] == ["sch_7", "sch_6", "sch_5", "sch_4", "sch_3"]
+    assert len(service.interactions) == 5
+    assert service.get_user_analytics("u1")["total_interactions"] == 5
+
+
+def test_spill_skips_persisted_searches_and_flushes_open_minute(service):
+    service.spill_searches = True
+    filters = SearchFilters(keyword="nursing", deadline_after=datetime(2030, 1, 1)).model_dump(mode="json")
+    with patch.object(analytics_module, "analytics_writer") as writer:
+        service.log_search("u1", "nursing", 3, filters, persisted=True)
+        service.log_search("u2", "nursing", 3, filters)
+        assert writer.enqueue.call_count == 0  # minute still open
+        service.flush_spill()
+        service.flush_spill()
+    assert writer.enqueue.call_count == 1
+    record = writer.enqueue.call_args.args[0]
+    assert record.user_id == "u2"
+    assert record.filters_applied["deadline_after"] == "2030-01-01T00:00:00"
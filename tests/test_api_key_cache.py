@@ -0,0 +1,81 @@
+"""
+Test Verified API Key Cache
+PBKDF2 runs once per key; suspension and cancellation take effect immediately
+"""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from production.api_commercialization import TierType, commercialization_service as service
+
+
+@pytest.fixture
+def api_key():
+    key = service.create_api_key("user_cache", "cache@example.com", "Cache Co", TierType.STARTER)["api_key"]
+    yield key
+    service.invalidate_verified_key(key)
+    service.api_keys.pop(key, None)
+
+
+def test_repeat_verification_skips_pbkdf2(api_key):
+    with patch.object(service, "_verify_api_key_cold", wraps=service._verify_api_key_cold) as cold:
+        for _ in range(5):
+            assert service.verify_api_key(api_key) is not None
+    assert cold.call_count == 1
+
+
+def test_wrong_secret_is_rejected_and_not_cached(api_key):
+    forged = api_key[:-1] + ("A" if api_key[-1] != "A" else "B")
+    assert service.verify_api_key(forged) is None
+    assert service._cached_key(service._key_digest(forged)) is None
+
+
+@pytest.mark.parametrize("action", ["suspend_api_key", "cancel_api_key"])
+def test_status_change_invalidates_immediately(api_key, action):
+    assert service.verify_api_key(api_key) is not None
+    assert getattr(service, action)(api_key)
+    assert service.verify_api_key(api_key) is None
+
+
+def test_expired_entry_is_reverified(api_key):
+    service.verify_api_key(api_key)
+    digest = service._key_digest(api_key)
+    key_id, _ = service._verified_keys[digest]
+    service._verified_keys[digest] = (key_id, 0.0)
+    with patch.object(service, "_verify_api_key_cold", wraps=service._verify_api_key_cold) as cold:
+        assert service.verify_api_key(api_key) is not None
+    assert cold.call_count == 1
+
+
+def test_async_verification_coalesces_concurrent_misses(api_key):
+    async def verify_many():
+        return await asyncio.gather(*(service.verify_api_key_async(api_key) for _ in range(10)))
+
+    with patch.object(service, "_verify_api_key_cold", wraps=service._verify_api_key_cold) as cold:
+        results = asyncio.run(verify_many())
+    assert all(result is not None for result in results)
+    assert cold.call_count == 1
+
+
+def test_cancelled_first_caller_does_not_fail_waiters(api_key):
+    async def cancel_leader():
+        leader = asyncio.create_task(service.verify_api_key_async(api_key))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(service.verify_api_key_async(api_key)) for _ in range(3)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*waiters)
+
+    with patch.object(service, "_verify_api_key_cold", wraps=service._verify_api_key_cold) as cold:
+        results = asyncio.run(cancel_leader())
+    assert all(result is not None for result in results)
+    assert cold.call_count == 1
+
+
+def test_async_rate_limit_check_allows_valid_key(api_key):
+    result = asyncio.run(service.check_rate_limits_async(api_key, "search"))
+    assert result["allowed"] is True
+    assert asyncio.run(service.check_rate_limits_async("sk_live_unknown", "search"))["status_code"] == 401
@@ -0,0 +1,143 @@
+"""
+Test Async Repository Layer
+Verify the AsyncSession read path returns exactly what the sync path returns
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+
+import models.async_database as async_database  # noqa: E402
+import services.scholarship_service as scholarship_module  # noqa: E402
+from models.database import ScholarshipDB  # noqa: E402
+from models.scholarship import FieldOfStudy, SearchFilters  # noqa: E402
+from services.hybrid_search_service import (  # noqa: E402
+    HybridSearchFilters,
+    StudentProfile,
+    hybrid_search_service,
+)
+from services.scholarship_index import ScholarshipIndex  # noqa: E402
+from services.scholarship_repository import scholarship_repository  # noqa: E402
+from services.scholarship_service import scholarship_service  # noqa: E402
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    path = tmp_path / "scholarships.db"
+    engine = create_engine(f"sqlite:///{path}")
+    ScholarshipDB.__table__.create(engine)
+    factory = sessionmaker(bind=engine)
+
+    base = datetime.utcnow() + timedelta(days=10)
+    db = factory()
+    for i in range(25):
+        db.add(ScholarshipDB(
+            id=f"sch_{i:03d}",
+            name=f"Engineering Award {i}" if i % 3 == 0 else f"General Award {i}",
+            organization="Test Foundation",
+            description="A scholarship for testing",
+            amount=1000.0 * (i + 1),
+            application_deadline=base + timedelta(days=i),
+            scholarship_type="need_based" if i % 2 else "merit_based",
+            eligibility_criteria={
+                "fields_of_study": ["engineering"] if i % 3 == 0 else ["arts"],
+                "residency_states": ["CA"] if i % 5 == 0 else [],
+                "min_gpa": 3.8 if i % 4 == 0 else None,
+            },
+            is_active=i != 7,
+            updated_at=datetime(2030, 1, 1)
+        ))
+    db.commit()
+    db.close()
+
+    async_database.configure_async_engine(create_async_engine(f"sqlite+aiosqlite:///{path}"))
+    monkeypatch.setattr(scholarship_module, "get_db_session", factory)
+    monkeypatch.setattr(hybrid_search_service, "_get_db_session", factory)
+    yield factory
+    async_database.configure_async_engine(None)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("filters", [
+    SearchFilters(keyword="engineering", limit=3),
+    SearchFilters(min_amount=5000, max_amount=20000, offset=4, limit=5),
+    SearchFilters(fields_of_study=[FieldOfStudy.ENGINEERING], states=["NY"], limit=2),
+])
+async def test_async_db_search_matches_sync(session_factory, filters):
+    sync_response = scholarship_service._search_scholarships_db(filters)
+    rows, total_count = await scholarship_repository.search(filters)
+    async_response = scholarship_service._search_response(filters, rows, total_count)
+
+    assert async_response == sync_response
+    assert sync_response.total_count > 0
+
+
+@pytest.mark.asyncio
+async def test_async_get_by_id_and_all_scholarships(session_factory):
+    def dump(scholarships):
+        return [s.model_dump(exclude={"created_at", "updated_at"}) for s in scholarships]
+
+    async_one = await scholarship_service._get_scholarship_by_id_db_async("sch_003")
+    assert dump([async_one]) == dump([scholarship_service._get_scholarship_by_id_db("sch_003")])
+    assert await scholarship_service._get_scholarship_by_id_db_async("sch_007") is None
+    assert dump(await scholarship_service.get_all_scholarships_async()) == \
+        dump(scholarship_service.get_all_scholarships())
+
+
+@pytest.mark.asyncio
+async def test_async_index_refresh_matches_sync_refresh(session_factory):
+    sync_index = ScholarshipIndex(scholarship_service._db_to_scholarship, session_factory, 0)
+    async_index = ScholarshipIndex(scholarship_service._db_to_scholarship, session_factory, 0)
+
+    sync_index.refresh()
+    await async_index.refresh_async()
+    filters = SearchFilters(limit=100)
+    assert async_index.search(filters, refresh=False) == sync_index.search(filters, refresh=False)
+    assert async_index.full_reloads == 1
+
+    db = session_factory()
+    db.get(ScholarshipDB, "sch_001").is_active = False
+    db.get(ScholarshipDB, "sch_001").updated_at = datetime(2030, 2, 1)
+    db.commit()
+    db.close()
+
+    await async_index.refresh_async()
+    assert async_index.search(filters, refresh=False).total_count == 23
+    assert async_index.incremental_refreshes == 1
+
+
+@pytest.mark.asyncio
+async def test_async_hybrid_search_matches_sync(session_factory):
+    filters = HybridSearchFilters(
+        keyword="award",
+        student_profile=StudentProfile(gpa=3.5, field_of_study="engineering"),
+        limit=50
+    )
+    sync_response = hybrid_search_service.search_with_hard_filters(filters)
+    async_response = await hybrid_search_service.search_with_hard_filters_async(filters)
+
+    assert async_response.results == sync_response.results
+    assert async_response.filtered_out_count == sync_response.filtered_out_count
+
+
+@pytest.mark.asyncio
+async def test_request_session_is_reused_and_closed(session_factory):
+    dependency = async_database.request_db_session()
+    await dependency.__anext__()
+
+    async with async_database.async_session_scope() as first:
+        pass
+    async with async_database.async_session_scope() as second:
+        pass
+    assert first is second
+
+    with pytest.raises(StopAsyncIteration):
+        await dependency.__anext__()
+
+    async with async_database.async_session_scope() as outside:
+        assert outside is not first
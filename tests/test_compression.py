@@ -0,0 +1,136 @@
+"""
+Test Streaming Compression Middleware
+Negotiation, streaming output and the variant cache keyed by resource and ETag
+"""
+import asyncio
+import gzip
+
+import pytest
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from middleware.compression import CompressionMiddleware, negotiate_encoding
+
+BODY = "scholarship " * 500
+
+
+async def listing(request):
+    return PlainTextResponse(BODY)
+
+
+async def tiny(request):
+    return PlainTextResponse("ok")
+
+
+async def streamed(request):
+    async def chunks():
+        for _ in range(10):
+            yield BODY.encode()
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+async def seo_page(request):
+    return Response(BODY, media_type="text/html", headers={"ETag": '"page-v1"'})
+
+
+async def seo_other(request):
+    # Same ETag as /seo/page, as StaticFiles gives files with equal mtime and size
+    return Response("other " * 500, media_type="text/html", headers={"ETag": '"page-v1"'})
+
+
+@pytest.fixture
+def client():
+    app = Starlette(
+        routes=[
+            Route("/listing", listing),
+            Route("/tiny", tiny),
+            Route("/streamed", streamed),
+            Route("/seo/page", seo_page),
+            Route("/seo/other", seo_other),
+        ],
+        middleware=[Middleware(CompressionMiddleware, variant_cache_max_bytes=1024 * 1024)],
+    )
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("header,expected", [
+    ("gzip", "gzip"),
+    ("gzip;q=0, identity", None),
+    ("", None),
+    ("*;q=0.5", "gzip"),
+    ("deflate, gzip;q=0.2", "gzip"),
+    ("compress", None),
+])
+def test_negotiate_gzip_only(header, expected):
+    assert negotiate_encoding(header, ("gzip",)) == expected
+
+
+def test_negotiate_prefers_higher_q_then_server_order():
+    supported = ("br", "zstd", "gzip")
+    assert negotiate_encoding("gzip, br", supported) == "br"
+    assert negotiate_encoding("gzip;q=1.0, br;q=0.5", supported) == "gzip"
+    assert negotiate_encoding("br;q=0, *", supported) == "zstd"
+
+
+def test_large_response_is_gzipped(client):
+    response = client.get("/listing", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.text == BODY
+
+
+def test_small_response_is_not_compressed(client):
+    response = client.get("/tiny", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+def test_no_accept_encoding_passes_through(client):
+    response = client.get("/listing", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.text == BODY
+
+
+def test_streaming_response_is_compressed_incrementally(client):
+    with client.stream("GET", "/streamed", headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        raw = b"".join(response.iter_raw())
+    assert gzip.decompress(raw) == (BODY * 10).encode()
+
+
+def test_seo_variant_served_from_cache(client):
+    first = client.get("/seo/page", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/seo/page", headers={"Accept-Encoding": "gzip"})
+    assert first.content == second.content == BODY.encode()
+    assert second.headers["content-encoding"] == "gzip"
+    cache = client.app.middleware_stack.app.variant_cache
+    assert cache.size > 0
+
+
+def test_variant_cache_keyed_by_resource(client):
+    client.get("/seo/page", headers={"Accept-Encoding": "gzip"})
+    other = client.get("/seo/other", headers={"Accept-Encoding": "gzip"})
+    other_again = client.get("/seo/other?v=2", headers={"Accept-Encoding": "gzip"})
+    assert other.content == other_again.content == ("other " * 500).encode()
+
+
+def test_head_after_get_sends_no_cached_body(client):
+    client.get("/seo/page", headers={"Accept-Encoding": "gzip"})
+    scope = {"type": "http", "method": "HEAD", "path": "/seo/page", "raw_path": b"/seo/page",
+             "query_string": b"", "headers": [(b"accept-encoding", b"gzip")], "root_path": "",
+             "scheme": "http", "server": ("testserver", 80), "app": client.app}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(client.app.middleware_stack(scope, receive, send))
+    assert sent[0]["status"] == 200
+    assert (b"content-encoding", b"gzip") not in sent[0]["headers"]
+    assert b"".join(m.get("body", b"") for m in sent[1:]) == BODY.encode()  # the app's own; the server drops it
@@ -0,0 +1,132 @@
+"""
+Test Vectorized Eligibility Engine
+Verify compiled catalog scores match the scalar evaluator exactly
+"""
+import random
+from datetime import datetime, timedelta
+
+from models.scholarship import (
+    EligibilityCriteria,
+    FieldOfStudy,
+    Scholarship,
+    ScholarshipType,
+)
+from models.user import UserProfile
+from services.eligibility_engine import CompiledCatalog
+from services.eligibility_service import eligibility_service
+
+GRADES = ["high_school", "undergraduate", "graduate"]
+STATES = ["CA", "NY", "TX"]
+CITIZENSHIP = ["US", "permanent_resident", "international"]
+FIELDS = list(FieldOfStudy)
+
+
+def _maybe(rng, value):
+    return value if rng.random() < 0.5 else None
+
+
+def _random_scholarship(rng, i):
+    min_gpa = _maybe(rng, round(rng.uniform(2.0, 3.8), 1))
+    min_age = _maybe(rng, rng.randint(14, 25))
+    return Scholarship(
+        id=f"sch_{i}",
+        name=f"Scholarship {i}",
+        organization="Org",
+        description="Description",
+        amount=1000,
+        max_awards=1,
+        application_deadline=datetime(2030, 1, 1) + timedelta(days=i),
+        scholarship_type=ScholarshipType.MERIT_BASED,
+        eligibility_criteria=EligibilityCriteria(
+            min_gpa=min_gpa,
+            max_gpa=_maybe(rng, 4.0 if min_gpa is None else min(4.0, min_gpa + 0.5)),
+            grade_levels=rng.sample(GRADES, rng.randint(0, 2)),
+            citizenship_required=_maybe(rng, rng.choice(CITIZENSHIP)),
+            residency_states=rng.sample(STATES, rng.randint(0, 2)),
+            fields_of_study=rng.sample(FIELDS, rng.randint(0, 3)),
+            min_age=min_age,
+            max_age=_maybe(rng, (min_age or 14) + rng.randint(2, 10)),
+            financial_need=rng.choice([None, True, False]),
+        ),
+        application_url="https://example.org"
+    )
+
+
+def _random_profile(rng):
+    return UserProfile(
+        gpa=_maybe(rng, round(rng.uniform(1.5, 4.0), 2)),
+        grade_level=_maybe(rng, rng.choice(GRADES)),
+        field_of_study=_maybe(rng, rng.choice(FIELDS)),
+        citizenship=_maybe(rng, rng.choice(CITIZENSHIP)),
+        state_of_residence=_maybe(rng, rng.choice(STATES)),
+        age=_maybe(rng, rng.randint(13, 40)),
+        financial_need=rng.choice([None, True, False]),
+    )
+
+
+def test_batch_scores_match_scalar_evaluator():
+    rng = random.Random(7)
+    scholarships = [_random_scholarship(rng, i) for i in range(200)]
+    profiles = [_random_profile(rng) for _ in range(40)]
+
+    eligible, match = CompiledCatalog(scholarships).score(profiles)
+
+    assert eligible.shape == match.shape == (40, 200)
+    for p, profile in enumerate(profiles):
+        for s, scholarship in enumerate(scholarships):
+            expected = eligibility_service._evaluate_eligibility(profile, scholarship)
+            assert bool(eligible[p, s]) == expected.eligible
+            assert float(match[p, s]) == expected.match_score
+
+
+def test_empty_catalog_and_positions():
+    catalog = CompiledCatalog([])
+    eligible, match = catalog.score([UserProfile(gpa=3.0)])
+    assert eligible.shape == (1, 0)
+
+    rng = random.Random(1)
+    scholarships = [_random_scholarship(rng, i) for i in range(3)]
+    assert CompiledCatalog(scholarships).positions == {"sch_0": 0, "sch_1": 1, "sch_2": 2}
+
+
+def _ranking_catalog(rng, n):
+    now = datetime.utcnow()
+    scholarships = []
+    for i in range(n):
+        scholarship = _random_scholarship(rng, i)
+        scholarships.append(scholarship.model_copy(update={
+            "amount": rng.choice([500, 1000, 4999, 5000, 20000]),
+            "scholarship_type": rng.choice(list(ScholarshipType)),
+            "application_deadline": now + timedelta(days=rng.randint(-10, 400), hours=rng.randint(0, 23)),
+        }))
+    return scholarships
+
+
+def test_recommendation_scores_match_scalar_calculation():
+    from services.search_service import search_service
+
+    rng = random.Random(11)
+    scholarships = _ranking_catalog(rng, 150)
+    catalog = CompiledCatalog(scholarships)
+    profiles = [_random_profile(rng) for _ in range(20)]
+    _, match = catalog.score(profiles)
+
+    for p, profile in enumerate(profiles):
+        scores = search_service._recommendation_scores(profile, catalog, match[p])
+        for s, scholarship in enumerate(scholarships):
+            expected = search_service._calculate_recommendation_score(profile, scholarship, float(match[p, s]))
+            assert float(scores[s]) == expected
+
+
+def test_top_k_matches_full_stable_sort():
+    import numpy as np
+
+    from services.search_service import SearchService
+
+    rng = np.random.default_rng(3)
+    # Coarse scores so ties straddle the cut-off
+    scores = rng.integers(0, 5, size=300).astype(np.float64) / 4
+    for candidates in (np.arange(300), np.flatnonzero(rng.random(300) < 0.3), np.array([], dtype=np.int64)):
+        expected = sorted(candidates.tolist(), key=lambda pos: -scores[pos])
+        for k in (0, 1, 7, 50, 1000):
+            assert SearchService._top_k(scores, candidates, k).tolist() == expected[:k]
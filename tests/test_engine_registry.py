@@ -0,0 +1,90 @@
+"""
+Test Engine Registry
+Named pools are created once, keep their own budgets and route reads to the replica
+"""
+import pytest
+
+from config.settings import settings
+from database.engine_registry import (
+    BACKGROUND_POOL,
+    HEALTH_POOL,
+    REQUEST_READ_POOL,
+    WRITE_POOL,
+    EngineRegistry,
+    PoolSpec,
+    default_pool_specs,
+    to_async_url,
+)
+
+
+@pytest.fixture
+def registry(tmp_path):
+    url = f"sqlite:///{tmp_path / 'registry.db'}"
+    return EngineRegistry(url_resolver=lambda: url)
+
+
+def test_default_specs_cover_every_workload():
+    specs = default_pool_specs()
+    assert set(specs) == {REQUEST_READ_POOL, WRITE_POOL, BACKGROUND_POOL, HEALTH_POOL}
+    assert specs[REQUEST_READ_POOL].read_only
+    assert not specs[WRITE_POOL].read_only
+    assert specs[HEALTH_POOL].max_overflow == 0
+    assert specs[HEALTH_POOL].pool_timeout < specs[WRITE_POOL].pool_timeout
+
+
+def test_engine_is_created_once_per_pool(registry):
+    assert registry.get_engine(WRITE_POOL) is registry.get_engine(WRITE_POOL)
+    assert registry.get_engine(WRITE_POOL) is not registry.get_engine(HEALTH_POOL)
+    assert registry.sessionmaker(WRITE_POOL) is registry.sessionmaker(WRITE_POOL)
+
+
+def test_unknown_pool_is_rejected(registry):
+    with pytest.raises(ValueError):
+        registry.get_engine("reporting")
+
+
+def test_read_only_pools_route_to_replica(registry, monkeypatch):
+    monkeypatch.setattr(settings, "database_read_replica_url", "postgresql://replica/db")
+    assert registry.url_for(REQUEST_READ_POOL) == "postgresql://replica/db"
+    assert registry.url_for(WRITE_POOL) != "postgresql://replica/db"
+
+
+def test_pool_status_reports_checked_out_connections(registry):
+    engine = registry.get_engine(WRITE_POOL)
+    with engine.connect():
+        status = registry.pool_status()
+    assert WRITE_POOL in status
+    assert set(status[WRITE_POOL]) >= {"pool_size", "checked_out", "idle", "overflow"}
+
+
+def test_configure_replaces_and_resets_engine(registry, tmp_path):
+    from sqlalchemy import create_engine
+
+    replacement = create_engine(f"sqlite:///{tmp_path / 'other.db'}")
+    registry.configure(BACKGROUND_POOL, replacement)
+    assert registry.get_engine(BACKGROUND_POOL) is replacement
+
+    registry.configure(BACKGROUND_POOL, None)
+    assert registry.get_engine(BACKGROUND_POOL) is not replacement
+
+
+def test_custom_specs_override_defaults(tmp_path):
+    spec = PoolSpec(WRITE_POOL, pool_size=1, max_overflow=0, pool_timeout=1)
+    registry = EngineRegistry(specs={WRITE_POOL: spec}, url_resolver=lambda: "sqlite://")
+    assert registry.spec(WRITE_POOL) is spec
+    with pytest.raises(ValueError):
+        registry.spec(REQUEST_READ_POOL)
+
+
+def test_async_url_strips_sslmode_and_names_pool():
+    url, connect_args = to_async_url(
+        "postgresql://u:p@host/db?sslmode=require",
+        statement_timeout_ms=1500,
+        application_name="scholarship_api:background",
+    )
+    assert url.startswith("postgresql+asyncpg://")
+    assert "sslmode" not in url
+    assert connect_args["server_settings"] == {
+        "application_name": "scholarship_api:background",
+        "statement_timeout": "1500",
+    }
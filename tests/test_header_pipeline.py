@@ -0,0 +1,91 @@
+"""
+Test Header Pipeline Middleware
+The fused pure-ASGI pipeline must emit what the seven layered middlewares did
+"""
+import pytest
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from middleware.header_pipeline import DOCS_CSP, STRICT_CSP, HeaderPipelineMiddleware
+
+SECURITY_HEADERS = [
+    "Strict-Transport-Security",
+    "Content-Security-Policy",
+    "X-Frame-Options",
+    "X-Content-Type-Options",
+    "Referrer-Policy",
+    "Permissions-Policy",
+]
+
+
+async def echo_state(request):
+    return JSONResponse({
+        "trace_id": request.state.trace_id,
+        "is_minor": request.state.is_minor,
+        "do_not_sell": request.state.do_not_sell,
+    })
+
+
+async def overriding(request):
+    return PlainTextResponse("ok", headers={"X-Frame-Options": "SAMEORIGIN"})
+
+
+@pytest.fixture
+def client():
+    app = Starlette(
+        routes=[Route("/state", echo_state), Route("/docs", echo_state), Route("/override", overriding)],
+        middleware=[Middleware(HeaderPipelineMiddleware, max_url_length=200, allowed_hosts=["api.example.com", "*.example.org"])],
+    )
+    return TestClient(app)
+
+
+def test_security_and_identity_headers_present(client):
+    response = client.get("/state")
+    for header in SECURITY_HEADERS + ["X-System-Identity", "X-App-Base-URL", "X-Request-ID", "X-Trace-ID"]:
+        assert header in response.headers
+    assert response.headers["Content-Security-Policy"] == STRICT_CSP
+
+
+def test_docs_get_relaxed_csp(client):
+    assert client.get("/docs").headers["Content-Security-Policy"] == DOCS_CSP
+
+
+def test_pipeline_headers_replace_route_headers(client):
+    response = client.get("/override")
+    assert response.headers.get_list("X-Frame-Options") == ["DENY"]
+
+
+def test_request_id_is_propagated_to_state(client):
+    response = client.get("/state", headers={"X-Request-ID": "req-123", "X-Trace-ID": "trace-9"})
+    assert response.headers["X-Request-ID"] == "req-123"
+    assert response.headers["X-Trace-ID"] == "trace-9"
+    assert response.json()["trace_id"] == "req-123"
+
+
+def test_privacy_context_for_minors(client):
+    response = client.get("/state", headers={"X-Privacy-Context": "minor=true"})
+    assert response.json()["is_minor"] is True
+    assert response.json()["do_not_sell"] is True
+    assert response.headers["X-Do-Not-Sell"] == "true"
+    assert response.headers["X-Minor-Protected"] == "true"
+    assert response.headers["X-Privacy-Context"] == "minor=true"
+
+
+def test_untrusted_host_rejected(client):
+    response = client.get("/state", headers={"Host": "evil.com"})
+    assert response.status_code == 400
+    assert response.json()["code"] == "INVALID_HOST"
+    assert "X-Request-ID" in response.headers
+
+
+def test_wildcard_host_allowed(client):
+    assert client.get("/state", headers={"Host": "api.example.org:443"}).status_code == 200
+
+
+def test_long_url_rejected(client):
+    response = client.get("/state?q=" + "a" * 300)
+    assert response.status_code == 414
+    assert "Strict-Transport-Security" in response.headers
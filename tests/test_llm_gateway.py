@@ -0,0 +1,120 @@
+"""
+Test LLM Gateway
+Single-flight coalescing, timeouts, cancellation and normalised-input caching
+against the in-process fake backend
+"""
+import asyncio
+import json
+
+import pytest
+
+from services.llm_gateway import FakeLLMBackend, LLMGateway
+from services.openai_service import OpenAIService
+
+
+def enhancement(request):
+    return json.dumps({"enhanced_query": "nursing scholarships", "suggested_filters": {}, "confidence": 0.9})
+
+
+def make_gateway(backend: FakeLLMBackend, timeout: float = 5.0) -> LLMGateway:
+    return LLMGateway(backend, timeout=timeout, cache_max_entries=100, cache_ttl=60)
+
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+
+def test_identical_concurrent_prompts_share_one_call():
+    backend = FakeLLMBackend(delay=0.05)
+    gateway = make_gateway(backend)
+
+    async def run():
+        return await asyncio.gather(*(gateway.complete("test", MESSAGES, temperature=0.2) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert len(set(results)) == 1
+    assert len(backend.requests) == 1
+    assert gateway.get_status()["inflight"] == 0
+
+
+def test_different_prompts_are_not_coalesced():
+    backend = FakeLLMBackend(delay=0.01)
+    gateway = make_gateway(backend)
+
+    async def run():
+        await asyncio.gather(
+            gateway.complete("test", MESSAGES, temperature=0.2),
+            gateway.complete("test", MESSAGES, temperature=0.7),
+        )
+
+    asyncio.run(run())
+    assert len(backend.requests) == 2
+
+
+def test_timeout_cancels_upstream_call():
+    backend = FakeLLMBackend(delay=1.0)
+    gateway = make_gateway(backend, timeout=0.05)
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(gateway.complete("test", MESSAGES, temperature=0.2))
+    assert backend.cancelled == 1
+
+
+def test_cancelled_caller_cancels_request_only_when_last():
+    backend = FakeLLMBackend(delay=0.2)
+    gateway = make_gateway(backend)
+
+    async def run():
+        first = asyncio.ensure_future(gateway.complete("test", MESSAGES, temperature=0.2))
+        second = asyncio.ensure_future(gateway.complete("test", MESSAGES, temperature=0.2))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        text = await second
+        assert backend.cancelled == 0
+
+        lone = asyncio.ensure_future(gateway.complete("test", MESSAGES, temperature=0.9))
+        await asyncio.sleep(0.01)
+        lone.cancel()
+        await asyncio.sleep(0.01)
+        return text
+
+    assert asyncio.run(run())
+    assert backend.cancelled == 1
+
+
+def test_enhance_search_query_cached_on_normalized_query():
+    backend = FakeLLMBackend(responder=enhancement)
+    service = OpenAIService(gateway=make_gateway(backend))
+
+    async def run():
+        first = await service.enhance_search_query("Nursing  Scholarships")
+        second = await service.enhance_search_query("nursing scholarships ")
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == second
+    assert len(backend.requests) == 1
+
+
+def test_summary_cache_follows_scholarship_content():
+    backend = FakeLLMBackend(responder=lambda request: "A great scholarship.")
+    service = OpenAIService(gateway=make_gateway(backend))
+    scholarship = {"id": "sch_1", "name": "STEM Award", "amount": 5000, "description": "For STEM students"}
+
+    async def run():
+        await service.generate_scholarship_summary(scholarship)
+        await service.generate_scholarship_summary(dict(scholarship))
+        await service.generate_scholarship_summary({**scholarship, "description": "Updated"})
+
+    asyncio.run(run())
+    assert len(backend.requests) == 2
+
+
+def test_failures_fall_back_and_are_not_cached():
+    backend = FakeLLMBackend(delay=1.0, responder=enhancement)
+    service = OpenAIService(gateway=make_gateway(backend, timeout=0.02))
+
+    async def run():
+        return [await service.enhance_search_query("nursing") for _ in range(2)]
+
+    results = asyncio.run(run())
+    assert results == [{"enhanced_query": "nursing", "suggested_filters": {}}] * 2
+    assert len(backend.requests) == 2
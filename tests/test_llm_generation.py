@@ -0,0 +1,146 @@
+"""
+Test LLM Generation Engine
+Concurrent page generation against a local stub LLM server, token budget and
+the on-disk completion cache
+"""
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from models.scholarship import EligibilityCriteria, Scholarship, ScholarshipType
+from services.auto_page_maker_service import AutoPageMakerService
+from services.llm_generation import LLMGenerationEngine, TokenRateLimiter
+from services.openai_service import OpenAIService
+
+STUB_LATENCY = 0.1
+
+
+class StubLLM(BaseHTTPRequestHandler):
+    """OpenAI-compatible /chat/completions that echoes the prompt after a fixed delay"""
+    calls = 0
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        cls = type(self)
+        with cls.lock:
+            cls.calls += 1
+            cls.in_flight += 1
+            cls.peak = max(cls.peak, cls.in_flight)
+        time.sleep(STUB_LATENCY)
+        with cls.lock:
+            cls.in_flight -= 1
+        prompt = body["messages"][-1]["content"]
+        payload = json.dumps({
+            "id": "chatcmpl-stub", "object": "chat.completion", "created": 0, "model": body["model"],
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": f"Generated: {prompt.split()[:12]}"}}],
+            "usage": {"prompt_tokens": 50, "completion_tokens": 50, "total_tokens": 100},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    StubLLM.calls = StubLLM.in_flight = StubLLM.peak = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubLLM)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+
+
+@pytest.fixture
+def service_factory(stub_server, tmp_path, monkeypatch):
+    # _generate_sitemap writes sitemap.xml to the working directory
+    monkeypatch.chdir(tmp_path)
+
+    def make(max_concurrency: int = 8) -> AutoPageMakerService:
+        engine = LLMGenerationEngine(api_key="test-key", base_url=stub_server, max_concurrency=max_concurrency,
+                                     tokens_per_minute=10_000_000, cache_dir=tmp_path / "cache")
+        return AutoPageMakerService(OpenAIService(), engine=engine)
+    return make
+
+
+def scholarships(count: int) -> list[Scholarship]:
+    return [
+        Scholarship(
+            id=f"sch_{i}", name=f"STEM Excellence Award {i}", organization="Test Foundation",
+            description="Merit scholarship for engineering and computer science students",
+            amount=5000 + i, max_awards=1, application_deadline=datetime(2030, 3, 1),
+            scholarship_type=ScholarshipType.MERIT_BASED, eligibility_criteria=EligibilityCriteria(),
+            application_url="https://example.test/apply",
+        )
+        for i in range(count)
+    ]
+
+
+def test_pages_generated_concurrently(service_factory):
+    service = service_factory(max_concurrency=8)
+    started = time.perf_counter()
+    results = asyncio.run(service.generate_programmatic_pages(scholarships(4)))
+    elapsed = time.perf_counter() - started
+
+    assert len(results["individual_pages"]) == 4
+    assert results["category_pages"]
+    assert results["individual_pages"][0]["content"]["overview"].startswith("Generated:")
+    expected_calls = 4 * 4 + len(results["category_pages"])
+    assert StubLLM.calls == expected_calls
+    assert StubLLM.peak <= 8
+    # Sequential generation would take expected_calls * STUB_LATENCY
+    assert elapsed < expected_calls * STUB_LATENCY / 2
+
+
+def test_concurrency_budget_is_respected(service_factory):
+    service = service_factory(max_concurrency=2)
+    asyncio.run(service.generate_programmatic_pages(scholarships(3)))
+    assert StubLLM.peak <= 2
+
+
+def test_unchanged_scholarships_regenerate_from_cache(service_factory):
+    first = asyncio.run(service_factory().generate_programmatic_pages(scholarships(3)))
+    calls = StubLLM.calls
+
+    changed = scholarships(3)
+    changed[0].amount = 9999
+    second = asyncio.run(service_factory().generate_programmatic_pages(changed))
+
+    # Only the changed scholarship's prompts (and categories summing its amount) reach the server
+    assert 0 < StubLLM.calls - calls < calls
+    assert second["individual_pages"][1]["content"] == first["individual_pages"][1]["content"]
+
+    calls = StubLLM.calls
+    asyncio.run(service_factory().generate_programmatic_pages(changed))
+    assert StubLLM.calls == calls
+
+
+def test_engine_without_key_falls_back(tmp_path, monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    engine = LLMGenerationEngine(cache_dir=tmp_path)
+    assert not engine.is_available()
+    assert asyncio.run(engine.complete("system", "prompt", max_tokens=10)) is None
+
+
+def test_token_rate_limiter_waits_for_budget():
+    async def run():
+        limiter = TokenRateLimiter(tokens_per_minute=6000)  # 100 tokens/s
+        await limiter.acquire(6000)
+        started = time.monotonic()
+        await limiter.acquire(20)
+        return time.monotonic() - started
+
+    assert 0.15 <= asyncio.run(run()) < 1.0
@@ -0,0 +1,124 @@
+"""
+Test Logging Pipeline
+Background writer thread, per-logger sampling and rate limits, and the
+fixed-field structured formatter
+"""
+import io
+import json
+import logging
+import threading
+
+import pytest
+
+from utils.logger import (
+    AsyncLogHandler,
+    LogPipeline,
+    LogRule,
+    LogSampler,
+    StructuredFormatter,
+    parse_log_rules,
+)
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records: list[tuple[str, str]] = []
+
+    def emit(self, record):
+        self.records.append((threading.current_thread().name, self.format(record)))
+
+
+def record(name: str = "scholarship_api.services.search_service", level: int = logging.INFO, msg: str = "hit",
+           args=(), **extra) -> logging.LogRecord:
+    rec = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    rec.__dict__.update(extra)
+    return rec
+
+
+@pytest.fixture
+def pipeline():
+    pipeline = LogPipeline(queue_size=100)
+    yield pipeline
+    pipeline.stop()
+
+
+def test_parse_log_rules():
+    rules = parse_log_rules("a.search=0.01, b=0.5", "a.search=10,c=2")
+    assert rules == {"a.search": LogRule(0.01, 10.0), "b": LogRule(0.5), "c": LogRule(1.0, 2.0)}
+    assert parse_log_rules("", "") == {}
+
+
+def test_sampling_keeps_fraction_of_info_only():
+    sampler = LogSampler({"scholarship_api.services.search_service": LogRule(sample_rate=0.01)})
+    kept = sum(sampler.filter(record()) for _ in range(1000))
+    assert kept == 10
+    assert all(sampler.filter(record(level=logging.WARNING)) for _ in range(5))
+    assert all(sampler.filter(record(name="scholarship_api.services.other")) for _ in range(5))
+    assert sampler.dropped() == {"scholarship_api.services.search_service": 990}
+
+
+def test_longest_prefix_rule_applies_to_children():
+    sampler = LogSampler({"scholarship_api": LogRule(sample_rate=1.0),
+                          "scholarship_api.services": LogRule(sample_rate=0.5)})
+    kept = sum(sampler.filter(record(name="scholarship_api.services.search_service")) for _ in range(10))
+    assert kept == 5
+    assert all(sampler.filter(record(name="scholarship_api.routers.search")) for _ in range(10))
+
+
+def test_rate_limit():
+    sampler = LogSampler({"scholarship_api.services.analytics_service": LogRule(max_per_second=5)})
+    kept = sum(sampler.filter(record(name="scholarship_api.services.analytics_service")) for _ in range(100))
+    assert 5 <= kept <= 6
+
+
+def test_records_written_by_writer_thread(pipeline):
+    target = RecordingHandler()
+    target.setFormatter(logging.Formatter("%(message)s"))
+    handler = pipeline.wrap(target)
+
+    args = {"query": "nursing"}
+    handler.handle(record(msg="filters: %s", args=(args,)))
+    args["query"] = "changed after the call"
+    pipeline.stop()
+
+    assert target.records == [("log-writer", "filters: {'query': 'nursing'}")]
+
+
+def test_full_queue_drops_instead_of_blocking():
+    pipeline = LogPipeline(queue_size=1)
+    target = RecordingHandler()
+    handler = AsyncLogHandler(target, pipeline)
+    pipeline._thread = threading.current_thread()  # running, but nothing drains the queue
+    for _ in range(3):
+        handler.handle(record())
+    assert pipeline.dropped == 2
+    pipeline._thread = None
+
+
+def test_stopped_pipeline_writes_inline(pipeline):
+    target = RecordingHandler()
+    handler = pipeline.wrap(target)
+    pipeline.stop()
+    handler.handle(record())
+    assert target.records[0][0] == threading.current_thread().name
+
+
+def test_structured_formatter_fixed_fields():
+    rec = record(msg="done %d", args=(3,), trace_id="t-1", latency_ms=0, user_id=None, status_code=200,
+                 unrelated="not emitted")
+    data = json.loads(StructuredFormatter().format(rec))
+    assert data["message"] == "done 3"
+    assert data["trace_id"] == "t-1"
+    assert data["latency_ms"] == 0
+    assert data["status_code"] == 200
+    assert "user_id" not in data and "unrelated" not in data
+
+
+def test_structured_formatter_serializes_non_json_values():
+    rec = record(details={"at": object}, exc_info=None)
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(StructuredFormatter())
+    handler.handle(rec)
+    assert json.loads(stream.getvalue())["details"] == {"at": str(object)}
@@ -0,0 +1,108 @@
+"""
+Test Near-Duplicate Index
+Shingling, LSH band sizing and incremental near-duplicate lookup
+"""
+import random
+
+import pytest
+
+from services.auto_page_maker_service import (
+    UNIQUENESS_INDEX_THRESHOLD,
+    ContentQualityAssurance,
+    uniqueness_index,
+)
+from services.near_duplicate_index import (
+    STOPWORDS,
+    NearDuplicateIndex,
+    band_layout,
+    jaccard,
+    word_shingles,
+)
+
+
+def test_word_shingles():
+    assert word_shingles("Nursing  nursing Scholarship") == {"nursing", "scholarship"}
+    assert word_shingles("a b c d", size=3) == {"a b c", "b c d"}
+    assert word_shingles("a b", size=3) == {"a b"}
+    assert word_shingles("   ", size=3) == frozenset()
+
+
+@pytest.mark.parametrize("threshold", [0.5, 0.8, 0.9])
+def test_band_layout_finds_pairs_at_threshold(threshold):
+    bands, rows = band_layout(threshold, 256)
+    assert bands * rows <= 256
+    assert 1 - (1 - threshold ** rows) ** bands >= 0.99
+
+
+def test_near_duplicates_use_exact_similarity():
+    index = NearDuplicateIndex(threshold=0.8)
+    index.add("a", "Nursing Excellence Scholarship for Texas Students")
+    index.add("b", "Computer Science Leadership Award in Ohio")
+    matches = index.near_duplicates("nursing excellence scholarship for texas students")
+    assert matches == [("a", 1.0)]
+    assert index.near_duplicates("Marine Biology Research Grant") == []
+
+
+def test_threshold_pairs_are_found():
+    rng = random.Random(7)
+    vocabulary = [f"w{i}" for i in range(5000)]
+    index = NearDuplicateIndex(threshold=0.8)
+    probes = []
+    for key in range(200):
+        words = rng.sample(vocabulary, 40)
+        index.add(key, " ".join(words))
+        probes.append((key, words[:37] + rng.sample(vocabulary, 3)))  # Jaccard ~0.86
+    for key, words in probes:
+        text = " ".join(words)
+        expected = jaccard(word_shingles(text), index._shingles[index._rows[key]])
+        assert (key, expected) in index.near_duplicates(text)
+
+
+def test_duplicate_keys_and_empty_text_are_ignored():
+    index = NearDuplicateIndex()
+    index.add(1, "first text")
+    index.add(1, "replacement text")
+    index.add(2, "")
+    assert len(index) == 1
+    assert index.near_duplicates("first text") == [(1, 1.0)]
+
+
+def test_assess_uniqueness_accepts_index():
+    body = "How to apply for the STEM scholarship with a strong essay and transcript"
+    index = uniqueness_index()
+    assert ContentQualityAssurance.assess_uniqueness(body, index) == 1.0
+    index.add("page-1", body)
+    assert ContentQualityAssurance.assess_uniqueness(body, index) == 0.0
+    assert ContentQualityAssurance.assess_uniqueness(body, [body]) == 0.0
+
+
+def test_indexed_uniqueness_matches_exact_scan():
+    rng = random.Random(11)
+    vocabulary = [f"w{i}" for i in range(2000)]
+    stopwords = sorted(STOPWORDS)
+
+    def page() -> list[str]:
+        return [rng.choice(stopwords) if rng.random() < 0.5 else rng.choice(vocabulary) for _ in range(300)]
+
+    pages = [page() for _ in range(60)]
+    index = uniqueness_index()
+    near = 0
+    for i, words in enumerate(pages):
+        index.add(i, " ".join(words))
+        if i % 2:
+            # Light edit of an indexed page
+            source = pages[rng.randrange(i + 1)]
+            probe = " ".join(rng.choice(vocabulary) if rng.random() < 0.05 else w for w in source)
+        else:
+            probe = " ".join(page())
+        shingles = word_shingles(probe, 2, STOPWORDS)
+        closest = max(jaccard(shingles, word_shingles(" ".join(p), 2, STOPWORDS)) for p in pages[:i + 1])
+        near += closest >= UNIQUENESS_INDEX_THRESHOLD
+        expected = 1.0 - closest if closest >= UNIQUENESS_INDEX_THRESHOLD else 1.0
+        assert ContentQualityAssurance.assess_uniqueness(probe, index) == pytest.approx(expected)
+    assert near == 30
+
+
+def test_stopwords_are_not_shingled():
+    assert word_shingles("The nursing scholarship for the students", 2, STOPWORDS) == {
+        "nursing scholarship", "scholarship students"}
@@ -0,0 +1,92 @@
+"""
+Test Predictive Matching
+Batched prediction pipeline: scores the scholarships it is handed without
+per-scholarship lookups, and /predict loads them in one query
+"""
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from models.database import ScholarshipDB
+from models.scholarship import EligibilityCriteria, FieldOfStudy, Scholarship, ScholarshipType
+from models.user import UserProfile
+from services.eligibility_service import EligibilityService
+from services.openai_service import OpenAIService
+from services.predictive_matching_service import PredictiveMatchingService
+from services.scholarship_service import scholarship_repository, scholarship_service
+
+DEADLINE = datetime.utcnow() + timedelta(days=60)
+
+
+def scholarship(i: int, **criteria) -> Scholarship:
+    return Scholarship(
+        id=f"sch_{i}", name=f"Award {i}", organization="Test Foundation",
+        description="A scholarship for testing", amount=1000.0 * (i + 1), max_awards=2,
+        application_deadline=DEADLINE, scholarship_type=ScholarshipType.MERIT_BASED,
+        eligibility_criteria=EligibilityCriteria(**criteria), application_url="https://example.test/apply",
+    )
+
+
+PROFILE = UserProfile(id="user_1", gpa=3.7, grade_level="undergraduate",
+                      field_of_study=FieldOfStudy.ENGINEERING, citizenship="US", state_of_residence="CA")
+
+
+@pytest.fixture
+def service():
+    eligibility = EligibilityService()
+    with patch.object(eligibility, "check_eligibility", side_effect=AssertionError("per-id lookup")):
+        yield PredictiveMatchingService(OpenAIService(), eligibility)
+
+
+def test_predictions_ranked_without_lookups(service):
+    scholarships = [
+        scholarship(0),
+        scholarship(1, min_gpa=3.0, fields_of_study=[FieldOfStudy.ENGINEERING], essay_required=True),
+        scholarship(2, min_gpa=3.9),
+        scholarship(3, residency_states=["NY"], citizenship_required="CA", grade_levels=["high_school"]),
+        scholarship(15, recommendation_letters=2),
+    ]
+    result = asyncio.run(service.predict_scholarship_matches(PROFILE, scholarships))
+
+    assert result.user_id == "user_1"
+    assert result.total_scholarships_analyzed == 5
+    ranked = result.high_priority_matches + result.medium_priority_matches
+    assert ranked
+    likelihoods = [r.predictive_match_result.likelihood_to_win for r in ranked]
+    assert likelihoods == sorted(likelihoods, reverse=True)
+    # sch_3 fails three criteria (match score 0.0) and is filtered before scoring
+    assert "sch_3" not in {r.scholarship_id for r in ranked}
+    assert result.recommended_application_count > 0
+    low, high = result.success_probability_range
+    assert 0 < low <= high <= 100
+
+
+def test_factor_vectors_follow_each_scholarship(service):
+    scholarships = [scholarship(0), scholarship(9, min_gpa=3.0, grade_levels=["undergraduate"])]
+    evaluations = service.eligibility_service.evaluate_scholarships(PROFILE, scholarships)
+    plain, strict = service._calculate_win_probability_factors(PROFILE, scholarships, evaluations)
+
+    assert (plain.total_requirements, plain.requirements_met) == (0, 0)
+    assert (strict.total_requirements, strict.requirements_met) == (2, 2)
+    # $10,000 award draws a stronger pool than $1,000, so the same GPA ranks lower
+    assert strict.gpa_percentile < plain.gpa_percentile
+
+
+def test_scholarships_by_ids_is_one_query():
+    rows = [
+        ScholarshipDB(
+            id=f"sch_{i}", name=f"Award {i}", organization="Test Foundation", description="Testing",
+            amount=1000.0, application_deadline=DEADLINE, scholarship_type="merit_based",
+            eligibility_criteria={}, is_active=True,
+        )
+        for i in (2, 0)
+    ]
+    lookup = AsyncMock(return_value=rows)
+    with patch.object(scholarship_repository, "list_active_by_ids", lookup), \
+            patch.object(scholarship_repository, "get_active", AsyncMock(side_effect=AssertionError)):
+        result = asyncio.run(scholarship_service.get_scholarships_by_ids_async(["sch_0", "sch_1", "sch_2", "sch_0"]))
+
+    lookup.assert_awaited_once_with(["sch_0", "sch_1", "sch_2"])
+    assert [s.id for s in result] == ["sch_0", "sch_2"]
@@ -0,0 +1,144 @@
+"""
+Test Prerender Store
+Render-once-per-version pages, conditional requests and sitemap sharding
+"""
+import gzip
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from production.auto_page_maker_seo import seo_service
+from routers import auto_page_seo, scholarship_pages
+from services import prerender_store
+from services.prerender_store import PrerenderStore, content_hash
+
+HTML = "<html>" + "scholarship " * 500 + "</html>"
+
+
+@pytest.fixture
+def store():
+    store = PrerenderStore(max_entries=3)
+    with patch.object(scholarship_pages, "prerender_store", store), \
+            patch.object(auto_page_seo, "prerender_store", store):
+        yield store
+
+
+@pytest.fixture
+def client(store):
+    app = FastAPI()
+    app.include_router(scholarship_pages.router)
+    app.include_router(auto_page_seo.router)
+    return TestClient(app)
+
+
+def detail_path() -> str:
+    return f"/scholarships/some-slug-{seo_service.sample_scholarships[0]['id']}"
+
+
+def test_content_hash_ignores_key_order():
+    assert content_hash({"a": 1, "b": [1, 2]}) == content_hash({"b": [1, 2], "a": 1})
+    assert content_hash({"a": 1}) != content_hash({"a": 2})
+
+
+def test_renders_once_per_content_version(store):
+    calls = []
+
+    def render():
+        calls.append(1)
+        return HTML
+
+    first = store.get_or_render("/p", {"v": 1}, render)
+    assert store.get_or_render("/p", {"v": 1}, render) is first
+    assert len(calls) == 1
+    second = store.get_or_render("/p", {"v": 2}, render)
+    assert len(calls) == 2
+    assert second.etag != first.etag
+    assert gzip.decompress(second.encoded["gzip"]) == HTML.encode()
+
+
+def test_store_is_bounded(store):
+    for i in range(5):
+        store.get_or_render(f"/p{i}", i, lambda: HTML)
+    assert len(store) == 3
+    assert store.lookup("/p0", content_hash(0)) is None
+
+
+def test_page_served_precompressed_with_validators(client):
+    response = client.get(detail_path(), headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"].startswith('"')
+    assert "last-modified" in response.headers
+    assert "<!DOCTYPE html>" in response.text
+
+    identity = client.get(detail_path(), headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert identity.headers["etag"] == response.headers["etag"]
+
+
+def test_conditional_requests_skip_rendering(client):
+    response = client.get(detail_path())
+    etag, last_modified = response.headers["etag"], response.headers["last-modified"]
+
+    with patch.object(scholarship_pages, "render_scholarship_page_html") as render:
+        assert client.get(detail_path(), headers={"If-None-Match": etag}).status_code == 304
+        assert client.get(detail_path(), headers={"If-Modified-Since": last_modified}).status_code == 304
+        assert client.get(detail_path()).status_code == 200
+        render.assert_not_called()
+
+
+def test_scholarship_change_rerenders_only_its_page(client):
+    scholarship = seo_service.sample_scholarships[0]
+    etag = client.get(detail_path()).headers["etag"]
+    original = scholarship["amount"]
+    try:
+        scholarship["amount"] = original + 1
+        response = client.get(detail_path(), headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+    finally:
+        scholarship["amount"] = original
+
+
+def test_sitemap_rendered_once(client):
+    with patch.object(seo_service, "generate_bulk_seo_pages", wraps=seo_service.generate_bulk_seo_pages) as bulk:
+        first = client.get("/seo/sitemap.xml")
+        second = client.get("/seo/sitemap.xml")
+    assert bulk.call_count == 1
+    assert first.status_code == 200
+    assert "<urlset" in first.text
+    assert second.headers["etag"] == first.headers["etag"]
+    assert client.get("/seo/sitemap-1.xml").status_code == 404
+
+
+def test_sitemap_split_into_index_and_shards(client):
+    with patch.object(auto_page_seo.settings, "seo_sitemap_max_urls", 40):
+        index = client.get("/seo/sitemap.xml")
+        assert "<sitemapindex" in index.text
+        shard_count = index.text.count("<sitemap>")
+        assert shard_count >= 2
+        urls = 0
+        for number in range(1, shard_count + 1):
+            shard = client.get(f"/seo/sitemap-{number}.xml")
+            assert shard.status_code == 200
+            assert shard.text.count("<url>") <= 40
+            urls += shard.text.count("<url>")
+        assert client.get(f"/seo/sitemap-{shard_count + 1}.xml").status_code == 404
+    assert urls > 40
+
+
+def test_missing_shard_is_404_even_with_index_etag(client):
+    with patch.object(auto_page_seo.settings, "seo_sitemap_max_urls", 40):
+        etag = client.get("/seo/sitemap.xml").headers["etag"]
+        assert client.get("/seo/sitemap-999.xml", headers={"If-None-Match": etag}).status_code == 404
+        assert client.get("/seo/sitemap-1.xml").headers["etag"] != etag
+
+
+def test_fallback_pages_are_compressed_cheaply(client):
+    field = seo_service.sample_scholarships[0]["field_of_study"].lower().replace(" ", "-")
+    with patch.object(prerender_store, "_precompress", wraps=prerender_store._precompress) as precompress:
+        assert client.get(f"/scholarships/category/{field}").status_code == 200
+        assert client.get("/scholarships/category/no-such-field-123").status_code == 200
+    assert [call.args[1] for call in precompress.call_args_list] == [True, False]
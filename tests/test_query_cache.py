@@ -0,0 +1,172 @@
+"""
+Test Query Result Cache
+Verify results are really cached, bounded, coalesced and invalidated
+"""
+import asyncio
+import threading
+import time
+
+from models.scholarship import SearchFilters
+from services.query_cache import QueryOptimizationService, QueryResultCache
+
+
+def test_hit_after_miss_returns_stored_result():
+    cache = QueryResultCache("test", max_entries=10, ttl_seconds=60)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return {"value": 42}
+
+    first = cache.get_or_load("k", loader, version=1)
+    second = cache.get_or_load("k", loader, version=1)
+
+    assert first is second
+    assert len(calls) == 1
+    assert cache.get_stats()["hits"] == 1
+    assert cache.get_stats()["misses"] == 1
+
+
+def test_lru_capacity_eviction():
+    cache = QueryResultCache("test", max_entries=2, ttl_seconds=60)
+    cache.get_or_load("a", lambda: "a")
+    cache.get_or_load("b", lambda: "b")
+    cache.get_or_load("a", lambda: "a")  # refresh recency of "a"
+    cache.get_or_load("c", lambda: "c")  # evicts "b"
+
+    assert cache.get_stats()["evictions"] == 1
+    assert cache.get_or_load("a", lambda: "reloaded") == "a"
+    assert cache.get_or_load("b", lambda: "reloaded") == "reloaded"
+
+
+def test_ttl_expiry_and_version_change_force_reload():
+    cache = QueryResultCache("test", max_entries=10, ttl_seconds=0.05)
+    cache.get_or_load("k", lambda: "v1", version=1)
+
+    assert cache.get_or_load("k", lambda: "v2", version=2) == "v2"
+    time.sleep(0.06)
+    assert cache.get_or_load("k", lambda: "v3", version=2) == "v3"
+    assert cache.get_stats()["evictions"] == 2
+
+
+def test_concurrent_identical_misses_are_coalesced():
+    cache = QueryResultCache("test", max_entries=10, ttl_seconds=60)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_loader():
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return "result"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(cache.get_or_load("k", slow_loader)))
+    leader.start()
+    started.wait(timeout=5)
+
+    followers = [
+        threading.Thread(target=lambda: results.append(cache.get_or_load("k", slow_loader)))
+        for _ in range(4)
+    ]
+    for t in followers:
+        t.start()
+    time.sleep(0.05)
+    release.set()
+    for t in [leader, *followers]:
+        t.join(timeout=5)
+
+    assert results == ["result"] * 5
+    assert len(calls) == 1
+    assert cache.get_stats()["coalesced"] == 4
+
+
+def test_loader_errors_are_not_cached():
+    cache = QueryResultCache("test", max_entries=10, ttl_seconds=60)
+
+    def failing():
+        raise RuntimeError("db down")
+
+    try:
+        cache.get_or_load("k", failing)
+    except RuntimeError:
+        pass
+    assert cache.get_or_load("k", lambda: "ok") == "ok"
+
+
+def test_service_invalidation_and_truthful_stats():
+    service = QueryOptimizationService(enabled=True, max_entries=16, ttl_seconds=60)
+    filters = SearchFilters(keyword="engineering")
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return "page"
+
+    service.get_scholarships_by_criteria(filters, loader, version=1)
+    service.get_scholarships_by_criteria(SearchFilters(keyword="engineering"), loader, version=1)
+    service.invalidate("scholarship_write")
+    service.get_scholarships_by_criteria(filters, loader, version=1)
+
+    stats = service.get_cache_stats()
+    assert len(calls) == 2
+    assert stats["cache_hits"] == 1
+    assert stats["cache_misses"] == 2
+    assert stats["namespaces"]["search"]["evictions"] == 1
+
+
+def test_disabled_or_unversioned_cache_bypasses():
+    service = QueryOptimizationService(enabled=True, max_entries=16, ttl_seconds=60)
+    calls = []
+    for _ in range(2):
+        service.get_scholarship_by_id("sch_001", lambda: calls.append(1), version=None)
+    assert len(calls) == 2
+    assert service.get_cache_stats()["total_requests"] == 0
+
+
+def test_sync_lookup_on_event_loop_never_waits_for_async_leader():
+    cache = QueryResultCache("test", max_entries=10, ttl_seconds=60)
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def slow_loader():
+            await release.wait()
+            return "async"
+
+        leader = asyncio.create_task(cache.get_or_load_async("k", slow_loader, version=1))
+        await asyncio.sleep(0)
+        # Sync caller on the loop thread while the async load is in flight: must not block
+        assert cache.get_or_load("k", lambda: "sync", version=1) == "sync"
+        release.set()
+        return await leader
+
+    assert asyncio.run(asyncio.wait_for(scenario(), timeout=5)) == "async"
+
+
+def test_cancelled_async_leader_still_loads_for_followers():
+    cache = QueryResultCache("test", max_entries=10, ttl_seconds=60)
+    calls = []
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def slow_loader():
+            calls.append(1)
+            await release.wait()
+            return "loaded"
+
+        leader = asyncio.create_task(cache.get_or_load_async("k", slow_loader, version=1))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(cache.get_or_load_async("k", slow_loader, version=1))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        assert await follower == "loaded"
+        assert leader.cancelled()
+
+    asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+    assert calls == [1]
+    assert cache.get_or_load("k", lambda: "reloaded", version=1) == "loaded"
@@ -0,0 +1,167 @@
+"""
+Test Revocation Cache
+Local revocation answers (Bloom filter + exact set), expiry, watermark polling,
+pub/sub sync and the bounded-staleness fallback in is_token_revoked
+"""
+import asyncio
+import json
+import queue
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from services import token_blocklist
+from services.revocation_cache import REVOCATION_CHANNEL, BloomFilter, RevocationCache
+
+
+def soon(seconds: float = 3600) -> datetime:
+    return datetime.utcnow() + timedelta(seconds=seconds)
+
+
+class FakeDatabase:
+    """Stands in for revoked_tokens: records each fetch's watermark"""
+
+    def __init__(self, rows=(), clock_skew: timedelta = timedelta(0)):
+        self.rows = list(rows)
+        self.clock_skew = clock_skew
+        self.fetches: list[datetime | None] = []
+
+    def __call__(self, since):
+        self.fetches.append(since)
+        rows = [r for r in self.rows if since is None or r[2] > since - timedelta(seconds=60)]
+        return rows, datetime.utcnow() + self.clock_skew
+
+
+class FakePubSub:
+    def __init__(self):
+        self.messages: queue.Queue = queue.Queue()
+        self.channels: list[str] = []
+
+    def subscribe(self, channel):
+        self.channels.append(channel)
+
+    def get_message(self, timeout=0.0):
+        try:
+            return self.messages.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        pass
+
+
+class FakeRedis:
+    def __init__(self):
+        self.pubsub_instance = FakePubSub()
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return self.pubsub_instance
+
+
+@pytest.fixture
+def cache():
+    return RevocationCache(poll_interval=0.05, max_staleness=5, bloom_capacity=100)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000)
+    items = [f"jti-{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 100
+
+
+def test_unsynced_cache_defers_to_remote(cache):
+    assert cache.check("abc") is None
+
+
+def test_sync_loads_then_polls_since_watermark(cache):
+    revoked_at = datetime.utcnow()
+    database = FakeDatabase([("old", soon(), revoked_at - timedelta(hours=1)), ("new", soon(), revoked_at)])
+    with patch.object(cache, "_fetch", database):
+        assert cache.sync()
+        assert cache.sync()
+    assert database.fetches == [None, revoked_at]
+    assert cache.check("new") is True
+    assert cache.check("old") is True
+    assert cache.check("never-revoked") is False
+
+
+def test_empty_table_watermark_uses_database_clock(cache):
+    database = FakeDatabase(clock_skew=-timedelta(minutes=10))
+    with patch.object(cache, "_fetch", database):
+        assert cache.sync()
+        database.rows.append(("lagging", soon(), datetime.utcnow() - timedelta(minutes=5)))
+        assert cache.sync()
+    assert database.fetches[1] < datetime.utcnow() - timedelta(minutes=9)
+    assert cache.check("lagging") is True
+
+
+def test_entries_expire_with_their_token(cache):
+    with patch.object(cache, "_fetch", FakeDatabase()):
+        cache.sync()
+    cache.add("short", time.time() + 0.05)
+    cache.add("long", time.time() + 3600)
+    assert cache.check("short") is True
+    time.sleep(0.1)
+    assert cache.check("short") is False
+    assert cache.prune() == 1
+    assert len(cache) == 1
+    assert cache.check("long") is True
+
+
+def test_bloom_grows_past_capacity(cache):
+    with patch.object(cache, "_fetch", FakeDatabase()):
+        cache.sync()
+    for i in range(250):
+        cache.add(f"jti-{i}", time.time() + 3600)
+    assert all(cache.check(f"jti-{i}") for i in range(250))
+    assert cache.get_status()["bloom_bits"] > BloomFilter(100).size
+
+
+def test_failed_sync_goes_stale():
+    cache = RevocationCache(poll_interval=0.05, max_staleness=0.05, bloom_capacity=100)
+    with patch.object(cache, "_fetch", FakeDatabase()):
+        cache.sync()
+    assert cache.check("abc") is False
+    with patch.object(cache, "_fetch", side_effect=ConnectionError("down")):
+        assert not cache.sync()
+    time.sleep(0.1)
+    assert cache.check("abc") is None
+
+
+def test_pubsub_revocations_reach_other_workers():
+    redis = FakeRedis()
+    cache = RevocationCache(poll_interval=0.05, max_staleness=5, bloom_capacity=100, redis_factory=lambda: redis)
+    with patch.object(cache, "_fetch", FakeDatabase()):
+        cache.start()
+        try:
+            message = json.dumps({"jti": "published", "exp": time.time() + 3600})
+            redis.pubsub_instance.messages.put({"type": "message", "data": message.encode()})
+            deadline = time.monotonic() + 2
+            while cache.check("published") is not True and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            cache.close()
+    assert redis.pubsub_instance.channels == [REVOCATION_CHANNEL]
+    assert cache.check("published") is True
+
+
+def test_is_token_revoked_answers_locally(cache):
+    with patch.object(cache, "_fetch", FakeDatabase([("revoked", soon(), datetime.utcnow())])):
+        cache.sync()
+    with patch.object(token_blocklist, "revocation_cache", cache), \
+            patch.object(token_blocklist, "_is_token_revoked_remote", side_effect=AssertionError("round trip")):
+        assert asyncio.run(token_blocklist.is_token_revoked("revoked")) is True
+        assert asyncio.run(token_blocklist.is_token_revoked("fresh")) is False
+
+
+def test_is_token_revoked_falls_back_when_stale(cache):
+    with patch.object(token_blocklist, "revocation_cache", cache), \
+            patch.object(token_blocklist, "_is_token_revoked_remote", return_value=True) as remote:
+        assert asyncio.run(token_blocklist.is_token_revoked("abc")) is True
+    remote.assert_called_once_with("abc")
@@ -0,0 +1,101 @@
+"""
+Test Scholarship Feature Store
+Precomputed competition features follow the catalog version and are keyed by
+scholarship id and updated_at
+"""
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from models.predictive_matching import CompetitionLevel, HistoricalWinnerProfile
+from models.scholarship import EligibilityCriteria, FieldOfStudy, Scholarship, ScholarshipType
+from models.user import UserProfile
+from services.eligibility_engine import CompiledCatalog, eligibility_engine
+from services.eligibility_service import EligibilityService
+from services.openai_service import OpenAIService
+from services.predictive_matching_service import PredictiveMatchingService
+from services.scholarship_features import ScholarshipFeatures, ScholarshipFeatureStore
+
+NOW = datetime(2030, 1, 1)
+UPDATED = datetime(2029, 6, 1)
+
+
+def scholarship(i: int, amount: float, max_awards: int = 1, **criteria) -> Scholarship:
+    return Scholarship(
+        id=f"sch_{i}", name=f"Award {i}", organization="Test Foundation", description="Testing",
+        amount=amount, max_awards=max_awards, application_deadline=NOW + timedelta(days=30 * i),
+        scholarship_type=ScholarshipType.MERIT_BASED, eligibility_criteria=EligibilityCriteria(**criteria),
+        application_url="https://example.test/apply", updated_at=UPDATED,
+    )
+
+
+CATALOG = [
+    scholarship(0, 500),
+    scholarship(1, 20000, max_awards=5),
+    scholarship(2, 8000, min_gpa=3.8, fields_of_study=[FieldOfStudy.ENGINEERING], residency_states=["CA"]),
+]
+
+
+@pytest.fixture
+def store():
+    winners = {"sch_1": [HistoricalWinnerProfile(scholarship_id="sch_1", winner_year=2028, avg_gpa=3.9),
+                         HistoricalWinnerProfile(scholarship_id="sch_1", winner_year=2029, avg_gpa=3.7)]}
+    store = ScholarshipFeatureStore(historical_winners=winners)
+    with patch.object(eligibility_engine, "_compiled", CompiledCatalog(CATALOG, version=7)):
+        yield store
+
+
+def test_competition_columns():
+    features = ScholarshipFeatures(CATALOG)
+    assert features.estimated_applicants.tolist() == [100, 300, int(200 * 0.7 ** 3)]
+    assert [int(level) for level in features.level] == [1, 2, 1]
+    assert features.acceptance_rate[1] == pytest.approx(5 / 300)
+    assert features.pool_quality.tolist() == pytest.approx([0.5, 0.7, 0.7])
+    assert features.trend_increasing.tolist() == [False, True, False]
+
+
+def test_analyses_served_from_compiled_catalog(store):
+    first = store.competition(CATALOG, now=NOW)
+    second = store.competition(list(reversed(CATALOG)), now=NOW)
+
+    assert store.compilations == 1
+    assert (store.hits, store.misses) == (6, 0)
+    assert [a.scholarship_id for a in second] == ["sch_2", "sch_1", "sch_0"]
+    assert first[0].competition_level == CompetitionLevel.LOW
+    assert first[0].deadline_pressure == pytest.approx(1.0)
+    assert first[2].deadline_pressure == pytest.approx(30 / 90)
+    assert len(first[1].historical_winner_profiles) == 2
+    assert first[1].avg_winner_characteristics == {"winner_years": 2, "avg_gpa": pytest.approx(3.8)}
+
+
+def test_changed_or_unknown_scholarships_computed_on_demand(store):
+    changed = CATALOG[1].model_copy(update={"amount": 500, "updated_at": UPDATED + timedelta(days=1)})
+    unknown = scholarship(9, 20000)
+    analyses = store.competition([changed, unknown], now=NOW)
+
+    assert (store.hits, store.misses) == (0, 2)
+    assert analyses[0].estimated_applicant_count == 100
+    expected = ScholarshipFeatures([unknown]).analyses([0], NOW)[0]
+    assert analyses[1].model_dump(exclude={"analysis_date"}) == expected.model_dump(exclude={"analysis_date"})
+
+
+def test_store_recompiles_on_new_catalog_version(store):
+    store.competition(CATALOG)
+    with patch.object(eligibility_engine, "_compiled", CompiledCatalog(CATALOG[:2], version=8)):
+        store.competition(CATALOG[:2])
+        store.competition(CATALOG[:2])
+    assert store.compilations == 2
+    assert store.get_status()["version"] == 8
+
+
+def test_predictions_use_precomputed_competition(store):
+    service = PredictiveMatchingService(OpenAIService(), EligibilityService(), feature_store=store)
+    profile = UserProfile(id="user_1", gpa=3.9, field_of_study=FieldOfStudy.ENGINEERING, state_of_residence="CA")
+    result = asyncio.run(service.predict_scholarship_matches(profile, CATALOG))
+
+    assert store.compilations == 1
+    assert store.hits == 3
+    ranked = result.high_priority_matches + result.medium_priority_matches
+    assert {r.predictive_match_result.competition_analysis.scholarship_id for r in ranked} <= {s.id for s in CATALOG}
@@ -0,0 +1,190 @@
+"""
+Test Scholarship Index
+Verify filters are pushed down before pagination and counts stay exact
+"""
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from models.database import ScholarshipDB
+from models.scholarship import FieldOfStudy, ScholarshipType, SearchFilters
+from services.scholarship_index import ScholarshipIndex
+from services import scholarship_service as scholarship_service_module
+from services.scholarship_service import scholarship_service
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    ScholarshipDB.__table__.create(engine)
+    factory = sessionmaker(bind=engine)
+
+    base = datetime(2030, 1, 1)
+    db = factory()
+    for i in range(30):
+        db.add(ScholarshipDB(
+            id=f"sch_{i:03d}",
+            name=f"Engineering Award {i}" if i % 3 == 0 else f"General Award {i}",
+            organization="Test Foundation",
+            description="A scholarship for testing",
+            amount=1000.0 * (i + 1),
+            application_deadline=base + timedelta(days=i),
+            scholarship_type="need_based" if i % 2 else "merit_based",
+            eligibility_criteria={
+                "fields_of_study": ["engineering"] if i % 3 == 0 else ["arts"],
+                "residency_states": ["CA"] if i % 5 == 0 else [],
+                "min_gpa": 3.8 if i % 4 == 0 else None,
+                "citizenship_required": "US" if i % 6 == 0 else None,
+            },
+            is_active=True,
+            updated_at=base
+        ))
+    db.commit()
+    db.close()
+    return factory
+
+
+@pytest.fixture
+def index(session_factory):
+    return ScholarshipIndex(
+        converter=scholarship_service._db_to_scholarship,
+        session_factory=session_factory,
+        refresh_interval_seconds=0
+    )
+
+
+def test_criteria_filters_apply_before_pagination(index):
+    """Eligibility filters must not shorten pages or skew total_count"""
+    response = index.search(SearchFilters(fields_of_study=[FieldOfStudy.ENGINEERING], limit=3))
+
+    assert response.total_count == 10
+    assert len(response.scholarships) == 3
+    assert response.has_next is True
+    assert [s.id for s in response.scholarships] == ["sch_000", "sch_003", "sch_006"]
+
+
+def test_combined_filters_match_reference_semantics(index):
+    filters = SearchFilters(
+        min_amount=2000,
+        max_amount=25000,
+        scholarship_types=[ScholarshipType.MERIT_BASED],
+        states=["NY"],
+        min_gpa=3.5,
+        citizenship="CA",
+        limit=100
+    )
+    response = index.search(filters)
+
+    expected = [
+        f"sch_{i:03d}" for i in range(30)
+        if 2000 <= 1000.0 * (i + 1) <= 25000
+        and i % 2 == 0
+        and i % 5 != 0
+        and i % 4 != 0
+        and i % 6 != 0
+    ]
+    assert [s.id for s in response.scholarships] == expected
+    assert response.total_count == len(expected)
+
+
+def test_keyword_and_deadline_window(index):
+    filters = SearchFilters(
+        keyword="engineering",
+        deadline_after=datetime(2030, 1, 4),
+        deadline_before=datetime(2030, 1, 13),
+    )
+    response = index.search(filters)
+    assert [s.id for s in response.scholarships] == ["sch_003", "sch_006", "sch_009", "sch_012"]
+
+
+def test_incremental_refresh_picks_up_updates_and_deactivations(index, session_factory):
+    assert index.search(SearchFilters(limit=100)).total_count == 30
+
+    db = session_factory()
+    row = db.get(ScholarshipDB, "sch_001")
+    row.is_active = False
+    row.updated_at = datetime(2030, 2, 1)
+    renamed = db.get(ScholarshipDB, "sch_002")
+    renamed.name = "Renamed Engineering Grant"
+    renamed.updated_at = datetime(2030, 2, 1)
+    db.commit()
+    db.close()
+
+    response = index.search(SearchFilters(keyword="renamed", limit=100))
+    assert [s.id for s in response.scholarships] == ["sch_002"]
+    assert index.search(SearchFilters(limit=100)).total_count == 29
+    assert index.incremental_refreshes >= 1
+
+
+def test_row_count_drift_triggers_full_reload(index, session_factory):
+    index.search(SearchFilters())
+    reloads = index.full_reloads
+
+    db = session_factory()
+    db.query(ScholarshipDB).filter(ScholarshipDB.id == "sch_029").delete()
+    db.commit()
+    db.close()
+
+    assert index.search(SearchFilters(limit=100)).total_count == 29
+    assert index.full_reloads == reloads + 1
+
+
+def test_version_only_changes_when_content_changes(index, session_factory):
+    index.refresh(force=True)
+    version = index.version
+    index.refresh(force=True)
+    assert index.version == version
+
+    db = session_factory()
+    row = db.get(ScholarshipDB, "sch_005")
+    row.amount = 123456.0
+    row.updated_at = datetime(2030, 3, 1)
+    db.commit()
+    db.close()
+
+    index.refresh(force=True)
+    assert index.version == version + 1
+
+
+def touch(session_factory, scholarship_id: str, when: datetime, **values) -> None:
+    db = session_factory()
+    row = db.get(ScholarshipDB, scholarship_id)
+    for name, value in values.items():
+        setattr(row, name, value)
+    row.updated_at = when
+    db.commit()
+    db.close()
+
+
+def test_catalog_version_follows_non_indexed_fields(index, session_factory):
+    index.refresh(force=True)
+    version, catalog_version = index.version, index.catalog_version
+    index.refresh(force=True)
+    assert index.catalog_version == catalog_version
+
+    touch(session_factory, "sch_005", datetime(2030, 3, 1), application_url="https://example.test/new")
+    index.refresh(force=True)
+    assert index.version == version
+    assert index.catalog_version == catalog_version + 1
+
+
+def test_catalog_version_without_index(session_factory):
+    with patch.object(scholarship_service_module.settings, "scholarship_index_enabled", False), \
+            patch.object(scholarship_service_module.settings, "scholarship_index_refresh_seconds", 0), \
+            patch.object(scholarship_service_module, "get_db_session", session_factory):
+        version = scholarship_service.catalog_version()
+        assert scholarship_service.catalog_version() == version
+
+        touch(session_factory, "sch_007", datetime(2030, 3, 1), contact_email="new@example.test")
+        assert scholarship_service.catalog_version() == version + 1
+
+        touch(session_factory, "sch_008", datetime(2030, 3, 1), is_active=False)
+        assert scholarship_service.catalog_version() == version + 2
@@ -0,0 +1,93 @@
+"""
+Test Telemetry Ingestion Queue
+Dedup on idempotency key, micro-batched writes and backpressure
+"""
+import uuid
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from services.telemetry_ingest import TelemetryIngestQueue, TelemetryQueueFull, build_insert
+
+
+def make_row(request_id: str | None = None) -> dict:
+    return {
+        "request_id": request_id or str(uuid.uuid4()),
+        "app": "scholarship_agent",
+        "env": "prod",
+        "event_name": "page_view",
+        "ts": None,
+        "actor_type": "system",
+        "actor_id": None,
+        "session_id": None,
+        "org_id": None,
+        "properties": "{}",
+    }
+
+
+@pytest.fixture
+def queue():
+    q = TelemetryIngestQueue(max_events=10, batch_size=4, flush_interval=60, dedup_window=100)
+    # Keep the writer thread out of the way; tests drive flush() directly
+    q._writer = object()
+    return q
+
+
+def test_duplicates_are_acknowledged_once(queue):
+    row = make_row()
+    first = queue.submit([row, dict(row)])
+    second = queue.submit([dict(row)])
+    assert first.accepted == [row["request_id"]]
+    assert first.duplicates == 1
+    assert second.accepted == [] and second.duplicates == 1
+    assert queue.depth() == 1
+
+
+def test_full_queue_refuses_whole_batch(queue):
+    queue.submit([make_row() for _ in range(8)])
+    with pytest.raises(TelemetryQueueFull) as exc:
+        queue.submit([make_row() for _ in range(3)])
+    assert exc.value.retry_after >= 1
+    assert queue.depth() == 8
+
+
+def test_flush_writes_micro_batches(queue):
+    queue.submit([make_row() for _ in range(10)])
+    with patch.object(queue, "_insert_batch", return_value=4) as insert:
+        queue.flush()
+    assert [len(call.args[0]) for call in insert.call_args_list] == [4, 4, 2]
+    assert queue.depth() == 0
+
+
+def test_database_outage_requeues_batch(queue):
+    rows = [make_row() for _ in range(3)]
+    queue.submit(rows)
+    with patch.object(queue, "_insert_batch", side_effect=OperationalError("INSERT", {}, Exception("down"))):
+        queue.flush()
+    assert queue.depth() == 3
+    assert queue._take_batch()[0]["request_id"] == rows[0]["request_id"]
+
+
+def test_bad_row_is_dropped_and_forgotten(queue):
+    good, bad = make_row(), make_row()
+
+    def insert(rows):
+        if len(rows) > 1 or rows[0] is bad:
+            raise ValueError("invalid input syntax")
+        return 1
+
+    queue.submit([good, bad])
+    with patch.object(queue, "_insert_batch", side_effect=insert) as insert_mock:
+        queue.flush()
+    assert insert_mock.call_count == 3  # batch, then one per row
+    # The dropped event can be resent; the written one is still a duplicate
+    receipt = queue.submit([dict(good), dict(bad)])
+    assert receipt.accepted == [bad["request_id"]]
+
+
+def test_build_insert_is_one_statement_with_conflict_guard():
+    sql = build_insert(3)
+    assert sql.count("CAST(:request_id_") == 3
+    assert ":properties_2 AS jsonb" in sql
+    assert sql.endswith("ON CONFLICT (request_id) DO NOTHING")
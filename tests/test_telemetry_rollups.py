@@ -0,0 +1,118 @@
+"""
+Test Telemetry Rollups
+Bucket cutoffs, guarded compaction and one-time schema install
+"""
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from services.telemetry_rollups import COMPACT_SQL, TelemetryRollupService, bucket_floor
+
+
+class FakeResult:
+    def __init__(self, value=None, rowcount=0):
+        self.value = value
+        self.rowcount = rowcount
+
+    def scalar(self):
+        return self.value
+
+    def first(self):
+        return self.value
+
+    def fetchall(self):
+        return []
+
+
+class FakeConnection:
+    def __init__(self, engine):
+        self.engine = engine
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.engine.statements.append((sql, params))
+        if "pg_try_advisory_xact_lock" in sql:
+            return FakeResult(self.engine.lock_available)
+        if "pg_trigger" in sql:
+            return FakeResult((1,) if self.engine.trigger_installed else None)
+        return FakeResult(rowcount=3)
+
+    def exec_driver_sql(self, sql):
+        self.engine.statements.append((sql, None))
+
+
+class FakeEngine:
+    def __init__(self, lock_available=True, trigger_installed=False):
+        self.lock_available = lock_available
+        self.trigger_installed = trigger_installed
+        self.statements = []
+        self.dialect = type("Dialect", (), {"name": "postgresql"})()
+
+    def begin(self):
+        return FakeConnection(self)
+
+    connect = begin
+
+
+@pytest.fixture
+def rollups():
+    return TelemetryRollupService(minute_retention_hours=48, compact_interval=600)
+
+
+def use_engine(engine):
+    return patch("services.telemetry_rollups.engine_registry.get_engine", return_value=engine)
+
+
+def test_bucket_floor():
+    moment = datetime(2026, 3, 1, 14, 37, 12, 500)
+    assert bucket_floor(moment) == datetime(2026, 3, 1, 14, 37)
+    assert bucket_floor(moment, "hour") == datetime(2026, 3, 1, 14)
+
+
+def test_cutoff_uses_minute_buckets_inside_retention(rollups):
+    cutoff = datetime.utcnow() - timedelta(hours=24)
+    assert rollups._cutoff(cutoff) == bucket_floor(cutoff)
+    old = datetime.utcnow() - timedelta(days=7)
+    assert rollups._cutoff(old) == bucket_floor(old, "hour")
+
+
+def test_compaction_folds_buckets_older_than_retention(rollups):
+    engine = FakeEngine()
+    now = datetime(2026, 3, 10, 12, 30)
+    with use_engine(engine):
+        assert rollups.compact(now) == 3
+    sql, params = engine.statements[-1]
+    assert sql == COMPACT_SQL
+    assert params == {"cutoff": datetime(2026, 3, 8, 12)}
+
+
+def test_compaction_skips_when_another_worker_holds_lock(rollups):
+    engine = FakeEngine(lock_available=False)
+    with use_engine(engine):
+        assert rollups.compact() == 0
+    assert len(engine.statements) == 1
+
+
+@pytest.mark.parametrize("installed", [True, False])
+def test_schema_installed_once(rollups, installed):
+    engine = FakeEngine(trigger_installed=installed)
+    with use_engine(engine):
+        assert rollups.ensure_schema() is True
+    ran_migration = any("CREATE TABLE IF NOT EXISTS business_event_rollups" in sql for sql, _ in engine.statements)
+    assert ran_migration is not installed
+
+
+def test_unknown_group_falls_back_to_event_name(rollups):
+    engine = FakeEngine()
+    with use_engine(engine):
+        rollups.grouped_counts(datetime.utcnow() - timedelta(hours=1), "properties; DROP TABLE x")
+    sql, _ = engine.statements[-1]
+    assert "GROUP BY event_name" in sql
+    assert "DROP" not in sql
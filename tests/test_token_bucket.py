@@ -0,0 +1,102 @@
+"""
+Test Token Bucket Limiter
+Atomic script path, local token leases and in-memory bucket eviction
+"""
+import time
+from unittest.mock import patch
+
+import pytest
+
+from middleware.production_rate_limiter import TokenBucketLimiter
+
+
+class ScriptedBucket:
+    """Python twin of TOKEN_BUCKET_LUA, standing in for redis register_script"""
+
+    def __init__(self):
+        self.state = {}
+        self.calls = 0
+
+    def __call__(self, keys, args):
+        self.calls += 1
+        limit, window, requested = args
+        now = time.time()
+        tokens, ts = self.state.get(keys[0], (float(limit), now))
+        tokens = min(limit, tokens + max(0.0, now - ts) * (limit / window))
+        granted = min(requested, int(tokens))
+        tokens -= granted
+        self.state[keys[0]] = (tokens, now)
+        return [granted, int(tokens)]
+
+
+class FakeRedis:
+    def __init__(self, script):
+        self.script = script
+
+    def register_script(self, source):
+        assert "redis.call('TIME')" in source
+        return self.script
+
+
+def redis_limiter(lease_size: int) -> tuple[TokenBucketLimiter, ScriptedBucket]:
+    limiter = TokenBucketLimiter(lease_size=lease_size, lease_ttl=60)
+    script = ScriptedBucket()
+    limiter.redis_client = FakeRedis(script)
+    limiter.redis_available = True
+    limiter.last_health_check = time.time()
+    return limiter, script
+
+
+def test_memory_bucket_starts_full_and_enforces_limit():
+    limiter = TokenBucketLimiter(memory_max_keys=100)
+    results = [limiter._get_tokens_memory("ip:1", limit=5, window=60)[0] for _ in range(7)]
+    assert results == [True] * 5 + [False] * 2
+
+
+def test_memory_buckets_are_evicted_when_full_again():
+    limiter = TokenBucketLimiter(memory_max_keys=100)
+    limiter._get_tokens_memory("ip:1", limit=10, window=1)
+    assert "ip:1" in limiter.memory_tokens
+    limiter._sweep_memory(time.time() + 2)
+    assert "ip:1" not in limiter.memory_tokens
+
+
+def test_memory_bucket_count_is_capped():
+    limiter = TokenBucketLimiter(memory_max_keys=3)
+    for i in range(10):
+        limiter._get_tokens_memory(f"ip:{i}", limit=10, window=60)
+    assert list(limiter.memory_tokens) == ["ip:7", "ip:8", "ip:9"]
+
+
+def test_redis_script_called_once_per_check_without_leases():
+    limiter, script = redis_limiter(lease_size=0)
+    for _ in range(5):
+        allowed, _, backend = limiter.check_rate_limit("user:1", limit=100, window=60)
+        assert allowed and backend == "redis"
+    assert script.calls == 5
+
+
+def test_leases_cut_redis_calls_without_over_admitting():
+    limiter, script = redis_limiter(lease_size=50)
+    admitted = [limiter.check_rate_limit("user:1", limit=200, window=3600)[0] for _ in range(200)]
+    assert all(admitted)
+    # lease size is capped at limit // 10 = 20 tokens per script call
+    assert script.calls == 10
+    assert limiter.check_rate_limit("user:1", limit=200, window=3600)[0] is False
+
+
+@pytest.mark.parametrize("limit", [1, 5, 9])
+def test_small_limits_lease_one_token(limit):
+    limiter, _ = redis_limiter(lease_size=50)
+    assert limiter._lease_size_for(limit) == 1
+
+
+def test_expired_leases_are_swept_while_redis_is_healthy():
+    limiter, _ = redis_limiter(lease_size=50)
+    for i in range(20):
+        limiter.check_rate_limit(f"user:{i}", limit=200, window=3600)
+    assert len(limiter.leases) == 20
+    later = time.time() + 120  # past lease_ttl and the sweep interval
+    with patch("middleware.production_rate_limiter.time.time", return_value=later):
+        limiter.check_rate_limit("user:new", limit=200, window=3600)
+    assert list(limiter.leases) == ["user:new"]
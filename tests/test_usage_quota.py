@@ -0,0 +1,128 @@
+"""
+Test Per-Key Usage Quotas
+Sliding-window minute limits shared across workers and batched day/month counters
+"""
+import asyncio
+import threading
+import time
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+import redis
+
+from production.usage_quota import MemoryQuotaStore, UsageQuotaEngine
+
+
+@pytest.fixture
+def store():
+    return MemoryQuotaStore()
+
+
+def engine(store: MemoryQuotaStore) -> UsageQuotaEngine:
+    return UsageQuotaEngine(store=store, flush_interval=3600)
+
+
+def test_window_enforces_limit_and_reports_remaining(store):
+    quota = engine(store)
+    decisions = [quota.check_window("sk_test", limit=5) for _ in range(7)]
+    assert [d.allowed for d in decisions] == [True] * 5 + [False] * 2
+    assert [d.remaining for d in decisions[:5]] == [4, 3, 2, 1, 0]
+    assert decisions[0].reset_at > time.time()
+
+
+def test_window_is_shared_between_workers(store):
+    # Two engines on one store behave like two gunicorn workers on one Redis
+    workers = [engine(store), engine(store)]
+    admitted = sum(workers[i % 2].check_window("sk_test", limit=10).allowed for i in range(30))
+    assert admitted == 10
+
+
+def test_previous_window_is_weighted_by_overlap(store):
+    quota = engine(store)
+    # Fill window 0 completely, then look halfway into window 1
+    with patch("production.usage_quota.time.time", return_value=30.0):
+        for _ in range(10):
+            quota.check_window("sk_test", limit=10)
+    with patch("production.usage_quota.time.time", return_value=90.0):
+        decisions = [quota.check_window("sk_test", limit=10) for _ in range(6)]
+    # 10 * 0.5 carried over leaves room for exactly 5 more
+    assert [d.allowed for d in decisions] == [True] * 5 + [False]
+
+
+def test_usage_is_buffered_until_flush(store):
+    first, second = engine(store), engine(store)
+    for _ in range(3):
+        first.record_usage("sk_test")
+    assert second.usage("sk_test").month == 0
+    first.flush()
+    assert second.usage("sk_test").month == 3
+    assert second.record_usage("sk_test").month == 4
+
+
+def test_flush_batches_into_one_store_call(store):
+    quota = engine(store)
+    for key in ("sk_a", "sk_b"):
+        for _ in range(50):
+            quota.record_usage(key)
+    with patch.object(store, "add_usage", wraps=store.add_usage) as add_usage:
+        quota.flush()
+    assert add_usage.call_count == 1
+    assert sum(add_usage.call_args.args[0].values()) == 200  # day + month for both keys
+
+
+def test_failed_flush_keeps_pending_increments(store):
+    quota = engine(store)
+    quota.record_usage("sk_test")
+    with patch.object(store, "add_usage", side_effect=ConnectionError("redis down")):
+        quota.flush()
+    assert engine(store).usage("sk_test").month == 0
+    quota.flush()
+    assert engine(store).usage("sk_test").month == 1
+
+
+def test_flush_drops_past_period_totals(store):
+    quota = engine(store)
+    with patch("production.usage_quota.datetime") as clock:
+        clock.now.return_value = datetime(2026, 1, 31, 23, 59)
+        quota.record_usage("sk_live_a")
+        quota.flush()
+        old_day, old_month = quota._usage_keys("sk_live_a", clock.now.return_value)
+        assert set(quota._shared) == {old_day, old_month}
+
+        clock.now.return_value = datetime(2026, 2, 1, 0, 1)
+        quota.record_usage("sk_live_a")
+        quota.flush()
+        new_day, new_month = quota._usage_keys("sk_live_a", clock.now.return_value)
+    assert set(quota._shared) == {new_day, new_month}
+
+
+def test_store_keys_do_not_contain_api_key(store):
+    quota = engine(store)
+    quota.check_window("sk_live_secret", limit=5)
+    quota.record_usage("sk_live_secret")
+    quota.flush()
+    assert store._counters
+    assert not any("sk_live_secret" in key for key in store._counters)
+
+
+def test_redis_outage_falls_back_to_worker_windows(store):
+    quota = engine(store)
+    with patch.object(store, "hit_window", side_effect=redis.ConnectionError("redis down")):
+        decisions = [quota.check_window("sk_test", limit=3) for _ in range(4)]
+    assert [d.allowed for d in decisions] == [True] * 3 + [False]
+
+
+def test_async_window_check_runs_off_the_event_loop(store):
+    store.backend = "redis"
+    threads = []
+    original = store.hit_window
+
+    def hit_window(*args):
+        threads.append(threading.current_thread())
+        return original(*args)
+
+    with patch.object(store, "hit_window", side_effect=hit_window):
+        decision = asyncio.run(engine(store).check_window_async("sk_test", limit=5))
+    assert decision.allowed
+    assert threads and threads[0] is not threading.main_thread()
@@ -0,0 +1,134 @@
+"""
+Test Verified Token Cache
+decode_token reuses verified results keyed by token digest until min(exp, TTL),
+and drops them on key rotation and revocation
+"""
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from jose import jwt
+
+from config.settings import settings
+from middleware import auth
+from services import token_blocklist
+from services.revocation_cache import RevocationCache
+from services.verified_token_cache import VerifiedTokenCache, token_digest, verified_token_cache
+
+real_is_token_revoked = token_blocklist.is_token_revoked
+
+
+def hs256_token(jti: str | None = None, ttl: int = 3600, secret: str | None = None) -> str:
+    now = datetime.utcnow()
+    claims = {"sub": "user_1", "roles": ["student"], "scope": "read write",
+              "iat": now, "exp": now + timedelta(seconds=ttl)}
+    if jti:
+        claims["jti"] = jti
+    if settings.jwt_issuer:
+        claims["iss"] = settings.jwt_issuer
+    if settings.jwt_audience:
+        claims["aud"] = settings.jwt_audience
+    return jwt.encode(claims, secret or settings.get_jwt_secret_key, algorithm="HS256")
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    verified_token_cache.clear()
+    with patch.object(token_blocklist, "is_token_revoked", AsyncMock(return_value=False)) as revoked:
+        yield revoked
+    verified_token_cache.clear()
+
+
+def test_hit_skips_verification():
+    token = hs256_token(jti=uuid.uuid4().hex)
+    first = asyncio.run(auth.decode_token(token))
+    assert first is not None and len(verified_token_cache) == 1
+
+    with patch.object(auth.jwt, "decode", side_effect=AssertionError("verified again")):
+        second = asyncio.run(auth.decode_token(token))
+    assert second == first
+
+
+def test_failed_verification_not_cached():
+    assert asyncio.run(auth.decode_token(hs256_token(secret="x" * 64))) is None
+    assert len(verified_token_cache) == 0
+
+
+def test_entries_expire_at_token_exp_or_ttl():
+    cache = VerifiedTokenCache(max_entries=10, ttl_seconds=3600)
+    cache.put("short", "data", time.time() + 0.05, None, ("hs256", "k"))
+    assert cache.get("short", lambda ref: True) is not None
+    time.sleep(0.1)
+    assert cache.get("short", lambda ref: True) is None
+
+    cache = VerifiedTokenCache(max_entries=10, ttl_seconds=0.05)
+    cache.put("long", "data", time.time() + 3600, None, ("hs256", "k"))
+    time.sleep(0.1)
+    assert cache.get("long", lambda ref: True) is None
+    assert len(cache) == 0
+
+
+def test_rotated_key_evicts():
+    token = hs256_token()
+    assert asyncio.run(auth.decode_token(token)) is not None
+    with patch.object(settings, "jwt_secret_key", "r" * 64), \
+            patch.object(settings, "jwt_previous_secret_keys", None):
+        assert asyncio.run(auth.decode_token(token)) is None
+    assert len(verified_token_cache) == 0
+
+
+def test_jwks_key_ref_follows_key_set():
+    from services.jwks_client import jwks_client
+    with patch.object(jwks_client, "_keys", {"kid-1": object()}):
+        assert auth._signing_key_current(("jwks", "kid-1"))
+        assert not auth._signing_key_current(("jwks", "kid-0"))
+
+
+def test_revocation_evicts_cached_token():
+    jti = uuid.uuid4().hex
+    token = hs256_token(jti=jti)
+    assert asyncio.run(auth.decode_token(token)) is not None
+
+    token_blocklist.revocation_cache.add(jti, time.time() + 3600)
+    assert len(verified_token_cache) == 0
+
+
+def test_stale_revocation_set_checked_on_hit(fresh_cache):
+    jti = uuid.uuid4().hex
+    token = hs256_token(jti=jti)
+    assert asyncio.run(auth.decode_token(token)) is not None
+
+    fresh_cache.return_value = True
+    assert asyncio.run(auth.decode_token(token)) is None
+    assert len(verified_token_cache) == 0
+
+
+def test_revocation_racing_put_rejected_on_hit():
+    jti = uuid.uuid4().hex
+    token = hs256_token(jti=jti)
+    assert asyncio.run(auth.decode_token(token)) is not None
+
+    # Fresh local set holding the jti, but whose add never evicted the cached entry
+    local = RevocationCache()
+    local._synced_at = time.monotonic()
+    local.add(jti, time.time() + 3600)
+    with patch.object(token_blocklist, "revocation_cache", local), \
+            patch.object(token_blocklist, "is_token_revoked", real_is_token_revoked):
+        assert asyncio.run(auth.decode_token(token)) is None
+    assert len(verified_token_cache) == 0
+
+
+def test_lru_bound():
+    cache = VerifiedTokenCache(max_entries=2, ttl_seconds=60)
+    for name in ("a", "b"):
+        cache.put(name, name, time.time() + 60, name, ("hs256", "k"))
+    cache.get("a", lambda ref: True)
+    cache.put("c", "c", time.time() + 60, "c", ("hs256", "k"))
+    assert cache.get("b", lambda ref: True) is None
+    assert cache.get("a", lambda ref: True).token_data == "a"
+    assert token_digest("c") in cache._entries
+    cache.evict_jti("b")
+    assert len(cache) == 2
@@ -0,0 +1,15 @@
+"""
+Epoch Time Utilities
+Integer timestamps for vectorized date arithmetic over the scholarship catalog
+"""
+
+from datetime import datetime, timedelta, timezone
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def epoch_microseconds(value: datetime) -> int:
+    """Integer microseconds since epoch, so day arithmetic matches timedelta.days exactly"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // timedelta(microseconds=1)
@@ -1,54 +1,235 @@
 """
 Centralized Logging Configuration and Utilities with Type Safety
 Provides structured logging with configurable levels and JSON formatters.
+
+Records are written to stdout by a background thread (log_pipeline); request
+threads only enqueue them. Per-logger sampling and rate limits (LOG_SAMPLING,
+LOG_RATE_LIMITS) thin out hot-path INFO logs before anything is formatted.
 """
 
+import atexit
+import copy
 import json
 import logging
+import os
+import queue
 import sys
-from datetime import datetime
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler
+
+from config.settings import settings
+
+# Extra fields emitted by StructuredFormatter (set via logger.x(..., extra={...}))
+STRUCTURED_FIELDS = (
+    "trace_id", "request_id", "correlation_id", "user_id", "method", "path", "status", "status_code",
+    "latency_ms", "error", "error_code", "details", "interaction_id", "event_type", "scholarship_id",
+    "task_id", "action", "requested_by",
+)
 
 
 class StructuredFormatter(logging.Formatter):
-    """JSON formatter for structured logging"""
+    """JSON formatter for structured logging (fixed field set, no record.__dict__ walk)"""
 
     def format(self, record: logging.LogRecord) -> str:
         log_data = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).replace(tzinfo=None).isoformat(),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
         }
 
         # Add extra fields if available
-        if hasattr(record, 'trace_id') and record.trace_id:
-            log_data["trace_id"] = record.trace_id
-
-        if hasattr(record, 'user_id') and record.user_id:
-            log_data["user_id"] = record.user_id
-
-        if hasattr(record, 'method') and record.method:
-            log_data["method"] = record.method
-
-        if hasattr(record, 'path') and record.path:
-            log_data["path"] = record.path
-
-        if hasattr(record, 'status') and record.status:
-            log_data["status"] = record.status
-
-        if hasattr(record, 'latency_ms') and record.latency_ms is not None:
-            log_data["latency_ms"] = record.latency_ms
+        fields = record.__dict__
+        for key in STRUCTURED_FIELDS:
+            value = fields.get(key)
+            if value or (value is not None and key == "latency_ms"):
+                log_data[key] = value
+
+        if record.exc_info:
+            log_data["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(log_data, default=str)
+
+
+@dataclass
+class LogRule:
+    """Volume control for one logger prefix; WARNING and above are never dropped"""
+    sample_rate: float = 1.0
+    max_per_second: float | None = None
+
+
+class _RuleState:
+    """Deterministic sampling (credit accumulator) followed by a token bucket"""
+
+    def __init__(self, rule: LogRule):
+        self.rule = rule
+        self._credit = 1.0 - rule.sample_rate  # first record is always kept
+        self._tokens = rule.max_per_second or 0.0
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def admit(self) -> bool:
+        with self._lock:
+            self._credit += self.rule.sample_rate
+            if self._credit < 1.0 - 1e-9:
+                self.dropped += 1
+                return False
+            if self.rule.max_per_second is not None:
+                now = time.monotonic()
+                self._tokens = min(self.rule.max_per_second,
+                                   self._tokens + (now - self._refilled) * self.rule.max_per_second)
+                self._refilled = now
+                if self._tokens < 1.0:
+                    self.dropped += 1
+                    return False
+                self._tokens -= 1.0
+            self._credit -= 1.0
+            return True
+
+
+def parse_log_rules(sampling: str = "", rate_limits: str = "") -> dict[str, LogRule]:
+    """Rules from "logger=fraction,..." and "logger=records_per_second,..." settings strings"""
+    rules: dict[str, LogRule] = {}
+    for spec, attr in ((sampling, "sample_rate"), (rate_limits, "max_per_second")):
+        for item in (spec or "").split(","):
+            name, sep, value = item.partition("=")
+            if not sep or not name.strip():
+                continue
+            setattr(rules.setdefault(name.strip(), LogRule()), attr, float(value))
+    return rules
+
+
+class LogSampler(logging.Filter):
+    """Applies the longest matching LogRule (by logger name prefix) to INFO/DEBUG records"""
+
+    def __init__(self, rules: dict[str, LogRule] | None = None):
+        super().__init__()
+        self.set_rules(rules or {})
+
+    def set_rules(self, rules: dict[str, LogRule]) -> None:
+        self._states = {name: _RuleState(rule) for name, rule in rules.items()}
+        self._resolved: dict[str, _RuleState | None] = {}
+
+    def _state_for(self, name: str) -> _RuleState | None:
+        try:
+            return self._resolved[name]
+        except KeyError:
+            pass
+        state, prefix = None, name
+        while prefix:
+            state = self._states.get(prefix)
+            if state is not None:
+                break
+            prefix = prefix.rpartition(".")[0]
+        self._resolved[name] = state
+        return state
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        state = self._state_for(record.name)
+        return state is None or state.admit()
+
+    def dropped(self) -> dict[str, int]:
+        return {name: state.dropped for name, state in self._states.items()}
+
+
+class AsyncLogHandler(QueueHandler):
+    """
+    Request-path side of the log pipeline: interpolate the message and enqueue
+    for the writer thread. Never blocks: records are dropped (and
+    counted) when the queue is full, and written inline once the pipeline stops.
+    """
 
-        # Add any other extra fields
-        for key, value in record.__dict__.items():
-            if key not in ['name', 'msg', 'args', 'levelname', 'levelno', 'pathname', 'filename',
-                          'module', 'lineno', 'funcName', 'created', 'msecs', 'relativeCreated',
-                          'thread', 'threadName', 'processName', 'process', 'getMessage', 'exc_info',
-                          'exc_text', 'stack_info', 'trace_id', 'user_id', 'method', 'path', 'status', 'latency_ms']:
-                if not key.startswith('_'):
-                    log_data[key] = value
+    def __init__(self, target: logging.Handler, pipeline: "LogPipeline"):
+        super().__init__(pipeline.queue)
+        self.target = target
+        self.pipeline = pipeline
+        self.setLevel(target.level)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Args may be mutated once the caller returns, so the message is fixed here;
+        # formatting (JSON, timestamps, tracebacks) is left to the writer thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait((self.target, record))
+        except queue.Full:
+            self.pipeline.dropped += 1
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if not self.pipeline.running:
+            self.target.handle(record)
+            return
+        super().emit(record)
+
+
+class LogPipeline:
+    """One bounded queue and one writer thread shared by every handler setup_logger creates"""
+
+    def __init__(self, queue_size: int, rules: dict[str, LogRule] | None = None):
+        self.queue_size = queue_size
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.sampler = LogSampler(rules)
+        self.dropped = 0
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def wrap(self, target: logging.Handler) -> AsyncLogHandler:
+        self.start()
+        return AsyncLogHandler(target, self)
+
+    def _run(self) -> None:
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            target, record = item
+            target.handle(record)
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Flush queued records; later records are written inline"""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self.queue.put(None)
+            thread.join(timeout)
+
+    def _after_fork(self) -> None:
+        # The writer thread does not survive fork(); the child gets a fresh queue and thread
+        was_running, self._thread = self._thread is not None, None
+        self.queue = queue.Queue(maxsize=self.queue_size)
+        for handler in _async_handlers:
+            handler.queue = self.queue
+        if was_running:
+            self.start()
+
+    def get_status(self) -> dict:
+        return {"running": self.running, "queued": self.queue.qsize(), "queue_size": self.queue_size,
+                "dropped_queue_full": self.dropped, "dropped_sampled": self.sampler.dropped()}
+
+
+log_pipeline = LogPipeline(settings.log_queue_size, parse_log_rules(settings.log_sampling, settings.log_rate_limits))
+_async_handlers: list[AsyncLogHandler] = []
+atexit.register(log_pipeline.stop)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=log_pipeline._after_fork)
 
-        return json.dumps(log_data)
 
 def setup_logger(
     name: str = "scholarship_api",
@@ -58,6 +239,9 @@ def setup_logger(
     """
     Set up and configure the application logger.
 
+    With LOG_ASYNC (default) the console handler sits behind log_pipeline, so
+    the calling thread never formats or writes to stdout.
+
     Args:
         name: Logger name
         level: Logging level
@@ -87,8 +271,14 @@ def setup_logger(
         # Add formatter to handler
         console_handler.setFormatter(formatter)
 
-        # Add handler to logger
-        logger.addHandler(console_handler)
+        # Add handler to logger (sampled before anything is formatted or queued)
+        if settings.log_async:
+            handler = log_pipeline.wrap(console_handler)
+            _async_handlers.append(handler)
+        else:
+            handler = console_handler
+        handler.addFilter(log_pipeline.sampler)
+        logger.addHandler(handler)
 
     return logger
 